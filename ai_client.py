@@ -0,0 +1,360 @@
+"""
+Pemanggilan model AI Masyud.
+
+Streaming:
+    stream_jawaban() mencetak potongan jawaban begitu datang dari model
+    (generate_content(..., stream=True)), lalu mengembalikan jawaban utuh untuk
+    disimpan ke chatlog, seperti respons panggilan biasa (.text dan .fallback).
+    Jika streaming gagal, otomatis kembali ke panggilan biasa.
+
+Latensi:
+    LatencyLog mencatat per pertanyaan waktu sampai potongan pertama (time-to-first-chunk)
+    dan waktu sampai jawaban lengkap, supaya perbaikan streaming bisa diukur.
+
+Ketahanan:
+    ResilientClient membungkus model dengan batas waktu per panggilan, retry dengan backoff
+    eksponensial yang dibatasi, dan circuit breaker. Jika model terus gagal, breaker terbuka
+    dan jawaban cadangan (fallback) langsung dikembalikan tanpa menunggu jaringan, sehingga
+    alur sewa di input_user() tidak pernah menggantung. Interface-nya sama dengan model
+    (generate_content(prompt, stream=...)), jadi bisa dipakai langsung oleh stream_jawaban().
+"""
+
+import queue
+import threading
+import time
+
+JAWABAN_CADANGAN = (
+    "Maaf, Masyud sedang tidak bisa dihubungi. Silakan coba lagi beberapa saat lagi, "
+    "atau tanyakan harga, warna, sopir, dan diskon yang bisa dijawab langsung."
+)
+
+
+class LatencyLog:
+    """
+    Catatan latensi panggilan AI.
+
+    Args:
+        path (str, optional): File CSV tujuan (satu baris per pertanyaan). None = hanya di memori.
+        max_records (int, optional): Jumlah catatan terakhir yang disimpan di memori.
+    """
+
+    def __init__(self, path=None, max_records=1000):
+        self.path = path
+        self.max_records = max_records
+        self.records = []
+
+    def record(self, first_chunk, total, mode):
+        """
+        Mencatat satu pertanyaan.
+
+        Args:
+            first_chunk (float): Detik sampai potongan pertama tampil.
+            total (float): Detik sampai jawaban lengkap.
+            mode (str): 'stream' atau 'blocking'.
+        """
+        self.records.append((first_chunk, total, mode))
+        if len(self.records) > self.max_records:
+            del self.records[0]
+        if self.path:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(f"{time.time():.3f},{mode},{first_chunk:.4f},{total:.4f}\n")
+
+    def percentiles(self, kolom=1):
+        """
+        Persentil latensi dari catatan di memori.
+
+        Args:
+            kolom (int, optional): 0 = time-to-first-chunk, 1 = total. Default total.
+
+        Returns:
+            dict: p50, p95, p99 (detik), 0.0 jika belum ada catatan.
+        """
+        nilai = sorted(r[kolom] for r in self.records)
+        if not nilai:
+            return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+        def ambil(p):
+            # Metode nearest-rank
+            return nilai[min(len(nilai) - 1, max(0, int(-(-p * len(nilai) // 100)) - 1))]
+        return {"p50": ambil(50), "p95": ambil(95), "p99": ambil(99)}
+
+    def summary(self):
+        """
+        Rata-rata latensi dari catatan di memori.
+
+        Returns:
+            dict: count, avg_first_chunk, avg_total (detik).
+        """
+        n = len(self.records)
+        if n == 0:
+            return {"count": 0, "avg_first_chunk": 0.0, "avg_total": 0.0}
+        return {
+            "count": n,
+            "avg_first_chunk": sum(r[0] for r in self.records) / n,
+            "avg_total": sum(r[1] for r in self.records) / n,
+        }
+
+
+def _tulis_layar(teks):
+    print(teks, end="", flush=True)
+
+
+def stream_jawaban(model, prompt, tulis=_tulis_layar, latensi=None):
+    """
+    Meminta jawaban ke model dan menampilkan potongannya begitu datang.
+
+    Args:
+        model: Objek model dengan method generate_content(prompt, stream=...).
+        prompt (str): Prompt lengkap.
+        tulis (callable, optional): Fungsi untuk menampilkan potongan teks. Default print tanpa newline.
+        latensi (LatencyLog, optional): Tempat mencatat latensi.
+
+    Returns:
+        Objek dengan .text (jawaban lengkap) dan .fallback (True jika jawaban cadangan dari
+        ResilientClient). Flag ini milik panggilan ini saja, jadi aman dipakai bersama antar
+        sesi, tidak seperti membandingkan penghitung ResilientClient.fallbacks.
+    """
+    mulai = time.perf_counter()
+    pertama = None
+    potongan = []
+    cadangan = False
+    try:
+        for chunk in model.generate_content(prompt, stream=True):
+            cadangan = cadangan or getattr(chunk, "fallback", False)
+            teks = chunk.text
+            if not teks:
+                continue
+            if pertama is None:
+                pertama = time.perf_counter() - mulai
+            potongan.append(teks)
+            tulis(teks)
+    except Exception:
+        # Streaming gagal (SDK/jaringan), ulangi dengan panggilan biasa
+        respons = model.generate_content(prompt)
+        jawaban = respons.text
+        sudah = "".join(potongan)
+        if sudah and jawaban.startswith(sudah):
+            tulis(jawaban[len(sudah):])
+        else:
+            tulis(("\n" if sudah else "") + jawaban)
+        total = time.perf_counter() - mulai
+        if latensi is not None:
+            latensi.record(pertama if pertama is not None else total, total, "blocking")
+        return _Teks(jawaban, getattr(respons, "fallback", False))
+
+    total = time.perf_counter() - mulai
+    if latensi is not None:
+        latensi.record(pertama if pertama is not None else total, total, "stream")
+    return _Teks("".join(potongan), cadangan)
+
+
+class _Teks:
+    """Objek jawaban minimal dengan atribut .text, seperti respons SDK."""
+
+    def __init__(self, text, fallback=False):
+        self.text = text
+        # True jika ini jawaban cadangan, bukan jawaban model
+        self.fallback = fallback
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker sederhana (tertutup -> terbuka -> setengah terbuka).
+
+    Args:
+        failure_threshold (int, optional): Jumlah kegagalan beruntun sampai breaker terbuka.
+        reset_timeout (float, optional): Detik sebelum satu panggilan percobaan diizinkan lagi.
+        clock (callable, optional): Sumber waktu (bisa diganti di test).
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self._kunci = threading.Lock()
+
+    @property
+    def state(self):
+        """'closed', 'open', atau 'half-open'."""
+        if self.opened_at is None:
+            return "closed"
+        if self.clock() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        """
+        Mengecek apakah panggilan boleh dilakukan.
+
+        Returns:
+            bool: False jika breaker sedang terbuka.
+        """
+        with self._kunci:
+            if self.state != "half-open":
+                return self.state == "closed"
+            # Hanya satu panggilan percobaan; sisanya menunggu hasilnya
+            self.opened_at = self.clock()
+            return True
+
+    def success(self):
+        """Mencatat panggilan berhasil (breaker kembali tertutup)."""
+        with self._kunci:
+            self.failures = 0
+            self.opened_at = None
+
+    def failure(self):
+        """Mencatat panggilan gagal (breaker terbuka jika ambang tercapai)."""
+        with self._kunci:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = self.clock()
+
+
+def _jalankan(fungsi, timeout):
+    """
+    Menjalankan fungsi di thread daemon dengan batas waktu.
+
+    Thread daemon dipakai supaya panggilan jaringan yang menggantung tidak menahan program saat keluar.
+
+    Raises:
+        TimeoutError: Jika fungsi tidak selesai dalam `timeout` detik.
+    """
+    hasil = queue.Queue(maxsize=1)
+
+    def kerja():
+        try:
+            hasil.put((True, fungsi()))
+        except BaseException as e:
+            hasil.put((False, e))
+
+    threading.Thread(target=kerja, name="masyud-call", daemon=True).start()
+    try:
+        ok, nilai = hasil.get(timeout=timeout)
+    except queue.Empty:
+        raise TimeoutError(f"Model tidak menjawab dalam {timeout} detik") from None
+    if not ok:
+        raise nilai
+    return nilai
+
+
+class ResilientClient:
+    """
+    Pembungkus model dengan deadline, retry + backoff, circuit breaker, dan fallback.
+
+    Args:
+        model: Objek model dengan method generate_content(prompt, stream=...).
+        timeout (float, optional): Batas waktu per panggilan (detik). Untuk streaming, batas
+            waktu berlaku untuk setiap potongan.
+        retries (int, optional): Jumlah percobaan ulang setelah percobaan pertama.
+        backoff (float, optional): Jeda awal sebelum percobaan ulang (detik), dikali 2 tiap kali.
+        max_backoff (float, optional): Jeda maksimal.
+        breaker (CircuitBreaker, optional): Circuit breaker yang dipakai.
+        fallback (callable, optional): fallback(prompt) -> str saat semua percobaan gagal.
+        sleep (callable, optional): Fungsi jeda (bisa diganti di test).
+    """
+
+    def __init__(self, model, timeout=30.0, retries=2, backoff=0.5, max_backoff=8.0,
+                 breaker=None, fallback=None, sleep=time.sleep):
+        self.model = model
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.fallback = fallback if fallback is not None else (lambda prompt: JAWABAN_CADANGAN)
+        self.sleep = sleep
+        # Latensi setiap panggilan model yang berhasil (untuk p50/p95/p99)
+        self.latensi = LatencyLog()
+        self.errors = 0
+        self.fallbacks = 0
+
+    def _cadangan(self, prompt):
+        self.fallbacks += 1
+        return _Teks(self.fallback(prompt), fallback=True)
+
+    def generate_content(self, prompt, stream=False):
+        """
+        Sama seperti model.generate_content(), tetapi tidak pernah menggantung atau melempar error.
+
+        Args:
+            prompt (str): Prompt lengkap.
+            stream (bool, optional): Jika True, mengembalikan iterator potongan jawaban.
+
+        Returns:
+            Objek dengan atribut .text, atau iterator objek tersebut jika stream=True.
+        """
+        if stream:
+            return self._stream(prompt)
+
+        for percobaan in range(self.retries + 1):
+            if not self.breaker.allow():
+                break
+            mulai = time.perf_counter()
+            try:
+                text = _jalankan(lambda: self.model.generate_content(prompt).text, self.timeout)
+            except Exception:
+                self.errors += 1
+                self.breaker.failure()
+                if percobaan < self.retries and self.breaker.state == "closed":
+                    self.sleep(min(self.max_backoff, self.backoff * 2 ** percobaan))
+                continue
+            lama = time.perf_counter() - mulai
+            self.latensi.record(lama, lama, "call")
+            self.breaker.success()
+            return _Teks(text)
+        return self._cadangan(prompt)
+
+    def _stream(self, prompt):
+        """
+        Iterator potongan jawaban dengan deadline per potongan.
+
+        Jika breaker terbuka, langsung menghasilkan jawaban cadangan. Jika streaming gagal,
+        error dilempar ke pemanggil (stream_jawaban) yang akan memakai generate_content() biasa.
+        """
+        if not self.breaker.allow():
+            yield self._cadangan(prompt)
+            return
+
+        potongan = queue.Queue()
+        selesai = object()
+
+        def kerja():
+            try:
+                for chunk in self.model.generate_content(prompt, stream=True):
+                    potongan.put(chunk)
+                potongan.put(selesai)
+            except BaseException as e:
+                potongan.put(e)
+
+        mulai = time.perf_counter()
+        pertama = None
+        threading.Thread(target=kerja, name="masyud-stream", daemon=True).start()
+        while True:
+            try:
+                item = potongan.get(timeout=self.timeout)
+            except queue.Empty:
+                item = TimeoutError(f"Model tidak mengirim potongan dalam {self.timeout} detik")
+            if item is selesai:
+                break
+            if isinstance(item, BaseException):
+                self.errors += 1
+                self.breaker.failure()
+                raise item
+            if pertama is None:
+                pertama = time.perf_counter() - mulai
+            yield item
+        total = time.perf_counter() - mulai
+        self.latensi.record(pertama if pertama is not None else total, total, "call")
+        self.breaker.success()
+
+    def stats(self):
+        """
+        Ringkasan kesehatan klien.
+
+        Returns:
+            dict: state breaker, jumlah error, jumlah fallback, dan p50/p95/p99 latensi (detik).
+        """
+        hasil = {"state": self.breaker.state, "errors": self.errors, "fallbacks": self.fallbacks}
+        hasil.update(self.latensi.percentiles())
+        return hasil
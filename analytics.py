@@ -0,0 +1,294 @@
+"""
+Laporan pendapatan dan pemakaian dari booking.db dan chatlog.txt.
+
+Menjawab pertanyaan seperti "pendapatan per kategori bulan ini", "rata-rata lama sewa",
+"berapa banyak yang pakai voucher", dan "seberapa sering pelanggan mengetik halo mas" tanpa
+mengurai struk teks satu per satu.
+
+Booking:
+    Agregasi dasar (jumlah sewa, hari, pendapatan, diskon voucher per tanggal x kode x
+    pembayaran x voucher) dikerjakan SQLite dengan GROUP BY langsung di booking.db, lalu
+    hasilnya (kecil: hari x kode x metode x voucher) dibaca per potongan (fetchmany) dan
+    dijumlahkan ke setiap dimensi di Python. Tabel booking tidak pernah dimuat ke memori,
+    jadi jutaan booking selesai dalam hitungan detik.
+
+Chat:
+    chatlog.txt (dan file rotasinya) dibaca per blok byte. Setiap blok dipotong di baris baru
+    terakhir, lalu record dihitung dengan bytes.count() tanpa decode per baris. Memori
+    hanya sebesar satu blok walaupun log berukuran puluhan GB.
+
+CLI:
+    python analytics.py --bulan 2025-08
+    python analytics.py --dari 2025-08-01 --sampai 2025-08-31 --db booking.db --chatlog chatlog.txt
+"""
+
+import argparse
+import datetime
+import os
+import pathlib
+import re
+import sqlite3
+import sys
+
+from catalog import Katalog
+from chatlog import LOG_FILE, PAMIT_MASYUD, PEMBUKA_MASYUD, escape_text
+from pricing import format_rupiah
+from store import STORE_FILE
+
+KATALOG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "katalog.json")
+UKURAN_POTONGAN = 10000   # Baris hasil GROUP BY per fetchmany
+BLOK_CHAT = 8 * 1024 * 1024
+
+DIMENSI = ("kategori", "kode", "tanggal", "pembayaran", "voucher")
+JUDUL_DIMENSI = {
+    "kategori": "Pendapatan per kategori",
+    "kode": "Pendapatan per kendaraan",
+    "tanggal": "Pendapatan per hari",
+    "pembayaran": "Metode pembayaran",
+    "voucher": "Pemakaian voucher",
+}
+
+# Voucher yang tidak memberi diskon (kosong/tidak valid) dihitung sebagai tanpa voucher
+_SQL_KUBUS = """
+SELECT substr(tanggal, 1, 10), kode, COALESCE(pembayaran, ''),
+       CASE WHEN diskonVoucher > 0 THEN voucher ELSE '' END,
+       COUNT(*), SUM(jumlahHari), SUM(grandTotal), SUM(COALESCE(diskonVoucher, 0))
+FROM booking
+"""
+
+
+def _angka():
+    return {"sewa": 0, "hari": 0, "pendapatan": 0, "diskonVoucher": 0}
+
+
+def _buka_baca(path):
+    # Mode read-only: laporan tidak pernah mengunci tulis sesi yang sedang berjalan
+    uri = pathlib.Path(path).resolve().as_uri() + "?mode=ro"
+    return sqlite3.connect(uri, uri=True)
+
+
+def ringkas_booking(path=STORE_FILE, kategori=None, dari=None, sampai=None, ukuran=UKURAN_POTONGAN):
+    """
+    Menjumlahkan booking per kategori, kode, tanggal, metode pembayaran, dan voucher.
+
+    Args:
+        path (str, optional): File booking.db.
+        kategori (dict, optional): kode -> kategori kendaraan. Kode yang tidak ada = 'Lainnya'.
+        dari (str, optional): Tanggal awal 'YYYY-MM-DD' (inklusif).
+        sampai (str, optional): Tanggal akhir 'YYYY-MM-DD' (inklusif).
+        ukuran (int, optional): Baris per fetchmany.
+
+    Returns:
+        dict: 'total' -> angka, dan setiap nama di DIMENSI -> {nilai: angka}. Angka berupa dict
+        sewa, hari, pendapatan, diskonVoucher.
+    """
+    kategori = kategori or {}
+    syarat, nilai = [], []
+    if dari:
+        syarat.append("tanggal >= ?")
+        nilai.append(dari)
+    if sampai:
+        besok = datetime.date.fromisoformat(sampai) + datetime.timedelta(days=1)
+        syarat.append("tanggal < ?")
+        nilai.append(besok.isoformat())
+    sql = _SQL_KUBUS
+    if syarat:
+        sql += "WHERE " + " AND ".join(syarat) + "\n"
+    sql += "GROUP BY 1, 2, 3, 4"
+
+    hasil = {"total": _angka()}
+    for dimensi in DIMENSI:
+        hasil[dimensi] = {}
+    conn = _buka_baca(path)
+    try:
+        cur = conn.execute(sql, nilai)
+        while True:
+            potongan = cur.fetchmany(ukuran)
+            if not potongan:
+                break
+            for tanggal, kode, pembayaran, voucher, sewa, hari, pendapatan, diskonVoucher in potongan:
+                kunci = (kategori.get(kode, "Lainnya"), kode, tanggal, pembayaran or "-", voucher or "-")
+                tujuan = [hasil["total"]]
+                for dimensi, k in zip(DIMENSI, kunci):
+                    angka = hasil[dimensi].get(k)
+                    if angka is None:
+                        angka = hasil[dimensi][k] = _angka()
+                    tujuan.append(angka)
+                for angka in tujuan:
+                    angka["sewa"] += sewa
+                    angka["hari"] += hari
+                    angka["pendapatan"] += pendapatan
+                    angka["diskonVoucher"] += diskonVoucher
+    finally:
+        conn.close()
+    return hasil
+
+
+def file_chatlog(path=LOG_FILE):
+    """
+    Returns:
+        list: `path` beserta file rotasinya (path.1, path.2, ...) yang ada, dari yang terlama.
+    """
+    daftar = []
+    n = 1
+    while os.path.exists(f"{path}.{n}"):
+        daftar.append(f"{path}.{n}")
+        n += 1
+    daftar.reverse()
+    if os.path.exists(path):
+        daftar.append(path)
+    return daftar
+
+
+def _pola_baris(baris):
+    """
+    Regex satu baris yang persis sama dengan `baris` (data diawali dan diakhiri '\n').
+
+    '\n' sebelum dan sesudahnya dicek dengan lookbehind/lookahead, jadi baris sama yang
+    berurutan (mis. pembuka halo mas berkali-kali) tetap terhitung semua; bytes.count()
+    tidak menghitung kecocokan yang tumpang tindih.
+    """
+    return re.compile(rb"(?<=\n)" + re.escape(baris) + rb"(?=\n)")
+
+
+def _hitung_baris(data, pola):
+    return sum(1 for _ in pola.finditer(data))
+
+
+def hitung_chat(paths, blok=BLOK_CHAT):
+    """
+    Menghitung record chat di satu atau beberapa file log.
+
+    Args:
+        paths (list): File log (mis. dari file_chatlog()).
+        blok (int, optional): Ukuran blok baca dalam byte.
+
+    Returns:
+        dict: record, pertanyaan (baris Anda), jawaban (baris Masyud selain pembuka/pamit),
+        halomas (berapa kali halo mas dibuka), keluar (ditutup dengan kata keluar), byte.
+    """
+    pembuka = _pola_baris(f"Masyud: {escape_text(PEMBUKA_MASYUD)}".encode("utf-8"))
+    pamit = _pola_baris(f"Masyud: {escape_text(PAMIT_MASYUD)}".encode("utf-8"))
+    hasil = {"record": 0, "pertanyaan": 0, "jawaban": 0, "halomas": 0, "keluar": 0, "byte": 0}
+    for path in paths:
+        hasil["byte"] += os.path.getsize(path)
+        with open(path, "rb") as f:
+            sisa = b""
+            while True:
+                data = f.read(blok)
+                if data:
+                    # Blok dipotong di baris baru terakhir; potongan baris dibawa ke blok berikutnya
+                    data = sisa + data
+                    akhir = data.rfind(b"\n") + 1
+                    data, sisa = data[:akhir], data[akhir:]
+                    if not data:
+                        continue
+                elif sisa:
+                    # Baris terakhir tanpa '\n'
+                    data, sisa = sisa + b"\n", b""
+                else:
+                    break
+                # '\n' di depan supaya record pertama blok juga cocok dengan pola '\nPeran: '
+                data = b"\n" + data
+                hasil["record"] += data.count(b"\n") - 1
+                hasil["pertanyaan"] += data.count(b"\nAnda: ")
+                hasil["jawaban"] += data.count(b"\nMasyud: ")
+                hasil["halomas"] += _hitung_baris(data, pembuka)
+                hasil["keluar"] += _hitung_baris(data, pamit)
+    hasil["jawaban"] -= hasil["halomas"] + hasil["keluar"]
+    return hasil
+
+
+# =================== LAPORAN ===================
+def _tabel(judul, label, baris, total):
+    teks = [judul, "-" * 96,
+            f"{label:<24} {'Sewa':>9} {'Porsi':>7} {'Rata hari':>10} {'Diskon voucher':>18} {'Pendapatan':>20}",
+            "-" * 96]
+    for nama, a in baris:
+        porsi = a["sewa"] / total["sewa"] * 100 if total["sewa"] else 0
+        teks.append(f"{str(nama)[:24]:<24} {a['sewa']:>9} {porsi:>6.1f}% {a['hari'] / a['sewa']:>10.2f} "
+                    f"{'Rp' + format_rupiah(a['diskonVoucher']):>18} {'Rp' + format_rupiah(a['pendapatan']):>20}")
+    teks.append("")
+    return teks
+
+
+def teks_laporan(booking=None, chat=None, nama_kendaraan=None):
+    """
+    Laporan teks dari hasil ringkas_booking() dan/atau hitung_chat().
+
+    Args:
+        booking (dict, optional): Hasil ringkas_booking().
+        chat (dict, optional): Hasil hitung_chat().
+        nama_kendaraan (dict, optional): kode -> nama, untuk tabel per kendaraan.
+
+    Returns:
+        str: Laporan yang siap dicetak.
+    """
+    teks = ["=" * 96, "Laporan Apen Al-wawi Rent", "=" * 96]
+    if booking is not None:
+        total = booking["total"]
+        teks.append(f"Jumlah sewa            : {total['sewa']}")
+        teks.append(f"Total pendapatan       : Rp{format_rupiah(total['pendapatan'])}")
+        if total["sewa"]:
+            pakai = total["sewa"] - booking["voucher"].get("-", {"sewa": 0})["sewa"]
+            teks.append(f"Rata-rata lama sewa    : {total['hari'] / total['sewa']:.2f} hari")
+            teks.append(f"Rata-rata per sewa     : Rp{format_rupiah(total['pendapatan'] // total['sewa'])}")
+            teks.append(f"Sewa dengan voucher    : {pakai} ({pakai / total['sewa'] * 100:.1f}%), "
+                        f"diskon Rp{format_rupiah(total['diskonVoucher'])}")
+        teks.append("")
+        if total["sewa"]:
+            nama_kendaraan = nama_kendaraan or {}
+            for dimensi in DIMENSI:
+                baris = booking[dimensi].items()
+                if dimensi == "tanggal":
+                    baris = sorted(baris)
+                else:
+                    baris = sorted(baris, key=lambda b: -b[1]["pendapatan"])
+                if dimensi == "kode":
+                    baris = [(f"{k} {nama_kendaraan.get(k, '')}".strip(), a) for k, a in baris]
+                teks.extend(_tabel(JUDUL_DIMENSI[dimensi], dimensi.capitalize(), baris, total))
+    if chat is not None:
+        teks.append("Chat Masyud")
+        teks.append("-" * 96)
+        teks.append(f"Halo mas dibuka        : {chat['halomas']}")
+        teks.append(f"Pertanyaan pelanggan   : {chat['pertanyaan']}")
+        teks.append(f"Jawaban Masyud         : {chat['jawaban']}")
+        if chat["halomas"]:
+            teks.append(f"Pertanyaan per sesi    : {chat['pertanyaan'] / chat['halomas']:.2f}")
+        teks.append(f"Ukuran log             : {chat['byte'] / 1024 / 1024:.1f} MB ({chat['record']} record)")
+    return "\n".join(teks)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Laporan pendapatan dan pemakaian Apen Al-wawi Rent")
+    parser.add_argument("--db", default=STORE_FILE, help="File database booking")
+    parser.add_argument("--chatlog", default=LOG_FILE, help="File chatlog (file rotasinya ikut dibaca)")
+    parser.add_argument("--katalog", default=KATALOG_FILE, help="File katalog untuk kategori kendaraan")
+    parser.add_argument("--bulan", help="Bulan 'YYYY-MM' (pengganti --dari/--sampai)")
+    parser.add_argument("--dari", help="Tanggal awal YYYY-MM-DD")
+    parser.add_argument("--sampai", help="Tanggal akhir YYYY-MM-DD")
+    args = parser.parse_args(argv)
+
+    dari, sampai = args.dari, args.sampai
+    if args.bulan:
+        awal = datetime.date.fromisoformat(args.bulan + "-01")
+        akhir = (awal + datetime.timedelta(days=32)).replace(day=1) - datetime.timedelta(days=1)
+        dari, sampai = awal.isoformat(), akhir.isoformat()
+
+    katalog = Katalog(args.katalog)
+    booking = chat = None
+    if os.path.exists(args.db):
+        booking = ringkas_booking(args.db, {k.kode: k.kategori for k in katalog.kendaraan.values()}, dari, sampai)
+    else:
+        print(f"Database {args.db} tidak ditemukan, laporan booking dilewati.", file=sys.stderr)
+    paths = file_chatlog(args.chatlog)
+    if paths:
+        chat = hitung_chat(paths)
+    if dari or sampai:
+        print(f"Periode booking: {dari or '...'} s/d {sampai or '...'}")
+    print(teks_laporan(booking, chat, {k.kode: k.nama for k in katalog.kendaraan.values()}))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""
+Cache jawaban AI Masyud.
+
+Pertanyaan yang sama ("berapa harga G-Class?", "ada diskon?") ditanyakan ratusan kali sehari.
+Jawaban disimpan dengan key = pertanyaan yang dinormalisasi + hash dari base_context dan
+system instruction, jadi begitu konteks berubah semua jawaban lama otomatis tidak terpakai.
+
+Fitur:
+    - Eviksi LRU (max_entries) dan TTL (ttl detik).
+    - Persistensi opsional ke file JSON supaya cache bertahan saat program dijalankan ulang.
+    - Cache dikosongkan otomatis jika file context.txt berubah (dicek lewat mtime).
+    - Counter hits/misses untuk mengukur berapa panggilan model berbayar yang dihemat.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+CACHE_FILE = "answer_cache.json"
+
+
+def normalisasi_pertanyaan(pertanyaan):
+    """
+    Menyamakan bentuk pertanyaan supaya variasi kecil tetap mengenai cache.
+
+    Huruf kecil, spasi berlebih dirapikan, tanda baca di akhir dibuang.
+
+    Args:
+        pertanyaan (str): Pertanyaan dari user.
+
+    Returns:
+        str: Pertanyaan yang sudah dinormalisasi.
+    """
+    teks = re.sub(r"\s+", " ", pertanyaan.lower()).strip()
+    return teks.rstrip("?!.,; ")
+
+
+class AnswerCache:
+    """
+    Cache LRU + TTL untuk jawaban model.
+
+    Args:
+        max_entries (int, optional): Jumlah jawaban maksimal di memori.
+        ttl (float, optional): Umur jawaban dalam detik. None = tidak kedaluwarsa.
+        path (str, optional): File JSON untuk persistensi. None = hanya di memori.
+        context_path (str, optional): File konteks yang dipantau; cache dikosongkan jika berubah.
+    """
+
+    def __init__(self, max_entries=1000, ttl=24 * 3600, path=None, context_path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.context_path = context_path
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._kunci = threading.RLock()
+        self._hash_konteks = (None, None)
+        self._mtime_konteks = self._mtime()
+        if path:
+            self.load()
+
+    def _mtime(self):
+        if not self.context_path:
+            return None
+        try:
+            return os.stat(self.context_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _cek_konteks(self):
+        """Mengosongkan cache jika file konteks berubah sejak terakhir dicek."""
+        mtime = self._mtime()
+        if mtime != self._mtime_konteks:
+            self._mtime_konteks = mtime
+            self.clear()
+
+    def _hash(self, context, system_instruction):
+        # base_context biasanya objek string yang sama setiap panggilan, jadi hash-nya diingat
+        kunci = (context, system_instruction)
+        if self._hash_konteks[0] != kunci:
+            h = hashlib.sha256()
+            h.update(context.encode("utf-8"))
+            h.update(b"\0")
+            h.update((system_instruction or "").encode("utf-8"))
+            self._hash_konteks = (kunci, h.hexdigest())
+        return self._hash_konteks[1]
+
+    def key(self, pertanyaan, context, system_instruction=""):
+        """
+        Membentuk key cache.
+
+        Args:
+            pertanyaan (str): Pertanyaan dari user.
+            context (str): Konteks yang dikirim ke model.
+            system_instruction (str, optional): System instruction model.
+
+        Returns:
+            str: Key cache.
+        """
+        return f"{self._hash(context, system_instruction)}:{normalisasi_pertanyaan(pertanyaan)}"
+
+    def get(self, pertanyaan, context, system_instruction=""):
+        """
+        Mengambil jawaban dari cache.
+
+        Args:
+            pertanyaan (str): Pertanyaan dari user.
+            context (str): Konteks yang dikirim ke model.
+            system_instruction (str, optional): System instruction model.
+
+        Returns:
+            str | None: Jawaban, atau None jika tidak ada/kedaluwarsa.
+        """
+        with self._kunci:
+            self._cek_konteks()
+            key = self.key(pertanyaan, context, system_instruction)
+            item = self._data.get(key)
+            if item is not None and (item[1] is None or item[1] > time.time()):
+                self._data.move_to_end(key)
+                self.hits += 1
+                return item[0]
+            if item is not None:
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, pertanyaan, context, jawaban, system_instruction=""):
+        """
+        Menyimpan jawaban ke cache (dan ke file jika persistensi aktif).
+
+        Args:
+            pertanyaan (str): Pertanyaan dari user.
+            context (str): Konteks yang dikirim ke model.
+            jawaban (str): Jawaban model.
+            system_instruction (str, optional): System instruction model.
+        """
+        with self._kunci:
+            self._cek_konteks()
+            key = self.key(pertanyaan, context, system_instruction)
+            kedaluwarsa = time.time() + self.ttl if self.ttl is not None else None
+            self._data[key] = (jawaban, kedaluwarsa)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+            if self.path:
+                # Hanya terjadi setelah panggilan model (detik), jadi menulis file di sini murah
+                self.save()
+
+    def clear(self):
+        """Mengosongkan seluruh cache (memori dan file)."""
+        with self._kunci:
+            self._data.clear()
+            if self.path and os.path.exists(self.path):
+                os.remove(self.path)
+
+    def stats(self):
+        """
+        Statistik pemakaian cache.
+
+        Returns:
+            dict: hits, misses, size, dan hit_rate.
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def save(self):
+        """Menyimpan cache ke file JSON secara atomik."""
+        with self._kunci:
+            sekarang = time.time()
+            isi = {
+                "context_mtime": self._mtime_konteks,
+                "entries": [[k, j, e] for k, (j, e) in self._data.items() if e is None or e > sekarang],
+            }
+            sementara = f"{self.path}.tmp"
+            with open(sementara, "w", encoding="utf-8") as f:
+                json.dump(isi, f, ensure_ascii=False)
+            os.replace(sementara, self.path)
+
+    def load(self):
+        """Memuat cache dari file JSON; diabaikan jika file rusak atau konteks sudah berubah."""
+        with self._kunci:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    isi = json.load(f)
+            except (OSError, ValueError):
+                return
+            if isi.get("context_mtime") != self._mtime_konteks:
+                return
+            sekarang = time.time()
+            for key, jawaban, kedaluwarsa in isi.get("entries", []):
+                if kedaluwarsa is None or kedaluwarsa > sekarang:
+                    self._data[key] = (jawaban, kedaluwarsa)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
@@ -0,0 +1,216 @@
+"""
+Ketersediaan unit kendaraan per tanggal.
+
+Katalog `pilihan` hanya berisi model kendaraan; satu model bisa punya beberapa unit
+(mis. mb3-1, mb3-2, ...). Ketersediaan mencatat rentang tanggal sewa per unit dan menjawab
+"apakah mb3 kosong mulai tanggal X selama N hari" dan "unit mana yang kosong minggu depan".
+
+Struktur data:
+    Per unit disimpan dua list terurut: tanggal mulai dan tanggal selesai (ordinal tanggal,
+    rentang setengah terbuka [mulai, selesai)). Reservasi dalam satu unit tidak pernah
+    tumpang tindih, jadi kedua list sama-sama terurut dan satu bisect cukup untuk mengecek
+    bentrok: O(log n) per unit walaupun ada ratusan ribu reservasi.
+
+Cek + reservasi dilakukan di bawah satu kunci (reservasi()), sehingga dua sesi server yang
+memesan unit terakhir di waktu bersamaan tidak bisa mendapat unit yang sama.
+"""
+
+import datetime
+import threading
+from bisect import bisect_right
+
+UNIT_DEFAULT = 3  # Jumlah unit per model jika tidak disebutkan
+
+
+def _ordinal(tanggal):
+    return tanggal.toordinal() if isinstance(tanggal, datetime.date) else int(tanggal)
+
+
+class _JadwalUnit:
+    """Rentang sewa satu unit: dua list terurut (mulai, selesai) dalam ordinal tanggal."""
+
+    __slots__ = ("mulai", "selesai")
+
+    def __init__(self):
+        self.mulai = []
+        self.selesai = []
+
+    def kosong(self, a, b):
+        # Reservasi pertama yang selesai setelah a harus mulai paling cepat di b
+        i = bisect_right(self.selesai, a)
+        return i == len(self.mulai) or self.mulai[i] >= b
+
+    def tambah(self, a, b):
+        i = bisect_right(self.selesai, a)
+        self.mulai.insert(i, a)
+        self.selesai.insert(i, b)
+
+    def hapus(self, a):
+        i = bisect_right(self.mulai, a) - 1
+        if i < 0 or self.mulai[i] != a:
+            return False
+        del self.mulai[i]
+        del self.selesai[i]
+        return True
+
+    def kosong_berikutnya(self, a, hari):
+        """Tanggal paling awal >= a di mana unit kosong selama `hari` hari."""
+        i = bisect_right(self.selesai, a)
+        while i < len(self.mulai) and self.mulai[i] < a + hari:
+            a = max(a, self.selesai[i])
+            i += 1
+        return a
+
+
+class Ketersediaan:
+    """
+    Kalender ketersediaan unit kendaraan.
+
+    Args:
+        unit (dict): Jumlah unit per kode kendaraan, mis. {"mb1": 3, "mk2": 5}.
+    """
+
+    def __init__(self, unit):
+        self._unit = {}
+        self._kunci = threading.Lock()
+        self.tambah_unit(unit)
+
+    def tambah_unit(self, unit):
+        """
+        Menambah kode/unit baru (mis. setelah katalog dimuat ulang). Jadwal unit lama tetap.
+
+        Args:
+            unit (dict): Jumlah unit per kode kendaraan.
+        """
+        with self._kunci:
+            for kode, jumlah in unit.items():
+                units = self._unit.setdefault(kode, {})
+                for n in range(len(units) + 1, jumlah + 1):
+                    units[f"{kode}-{n}"] = _JadwalUnit()
+
+    def unit(self, kode):
+        """
+        Returns:
+            list: ID unit untuk kode kendaraan (mis. ['mb1-1', 'mb1-2']).
+        """
+        return list(self._unit.get(kode, ()))
+
+    def _rentang(self, mulai, hari):
+        if hari <= 0:
+            raise ValueError("Jumlah hari harus lebih dari 0")
+        a = _ordinal(mulai)
+        return a, a + hari
+
+    def unit_tersedia(self, kode, mulai, hari):
+        """
+        Unit yang kosong selama `hari` hari mulai tanggal `mulai`.
+
+        Args:
+            kode (str): Kode kendaraan.
+            mulai (datetime.date): Tanggal mulai sewa.
+            hari (int): Lama sewa.
+
+        Returns:
+            list: ID unit yang kosong.
+
+        Raises:
+            ValueError: Jika hari <= 0.
+        """
+        a, b = self._rentang(mulai, hari)
+        with self._kunci:
+            return [u for u, jadwal in self._unit.get(kode, {}).items() if jadwal.kosong(a, b)]
+
+    def tersedia(self, kode, mulai, hari):
+        """
+        Returns:
+            bool: True jika minimal satu unit `kode` kosong pada rentang tersebut.
+        """
+        a, b = self._rentang(mulai, hari)
+        with self._kunci:
+            return any(jadwal.kosong(a, b) for jadwal in self._unit.get(kode, {}).values())
+
+    def ringkasan(self, mulai, hari):
+        """
+        Jumlah unit kosong per kode kendaraan, mis. untuk "apa saja yang kosong minggu depan".
+
+        Returns:
+            dict: kode -> jumlah unit kosong.
+        """
+        a, b = self._rentang(mulai, hari)
+        with self._kunci:
+            return {kode: sum(j.kosong(a, b) for j in units.values()) for kode, units in self._unit.items()}
+
+    def kosong_berikutnya(self, kode, mulai, hari):
+        """
+        Tanggal paling awal (>= mulai) di mana ada unit `kode` kosong selama `hari` hari.
+
+        Returns:
+            datetime.date | None: Tanggal tersebut, atau None jika kode tidak punya unit.
+        """
+        a, _ = self._rentang(mulai, hari)
+        with self._kunci:
+            kandidat = [j.kosong_berikutnya(a, hari) for j in self._unit.get(kode, {}).values()]
+        return datetime.date.fromordinal(min(kandidat)) if kandidat else None
+
+    def reservasi(self, kode, mulai, hari, unit=None):
+        """
+        Mengecek dan memesan satu unit secara atomik.
+
+        Args:
+            kode (str): Kode kendaraan.
+            mulai (datetime.date): Tanggal mulai sewa.
+            hari (int): Lama sewa.
+            unit (str, optional): Unit tertentu; None = unit kosong pertama.
+
+        Returns:
+            str | None: ID unit yang dipesan, atau None jika tidak ada yang kosong.
+
+        Raises:
+            ValueError: Jika hari <= 0.
+        """
+        a, b = self._rentang(mulai, hari)
+        with self._kunci:
+            units = self._unit.get(kode, {})
+            calon = [unit] if unit is not None else units
+            for u in calon:
+                jadwal = units.get(u)
+                if jadwal is not None and jadwal.kosong(a, b):
+                    jadwal.tambah(a, b)
+                    return u
+        return None
+
+    def lepas(self, kode, unit, mulai):
+        """
+        Membatalkan reservasi unit yang dimulai pada tanggal `mulai`.
+
+        Returns:
+            bool: False jika reservasi tidak ditemukan.
+        """
+        with self._kunci:
+            jadwal = self._unit.get(kode, {}).get(unit)
+            return jadwal is not None and jadwal.hapus(_ordinal(mulai))
+
+    def muat(self, reservasi):
+        """
+        Memuat reservasi yang sudah ada (mis. dari BookingStore.reservasi_aktif()).
+
+        Reservasi yang bentrok atau unitnya sudah tidak ada dilewati.
+
+        Args:
+            reservasi (iterable): Tuple (kode, unit, mulai, selesai) dengan tanggal datetime.date
+                atau string 'YYYY-MM-DD'.
+
+        Returns:
+            int: Jumlah reservasi yang dimuat.
+        """
+        jumlah = 0
+        with self._kunci:
+            for kode, unit, mulai, selesai in reservasi:
+                if isinstance(mulai, str):
+                    mulai, selesai = datetime.date.fromisoformat(mulai), datetime.date.fromisoformat(selesai)
+                a, b = _ordinal(mulai), _ordinal(selesai)
+                jadwal = self._unit.get(kode, {}).get(unit)
+                if jadwal is not None and b > a and jadwal.kosong(a, b):
+                    jadwal.tambah(a, b)
+                    jumlah += 1
+        return jumlah
@@ -0,0 +1,69 @@
+"""
+Benchmark analytics.py: laporan dari jutaan booking dan chatlog berukuran GB.
+
+Membuat booking.db sintetis (data seperti bench_store.py, tanggal tersebar sepanjang
+setahun) dan chatlog sintetis, lalu mengukur ringkas_booking() dan hitung_chat().
+
+Contoh:
+    python benchmarks/bench_analytics.py --rows 1000000 --chat 1G
+    python benchmarks/bench_analytics.py --rows 200000 --chat 100M --db /tmp/booking.db
+"""
+
+import argparse
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analytics
+from bench_chatlog import buat_log, parse_ukuran
+from bench_store import buat_booking
+from catalog import Katalog
+from store import BookingStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--chat", default="1G", help="Ukuran chatlog, mis. 100M atau 1G")
+    parser.add_argument("--db", help="Database booking yang sudah ada (tidak dibuat ulang)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = args.db
+        if db is None:
+            db = os.path.join(tmp, "booking.db")
+            store = BookingStore(db)
+            rng = random.Random(17)
+            awal = datetime.datetime(2024, 1, 1)
+            for i in range(0, args.rows, 10000):
+                # Dua booking per menit -> hampir satu tahun untuk 1 juta booking
+                store.simpan_banyak(buat_booking(j // 2, rng, awal) for j in range(i, min(args.rows, i + 10000)))
+            store.close()
+        katalog = Katalog(analytics.KATALOG_FILE)
+        kategori = {k.kode: k.kategori for k in katalog.kendaraan.values()}
+
+        mulai = time.perf_counter()
+        hasil = analytics.ringkas_booking(db, kategori)
+        lama = time.perf_counter() - mulai
+        n = hasil["total"]["sewa"]
+        print(f"ringkas_booking: {n} booking dalam {lama:.2f} detik ({n / lama:,.0f} booking/detik)")
+        mulai = time.perf_counter()
+        analytics.ringkas_booking(db, kategori, dari="2024-03-01", sampai="2024-03-31")
+        print(f"ringkas_booking satu bulan: {time.perf_counter() - mulai:.2f} detik")
+
+        log = os.path.join(tmp, "chatlog.txt")
+        buat_log(log, parse_ukuran(args.chat))
+        mulai = time.perf_counter()
+        chat = analytics.hitung_chat([log])
+        lama = time.perf_counter() - mulai
+        print(f"hitung_chat: {chat['byte'] / 1024 ** 2:.0f} MB, {chat['record']} record dalam {lama:.2f} detik "
+              f"({chat['byte'] / 1024 ** 2 / lama:.0f} MB/detik)")
+
+
+if __name__ == "__main__":
+    main()
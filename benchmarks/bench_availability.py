@@ -0,0 +1,72 @@
+"""
+Benchmark availability.Ketersediaan pada skala armada.
+
+Membuat armada (model x unit), mengisi ratusan ribu reservasi acak selama beberapa tahun,
+lalu mengukur throughput reservasi() dan query tersedia()/unit_tersedia()/ringkasan().
+
+Contoh:
+    python benchmarks/bench_availability.py --models 50 --units 20 --reservasi 300000
+"""
+
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from availability import Ketersediaan
+
+
+def ukur(fungsi, ulang):
+    mulai = time.perf_counter()
+    for _ in range(ulang):
+        fungsi()
+    lama = time.perf_counter() - mulai
+    return ulang / lama, lama / ulang * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--models", type=int, default=50)
+    parser.add_argument("--units", type=int, default=20, help="Unit per model")
+    parser.add_argument("--reservasi", type=int, default=300000, help="Jumlah percobaan reservasi")
+    parser.add_argument("--tahun", type=int, default=5, help="Rentang tanggal reservasi")
+    parser.add_argument("--ulang", type=int, default=20000)
+    args = parser.parse_args()
+
+    kode = [f"mb{i}" for i in range(1, args.models + 1)]
+    kalender = Ketersediaan({k: args.units for k in kode})
+    rng = random.Random(17)
+    awal = datetime.date(2025, 1, 1)
+    rentang = args.tahun * 365
+
+    def acak():
+        return rng.choice(kode), awal + datetime.timedelta(days=rng.randrange(rentang)), rng.randint(1, 14)
+
+    permintaan = [acak() for _ in range(args.reservasi)]
+    mulai = time.perf_counter()
+    berhasil = sum(kalender.reservasi(k, t, h) is not None for k, t, h in permintaan)
+    lama = time.perf_counter() - mulai
+    print(f"Armada {args.models} model x {args.units} unit, {berhasil} reservasi tersimpan "
+          f"({args.reservasi - berhasil} ditolak karena bentrok)")
+    print(f"reservasi()            : {args.reservasi / lama:>12.0f} op/detik")
+
+    query = [acak() for _ in range(args.ulang)]
+    it = iter(query * 10)
+    pekan_depan = awal + datetime.timedelta(days=rentang // 2)
+    hasil = [
+        ("tersedia()", lambda: kalender.tersedia(*next(it))),
+        ("unit_tersedia()", lambda: kalender.unit_tersedia(*next(it))),
+        ("kosong_berikutnya()", lambda: kalender.kosong_berikutnya(*next(it))),
+        ("ringkasan() 7 hari", lambda: kalender.ringkasan(pekan_depan, 7)),
+    ]
+    for nama, fungsi in hasil:
+        ops, us = ukur(fungsi, args.ulang if "ringkasan" not in nama else 200)
+        print(f"{nama:<23}: {ops:>12.0f} op/detik ({us:.1f} us/op)")
+
+
+if __name__ == "__main__":
+    main()
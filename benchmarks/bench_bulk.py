@@ -0,0 +1,61 @@
+"""
+Benchmark bulk.py: hitung ulang + cetak struk untuk file pesanan sintetis.
+
+Membuat file JSONL berisi N pesanan acak (kode, warna, hari, sopir, voucher, pembayaran dari
+katalog), lalu menjalankan bulk.jalankan() dengan beberapa jumlah worker dan mencetak
+pesanan/detik untuk masing-masing.
+
+Contoh:
+    python benchmarks/bench_bulk.py --orders 200000
+    python benchmarks/bench_bulk.py --orders 50000 --workers 0 1 4
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bulk
+from catalog import Katalog
+
+NAMA = ["Budi", "Ani", "Siti", "Agus", "Dewi", "Rudi", "Rina", "Joko", "Tono", "Wati"]
+VOUCHER = ["", "", "", "HEMAT5", "MERDEKA17"]
+
+
+def tulis_pesanan(path, jumlah, rng):
+    kendaraan = list(Katalog(bulk.KATALOG_FILE).kendaraan.values())
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(jumlah):
+            k = rng.choice(kendaraan)
+            f.write(json.dumps({
+                "kode": k.kode, "warna": rng.choice(k.warna), "jumlahHari": rng.randint(1, 20),
+                "sopir": k.sopir and rng.random() < 0.5, "nama": f"{rng.choice(NAMA)} {i}", "alamat": "Jl. Uji",
+                "telepon": f"08{i:010d}", "jenisKelamin": "L", "jaminan": rng.choice(["KTP", "SIM", "Pasport"]),
+                "nomorJaminan": str(i), "voucher": rng.choice(VOUCHER), "pembayaran": rng.choice(["Tunai", "Transfer"]),
+            }) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=200000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, os.cpu_count() or 1])
+    parser.add_argument("--potongan", type=int, default=bulk.UKURAN_POTONGAN)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "pesanan.jsonl")
+        tulis_pesanan(path, args.orders, random.Random(17))
+        print(f"{args.orders} pesanan, {args.potongan} per potongan")
+        for workers in args.workers:
+            hasil = bulk.jalankan(path, os.path.join(tmp, f"out{workers}"), workers, args.potongan,
+                                  voucher_db=os.path.join(tmp, "booking.db"))
+            print(f"  workers={workers:<3} {hasil['detik']:7.2f} detik  {hasil['perDetik']:>10,.0f} pesanan/detik  "
+                  f"gagal={hasil['gagal']}")
+
+
+if __name__ == "__main__":
+    main()
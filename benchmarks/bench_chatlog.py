@@ -0,0 +1,82 @@
+"""
+Benchmark load_chat_history: membaca mundur dari akhir file vs readlines().
+
+Membuat chatlog sintetis dengan beberapa ukuran lalu mengukur waktu mengambil
+5 record terakhir. Waktu tail harus konstan walaupun file membesar sampai GB.
+
+Contoh:
+    python benchmarks/bench_chatlog.py --sizes 1M,100M,2G
+    python benchmarks/bench_chatlog.py --sizes 1M,100M --readlines
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chatlog
+
+SATUAN = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+
+def parse_ukuran(teks):
+    teks = teks.strip().upper()
+    if teks[-1] in SATUAN:
+        return int(float(teks[:-1]) * SATUAN[teks[-1]])
+    return int(teks)
+
+
+def buat_log(path, ukuran):
+    """Menulis chatlog sintetis berukuran kira-kira `ukuran` byte."""
+    blok = "".join(
+        chatlog.format_record("Anda" if i % 2 == 0 else "Masyud",
+                              f"pesan nomor {i}\nberisi beberapa baris jawaban tentang harga sewa")
+        for i in range(2000)
+    ).encode("utf-8")
+    with open(path, "wb") as f:
+        ditulis = 0
+        while ditulis < ukuran:
+            f.write(blok)
+            ditulis += len(blok)
+
+
+def ukur(fungsi, ulang):
+    mulai = time.perf_counter()
+    for _ in range(ulang):
+        fungsi()
+    return (time.perf_counter() - mulai) / ulang
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1M,100M,1G", help="Daftar ukuran log, dipisah koma")
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--readlines", action="store_true", help="Ukur juga cara lama (readlines)")
+    parser.add_argument("--dir", default=None, help="Folder untuk file sementara")
+    args = parser.parse_args()
+
+    print(f"{'Ukuran':>10} | {'tail (ms)':>10} | {'readlines (ms)':>15}")
+    print("-" * 42)
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        path = os.path.join(tmp, "chatlog.txt")
+        for teks in args.sizes.split(","):
+            ukuran = parse_ukuran(teks)
+            buat_log(path, ukuran)
+            log = chatlog.ChatLog(path, max_bytes=None)
+            waktuTail = ukur(lambda: log.tail(args.limit), args.repeat)
+            waktuLama = "-"
+            if args.readlines:
+                def lama():
+                    with open(path, "r", encoding="utf-8") as f:
+                        return f.readlines()[-args.limit:]
+                waktuLama = f"{ukur(lama, 1) * 1000:.2f}"
+            print(f"{teks:>10} | {waktuTail * 1000:>10.4f} | {waktuLama:>15}")
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark replay.py: membuat N rekaman sesi sintetis lalu memutarnya ulang secepat mesin.
+
+Rekaman dibuat seperti pelanggan di loadgen.py (kendaraan, warna, sopir, hari, voucher, dan
+pembayaran acak), sebagian salah ketik kode dulu (jeda memuat ulang) dan sebagian bertanya ke
+Masyud (FAQ lokal dan pertanyaan yang dijawab AI tiruan). Hasil yang diharapkan diambil dari
+putaran pertama, lalu seluruh rekaman diputar ulang dan diverifikasi.
+
+Contoh:
+    python benchmarks/bench_replay.py --sessions 10000
+    python benchmarks/bench_replay.py --sessions 5000 --simpan rekaman_sintetis.jsonl
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rent
+from rekaman import CHAT, VERSI
+from replay import Pemutar, teks_laporan
+
+PERTANYAAN_FAQ = ["berapa harga G-Class?", "ada diskon?", "bisa sewa sopir?", "warna r6 apa aja?"]
+PERTANYAAN_AI = ["bagaimana prosedur klaim asuransi?", "jam berapa kantor buka?", "boleh dibawa ke luar kota?"]
+
+
+def buat_masukan(i, rng):
+    """Masukan satu sesi sintetis sebagai [state, jawaban] / [chat, pertanyaan, jawaban]."""
+    kode = rng.choice(list(rent.pilihan))
+    masukan = []
+    if rng.random() < 0.1:
+        masukan.append(["kendaraan", "xx9"])
+    if rng.random() < 0.3:
+        masukan.append([CHAT, rng.choice(PERTANYAAN_FAQ), ""])
+        pertanyaan = rng.choice(PERTANYAAN_AI)
+        masukan.append([CHAT, pertanyaan, f"Jawaban Masyud untuk: {pertanyaan}"])
+    masukan += [["kendaraan", kode], ["warna", rng.choice(rent.pilihan[kode][2])], ["konfirmasi", "Y"]]
+    if rent.katalog.bisa_sopir(kode):
+        masukan.append(["sopir", rng.choice(["Y", "T"])])
+    pembayaran = rng.choice(["1", "2"])
+    masukan += [
+        ["hari", str(rng.randint(1, 20))], ["nama", f"Pelanggan {i}"], ["alamat", "Jl. Uji Beban 1"],
+        ["telepon", f"08{i:010d}"], ["jenis_kelamin", rng.choice(["L", "P"])], ["jaminan", rng.choice("123")],
+        ["nomor_jaminan", "3201000000000001"], ["voucher", rng.choice(["", "", "HEMAT5", "MERDEKA17"])],
+        ["pembayaran", pembayaran],
+    ]
+    if pembayaran == "1":
+        masukan.append(["uang", "1000000000"])
+    return masukan
+
+
+def buat_rekaman(n, seed):
+    """N rekaman sintetis; 'hasil' diisi dari satu putaran lewat Pemutar."""
+    rng = random.Random(seed)
+    pemutar = Pemutar()
+    daftar = []
+    with pemutar.terpasang():
+        for i in range(n):
+            r = {"v": VERSI, "tanggal": "2025-08-17", "masukan": buat_masukan(i, rng)}
+            r["hasil"], alasan = pemutar.putar(r)
+            if alasan is not None:
+                raise RuntimeError(f"Rekaman sintetis #{i} tidak valid: {alasan}")
+            daftar.append(r)
+    pemutar.close()
+    return daftar
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10000, help="Jumlah rekaman sintetis")
+    parser.add_argument("--seed", type=int, default=17)
+    parser.add_argument("--db", default=":memory:", help="Database booking/voucher untuk putar ulang")
+    parser.add_argument("--simpan", help="Simpan rekaman sintetis ke file JSONL (untuk replay.py)")
+    args = parser.parse_args()
+
+    daftar = buat_rekaman(args.sessions, args.seed)
+    if args.simpan:
+        with open(args.simpan, "w", encoding="utf-8") as f:
+            for r in daftar:
+                f.write(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    pemutar = Pemutar(args.db)
+    laporan = pemutar.jalankan(daftar)
+    pemutar.close()
+    print(teks_laporan(laporan))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark BookingStore: impor massal dan pencarian struk di antara jutaan booking.
+
+Membuat database sintetis berisi N booking (simpan_banyak per batch), lalu mengukur
+waktu cari() berdasarkan telepon, awalan nama, kode + rentang tanggal, dan ambil() per ID.
+
+Contoh:
+    python benchmarks/bench_store.py --rows 1000000
+    python benchmarks/bench_store.py --rows 100000 --batch 5000 --db /tmp/booking.db
+"""
+
+import argparse
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pricing import quote
+from store import BookingStore
+
+NAMA = ["Budi", "Ani", "Siti", "Agus", "Dewi", "Rudi", "Rina", "Joko", "Tono", "Wati"]
+KENDARAAN = [("mb1", "G-Class", 5000000), ("mb2", "BMW M4", 3450000), ("mk2", "Yamaha R6", 700000),
+             ("s1", "Sepeda Listrik", 20000)]
+
+
+def buat_booking(i, rng, awal):
+    kode, jenis, harga = rng.choice(KENDARAAN)
+    hari = rng.randint(1, 20)
+    d = {
+        "tanggal": (awal + datetime.timedelta(minutes=i)).isoformat(sep=" "),
+        "kode": kode, "jenisKendaraan": jenis, "warna": "Hitam", "harga": harga, "jumlahHari": hari,
+        "nama": f"{rng.choice(NAMA)} {i}", "alamat": "Jl. Uji", "telepon": f"08{i:010d}",
+        "jenisKelamin": "L", "jaminan": "KTP", "nomorJaminan": str(i), "pembayaran": "Transfer",
+    }
+    d.update(quote(harga, hari))
+    return d
+
+
+def ukur(fungsi, ulang):
+    mulai = time.perf_counter()
+    for _ in range(ulang):
+        fungsi()
+    return (time.perf_counter() - mulai) / ulang * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--batch", type=int, default=10000, help="Booking per transaksi")
+    parser.add_argument("--db", help="File database (default: file sementara)")
+    parser.add_argument("--ulang", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = BookingStore(args.db or os.path.join(tmp, "booking.db"))
+        rng = random.Random(17)
+        awal = datetime.datetime(2024, 1, 1)
+        mulai = time.perf_counter()
+        for i in range(0, args.rows, args.batch):
+            store.simpan_banyak(buat_booking(j, rng, awal) for j in range(i, min(args.rows, i + args.batch)))
+        lama = time.perf_counter() - mulai
+        print(f"Impor {args.rows} booking: {lama:.2f} detik ({args.rows / lama:.0f} booking/detik)")
+
+        n = store.jumlah()
+        target = n // 2
+        d = store.ambil(target + 1)
+        tanggal = d["tanggal"][:10]
+        hasil = [
+            ("ambil(id)", lambda: store.ambil(target)),
+            ("cari(telepon)", lambda: store.cari(telepon=d["telepon"])),
+            ("cari(nama awalan)", lambda: store.cari(nama=d["nama"])),
+            ("cari(kode, 1 hari)", lambda: store.cari(kode=d["kode"], dari=tanggal, sampai=tanggal)),
+            ("simpan() 1 booking", lambda: store.simpan(buat_booking(n, rng, awal))),
+        ]
+        print(f"{'operasi':<22} {'ms/operasi':>12}")
+        for nama, fungsi in hasil:
+            print(f"{nama:<22} {ukur(fungsi, args.ulang):>12.3f}")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
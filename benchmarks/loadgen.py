@@ -0,0 +1,164 @@
+"""
+Load generator untuk server.py: mensimulasikan N pelanggan bersamaan.
+
+Setiap pelanggan menjalankan satu sesi sewa lengkap (kendaraan acak, sopir, hari, voucher,
+pembayaran) lewat protokol baris server, opsional dengan satu pertanyaan ke Masyud
+(FAQ lokal, tanpa jaringan). Di akhir dilaporkan throughput (sesi/detik) dan latensi
+per prompt (p50/p95/p99).
+
+Contoh:
+    python benchmarks/loadgen.py --clients 200 --sessions 2000           # server embedded
+    python benchmarks/loadgen.py --port 8765 --clients 100 --chat        # ke server yang sudah jalan
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rent
+import server
+from availability import Ketersediaan
+from store import BookingStore
+from vouchers import VoucherBook, voucher_default
+
+PERTANYAAN_CHAT = ["berapa harga G-Class?", "ada diskon?", "bisa sewa sopir?", "warna r6 apa aja?"]
+
+
+def jawab_prompt(prompt, rencana):
+    """Memilih jawaban untuk sebuah prompt berdasarkan rencana pelanggan."""
+    p = prompt.lower()
+    if "jenis kendaraan" in p:
+        return rencana["kode"]
+    if "warna" in p:
+        return rencana["warna"]
+    if "yakin" in p:
+        return "Y"
+    if "sopir" in p:
+        return "Y"
+    if "jumlah hari" in p:
+        return str(rencana["hari"])
+    if "nama" in p:
+        return rencana["nama"]
+    if "alamat" in p:
+        return "Jl. Uji Beban 1"
+    if "telepon" in p:
+        return rencana["telepon"]
+    if "jenis kelamin" in p:
+        return "L"
+    if "jenis jaminan" in p:
+        return "1"
+    if "nik" in p or "pasport" in p or "sim" in p:
+        return "3201000000000001"
+    if "voucher" in p:
+        return rencana["voucher"]
+    if "metode pembayaran" in p:
+        return rencana["pembayaran"]
+    if "uang" in p:
+        return "1000000000"
+    raise ValueError(f"Prompt tidak dikenal: {prompt!r}")
+
+
+def buat_rencana(i, rng):
+    kode = rng.choice(list(rent.pilihan))
+    return {
+        "kode": kode,
+        "warna": rng.choice(rent.pilihan[kode][2]),
+        "hari": rng.randint(1, 20),
+        "nama": f"Pelanggan {i}",
+        "telepon": f"08{i:010d}",
+        "voucher": rng.choice(["", "", "HEMAT5", "MERDEKA17"]),
+        "pembayaran": rng.choice(["1", "2"]),
+    }
+
+
+async def pelanggan(host, port, i, rng, chat, latensi):
+    rencana = buat_rencana(i, rng)
+    reader, writer = await asyncio.open_connection(host, port)
+    sudah_chat = not chat
+    sudah_tanya = False
+    dikirim = None
+    try:
+        while True:
+            baris = await reader.readline()
+            if not baris:
+                return True
+            teks = baris.decode("utf-8")
+            if not teks.startswith(server.PROMPT_PREFIX):
+                continue
+            if dikirim is not None:
+                latensi.append(time.perf_counter() - dikirim)
+            prompt = teks[len(server.PROMPT_PREFIX):].strip()
+            if prompt.startswith("Anda:"):
+                jawaban = "keluar" if sudah_tanya else rng.choice(PERTANYAAN_CHAT)
+                sudah_tanya = True
+            elif not sudah_chat:
+                sudah_chat = True
+                jawaban = "halo mas"
+            else:
+                jawaban = jawab_prompt(prompt, rencana)
+            dikirim = time.perf_counter()
+            writer.write((jawaban + "\n").encode("utf-8"))
+            await writer.drain()
+    finally:
+        writer.close()
+
+
+async def jalankan(args):
+    srv = None
+    host, port = args.host, args.port
+    if port is None:
+        rent.booking_store = BookingStore(args.db)
+        rent.ketersediaan = Ketersediaan({kode: args.unit for kode in rent.pilihan})
+        rent.voucher_book = VoucherBook(args.db, kategori_kendaraan=rent.kategori_kendaraan)
+        rent.voucher_book.simpan_aturan(voucher_default())
+        srv = await server.mulai_server("127.0.0.1", 0, jeda_ulang=0)
+        host, port = srv.sockets[0].getsockname()[:2]
+
+    rng = random.Random(args.seed)
+    latensi = []
+    semaphore = asyncio.Semaphore(args.clients)
+    berhasil = 0
+
+    async def satu(i):
+        nonlocal berhasil
+        async with semaphore:
+            if await pelanggan(host, port, i, random.Random(rng.random()), args.chat, latensi):
+                berhasil += 1
+
+    mulai = time.perf_counter()
+    await asyncio.gather(*(satu(i) for i in range(args.sessions)))
+    lama = time.perf_counter() - mulai
+    if srv is not None:
+        srv.close()
+        await srv.wait_closed()
+
+    latensi.sort()
+    def persen(p):
+        return latensi[min(len(latensi) - 1, int(len(latensi) * p / 100))] * 1000 if latensi else 0.0
+    print(f"Sesi selesai     : {berhasil}/{args.sessions} ({args.clients} pelanggan bersamaan)")
+    print(f"Waktu total      : {lama:.2f} detik")
+    print(f"Throughput       : {berhasil / lama:.1f} sesi/detik, {len(latensi) / lama:.0f} prompt/detik")
+    print(f"Latensi prompt   : p50 {persen(50):.2f} ms | p95 {persen(95):.2f} ms | p99 {persen(99):.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None, help="Port server; kosong = jalankan server embedded")
+    parser.add_argument("--clients", type=int, default=100, help="Jumlah pelanggan bersamaan")
+    parser.add_argument("--sessions", type=int, default=1000, help="Jumlah sesi total")
+    parser.add_argument("--chat", action="store_true", help="Setiap pelanggan bertanya sekali ke Masyud")
+    parser.add_argument("--seed", type=int, default=17)
+    parser.add_argument("--db", default=":memory:", help="Database booking untuk server embedded")
+    parser.add_argument("--unit", type=int, default=1000, help="Unit per kendaraan untuk server embedded")
+    args = parser.parse_args()
+    asyncio.run(jalankan(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""
+Suite benchmark offline untuk jalur yang penting saat beban tinggi.
+
+Kasus:
+    harga.quote               pricing.quote() untuk skenario acak dari katalog (per quote)
+    harga.quote_batch         pricing.quote_batch() 10.000 skenario (hanya jika numpy terpasang)
+    sesi.alur_penuh           satu SesiSewa dari pilih kendaraan sampai bayar tunai (per sesi)
+    chat.load_chat_history.N  rent.load_chat_history() pada chatlog berukuran N (per panggilan)
+    chat.save_chat            rent.save_chat() sampai tertulis ke disk (per pesan)
+    struk.teks_struk          store.teks_struk() (per struk)
+    struk.tulis_struk         store.tulis_struk() ke file (per struk)
+    ai.tanya_masyud           rent.tanya_masyud() end-to-end per pertanyaan, dengan model tiruan
+                              yang menjawab streaming dengan latensi --latensi-ai
+    ai.overhead               ai.tanya_masyud dikurangi latensi model (informasi, tidak dibandingkan)
+
+Semua hasil dalam detik per operasi (lebih kecil lebih baik); setiap kasus diambil waktu
+terbaik dari --ulang percobaan supaya gangguan dari proses lain tidak ikut terukur.
+Tidak butuh API key maupun jaringan: model Gemini diganti model tiruan, chatlog, cache
+jawaban, dan struk ditulis ke folder sementara.
+
+Baseline:
+    python benchmarks/suite.py --simpan-baseline benchmarks/baseline.json
+    python benchmarks/suite.py --baseline benchmarks/baseline.json --toleransi 0.25
+Perintah kedua keluar dengan kode 1 jika ada kasus yang lebih lambat dari baseline lebih dari
+toleransi (0.25 = 25%). Baseline bergantung mesin; buat di mesin yang sama dengan pembanding.
+
+Contoh lain:
+    python benchmarks/suite.py --out hasil.json --sizes 1M,100M,1G
+    python benchmarks/suite.py --cepat
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+AKAR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AKAR)
+
+import rent
+from ai_client import ResilientClient
+from answer_cache import AnswerCache
+from bench_chatlog import buat_log, parse_ukuran
+from bulk import buat_pesanan
+from chatlog import ChatLog, ChatWriter
+from pricing import HARGA_SOPIR, quote, quote_batch
+from session import SesiSewa
+from store import teks_struk, tulis_struk
+
+TOLERANSI = 0.25
+
+
+def ukur(fungsi, n, ulang):
+    """
+    Detik per operasi: waktu terbaik dari `ulang` percobaan, masing-masing memanggil fungsi n kali.
+    """
+    terbaik = float("inf")
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        for _ in range(n):
+            fungsi()
+        terbaik = min(terbaik, time.perf_counter() - mulai)
+    return terbaik / n
+
+
+def _diam(*args, **kwargs):
+    pass
+
+
+# =================== KASUS ===================
+def kasus_harga(rng, ulang):
+    kendaraan = list(rent.katalog.kendaraan.values())
+    skenario = [(k.harga, rng.randint(1, 30), HARGA_SOPIR if k.sopir and rng.random() < 0.5 else 0,
+                 rng.choice(["", "", "HEMAT5", "MERDEKA17"])) for k in (rng.choice(kendaraan) for _ in range(1000))]
+    def semua():
+        for s in skenario:
+            quote(*s)
+    hasil = {"harga.quote": ukur(semua, 10, ulang) / len(skenario)}
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return hasil
+    kode = [k.kode for k in (rng.choice(kendaraan) for _ in range(10000))]
+    hari = [rng.randint(1, 30) for _ in kode]
+    sopir = [rng.random() < 0.5 for _ in kode]
+    voucher = [rng.choice(["", "HEMAT5", "MERDEKA17"]) for _ in kode]
+    hasil["harga.quote_batch"] = ukur(lambda: quote_batch(rent.pilihan, kode, hari, sopir, voucher,
+                                                          cek_sopir=rent.katalog.bisa_sopir), 5, ulang)
+    return hasil
+
+
+def kasus_sesi(ulang):
+    jawaban = ["mb1", "hitam", "Y", "Y", "7", "Budi", "Jl. Mawar", "0812", "L", "1", "3201", "hemat5", "1",
+               "50000000"]
+    def satu_sesi():
+        sesi = SesiSewa(rent.pilihan, tulis=_diam, jeda_ulang=0, struk_path=None, cek_sopir=rent.katalog.bisa_sopir)
+        sesi.mulai()
+        for j in jawaban:
+            sesi.kirim(j)
+        return sesi
+    if not satu_sesi().selesai:
+        raise RuntimeError("Skenario sesi.alur_penuh tidak sampai pembayaran; perbarui daftar jawaban")
+    return {"sesi.alur_penuh": ukur(satu_sesi, 200, ulang)}
+
+
+def kasus_chat(tmp, ukuran_log, ulang):
+    hasil = {}
+    path = os.path.join(tmp, "chatlog.txt")
+    for teks in ukuran_log:
+        buat_log(path, parse_ukuran(teks))
+        log = ChatLog(path, max_bytes=None)
+        with patch.object(rent, "chat_log", log), patch.object(rent, "chat_writer", ChatWriter(log)):
+            hasil[f"chat.load_chat_history.{teks}"] = ukur(lambda: rent.load_chat_history(5), 200, ulang)
+            rent.chat_writer.close()
+        os.remove(path)
+
+    log = ChatLog(path, max_bytes=None)
+    pesan = "berapa harga sewa G-Class untuk 7 hari dengan sopir?\nterima kasih"
+    def tulis_banyak():
+        writer = ChatWriter(log)
+        with patch.object(rent, "chat_writer", writer):
+            for _ in range(10000):
+                rent.save_chat("Anda", pesan)
+        writer.close()
+    hasil["chat.save_chat"] = ukur(tulis_banyak, 1, ulang) / 10000
+    return hasil
+
+
+def kasus_struk(tmp, ulang):
+    d = buat_pesanan({"kode": "mb1", "warna": "Hitam", "jumlahHari": 7, "sopir": True, "nama": "Budi",
+                      "alamat": "Jl. Mawar", "telepon": "0812", "jenisKelamin": "L", "jaminan": "KTP",
+                      "nomorJaminan": "3201", "voucher": "HEMAT5", "pembayaran": "Tunai", "uang": 50000000},
+                     rent.katalog)
+    path = os.path.join(tmp, "struk_penyewaan.txt")
+    return {
+        "struk.teks_struk": ukur(lambda: teks_struk(d), 2000, ulang),
+        "struk.tulis_struk": ukur(lambda: tulis_struk(d, path), 500, ulang),
+    }
+
+
+class ModelTiruan:
+    """Pengganti model Gemini: menjawab dalam beberapa potongan dengan latensi total `latensi` detik."""
+
+    class _Potongan:
+        def __init__(self, text):
+            self.text = text
+
+    def __init__(self, latensi, potongan=5):
+        self.latensi = latensi
+        self.potongan = potongan
+
+    def generate_content(self, prompt, stream=False):
+        jawaban = [f"Bagian {i} jawaban untuk prompt {len(prompt)} karakter. " for i in range(self.potongan)]
+        if not stream:
+            time.sleep(self.latensi)
+            return self._Potongan("".join(jawaban))
+        return self._stream(jawaban)
+
+    def _stream(self, jawaban):
+        for teks in jawaban:
+            time.sleep(self.latensi / self.potongan)
+            yield self._Potongan(teks)
+
+
+def kasus_ai(tmp, latensi, pertanyaan, ulang):
+    log = ChatLog(os.path.join(tmp, "chatlog_ai.txt"), max_bytes=None)
+    writer = ChatWriter(log)
+    # rent.ai sudah terisi, jadi siapkan_ai() tidak memuat SDK Gemini maupun .env
+    ganti = [
+        patch.object(rent, "ai", ResilientClient(ModelTiruan(latensi), timeout=30, retries=0)),
+        patch.object(rent, "answer_cache", AnswerCache()),
+        patch.object(rent, "CONTEXT_FILE", os.path.join(AKAR, "context.txt")),
+        patch.object(rent, "chat_log", log),
+        patch.object(rent, "chat_writer", writer),
+        patch("builtins.print", _diam),
+    ]
+    for p in ganti:
+        p.start()
+    try:
+        nomor = iter(range(10 ** 9))
+        def satu_chat():
+            # Pertanyaan unik: tidak terjawab FAQ maupun cache, selalu sampai ke model
+            masukan = [f"bagaimana prosedur klaim asuransi kasus {next(nomor)}?" for _ in range(pertanyaan)]
+            with patch("builtins.input", side_effect=masukan + ["keluar"]):
+                rent.tanya_masyud()
+        per_tanya = ukur(satu_chat, 1, ulang) / pertanyaan
+    finally:
+        for p in reversed(ganti):
+            p.stop()
+        writer.close()
+    return {"ai.tanya_masyud": per_tanya, "ai.overhead": max(0.0, per_tanya - latensi)}
+
+
+# Kasus yang hanya informasi (selisih kecil dari angka besar, terlalu berisik untuk dibandingkan)
+TIDAK_DIBANDINGKAN = {"ai.overhead"}
+
+
+def jalankan(args):
+    rng = random.Random(args.seed)
+    hasil = {}
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        langkah = [
+            ("harga", lambda: kasus_harga(rng, args.ulang)),
+            ("sesi", lambda: kasus_sesi(args.ulang)),
+            ("chat", lambda: kasus_chat(tmp, args.sizes.split(","), args.ulang)),
+            ("struk", lambda: kasus_struk(tmp, args.ulang)),
+            ("ai", lambda: kasus_ai(tmp, args.latensi_ai, args.pertanyaan, args.ulang)),
+        ]
+        for nama, fungsi in langkah:
+            if args.kasus and nama not in args.kasus:
+                continue
+            print(f"... {nama}", file=sys.stderr)
+            hasil.update(fungsi())
+    return {
+        "meta": {
+            "waktu": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "opsi": {k: v for k, v in vars(args).items() if k not in ("out", "baseline", "simpan_baseline", "dir")},
+        },
+        "hasil": {k: {"detik": v, "banding": k not in TIDAK_DIBANDINGKAN} for k, v in sorted(hasil.items())},
+    }
+
+
+def format_waktu(detik):
+    if detik >= 1:
+        return f"{detik:.2f} s"
+    if detik >= 1e-3:
+        return f"{detik * 1e3:.2f} ms"
+    return f"{detik * 1e6:.2f} us"
+
+
+def bandingkan(hasil, baseline, toleransi=TOLERANSI):
+    """
+    Membandingkan hasil dengan baseline.
+
+    Args:
+        hasil (dict): Keluaran jalankan().
+        baseline (dict): Keluaran jalankan() sebelumnya.
+        toleransi (float, optional): Batas melambat relatif (0.25 = 25%).
+
+    Returns:
+        list: Tuple (nama, detik baseline, detik sekarang, rasio, melambat) untuk kasus yang ada
+        di keduanya.
+    """
+    baris = []
+    for nama, h in hasil["hasil"].items():
+        b = baseline.get("hasil", {}).get(nama)
+        if b is None or not h["banding"] or b["detik"] <= 0:
+            continue
+        rasio = h["detik"] / b["detik"]
+        baris.append((nama, b["detik"], h["detik"], rasio, rasio > 1 + toleransi))
+    return baris
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1M,100M,1G", help="Ukuran chatlog untuk load_chat_history")
+    parser.add_argument("--ulang", type=int, default=5, help="Percobaan per kasus (diambil yang tercepat)")
+    parser.add_argument("--latensi-ai", type=float, default=0.05, help="Latensi model tiruan per jawaban (detik)")
+    parser.add_argument("--pertanyaan", type=int, default=20, help="Pertanyaan per chat di kasus AI")
+    parser.add_argument("--kasus", nargs="+", choices=["harga", "sesi", "chat", "struk", "ai"],
+                        help="Hanya jalankan kasus tertentu")
+    parser.add_argument("--seed", type=int, default=17)
+    parser.add_argument("--cepat", action="store_true", help="Ukuran kecil untuk cek cepat (--sizes 1M --ulang 2)")
+    parser.add_argument("--out", help="Tulis hasil JSON ke file (default: stdout)")
+    parser.add_argument("--baseline", help="File JSON baseline untuk dibandingkan")
+    parser.add_argument("--toleransi", type=float, default=TOLERANSI, help="Batas melambat relatif")
+    parser.add_argument("--simpan-baseline", help="Simpan hasil sebagai baseline baru")
+    parser.add_argument("--dir", help="Folder untuk file sementara (chatlog GB butuh ruang disk)")
+    args = parser.parse_args(argv)
+    if args.cepat:
+        args.sizes, args.ulang, args.pertanyaan = "1M", 2, 5
+
+    hasil = jalankan(args)
+    teks = json.dumps(hasil, indent=2)
+    for path in filter(None, (args.out, args.simpan_baseline)):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(teks + "\n")
+    if not args.out:
+        print(teks)
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    baris = bandingkan(hasil, baseline, args.toleransi)
+    print(f"\n{'kasus':<32} {'baseline':>12} {'sekarang':>12} {'ubah':>8}", file=sys.stderr)
+    for nama, lama, baru, rasio, melambat in baris:
+        tanda = "  MELAMBAT" if melambat else ""
+        print(f"{nama:<32} {format_waktu(lama):>12} {format_waktu(baru):>12} {(rasio - 1) * 100:>+7.1f}%{tanda}",
+              file=sys.stderr)
+    melambat = [b[0] for b in baris if b[4]]
+    if melambat:
+        print(f"\n{len(melambat)} kasus melambat lebih dari {args.toleransi:.0%}: {', '.join(melambat)}",
+              file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,351 @@
+"""
+Hitung ulang harga dan cetak ulang struk secara massal, tanpa prompt interaktif.
+
+Untuk kontrak korporat atau audit, pesanan dibaca dari file JSONL (satu objek JSON per baris)
+atau CSV dengan kolom yang sama seperti data sesi:
+
+    {"kode": "mb1", "warna": "Hitam", "jumlahHari": 7, "sopir": true, "nama": "Budi",
+     "alamat": "Jl. Mawar", "telepon": "0812", "jenisKelamin": "L", "jaminan": "KTP",
+     "nomorJaminan": "3201", "voucher": "HEMAT5", "pembayaran": "Tunai", "uang": 37000000}
+
+    - jaminan    : 1/2/3 atau KTP/Pasport/SIM.
+    - pembayaran : 1/2 atau Tunai/Transfer.
+    - uang       : hanya untuk tunai; kosong = uang pas.
+
+Setiap pesanan divalidasi terhadap katalog (kode, warna, sopir) lalu dihitung dengan
+pricing.quote() seperti di sesi interaktif. Voucher dicek dengan aturan VoucherBook di booking.db
+(--db), tetapi hanya aturan yang tidak bergantung pada pemakaian (masa berlaku, kategori, minimal
+hari, gabung): pesanan yang dihitung ulang sudah memakai vouchernya, jadi kuota yang habis atau
+batas per pelanggan tidak membuatnya ditolak, dan kuota tidak dipotong lagi. Voucher yang tidak
+ada atau tidak berlaku untuk pesanan itu dicatat di gagal.jsonl. Kolom `tanggal` (YYYY-MM-DD,
+tanggal sewa) wajib untuk voucher yang punya masa berlaku.
+Struk ditulis dengan format struk_penyewaan.txt ke folder output yang dipecah per potongan input:
+
+    struk_massal/00000/struk_00000001.txt
+    struk_massal/00001/struk_00000501.txt
+    struk_massal/gagal.jsonl          <- nomor baris + alasan pesanan yang ditolak
+
+Dengan --format json/csv struk ditulis sebagai JSON/CSV (struk.py), dan dengan --gabung semua
+struk satu potongan masuk ke satu file (struk_massal/00000/struk.csv) yang ditulis per blok,
+bukan ribuan file kecil.
+
+Input dibaca sebagai stream dan dikirim per potongan ke process pool dengan jumlah potongan
+yang sedang diproses dibatasi, jadi memakai memori tetap berapa pun besar file input.
+
+CLI:
+    python bulk.py pesanan.jsonl --out struk_massal --workers 8
+    python bulk.py pesanan.jsonl --format csv --gabung
+"""
+
+import argparse
+import csv
+import datetime
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from catalog import Katalog
+from pricing import HARGA_SOPIR, quote, voucher_persen
+from session import JENIS_JAMINAN
+from store import STORE_FILE
+from struk import EKSTENSI, FORMAT, TEKS, render, tulis_banyak
+from vouchers import VoucherBook, voucher_default
+
+KATALOG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "katalog.json")
+OUT_DIR = "struk_massal"
+GAGAL_FILE = "gagal.jsonl"
+GABUNGAN = "struk"  # Nama file struk gabungan per potongan (--gabung)
+UKURAN_POTONGAN = 500  # Pesanan per potongan = per folder output
+
+_JAMINAN = {nama.upper(): nama for nama, _ in JENIS_JAMINAN.values()}
+_PEMBAYARAN = {"1": "Tunai", "TUNAI": "Tunai", "2": "Transfer", "TRANSFER": "Transfer"}
+
+
+def _teks(baris, kolom):
+    nilai = baris.get(kolom)
+    return "" if nilai is None else str(nilai).strip()
+
+
+def _ya(nilai):
+    if isinstance(nilai, str):
+        return nilai.strip().upper() in ("Y", "YA", "1", "TRUE")
+    return bool(nilai)
+
+
+def _periksa_voucher(vouchers, v, baris, d):
+    # Masa berlaku dicek terhadap tanggal pesanan, bukan hari ini: pesanan lama untuk audit
+    # tidak boleh ditolak hanya karena vouchernya sudah lewat masa berlaku sekarang
+    tanggal = _teks(baris, "tanggal")
+    if not tanggal and (v.mulai or v.sampai):
+        raise ValueError(f"Kolom tanggal wajib diisi untuk voucher {v.kode} yang punya masa berlaku")
+    try:
+        tanggal = datetime.date.fromisoformat(tanggal) if tanggal else None
+    except ValueError:
+        raise ValueError(f"Tanggal tidak valid: {tanggal!r}") from None
+    return vouchers.periksa(v, dict(kode=d["kode"], jumlahHari=d["jumlahHari"], telepon=d["telepon"],
+                                    tanggal=tanggal))
+
+
+def buat_pesanan(baris, katalog, vouchers=None):
+    """
+    Memvalidasi satu pesanan dan menghitung rinciannya.
+
+    Args:
+        baris (dict): Satu pesanan dari file input.
+        katalog (catalog.Katalog): Katalog untuk validasi kode, warna, dan sopir.
+        vouchers (vouchers.VoucherBook, optional): Aturan voucher (tanpa cek kuota dan batas per
+            pelanggan, karena voucher pesanan sudah dipakai saat sewa).
+            None = hanya voucher bawaan di pricing.VOUCHER.
+
+    Returns:
+        dict: Data booking dengan key yang sama seperti SesiSewa.data (siap untuk struk.render()).
+
+    Raises:
+        ValueError: Jika pesanan tidak valid (pesan berisi alasannya).
+    """
+    kode = _teks(baris, "kode").lower().replace(" ", "")
+    if kode not in katalog:
+        raise ValueError(f"Kode kendaraan tidak valid: {kode!r}")
+    kendaraan = katalog[kode]
+
+    warna = _teks(baris, "warna").capitalize()
+    if warna not in kendaraan.warna:
+        raise ValueError(f"Warna {warna!r} tidak tersedia untuk {kendaraan.nama}")
+
+    try:
+        jumlahHari = int(_teks(baris, "jumlahHari"))
+    except ValueError:
+        raise ValueError(f"Jumlah hari tidak valid: {baris.get('jumlahHari')!r}") from None
+    if jumlahHari <= 0:
+        raise ValueError(f"Jumlah hari harus lebih dari 0: {jumlahHari}")
+
+    sopir = _ya(baris.get("sopir", False))
+    if sopir and not kendaraan.sopir:
+        raise ValueError(f"{kendaraan.nama} tidak bisa disewa dengan sopir")
+
+    nama = _teks(baris, "nama")
+    if not nama:
+        raise ValueError("Nama penyewa kosong")
+
+    jaminan = _teks(baris, "jaminan")
+    jaminan = JENIS_JAMINAN[jaminan][0] if jaminan in JENIS_JAMINAN else _JAMINAN.get(jaminan.upper())
+    if jaminan is None:
+        raise ValueError(f"Jenis jaminan tidak valid: {baris.get('jaminan')!r}")
+
+    pembayaran = _PEMBAYARAN.get(_teks(baris, "pembayaran").upper())
+    if pembayaran is None:
+        raise ValueError(f"Metode pembayaran tidak valid: {baris.get('pembayaran')!r}")
+
+    d = {
+        "kode": kode, "jenisKendaraan": kendaraan.nama, "harga": kendaraan.harga, "warna": warna,
+        "jumlahHari": jumlahHari, "nama": nama, "alamat": _teks(baris, "alamat"),
+        "telepon": _teks(baris, "telepon"), "jenisKelamin": _teks(baris, "jenisKelamin"),
+        "jaminan": jaminan, "nomorJaminan": _teks(baris, "nomorJaminan"), "pembayaran": pembayaran,
+    }
+
+    # Pesanan yang dihitung ulang sudah memakai vouchernya, jadi hanya aturan yang tidak bergantung
+    # pada pemakaian yang dicek (masa berlaku, kategori, minimal hari, gabung); kuota dan batas per
+    # pelanggan dilewati. Voucher yang tidak berlaku ditolak, bukan dihitung harga penuh
+    voucher = _teks(baris, "voucher").upper()
+    persen = 0
+    if voucher:
+        if vouchers is not None:
+            v = vouchers.get(voucher)
+            alasan = "Kode voucher tidak valid." if v is None else _periksa_voucher(vouchers, v, baris, d)
+            persen = 0 if alasan else v.persen
+        else:
+            persen, alasan = voucher_persen(voucher), "Kode voucher tidak valid."
+        if not persen:
+            raise ValueError(f"Voucher {voucher} tidak bisa dipakai: {alasan}")
+    d.update(quote(kendaraan.harga, jumlahHari, HARGA_SOPIR if sopir else 0, voucher, voucherPersen=persen))
+
+    if pembayaran == "Tunai":
+        uang = _teks(baris, "uang")
+        try:
+            d["uang"] = int(uang) if uang else d["grandTotal"]
+        except ValueError:
+            raise ValueError(f"Jumlah uang tidak valid: {uang!r}") from None
+        d["kembalian"] = d["uang"] - d["grandTotal"]
+        if d["kembalian"] < 0:
+            raise ValueError(f"Uang tidak cukup untuk total Rp{d['grandTotal']}")
+    return d
+
+
+def baca_pesanan(path):
+    """
+    Membaca pesanan dari file JSONL atau CSV (dilihat dari ekstensinya) sebagai stream.
+
+    Baris JSONL tidak di-parse di sini, supaya parsing ikut dibagi ke worker.
+
+    Yields:
+        tuple: (nomor baris, dict untuk CSV atau str untuk JSONL). Baris kosong dilewati.
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            # Header di baris 1
+            for nomor, baris in enumerate(csv.DictReader(f), start=2):
+                yield nomor, baris
+        else:
+            for nomor, baris in enumerate(f, start=1):
+                if baris.strip():
+                    yield nomor, baris
+
+
+# =================== WORKER ===================
+_katalog = None
+_vouchers = None
+
+
+def _siapkan_worker(katalog_path, voucher_db=STORE_FILE):
+    # Katalog dan voucher dibuka sekali per proses, bukan dikirim bersama setiap potongan
+    global _katalog, _vouchers
+    _katalog = Katalog(katalog_path)
+    if _vouchers is not None:
+        _vouchers.close()
+    _vouchers = VoucherBook(voucher_db, kategori_kendaraan=lambda kode: _katalog[kode].kategori)
+
+
+def siapkan_voucher(voucher_db=STORE_FILE):
+    """Menambahkan voucher bawaan ke database voucher jika belum ada (seperti rent.buka_voucher())."""
+    book = VoucherBook(voucher_db)
+    try:
+        book.simpan_aturan(voucher_default(), timpa=False)
+    finally:
+        book.close()
+
+
+def proses_potongan(potongan, folder, format=TEKS, gabung=False):
+    """
+    Memproses satu potongan pesanan dan menulis struknya ke `folder`.
+
+    Args:
+        potongan (list): Tuple (nomor baris, pesanan) dari baca_pesanan().
+        folder (str): Folder output potongan ini.
+        format (str, optional): Format struk (struk.TEKS/JSON/CSV).
+        gabung (bool, optional): Semua struk potongan ke satu file GABUNGAN + ekstensi format,
+            bukan satu file per pesanan.
+
+    Returns:
+        tuple: (jumlah struk, list (nomor baris, alasan) untuk pesanan yang gagal).
+    """
+    os.makedirs(folder, exist_ok=True)
+    ekstensi = EKSTENSI[format]
+    berhasil, gagal, hasil = 0, [], []
+    for nomor, baris in potongan:
+        try:
+            if isinstance(baris, str):
+                try:
+                    baris = json.loads(baris)
+                except ValueError as e:
+                    raise ValueError(f"JSON tidak valid: {e}") from None
+                if not isinstance(baris, dict):
+                    raise ValueError("Baris JSON harus berupa objek")
+            d = buat_pesanan(baris, _katalog, _vouchers)
+        except ValueError as e:
+            gagal.append((nomor, str(e)))
+            continue
+        if gabung:
+            hasil.append(d)
+        else:
+            with open(os.path.join(folder, f"struk_{nomor:08d}{ekstensi}"), "w", encoding="utf-8", newline="") as f:
+                f.write(render(d, format))
+        berhasil += 1
+    if hasil:
+        with open(os.path.join(folder, GABUNGAN + ekstensi), "w", encoding="utf-8", newline="") as f:
+            tulis_banyak(hasil, f, format)
+    return berhasil, gagal
+
+
+def _potong(pesanan, ukuran):
+    potongan = []
+    for item in pesanan:
+        potongan.append(item)
+        if len(potongan) == ukuran:
+            yield potongan
+            potongan = []
+    if potongan:
+        yield potongan
+
+
+def jalankan(path, out=OUT_DIR, workers=None, ukuran=UKURAN_POTONGAN, katalog_path=KATALOG_FILE, format=TEKS,
+             gabung=False, voucher_db=STORE_FILE):
+    """
+    Memproses seluruh file pesanan.
+
+    Args:
+        path (str): File pesanan (.jsonl atau .csv).
+        out (str, optional): Folder output.
+        workers (int, optional): Jumlah proses. None = jumlah core; 0 = tanpa process pool.
+        ukuran (int, optional): Pesanan per potongan (per folder output).
+        katalog_path (str, optional): File katalog.
+        format (str, optional): Format struk (teks/json/csv).
+        gabung (bool, optional): Satu file struk per potongan (lihat proses_potongan()).
+        voucher_db (str, optional): Database aturan voucher (default booking.db, sama seperti rent.py).
+
+    Returns:
+        dict: pesanan, struk, gagal, detik, perDetik.
+    """
+    os.makedirs(out, exist_ok=True)
+    siapkan_voucher(voucher_db)
+    mulai = time.perf_counter()
+    potongan = enumerate(_potong(baca_pesanan(path), ukuran))
+    berhasil = jumlah_gagal = 0
+    with open(os.path.join(out, GAGAL_FILE), "w", encoding="utf-8") as f_gagal:
+        def catat(hasil):
+            nonlocal berhasil, jumlah_gagal
+            n, gagal = hasil
+            berhasil += n
+            jumlah_gagal += len(gagal)
+            for nomor, alasan in gagal:
+                f_gagal.write(json.dumps({"baris": nomor, "alasan": alasan}, ensure_ascii=False) + "\n")
+
+        if workers == 0:
+            _siapkan_worker(katalog_path, voucher_db)
+            for i, p in potongan:
+                catat(proses_potongan(p, os.path.join(out, f"{i:05d}"), format, gabung))
+        else:
+            workers = workers or os.cpu_count() or 1
+            with ProcessPoolExecutor(workers, initializer=_siapkan_worker,
+                                     initargs=(katalog_path, voucher_db)) as pool:
+                # Maksimal 2 potongan per worker yang sedang diproses/antre -> memori tetap
+                berjalan = set()
+                for i, p in potongan:
+                    if len(berjalan) >= workers * 2:
+                        selesai, berjalan = wait(berjalan, return_when=FIRST_COMPLETED)
+                        for fut in selesai:
+                            catat(fut.result())
+                    berjalan.add(pool.submit(proses_potongan, p, os.path.join(out, f"{i:05d}"), format, gabung))
+                for fut in berjalan:
+                    catat(fut.result())
+
+    detik = time.perf_counter() - mulai
+    pesanan = berhasil + jumlah_gagal
+    return {"pesanan": pesanan, "struk": berhasil, "gagal": jumlah_gagal, "detik": detik,
+            "perDetik": pesanan / detik if detik > 0 else 0.0}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hitung ulang harga dan cetak struk massal dari file pesanan")
+    parser.add_argument("file", help="File pesanan (.jsonl atau .csv)")
+    parser.add_argument("--out", default=OUT_DIR, help="Folder output struk")
+    parser.add_argument("--workers", type=int, help="Jumlah proses (default jumlah core, 0 = tanpa pool)")
+    parser.add_argument("--potongan", type=int, default=UKURAN_POTONGAN, help="Pesanan per potongan/folder")
+    parser.add_argument("--katalog", default=KATALOG_FILE, help="File katalog kendaraan")
+    parser.add_argument("--format", choices=FORMAT, default=TEKS, help="Format struk")
+    parser.add_argument("--gabung", action="store_true", help="Satu file struk per potongan (bukan per pesanan)")
+    parser.add_argument("--db", default=STORE_FILE, help="Database aturan voucher")
+    args = parser.parse_args(argv)
+
+    hasil = jalankan(args.file, args.out, args.workers, args.potongan, args.katalog, args.format, args.gabung,
+                     args.db)
+    print(f"{hasil['pesanan']} pesanan: {hasil['struk']} struk, {hasil['gagal']} gagal "
+          f"dalam {hasil['detik']:.2f} detik ({hasil['perDetik']:,.0f} pesanan/detik)")
+    if hasil["gagal"]:
+        print(f"Alasan pesanan yang gagal: {os.path.join(args.out, GAGAL_FILE)}", file=sys.stderr)
+    return 1 if hasil["gagal"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,363 @@
+"""
+Katalog kendaraan dari file (JSON atau CSV).
+
+Sebelumnya daftar kendaraan ditulis dua kali di rent.py (dict `pilihan` dan isi tabel di
+tabelAwal()), dan kendaraan yang boleh pakai sopir ditentukan dari kode. Sekarang satu file
+katalog (default katalog.json) menjadi sumber semua data tersebut:
+
+    [{"kode": "mb1", "nama": "G-Class", "kategori": "Mobil", "harga": 5000000,
+      "warna": ["Hitam", "Putih", "Silver"], "sopir": true, "unit": 3}, ...]
+
+CSV memakai kolom yang sama (kode,nama,kategori,harga,warna,sopir,unit) dengan warna
+dipisah '|', mis. "Hitam|Putih|Silver". Kolom unit boleh kosong.
+
+Fitur:
+    - Record ringkas (__slots__) per kendaraan.
+    - Index kategori, warna, dan harga (list terurut + bisect) untuk cari() yang tetap
+      instan walaupun katalog berisi puluhan ribu model.
+    - rekomendasi(): kendaraan terbaik untuk sekian hari dalam budget total akhir (pajak,
+      diskon, sopir, voucher dari pricing.quote), lewat index harga yang sama.
+    - Tabel menu dirender sekali lalu di-cache sebagai string.
+    - Hot reload: muat_ulang_jika_berubah() mengecek mtime file; jika berubah, katalog,
+      index, dan cache tabel dibangun ulang tanpa restart proses. File yang rusak
+      (mis. sedang diedit) diabaikan dan katalog lama tetap dipakai.
+"""
+
+import csv
+import heapq
+import json
+import os
+from bisect import bisect_left, bisect_right
+
+from pricing import HARGA_SOPIR, format_rupiah, quote
+
+KATALOG_FILE = "katalog.json"
+# Lebar kolom tabel menu per kategori; kategori lain memakai LEBAR_DEFAULT
+LEBAR_KOLOM = {"Mobil": 50, "Motor": 40, "Sepeda": 20}
+LEBAR_DEFAULT = 20
+
+
+class Kendaraan:
+    """
+    Satu model kendaraan di katalog.
+
+    Attributes:
+        kode (str): Kode sewa, mis. 'mb1'.
+        nama (str): Nama kendaraan.
+        kategori (str): 'Mobil', 'Motor', 'Sepeda', dst.
+        harga (int): Harga sewa per hari.
+        warna (tuple): Warna yang tersedia.
+        sopir (bool): Boleh disewa dengan sopir.
+        unit (int | None): Jumlah unit; None = pakai default pemanggil.
+    """
+
+    __slots__ = ("kode", "nama", "kategori", "harga", "warna", "sopir", "unit")
+
+    def __init__(self, kode, nama, kategori, harga, warna, sopir=False, unit=None):
+        self.kode = kode
+        self.nama = nama
+        self.kategori = kategori
+        self.harga = harga
+        self.warna = warna
+        self.sopir = sopir
+        self.unit = unit
+
+    def __repr__(self):
+        return f"Kendaraan({self.kode!r}, {self.nama!r}, {self.kategori!r}, {self.harga})"
+
+
+def _bool(nilai):
+    if isinstance(nilai, str):
+        return nilai.strip().lower() in ("1", "y", "ya", "true")
+    return bool(nilai)
+
+
+def _kendaraan(baris):
+    """
+    Membuat Kendaraan dari satu baris JSON/CSV.
+
+    Raises:
+        ValueError: Jika kolom wajib kosong atau harga tidak valid.
+    """
+    try:
+        kode = str(baris["kode"]).strip().lower()
+        nama = str(baris["nama"]).strip()
+        kategori = str(baris["kategori"]).strip()
+        harga = int(baris["harga"])
+        warna = baris["warna"]
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Baris katalog tidak valid: {baris!r}") from e
+    if isinstance(warna, str):
+        warna = warna.split("|")
+    warna = tuple(w.strip() for w in warna if w.strip())
+    if not kode or not nama or not kategori or not warna or harga <= 0:
+        raise ValueError(f"Baris katalog tidak valid: {baris!r}")
+    unit = baris.get("unit")
+    unit = int(unit) if unit not in (None, "") else None
+    return Kendaraan(kode, nama, kategori, harga, warna, _bool(baris.get("sopir", False)), unit)
+
+
+def baca_katalog(path):
+    """
+    Membaca file katalog JSON atau CSV (dilihat dari ekstensinya).
+
+    Args:
+        path (str): File katalog.
+
+    Returns:
+        list: Kendaraan sesuai urutan di file.
+
+    Raises:
+        ValueError: Jika isi file tidak valid atau ada kode ganda.
+        OSError: Jika file tidak bisa dibaca.
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            baris = list(csv.DictReader(f))
+        else:
+            baris = json.load(f)
+    daftar = [_kendaraan(b) for b in baris]
+    kode = set()
+    for k in daftar:
+        if k.kode in kode:
+            raise ValueError(f"Kode kendaraan ganda di katalog: {k.kode}")
+        kode.add(k.kode)
+    return daftar
+
+
+class Katalog:
+    """
+    Katalog kendaraan beserta index dan tabel menu yang di-cache.
+
+    Args:
+        path (str, optional): File katalog (JSON/CSV). None = katalog dari `kendaraan` saja.
+        kendaraan (list, optional): Daftar Kendaraan awal (dipakai jika path None).
+    """
+
+    def __init__(self, path=KATALOG_FILE, kendaraan=None):
+        self.path = path
+        self.error_terakhir = None
+        self._mtime = None
+        if path is not None:
+            self._mtime = self._stat()
+            kendaraan = baca_katalog(path)
+        self._bangun(kendaraan or [])
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _bangun(self, daftar):
+        """Membangun dict kendaraan, semua index, dan mengosongkan cache tabel."""
+        self.kendaraan = {k.kode: k for k in daftar}
+        self._kategori = {}
+        self._warna = {}
+        for k in daftar:
+            self._kategori.setdefault(k.kategori, []).append(k.kode)
+            for w in k.warna:
+                self._warna.setdefault(w.lower(), set()).add(k.kode)
+        urut = sorted(daftar, key=lambda k: k.harga)
+        self._harga = [k.harga for k in urut]
+        self._kode_harga = [k.kode for k in urut]
+        self._posisi_harga = {k.kode: i for i, k in enumerate(urut)}
+        self._tabel = None
+
+    def muat_ulang_jika_berubah(self):
+        """
+        Memuat ulang file katalog jika mtime/ukurannya berubah.
+
+        Returns:
+            bool: True jika katalog dimuat ulang.
+        """
+        if self.path is None:
+            return False
+        mtime = self._stat()
+        if mtime == self._mtime:
+            return False
+        try:
+            daftar = baca_katalog(self.path)
+        except (OSError, ValueError) as e:
+            # File sedang diedit/rusak: tetap pakai katalog lama, coba lagi di pengecekan berikutnya
+            self.error_terakhir = e
+            return False
+        self._mtime = mtime
+        self.error_terakhir = None
+        self._bangun(daftar)
+        return True
+
+    def __len__(self):
+        return len(self.kendaraan)
+
+    def __contains__(self, kode):
+        return kode in self.kendaraan
+
+    def __getitem__(self, kode):
+        return self.kendaraan[kode]
+
+    def pilihan(self):
+        """
+        Katalog dalam bentuk lama: kode -> (nama, harga, list warna).
+
+        Returns:
+            dict: Sama seperti `rent.pilihan`.
+        """
+        return {k.kode: (k.nama, k.harga, list(k.warna)) for k in self.kendaraan.values()}
+
+    def bisa_sopir(self, kode):
+        """
+        Returns:
+            bool: True jika kendaraan `kode` boleh disewa dengan sopir.
+        """
+        k = self.kendaraan.get(kode)
+        return k is not None and k.sopir
+
+    def kategori(self):
+        """
+        Returns:
+            list: Nama kategori sesuai urutan kemunculan di file.
+        """
+        return list(self._kategori)
+
+    def _kandidat(self, kategori, warna):
+        """Kode yang cocok dengan filter kategori/warna, None jika tanpa filter."""
+        kandidat = None
+        if kategori is not None:
+            kandidat = set(self._kategori.get(kategori, ()))
+        if warna is not None:
+            per_warna = self._warna.get(warna.lower(), set())
+            kandidat = per_warna if kandidat is None else kandidat & per_warna
+        return kandidat
+
+    def cari(self, kategori=None, warna=None, harga_min=None, harga_max=None):
+        """
+        Menyaring katalog. Semua filter digabung dengan AND.
+
+        Args:
+            kategori (str, optional): Nama kategori, mis. 'Mobil'.
+            warna (str, optional): Warna (tanpa beda huruf besar/kecil).
+            harga_min (int, optional): Harga per hari minimal (inklusif).
+            harga_max (int, optional): Harga per hari maksimal (inklusif).
+
+        Returns:
+            list: Kendaraan, urut dari harga termurah.
+        """
+        kandidat = self._kandidat(kategori, warna)
+        # Rentang harga diambil dari list terurut, jadi hasil sudah urut harga
+        kiri = 0 if harga_min is None else bisect_left(self._harga, harga_min)
+        kanan = len(self._harga) if harga_max is None else bisect_right(self._harga, harga_max)
+        rentang = self._kode_harga[kiri:kanan]
+        if kandidat is None:
+            return [self.kendaraan[k] for k in rentang]
+        if len(kandidat) < len(rentang):
+            hasil = [self.kendaraan[k] for k in kandidat
+                     if (harga_min is None or self.kendaraan[k].harga >= harga_min)
+                     and (harga_max is None or self.kendaraan[k].harga <= harga_max)]
+            return sorted(hasil, key=lambda k: k.harga)
+        return [self.kendaraan[k] for k in rentang if k in kandidat]
+
+    def rekomendasi(self, hari, budget=None, kategori=None, warna=None, sopir=False, voucher="", k=5,
+                    termurah=False, voucherPersen=None):
+        """
+        Kendaraan untuk `hari` hari yang total akhirnya (grandTotal pricing.quote()) masuk budget.
+
+        Total akhir naik bersama harga per hari, jadi kendaraan yang masuk budget selalu awalan
+        index harga. Panjang awalan dicari dengan binary search (O(log n) kali quote()), lalu
+        index dijalani dari batas itu ke bawah (atau dari yang termurah ke atas) dan berhenti
+        setelah k kendaraan yang cocok dengan filter.
+
+        Args:
+            hari (int): Lama sewa (harus > 0).
+            budget (int, optional): Total akhir maksimal (inklusif). None = tanpa batas.
+            kategori (str, optional): Nama kategori, mis. 'Mobil'.
+            warna (str, optional): Warna (tanpa beda huruf besar/kecil).
+            sopir (bool, optional): True = hanya kendaraan yang boleh pakai sopir, total termasuk sopir.
+            voucher (str, optional): Kode voucher.
+            k (int, optional): Jumlah rekomendasi maksimal.
+            termurah (bool, optional): True = urut dari yang termurah. Default dari yang paling
+                mahal yang masih masuk budget (kendaraan terbaik untuk budget tersebut).
+            voucherPersen (float, optional): Persen voucher yang sudah divalidasi (mis. oleh
+                vouchers.VoucherBook.cek()). None = aturan bawaan pricing.VOUCHER.
+
+        Returns:
+            list: Tuple (Kendaraan, rincian quote()), urut sesuai `termurah`.
+
+        Raises:
+            ValueError: Jika hari <= 0.
+        """
+        if hari <= 0:
+            raise ValueError("Jumlah hari harus lebih dari 0")
+        hargaSopir = HARGA_SOPIR if sopir else 0
+
+        # Jumlah kendaraan termurah yang total akhirnya masuk budget
+        kanan = len(self._harga)
+        if budget is not None:
+            kiri = 0
+            while kiri < kanan:
+                tengah = (kiri + kanan) // 2
+                if quote(self._harga[tengah], hari, hargaSopir, voucher, voucherPersen)["grandTotal"] <= budget:
+                    kiri = tengah + 1
+                else:
+                    kanan = tengah
+
+        # Perkiraan jumlah kendaraan yang lolos filter, tanpa membangun set kandidat
+        jumlah = len(self._harga)
+        if kategori is not None:
+            jumlah = min(jumlah, len(self._kategori.get(kategori, ())))
+        if warna is not None:
+            warna = warna.lower()
+            jumlah = min(jumlah, len(self._warna.get(warna, ())))
+
+        # Menjalani index butuh sekitar k * kanan / jumlah langkah sampai k kendaraan cocok;
+        # jika yang lolos filter sangat sedikit, lebih murah langsung mengurutkan posisinya
+        if jumlah * jumlah < k * kanan:
+            kandidat = self._kandidat(kategori, warna)
+            posisi = [self._posisi_harga[kode] for kode in (self.kendaraan if kandidat is None else kandidat)
+                      if self._posisi_harga[kode] < kanan and (not sopir or self.kendaraan[kode].sopir)]
+            posisi = heapq.nsmallest(k, posisi) if termurah else heapq.nlargest(k, posisi)
+            pilih = [self.kendaraan[self._kode_harga[i]] for i in posisi]
+        else:
+            pilih = []
+            for i in (range(kanan) if termurah else range(kanan - 1, -1, -1)):
+                if len(pilih) >= k:
+                    break
+                v = self.kendaraan[self._kode_harga[i]]
+                if ((kategori is None or v.kategori == kategori) and (not sopir or v.sopir)
+                        and (warna is None or v.kode in self._warna[warna])):
+                    pilih.append(v)
+        return [(v, quote(v.harga, hari, hargaSopir, voucher, voucherPersen)) for v in pilih]
+
+    def tabel(self):
+        """
+        Tabel menu kendaraan (satu kolom per kategori), dirender sekali lalu di-cache.
+
+        Returns:
+            str: Tabel yang siap dicetak.
+        """
+        if self._tabel is None:
+            self._tabel = self._render_tabel()
+        return self._tabel
+
+    def _render_tabel(self):
+        kategori = self.kategori()
+        lebar = [LEBAR_KOLOM.get(k, LEBAR_DEFAULT) for k in kategori]
+        kolom = [[f"{self.kendaraan[kode].nama} - Rp {format_rupiah(self.kendaraan[kode].harga)}/hari"
+                  for kode in self._kategori[k]] for k in kategori]
+        jumlahBaris = max((len(isi) for isi in kolom), default=0)
+        baris = [
+            "="*120,
+            "\n{:^120}".format("Apen Al-wawi Rent\n"),
+            "="*120,
+            "-"*120,
+            # Judul tabel
+            f"{'No':<2} | " + " | ".join(f"{k:<{l}}" for k, l in zip(kategori, lebar)),
+            "-"*120,
+        ]
+        # Isi tabel
+        for i in range(jumlahBaris):
+            sel = [f"{(isi[i] if i < len(isi) else ''):<{l}}" for isi, l in zip(kolom, lebar)]
+            baris.append(f"{str(i + 1):<2} | " + " | ".join(sel))
+        baris.append("-"*120)
+        return "\n".join(baris)
@@ -0,0 +1,371 @@
+"""
+Penyimpanan riwayat chat Masyud (chatlog.txt).
+
+Format file:
+    Satu record per baris: "Peran: teks". Baris baru di dalam teks disimpan sebagai
+    backslash + 'n' (backslash sendiri digandakan), sehingga jawaban AI yang panjang dan
+    berbaris-baris tetap menjadi satu record utuh.
+
+Kenapa tidak readlines():
+    Log dipakai bersama oleh semua sesi dan terus membesar. Membaca N record terakhir
+    dilakukan dengan membaca mundur dari akhir file per blok, jadi waktunya hanya
+    bergantung pada panjang N record terakhir, bukan ukuran file.
+
+Rotasi:
+    Jika file melewati max_bytes atau umurnya melewati max_age detik, file diganti nama
+    menjadi chatlog.txt.1 (chatlog.txt.1 -> chatlog.txt.2, dst.) sampai backup_count.
+    Umur dihitung dari waktu mulai yang dicatat di chatlog.txt.mulai, jadi tetap benar
+    walaupun log dibuka ulang oleh banyak proses CLI yang berumur pendek.
+
+Penulisan di latar belakang:
+    ChatWriter menampung pesan di antrean memori dan menuliskannya per batch dari thread
+    terpisah, sehingga user tidak menunggu disk setiap kali chat disimpan. Batch ditulis
+    saat ukurannya melewati flush_bytes, setiap flush_interval detik, saat flush()
+    dipanggil, dan saat program keluar (atexit).
+"""
+
+import atexit
+import os
+import queue
+import re
+import threading
+import time
+
+LOG_FILE = "chatlog.txt"
+BLOK_BACA = 8192
+SUFIKS_MULAI = ".mulai"  # chatlog.txt.mulai: waktu mulai file log (rotasi umur)
+# Record yang ditulis setiap kali halo mas dibuka dan ditutup (dipakai juga oleh analytics.py)
+PEMBUKA_MASYUD = "Halo! Mau tanya apa seputar penyewaan?"
+PAMIT_MASYUD = "Oke, sampai jumpa!"
+
+_ESCAPE = {"\\": "\\\\", "\n": "\\n", "\r": "\\r"}
+_UNESCAPE = {"\\": "\\", "n": "\n", "r": "\r"}
+_POLA_ESCAPE = re.compile(r"\\(.)")
+
+
+def escape_text(text):
+    """
+    Mengubah teks multi-baris menjadi satu baris untuk disimpan di log.
+
+    Args:
+        text (str): Teks asli.
+
+    Returns:
+        str: Teks tanpa karakter baris baru.
+    """
+    return "".join(_ESCAPE.get(c, c) for c in text)
+
+
+def unescape_text(text):
+    """
+    Kebalikan dari escape_text().
+
+    Args:
+        text (str): Teks dari log.
+
+    Returns:
+        str: Teks asli (boleh berisi baris baru).
+    """
+    return _POLA_ESCAPE.sub(lambda m: _UNESCAPE.get(m.group(1), m.group(0)), text)
+
+
+def format_record(role, text):
+    """
+    Membentuk satu baris record log.
+
+    Args:
+        role (str): Peran yang berbicara (Anda atau Masyud).
+        text (str): Teks yang diucapkan.
+
+    Returns:
+        str: Baris record, diakhiri '\\n'.
+    """
+    return f"{role}: {escape_text(text)}\n"
+
+
+def parse_record(line):
+    """
+    Memecah satu baris log menjadi (peran, teks).
+
+    Args:
+        line (str): Baris log tanpa '\\n' di akhir.
+
+    Returns:
+        tuple: (role, text). role kosong jika baris tidak punya pemisah ': '
+        (misalnya potongan jawaban dari log format lama).
+    """
+    role, sep, text = line.partition(": ")
+    if not sep:
+        return "", unescape_text(line)
+    return role, unescape_text(text)
+
+
+def tail_lines(path, limit, blok=BLOK_BACA):
+    """
+    Membaca `limit` baris terakhir sebuah file dengan membaca mundur dari akhir file.
+
+    Args:
+        path (str): Lokasi file.
+        limit (int): Jumlah baris yang diinginkan.
+        blok (int, optional): Ukuran blok baca dalam byte.
+
+    Returns:
+        list: Daftar baris (str, tanpa '\\n'), urut dari yang paling lama.
+    """
+    if limit <= 0 or not os.path.exists(path):
+        return []
+
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        posisi = f.tell()
+        data = b""
+        # Butuh limit + 1 pemisah supaya baris paling awal yang diambil pasti utuh
+        while posisi > 0 and data.count(b"\n") <= limit:
+            baca = min(blok, posisi)
+            posisi -= baca
+            f.seek(posisi)
+            data = f.read(baca) + data
+
+    lines = data.split(b"\n")
+    if lines and lines[-1] == b"":
+        lines.pop()
+    if posisi > 0:
+        # Baris pertama terpotong di tengah, buang
+        lines = lines[1:]
+    return [line.decode("utf-8", errors="replace") for line in lines[-limit:]]
+
+
+class ChatLog:
+    """
+    Riwayat chat yang disimpan di satu file teks dengan rotasi ukuran/umur.
+
+    Args:
+        path (str, optional): Lokasi file log. Default 'chatlog.txt'.
+        max_bytes (int, optional): Rotasi jika ukuran file melewati batas ini. None = tanpa batas.
+        max_age (float, optional): Rotasi jika umur file (detik) melewati batas ini. None = tanpa batas.
+        backup_count (int, optional): Jumlah file lama yang disimpan (chatlog.txt.1 ... .N).
+    """
+
+    def __init__(self, path=LOG_FILE, max_bytes=50 * 1024 * 1024, max_age=None, backup_count=3):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.backup_count = backup_count
+
+    @property
+    def path_mulai(self):
+        """File pendamping berisi waktu mulai file log saat ini (dipakai untuk max_age)."""
+        return self.path + SUFIKS_MULAI
+
+    def _baca_mulai(self):
+        try:
+            with open(self.path_mulai, encoding="utf-8") as f:
+                return float(f.read().strip())
+        except (OSError, ValueError):
+            return None
+
+    def _tulis_mulai(self, waktu):
+        with open(self.path_mulai, "w", encoding="utf-8") as f:
+            f.write(repr(waktu))
+
+    def _umur(self):
+        """
+        Umur file log saat ini dalam detik.
+
+        Linux tidak punya st_birthtime, jadi waktu mulai disimpan di file pendamping
+        (chatlog.txt.mulai) yang bertahan walaupun program dijalankan ulang. Log lama tanpa file
+        pendamping memakai waktu tulis terakhirnya (batas bawah umur sebenarnya), lalu dicatat.
+        """
+        st = os.stat(self.path)
+        mulai = getattr(st, "st_birthtime", None)
+        if mulai is None:
+            mulai = self._baca_mulai()
+            if mulai is None:
+                mulai = min(st.st_mtime, time.time())
+                self._tulis_mulai(mulai)
+        return time.time() - mulai
+
+    def should_rotate(self, tambahan=0):
+        """
+        Mengecek apakah file log perlu dirotasi.
+
+        Args:
+            tambahan (int, optional): Jumlah byte yang akan ditulis berikutnya.
+
+        Returns:
+            bool: True jika batas ukuran atau umur terlewati.
+        """
+        if not os.path.exists(self.path):
+            return False
+        if self.max_bytes is not None and os.path.getsize(self.path) + tambahan > self.max_bytes:
+            return os.path.getsize(self.path) > 0
+        if self.max_age is not None and self._umur() > self.max_age:
+            return True
+        return False
+
+    def rotate(self):
+        """Menggeser chatlog.txt -> chatlog.txt.1 -> ... -> chatlog.txt.N (yang terakhir dihapus)."""
+        if not os.path.exists(self.path):
+            return
+        if self.backup_count <= 0:
+            os.remove(self.path)
+        else:
+            for i in range(self.backup_count - 1, 0, -1):
+                lama = f"{self.path}.{i}"
+                if os.path.exists(lama):
+                    os.replace(lama, f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        if os.path.exists(self.path_mulai):
+            os.remove(self.path_mulai)
+
+    def write_lines(self, data, fsync=False):
+        """
+        Menulis satu atau lebih record yang sudah diformat, merotasi file bila perlu.
+
+        Args:
+            data (str): Gabungan baris hasil format_record().
+            fsync (bool, optional): Paksa data sampai ke disk sebelum kembali.
+        """
+        encoded = data.encode("utf-8")
+        if self.should_rotate(len(encoded)):
+            self.rotate()
+        if self.max_age is not None and not os.path.exists(self.path):
+            # File baru: catat waktu mulainya untuk rotasi umur
+            self._tulis_mulai(time.time())
+        with open(self.path, "ab") as f:
+            f.write(encoded)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+
+    def append(self, role, text):
+        """
+        Menambahkan satu pesan ke log.
+
+        Args:
+            role (str): Peran yang berbicara (Anda atau Masyud).
+            text (str): Teks yang diucapkan.
+        """
+        self.write_lines(format_record(role, text))
+
+    def tail(self, limit=5):
+        """
+        Mengambil `limit` record terakhir, menyambung ke chatlog.txt.1 bila file saat ini kurang.
+
+        Args:
+            limit (int, optional): Jumlah record. Default 5.
+
+        Returns:
+            list: Daftar (role, text), urut dari yang paling lama.
+        """
+        lines = tail_lines(self.path, limit)
+        if len(lines) < limit and self.backup_count > 0:
+            lines = tail_lines(f"{self.path}.1", limit - len(lines)) + lines
+        return [parse_record(line) for line in lines]
+
+
+class ChatWriter:
+    """
+    Penulis log chat berbasis antrean yang dikuras oleh satu thread latar belakang.
+
+    Format di disk sama persis dengan ChatLog.append(), jadi ChatLog.tail() dan
+    load_chat_history() tetap bisa membacanya.
+
+    Args:
+        log (ChatLog): Log tujuan.
+        flush_bytes (int, optional): Tulis batch jika ukurannya mencapai batas ini.
+        flush_interval (float, optional): Tulis batch paling lambat setiap sekian detik.
+        fsync (bool, optional): Jika True, setiap batch di-fsync agar tahan mati listrik.
+    """
+
+    _SELESAI = object()
+
+    def __init__(self, log, flush_bytes=64 * 1024, flush_interval=1.0, fsync=False):
+        self.log = log
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self._antrean = queue.Queue()
+        self._thread = None
+        self._kunci = threading.Lock()
+        self._error = None
+        self._atexit = False
+
+    def _mulai(self):
+        """Menyalakan thread penulis saat pesan pertama masuk."""
+        with self._kunci:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._jalan, name="chat-writer", daemon=True)
+                self._thread.start()
+                if not self._atexit:
+                    atexit.register(self.close)
+                    self._atexit = True
+
+    def _tulis(self, batch):
+        if not batch:
+            return
+        try:
+            self.log.write_lines("".join(batch), fsync=self.fsync)
+        except OSError as e:
+            # Jangan matikan thread; error dilaporkan ke pemanggil flush() berikutnya
+            self._error = e
+        batch.clear()
+
+    def _jalan(self):
+        batch = []
+        ukuran = 0
+        batas = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._antrean.get(timeout=max(0.0, batas - time.monotonic()))
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, str):
+                batch.append(item)
+                ukuran += len(item)
+                if ukuran < self.flush_bytes and time.monotonic() < batas:
+                    continue
+            # Batas waktu/ukuran tercapai, atau ada permintaan flush/close
+            self._tulis(batch)
+            ukuran = 0
+            batas = time.monotonic() + self.flush_interval
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is self._SELESAI:
+                return
+
+    def write(self, role, text):
+        """
+        Memasukkan satu pesan ke antrean tanpa menunggu disk.
+
+        Args:
+            role (str): Peran yang berbicara (Anda atau Masyud).
+            text (str): Teks yang diucapkan.
+        """
+        self._mulai()
+        self._antrean.put(format_record(role, text))
+
+    def flush(self, timeout=None):
+        """
+        Menunggu sampai semua pesan yang sudah masuk antrean tertulis ke file.
+
+        Args:
+            timeout (float, optional): Batas waktu menunggu dalam detik.
+
+        Raises:
+            OSError: Jika penulisan batch sebelumnya gagal.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            selesai = threading.Event()
+            self._antrean.put(selesai)
+            selesai.wait(timeout)
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def close(self):
+        """Menulis sisa antrean lalu menghentikan thread (dipanggil otomatis saat keluar)."""
+        if self._thread is not None and self._thread.is_alive():
+            self._antrean.put(self._SELESAI)
+            self._thread.join()
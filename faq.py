@@ -0,0 +1,354 @@
+"""
+Penjawab FAQ lokal untuk Masyud.
+
+Banyak pertanyaan ke Masyud sebenarnya hanya pencarian data yang sudah ada di program:
+harga per hari, warna yang tersedia, boleh pakai sopir atau tidak, diskon durasi, pajak,
+estimasi total untuk sekian hari, atau kendaraan terbaik dalam budget ("mobil apa yang bisa
+disewa 10 hari di bawah 30 juta pakai sopir?", lewat catalog.Katalog.rekomendasi()).
+FaqResolver menjawab pertanyaan tersebut langsung dari `pilihan` dan aturan di pricing.py
+(dalam hitungan mikrodetik, tanpa jaringan), sehingga jawabannya selalu sama dengan harga
+yang benar-benar dipakai program.
+
+Pertanyaan yang tidak dikenali mengembalikan None dan diteruskan ke Gemini.
+"""
+
+import datetime
+import re
+
+from pricing import (
+    DISKON_DURASI,
+    HARGA_SOPIR,
+    PAJAK,
+    VOUCHER,
+    bisa_sopir,
+    format_rupiah,
+    quote,
+    voucher_persen,
+)
+
+_POLA_KATA = re.compile(r"[a-z0-9]+")
+# Calon kode voucher, mis. 'hemat5' atau 'baru-8h2k'
+_POLA_KODE = re.compile(r"[a-z0-9][a-z0-9_-]*")
+_POLA_HARI = re.compile(r"(\d+)\s*(?:hari|hr)\b")
+# Nominal uang: "Rp 30.000.000", "rp30jt", "30 juta", "1,5 jt", "500 ribu", "500rb"
+_POLA_UANG = re.compile(r"(rp\.?\s*)?(\d+(?:[.,]\d+)*)\s*(juta|jt|ribu|rb)?\b")
+SATUAN_UANG = {"juta": 1000000, "jt": 1000000, "ribu": 1000, "rb": 1000}
+KATEGORI = {"mb": "Mobil", "mk": "Motor", "s": "Sepeda"}
+# Pertanyaan panjang biasanya butuh penjelasan; biarkan model yang menjawab
+MAX_KATA = 14
+# Pertanyaan budget cenderung panjang ("mobil terbaik apa yang bisa saya sewa ...")
+MAX_KATA_BUDGET = 24
+JUMLAH_REKOMENDASI = 3
+
+KATA_HARGA = {"harga", "harganya", "berapa", "biaya", "tarif", "sewanya", "ongkos"}
+KATA_WARNA = {"warna", "warnanya"}
+KATA_SOPIR = {"sopir", "supir", "driver"}
+KATA_DISKON = {"diskon", "potongan", "promo"}
+KATA_PAJAK = {"pajak", "pajaknya", "ppn"}
+KATA_TOTAL = {"total", "totalnya", "semua", "estimasi", "jadi"}
+KATA_DAFTAR = {"daftar", "list", "pilihan", "tersedia", "apa", "saja", "aja"}
+KATA_BUDGET = {"budget", "bujet", "anggaran", "dana", "bawah", "maksimal", "maks", "max", "kurang", "cuma",
+               "hanya", "rekomendasi", "terbaik", "cukup", "dapat", "dapet"}
+# Kata umum yang tidak perlu dicari di daftar voucher
+KATA_BUKAN_VOUCHER = KATA_BUDGET | KATA_SOPIR | KATA_HARGA | {
+    "hari", "mobil", "motor", "sepeda", "voucher", "pakai", "dengan", "tanpa", "untuk", "yang", "apa", "di",
+    "bisa", "saya", "sewa", "rp", "juta", "jt", "ribu", "rb"}
+
+
+def _rapat(teks):
+    """Huruf kecil tanpa spasi/tanda baca, mis. 'G-Class' -> 'gclass'."""
+    return "".join(_POLA_KATA.findall(teks.lower()))
+
+
+def _kode_kategori(kode):
+    return kode.rstrip("0123456789")
+
+
+def cari_budget(pertanyaan):
+    """
+    Mencari nominal uang di pertanyaan.
+
+    Hanya angka dengan 'Rp' di depan atau satuan (juta/jt/ribu/rb) yang dianggap uang,
+    supaya "10 hari" tidak ikut terbaca.
+
+    Args:
+        pertanyaan (str): Pertanyaan user.
+
+    Returns:
+        int | None: Nominal dalam rupiah, atau None jika tidak ada.
+    """
+    for cocok in _POLA_UANG.finditer(pertanyaan.lower()):
+        rp, angka, satuan = cocok.groups()
+        if satuan:
+            # "1,5 juta" / "1.5 juta": koma atau titik sebagai desimal
+            try:
+                return int(float(angka.replace(",", ".")) * SATUAN_UANG[satuan])
+            except ValueError:
+                continue
+        if rp:
+            return int(angka.replace(".", "").replace(",", ""))
+    return None
+
+
+class FaqResolver:
+    """
+    Pencocok intent sederhana di atas katalog kendaraan.
+
+    Args:
+        pilihan (dict): Katalog kendaraan (kode -> (nama, harga, warna)).
+        cek_sopir (callable, optional): cek_sopir(kode) -> bool, kendaraan yang boleh pakai sopir.
+        katalog (catalog.Katalog, optional): Katalog dengan index harga untuk pertanyaan budget.
+            None = pertanyaan budget diteruskan ke model.
+        buka_voucher (callable, optional): Fungsi tanpa argumen yang mengembalikan
+            vouchers.VoucherBook (mis. rent.buka_voucher), dipanggil saat voucher pertama kali
+            dicek. None = hanya voucher bawaan di pricing.VOUCHER.
+    """
+
+    def __init__(self, pilihan, cek_sopir=bisa_sopir, katalog=None, buka_voucher=None):
+        self.pilihan = pilihan
+        self.cek_sopir = cek_sopir
+        self.katalog = katalog
+        self.buka_voucher = buka_voucher
+        self._warna = {w.lower(): w for _, _, warna in pilihan.values() for w in warna}
+        # Nama lengkap yang dirapatkan, dicocokkan dari yang terpanjang ('sepedalistrik' sebelum 'sepeda')
+        self._nama = sorted(((_rapat(v[0]), k) for k, v in pilihan.items()), key=lambda x: -len(x[0]))
+        # Kata unik di nama kendaraan (mis. 'alphard', 'supra', 'r6') sebagai alias
+        hitung = {}
+        for kode, (nama, _, _) in pilihan.items():
+            for kata in set(_POLA_KATA.findall(nama.lower())):
+                hitung.setdefault(kata, []).append(kode)
+        # Angka murni (mis. '48', '911') dilewati supaya "sewa 48 hari" tidak dianggap Sportster 48
+        self._alias = {kata: kode[0] for kata, kode in hitung.items()
+                       if len(kode) == 1 and len(kata) >= 2 and not kata.isdigit()}
+
+    def cari_kendaraan(self, pertanyaan):
+        """
+        Mencari kendaraan yang disebut di pertanyaan (lewat kode, nama, atau alias).
+
+        Args:
+            pertanyaan (str): Pertanyaan user.
+
+        Returns:
+            list: Kode kendaraan yang disebut, urut sesuai katalog.
+        """
+        kata = _POLA_KATA.findall(pertanyaan.lower())
+        ditemukan = {k for k in kata if k in self.pilihan}
+        rapat = "".join(kata)
+        for nama, kode in self._nama:
+            if nama and nama in rapat:
+                ditemukan.add(kode)
+                rapat = rapat.replace(nama, " ")
+        ditemukan.update(self._alias[k] for k in kata if k in self._alias)
+        return [k for k in self.pilihan if k in ditemukan]
+
+    def jawab(self, pertanyaan):
+        """
+        Menjawab pertanyaan dari data lokal bila memungkinkan.
+
+        Args:
+            pertanyaan (str): Pertanyaan user.
+
+        Returns:
+            str | None: Jawaban, atau None jika harus diteruskan ke model.
+        """
+        kata = set(_POLA_KATA.findall(pertanyaan.lower()))
+        if not kata or len(kata) > MAX_KATA_BUDGET:
+            return None
+        kendaraan = self.cari_kendaraan(pertanyaan)
+        hari = _POLA_HARI.search(pertanyaan.lower())
+        jumlahHari = int(hari.group(1)) if hari else None
+
+        if self.katalog is not None and not kendaraan and kata & KATA_BUDGET:
+            budget = cari_budget(pertanyaan)
+            if budget is not None:
+                return self._jawab_budget(pertanyaan, kata, jumlahHari or 1, budget)
+        if len(kata) > MAX_KATA:
+            return None
+
+        # Intent spesifik (total, pajak, diskon) dicek sebelum kata umum seperti "berapa"/"harga",
+        # supaya "berapa pajak G-Class?" dijawab pajak, bukan harga per hari
+        if kendaraan and jumlahHari and kata & KATA_TOTAL:
+            return self._jawab_total(kendaraan, jumlahHari, bool(kata & KATA_SOPIR))
+        if kata & KATA_PAJAK:
+            return f"Semua penyewaan dikenakan pajak {int(PAJAK * 100)}% dari subtotal."
+        if kata & KATA_DISKON and "voucher" not in kata:
+            return self._jawab_diskon(jumlahHari)
+        if kendaraan and jumlahHari and kata & KATA_HARGA:
+            return self._jawab_total(kendaraan, jumlahHari, bool(kata & KATA_SOPIR))
+        if kendaraan and kata & KATA_WARNA:
+            return self._jawab_warna(kendaraan)
+        if kata & KATA_SOPIR:
+            return self._jawab_sopir(kendaraan)
+        if kendaraan and kata & KATA_HARGA:
+            return self._jawab_harga(kendaraan)
+        if not kendaraan and kata & KATA_DAFTAR:
+            for kode, nama in KATEGORI.items():
+                if nama.lower() in kata:
+                    return self._jawab_daftar(kode)
+        return None
+
+    def _jawab_harga(self, kendaraan):
+        baris = [f"{self.pilihan[k][0]} ({k}): Rp {format_rupiah(self.pilihan[k][1])} per hari" for k in kendaraan]
+        return "Harga sewa " + "; ".join(baris) + "."
+
+    def _jawab_warna(self, kendaraan):
+        baris = [f"{self.pilihan[k][0]}: {', '.join(self.pilihan[k][2])}" for k in kendaraan]
+        return "Warna yang tersedia untuk " + "; ".join(baris) + "."
+
+    def _kendaraan_sopir(self):
+        """
+        Kendaraan yang boleh pakai sopir menurut cek_sopir, per kategori.
+
+        Returns:
+            tuple: (kategori yang semua kendaraannya bisa, nama kendaraan yang bisa di kategori lain,
+            kategori yang tidak ada kendaraannya yang bisa).
+        """
+        semua, sebagian, tidak = [], [], []
+        for kategori, nama in KATEGORI.items():
+            kode = [k for k in self.pilihan if _kode_kategori(k) == kategori]
+            sopir = [k for k in kode if self.cek_sopir(k)]
+            if not kode:
+                continue
+            if len(sopir) == len(kode):
+                semua.append(nama.lower())
+            elif sopir:
+                sebagian += [self.pilihan[k][0] for k in sopir]
+            else:
+                tidak.append(nama.lower())
+        return semua, sebagian, tidak
+
+    def _jawab_sopir(self, kendaraan):
+        sopir = f"Rp {format_rupiah(HARGA_SOPIR)} per hari"
+        semua, sebagian, tidak = self._kendaraan_sopir()
+        if not semua and not sebagian:
+            return "Saat ini tidak ada kendaraan yang bisa disewa dengan sopir."
+        if not kendaraan:
+            bisa = " dan ".join([f"semua {k}" for k in semua] + sebagian)
+            catatan = f" {' dan '.join(tidak).capitalize()} tidak termasuk." if tidak else ""
+            return f"Sopir bisa disewa untuk {bisa} dengan biaya {sopir}.{catatan}"
+        baris = []
+        for k in kendaraan:
+            nama = self.pilihan[k][0]
+            if self.cek_sopir(k):
+                baris.append(f"{nama} bisa disewa dengan sopir ({sopir})")
+            else:
+                baris.append(f"{nama} tidak bisa disewa dengan sopir (sopir hanya untuk "
+                             f"{' dan '.join(semua + sebagian)})")
+        return "; ".join(baris) + "."
+
+    def _jawab_diskon(self, jumlahHari):
+        aturan = ", ".join(f"minimal {h} hari diskon {int(p * 100)}%" for h, p in reversed(DISKON_DURASI))
+        if jumlahHari is None:
+            return f"Diskon durasi otomatis: {aturan}. Diskon dihitung dari total setelah pajak."
+        for minimal, persen in DISKON_DURASI:
+            if jumlahHari >= minimal:
+                return f"Sewa {jumlahHari} hari dapat diskon durasi {int(persen * 100)}% dari total setelah pajak."
+        return f"Sewa {jumlahHari} hari belum dapat diskon durasi ({aturan})."
+
+    def _jawab_total(self, kendaraan, jumlahHari, pakaiSopir):
+        if jumlahHari <= 0:
+            return None
+        baris = []
+        for k in kendaraan:
+            nama, harga, _ = self.pilihan[k]
+            hargaSopir = HARGA_SOPIR if pakaiSopir and self.cek_sopir(k) else 0
+            rincian = quote(harga, jumlahHari, hargaSopir)
+            keterangan = " dengan sopir" if hargaSopir else ""
+            baris.append(f"{nama}{keterangan} {jumlahHari} hari: Rp {format_rupiah(rincian['grandTotal'])}")
+        return ("Estimasi total " + "; ".join(baris)
+                + f" (sudah termasuk pajak {int(PAJAK * 100)}% dan diskon durasi, belum termasuk voucher).")
+
+    def cari_voucher(self, pertanyaan):
+        """
+        Kode voucher yang disebut di pertanyaan (voucher di VoucherBook atau pricing.VOUCHER).
+
+        Returns:
+            str: Kode voucher (huruf besar), kosong jika tidak ada.
+        """
+        book = self.buka_voucher() if self.buka_voucher is not None else None
+        for kode in _POLA_KODE.findall(pertanyaan.lower()):
+            if kode in KATA_BUKAN_VOUCHER or kode.isdigit():
+                continue
+            if (book.get(kode) if book is not None else kode.upper() in VOUCHER):
+                return kode.upper()
+        return ""
+
+    def persen_voucher(self, voucher, jumlahHari, kategori=None):
+        """
+        Persen voucher untuk rekomendasi, dicek dengan aturan yang sama seperti sesi sewa
+        (vouchers.VoucherBook.cek(), tanpa memakai kuota).
+
+        Voucher yang dibatasi kategori hanya berlaku jika `kategori` termasuk di dalamnya.
+
+        Args:
+            voucher (str): Kode voucher.
+            jumlahHari (int): Lama sewa.
+            kategori (str, optional): Kategori yang ditanyakan.
+
+        Returns:
+            tuple: (persen, alasan). persen 0 dan alasan berisi pesan jika voucher tidak berlaku.
+        """
+        if self.buka_voucher is None:
+            persen = voucher_persen(voucher)
+            return persen, None if persen else "Kode voucher tidak valid."
+        contoh = self.katalog.cari(kategori=kategori) if kategori is not None and self.katalog is not None else []
+        pesanan = dict(kode=contoh[0].kode if contoh else "", jumlahHari=jumlahHari, telepon=None,
+                       tanggal=datetime.date.today())
+        return self.buka_voucher().cek(voucher, pesanan)
+
+    def _jawab_budget(self, pertanyaan, kata, jumlahHari, budget):
+        if jumlahHari <= 0:
+            return None
+        kategori = next((k for k in self.katalog.kategori() if k.lower() in kata), None)
+        warna = next((self._warna[w] for w in kata if w in self._warna), None)
+        sopir = bool(kata & KATA_SOPIR) and "tanpa" not in kata
+        return self.teks_rekomendasi(jumlahHari, budget, kategori, warna, sopir, self.cari_voucher(pertanyaan))
+
+    def teks_rekomendasi(self, jumlahHari, budget, kategori=None, warna=None, sopir=False, voucher=""):
+        """
+        Jawaban rekomendasi kendaraan dalam budget (dipakai Masyud dan menu).
+
+        Args:
+            jumlahHari (int): Lama sewa.
+            budget (int): Total akhir maksimal.
+            kategori (str, optional): Kategori katalog, mis. 'Mobil'.
+            warna (str, optional): Warna yang diinginkan.
+            sopir (bool, optional): Sewa dengan sopir.
+            voucher (str, optional): Kode voucher.
+
+        Returns:
+            str: Rekomendasi dengan total akhir, atau pilihan termurah jika tidak ada yang masuk budget.
+        """
+        jenis = (kategori or "kendaraan").lower()
+        if warna:
+            jenis += f" warna {warna.lower()}"
+        if sopir:
+            jenis += " dengan sopir"
+        catatan = ""
+        persen = 0
+        if voucher:
+            persen, alasan = self.persen_voucher(voucher, jumlahHari, kategori)
+            if not persen:
+                catatan = f" {alasan}"
+                voucher = ""
+        syarat = dict(kategori=kategori, warna=warna, sopir=sopir, voucher=voucher, voucherPersen=persen)
+        hasil = self.katalog.rekomendasi(jumlahHari, budget, k=JUMLAH_REKOMENDASI, **syarat)
+        keterangan = f"sudah termasuk pajak {int(PAJAK * 100)}% dan diskon durasi"
+        if voucher:
+            keterangan += f", voucher {voucher}"
+        if not hasil:
+            termurah = self.katalog.rekomendasi(jumlahHari, k=1, termurah=True, **syarat)
+            if not termurah:
+                return f"Maaf, tidak ada {jenis} di katalog kami."
+            v, rincian = termurah[0]
+            return (f"Maaf, tidak ada {jenis} untuk {jumlahHari} hari dengan total di bawah "
+                    f"Rp {format_rupiah(budget)}. "
+                    f"Pilihan termurah: {v.nama} ({v.kode}) Rp {format_rupiah(rincian['grandTotal'])} ({keterangan})."
+                    + catatan)
+        baris = [f"{v.nama} ({v.kode}) Rp {format_rupiah(rincian['grandTotal'])}" for v, rincian in hasil]
+        return (f"Rekomendasi {jenis} untuk {jumlahHari} hari dengan budget Rp {format_rupiah(budget)}: "
+                + "; ".join(baris) + f" (total akhir, {keterangan})." + catatan)
+
+    def _jawab_daftar(self, kategori):
+        nama = [f"{v[0]} ({k})" for k, v in self.pilihan.items() if _kode_kategori(k) == kategori]
+        return f"Pilihan {KATEGORI[kategori].lower()} yang tersedia: " + ", ".join(nama) + "."
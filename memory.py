@@ -0,0 +1,180 @@
+"""
+Memori percakapan Masyud per sesi.
+
+Dulu prompt AI memakai 5 baris terakhir chatlog.txt yang dipakai bersama semua pelanggan,
+sehingga pertanyaan pelanggan lain bisa ikut masuk ke prompt dan jawaban panjang terpotong.
+Sekarang setiap sesi punya MemoriChat sendiri:
+
+    - Beberapa tanya-jawab terakhir disimpan utuh.
+    - Tanya-jawab yang lebih lama diringkas menjadi ringkasan bergulir (rolling summary).
+    - Teks riwayat untuk prompt (teks()) selalu di bawah budget token, jadi panjang prompt,
+      latensi, dan biaya tetap datar berapa lama pun pelanggan mengobrol.
+
+Ringkasan default dibuat lokal tanpa memanggil model: satu baris per tanya-jawab berisi
+awal pertanyaan dan kalimat pertama jawaban. Peringkas lain (mis. satu panggilan model
+murah) bisa dipasang lewat argumen `peringkas`; hasilnya disimpan di memori sesi sehingga
+tidak dihitung ulang.
+
+MemoriSesi menyimpan MemoriChat per ID sesi (SesiSewa.id) dan membuang sesi yang paling
+lama tidak dipakai jika jumlahnya melewati batas.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+
+from retrieval import estimasi_token
+
+BUDGET_TOKEN = 600           # Batas token teks riwayat di prompt (ringkasan + tanya-jawab utuh)
+BUDGET_RINGKASAN = 200       # Bagian dari BUDGET_TOKEN untuk ringkasan
+MAKS_UTUH = 4                # Tanya-jawab terakhir yang disimpan utuh
+MAKS_SESI = 10000            # Sesi maksimal di MemoriSesi sebelum yang terlama dibuang
+PANJANG_PERTANYAAN = 80      # Karakter pertanyaan di ringkasan lokal
+PANJANG_JAWABAN = 120        # Karakter jawaban di ringkasan lokal
+
+JUDUL_RINGKASAN = "Ringkasan percakapan sebelumnya:\n"
+
+_AKHIR_KALIMAT = re.compile(r"(?<=[.!?])\s")
+
+
+def _format(pertanyaan, jawaban):
+    return f"Anda: {pertanyaan}\nMasyud: {jawaban}\n"
+
+
+def _potong(teks, panjang):
+    teks = " ".join(teks.split())
+    return teks if len(teks) <= panjang else teks[: panjang - 3].rstrip() + "..."
+
+
+def ringkas_lokal(ringkasan, giliran):
+    """
+    Peringkas default: menambah satu baris per tanya-jawab ke ringkasan lama.
+
+    Args:
+        ringkasan (str): Ringkasan sebelumnya (boleh kosong).
+        giliran (list): Tuple (pertanyaan, jawaban) yang akan diringkas, dari yang terlama.
+
+    Returns:
+        str: Ringkasan baru.
+    """
+    baris = [ringkasan] if ringkasan else []
+    for pertanyaan, jawaban in giliran:
+        kalimat = _AKHIR_KALIMAT.split(" ".join(jawaban.split()), 1)[0]
+        baris.append(f"- Anda: {_potong(pertanyaan, PANJANG_PERTANYAAN)} -> "
+                     f"Masyud: {_potong(kalimat, PANJANG_JAWABAN)}")
+    return "\n".join(baris)
+
+
+def _batasi(ringkasan, budget):
+    """Membuang baris terlama ringkasan sampai muat di budget token."""
+    if estimasi_token(ringkasan) <= budget:
+        return ringkasan
+    baris = ringkasan.split("\n")
+    while len(baris) > 1 and estimasi_token("\n".join(baris)) > budget:
+        del baris[0]
+    teks = "\n".join(baris)
+    # Satu baris yang masih terlalu panjang (mis. dari peringkas model) dipotong
+    return teks if estimasi_token(teks) <= budget else teks[: budget * 4 - 3] + "..."
+
+
+class MemoriChat:
+    """
+    Riwayat tanya-jawab satu sesi dengan ringkasan bergulir.
+
+    Args:
+        budget_token (int, optional): Batas token teks riwayat untuk prompt.
+        budget_ringkasan (int, optional): Batas token ringkasan (bagian dari budget_token).
+        maks_utuh (int, optional): Jumlah tanya-jawab terakhir yang disimpan utuh.
+        peringkas (callable, optional): peringkas(ringkasan, giliran) -> str. Default ringkas_lokal.
+    """
+
+    def __init__(self, budget_token=BUDGET_TOKEN, budget_ringkasan=BUDGET_RINGKASAN, maks_utuh=MAKS_UTUH,
+                 peringkas=ringkas_lokal):
+        self.budget_token = budget_token
+        self.budget_ringkasan = min(budget_ringkasan, budget_token)
+        self.maks_utuh = maks_utuh
+        self.peringkas = peringkas
+        self.ringkasan = ""
+        self.giliran = []  # (pertanyaan, jawaban) utuh, dari yang terlama
+        self.jumlah = 0
+        self._kunci = threading.Lock()
+
+    def _token_utuh(self):
+        return sum(estimasi_token(_format(p, j)) for p, j in self.giliran)
+
+    def tambah(self, pertanyaan, jawaban):
+        """
+        Mencatat satu tanya-jawab; giliran lama diringkas jika melewati batas.
+
+        Args:
+            pertanyaan (str): Pertanyaan pelanggan.
+            jawaban (str): Jawaban Masyud.
+        """
+        with self._kunci:
+            self.giliran.append((pertanyaan, jawaban))
+            self.jumlah += 1
+            budget_utuh = self.budget_token - self.budget_ringkasan
+            lama = []
+            while self.giliran and (len(self.giliran) > self.maks_utuh or self._token_utuh() > budget_utuh):
+                lama.append(self.giliran.pop(0))
+            if lama:
+                # Judul ringkasan dan pemisah baris ikut dihitung dalam budget
+                budget = self.budget_ringkasan - estimasi_token(JUDUL_RINGKASAN) - 1
+                self.ringkasan = _batasi(self.peringkas(self.ringkasan, lama), budget)
+
+    def teks(self):
+        """
+        Teks riwayat untuk prompt, selalu <= budget_token (perkiraan).
+
+        Returns:
+            str: Ringkasan (jika ada) lalu tanya-jawab terakhir apa adanya. Kosong jika belum ada.
+        """
+        with self._kunci:
+            bagian = []
+            if self.ringkasan:
+                bagian.append(JUDUL_RINGKASAN + self.ringkasan)
+            if self.giliran:
+                bagian.append("".join(_format(p, j) for p, j in self.giliran).rstrip("\n"))
+            return "\n".join(bagian)
+
+    def __len__(self):
+        return self.jumlah
+
+
+class MemoriSesi:
+    """
+    MemoriChat per ID sesi (LRU).
+
+    Args:
+        maks_sesi (int, optional): Jumlah sesi yang disimpan; sesi terlama dibuang jika lewat.
+        **opsi: Diteruskan ke MemoriChat untuk setiap sesi baru.
+    """
+
+    def __init__(self, maks_sesi=MAKS_SESI, **opsi):
+        self.maks_sesi = maks_sesi
+        self.opsi = opsi
+        self._memori = OrderedDict()
+        self._kunci = threading.Lock()
+
+    def ambil(self, id_sesi):
+        """
+        Returns:
+            MemoriChat: Memori sesi `id_sesi` (dibuat jika belum ada).
+        """
+        with self._kunci:
+            memori = self._memori.get(id_sesi)
+            if memori is None:
+                memori = self._memori[id_sesi] = MemoriChat(**self.opsi)
+                while len(self._memori) > self.maks_sesi:
+                    self._memori.popitem(last=False)
+            else:
+                self._memori.move_to_end(id_sesi)
+            return memori
+
+    def hapus(self, id_sesi):
+        """Membuang memori sesi yang sudah selesai."""
+        with self._kunci:
+            self._memori.pop(id_sesi, None)
+
+    def __len__(self):
+        return len(self._memori)
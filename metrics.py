@@ -0,0 +1,373 @@
+"""
+Instrumentasi ringan untuk alur sewa: durasi per tahap, penghitung, dan ukuran prompt AI.
+
+Tahap yang diukur (label `tahap`):
+    input_user       menunggu pelanggan mengetik (terminal dan server)
+    tanya_masyud     satu sesi chat halo mas, dari dibuka sampai keluar
+    ai               menunggu jawaban Gemini (tidak termasuk jawaban FAQ/cache)
+    save_chat        memasukkan chat ke antrean log
+    load_chat_history  membaca riwayat chat terakhir
+    simpan_booking   menyimpan booking ke booking.db
+    tulis_struk      menulis file struk
+
+Mati secara default. Saat mati, ukur() mengembalikan satu objek kosong yang sama dan
+fungsi yang diberi @diukur langsung memanggil fungsi aslinya, jadi biayanya hanya satu
+pengecekan flag per panggilan.
+
+Ekspor format teks Prometheus:
+    - tulis_file(path) / mulai_file(path): file untuk textfile collector node_exporter
+      (ditulis atomik: file sementara lalu os.replace).
+    - mulai_http(port): endpoint http://127.0.0.1:<port>/metrics.
+
+Profil:
+    pasang_sinyal_profil(): kirim SIGUSR1 sekali untuk mulai cProfile di thread utama, kirim
+    lagi untuk berhenti dan menulis profil-<waktu>.pstats (baca dengan `python -m pstats`).
+
+Mengaktifkan dari environment (dipakai rent.main() dan server.py):
+    APEN_METRIK=1              aktif tanpa ekspor (mis. untuk dibaca di test)
+    APEN_METRIK_PORT=9108      aktif + endpoint HTTP
+    APEN_METRIK_FILE=/var/lib/node_exporter/apen.prom
+    APEN_PROFIL=1              pasang sinyal profil
+"""
+
+import atexit
+import cProfile
+import functools
+import os
+import signal
+import threading
+import time
+from bisect import bisect_left
+
+PREFIX = "apen"
+BATAS_DETIK = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+BATAS_UKURAN = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+INTERVAL_FILE = 15  # Detik antar penulisan file metrik
+
+KETERANGAN = {
+    "tahap_detik": "Durasi per tahap alur sewa (detik).",
+    "prompt_karakter": "Panjang prompt yang dikirim ke Gemini (karakter).",
+    "prompt_token": "Perkiraan token prompt yang dikirim ke Gemini (1 token ~ 4 karakter).",
+    "jawaban_total": "Jawaban Masyud per sumber (faq, cache, ai, cadangan).",
+}
+
+aktif = False
+_kunci = threading.Lock()
+_histogram = {}   # (nama, label) -> _Histogram
+_penghitung = {}  # (nama, label) -> int
+_profil = None
+
+
+class _Histogram:
+    __slots__ = ("batas", "ember", "jumlah", "total")
+
+    def __init__(self, batas):
+        self.batas = batas
+        self.ember = [0] * (len(batas) + 1)  # Ember terakhir = +Inf
+        self.jumlah = 0
+        self.total = 0.0
+
+
+class _Kosong:
+    """Context manager yang tidak melakukan apa-apa (dipakai saat metrik mati)."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_KOSONG = _Kosong()
+
+
+class _Timer:
+    __slots__ = ("tahap", "mulai")
+
+    def __init__(self, tahap):
+        self.tahap = tahap
+
+    def __enter__(self):
+        self.mulai = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        catat_waktu(self.tahap, time.perf_counter() - self.mulai)
+        return False
+
+
+def aktifkan(nyala=True):
+    """Menyalakan atau mematikan pencatatan metrik."""
+    global aktif
+    aktif = nyala
+
+
+def reset():
+    """Menghapus semua metrik yang sudah tercatat."""
+    with _kunci:
+        _histogram.clear()
+        _penghitung.clear()
+
+
+def amati(nama, nilai, batas=BATAS_UKURAN, **label):
+    """
+    Mencatat satu nilai ke histogram `nama`.
+
+    Args:
+        nama (str): Nama metrik tanpa prefix, mis. 'prompt_karakter'.
+        nilai (float): Nilai yang diamati.
+        batas (tuple, optional): Batas atas ember (dipakai saat histogram pertama kali dibuat).
+        **label: Label Prometheus, mis. tahap='ai'.
+    """
+    if not aktif:
+        return
+    kunci = (nama, tuple(sorted(label.items())))
+    with _kunci:
+        h = _histogram.get(kunci)
+        if h is None:
+            h = _histogram[kunci] = _Histogram(batas)
+        h.ember[bisect_left(h.batas, nilai)] += 1
+        h.jumlah += 1
+        h.total += nilai
+
+
+def catat_waktu(tahap, detik):
+    """Mencatat durasi satu tahap ke histogram tahap_detik."""
+    amati("tahap_detik", detik, BATAS_DETIK, tahap=tahap)
+
+
+def hitung(nama, n=1, **label):
+    """
+    Menambah penghitung `nama` (tanpa prefix, mis. 'jawaban_total').
+
+    Args:
+        nama (str): Nama metrik.
+        n (int, optional): Pertambahan.
+        **label: Label Prometheus, mis. sumber='faq'.
+    """
+    if not aktif:
+        return
+    kunci = (nama, tuple(sorted(label.items())))
+    with _kunci:
+        _penghitung[kunci] = _penghitung.get(kunci, 0) + n
+
+
+def ukur(tahap):
+    """
+    Context manager pengukur durasi tahap:
+
+        with metrics.ukur("input_user"):
+            jawaban = input(prompt)
+    """
+    return _Timer(tahap) if aktif else _KOSONG
+
+
+def diukur(tahap):
+    """Decorator: mengukur setiap panggilan fungsi sebagai `tahap`."""
+    def bungkus(fungsi):
+        @functools.wraps(fungsi)
+        def fungsi_diukur(*args, **kwargs):
+            if not aktif:
+                return fungsi(*args, **kwargs)
+            mulai = time.perf_counter()
+            try:
+                return fungsi(*args, **kwargs)
+            finally:
+                catat_waktu(tahap, time.perf_counter() - mulai)
+        return fungsi_diukur
+    return bungkus
+
+
+def snapshot():
+    """
+    Salinan metrik saat ini.
+
+    Returns:
+        dict: 'histogram' -> {(nama, label): (jumlah, total)}, 'penghitung' -> {(nama, label): n}.
+    """
+    with _kunci:
+        return {
+            "histogram": {k: (h.jumlah, h.total) for k, h in _histogram.items()},
+            "penghitung": dict(_penghitung),
+        }
+
+
+# =================== EKSPOR ===================
+def _label(pasangan, tambahan=None):
+    pasangan = list(pasangan) + ([tambahan] if tambahan else [])
+    if not pasangan:
+        return ""
+    isi = ",".join('{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"')) for k, v in pasangan)
+    return "{" + isi + "}"
+
+
+def _angka(nilai):
+    return repr(float(nilai)) if isinstance(nilai, float) else str(nilai)
+
+
+def teks_prometheus():
+    """
+    Returns:
+        str: Semua metrik dalam format teks Prometheus (versi 0.0.4).
+    """
+    with _kunci:
+        histogram = sorted((k, (h.batas, list(h.ember), h.jumlah, h.total)) for k, h in _histogram.items())
+        penghitung = sorted(_penghitung.items())
+    baris = []
+    sudah = set()
+
+    def kepala(nama, jenis):
+        if nama not in sudah:
+            sudah.add(nama)
+            baris.append(f"# HELP {PREFIX}_{nama} {KETERANGAN.get(nama, nama)}")
+            baris.append(f"# TYPE {PREFIX}_{nama} {jenis}")
+
+    for (nama, label), (batas, ember, jumlah, total) in histogram:
+        kepala(nama, "histogram")
+        kumulatif = 0
+        for b, n in zip(list(batas) + ["+Inf"], ember):
+            kumulatif += n
+            baris.append(f"{PREFIX}_{nama}_bucket{_label(label, ('le', b))} {kumulatif}")
+        baris.append(f"{PREFIX}_{nama}_sum{_label(label)} {_angka(total)}")
+        baris.append(f"{PREFIX}_{nama}_count{_label(label)} {jumlah}")
+    for (nama, label), n in penghitung:
+        kepala(nama, "counter")
+        baris.append(f"{PREFIX}_{nama}{_label(label)} {n}")
+    return "\n".join(baris) + "\n"
+
+
+def tulis_file(path):
+    """Menulis teks_prometheus() ke `path` secara atomik."""
+    sementara = f"{path}.{os.getpid()}.tmp"
+    with open(sementara, "w", encoding="utf-8") as f:
+        f.write(teks_prometheus())
+    os.replace(sementara, path)
+
+
+def mulai_file(path, interval=INTERVAL_FILE):
+    """
+    Menulis file metrik setiap `interval` detik di thread latar belakang dan saat program keluar.
+
+    Returns:
+        threading.Event: Set untuk menghentikan thread.
+    """
+    berhenti = threading.Event()
+
+    def jalan():
+        while not berhenti.wait(interval):
+            tulis_file(path)
+
+    threading.Thread(target=jalan, name="metrik-file", daemon=True).start()
+    atexit.register(tulis_file, path)
+    return berhenti
+
+
+def mulai_http(port, host="127.0.0.1"):
+    """
+    Menjalankan endpoint /metrics di thread latar belakang.
+
+    http.server baru di-import di sini (sekitar 50-100 ms), jadi `import rent` tidak ikut
+    membayarnya jika endpoint tidak dinyalakan.
+
+    Args:
+        port (int): Port (0 = pilih otomatis).
+        host (str, optional): Alamat bind; default hanya lokal.
+
+    Returns:
+        ThreadingHTTPServer: Server (port asli di server_address[1]; hentikan dengan shutdown()).
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class HandlerMetrik(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            isi = teks_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(isi)))
+            self.end_headers()
+            self.wfile.write(isi)
+
+        def log_message(self, format, *args):
+            # Jangan mengotori layar sesi terminal
+            pass
+
+    server = ThreadingHTTPServer((host, port), HandlerMetrik)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrik-http", daemon=True).start()
+    return server
+
+
+# =================== PROFIL ===================
+def _sinyal_profil(folder):
+    def handler(signum, frame):
+        global _profil
+        if _profil is None:
+            _profil = cProfile.Profile()
+            _profil.enable()
+            return
+        _profil.disable()
+        _profil.dump_stats(os.path.join(folder, time.strftime("profil-%Y%m%d-%H%M%S.pstats")))
+        _profil = None
+    return handler
+
+
+def pasang_sinyal_profil(folder=".", sinyal=None):
+    """
+    Memasang handler sinyal untuk mulai/berhenti cProfile (harus dipanggil dari thread utama).
+
+    Args:
+        folder (str, optional): Folder tujuan file .pstats.
+        sinyal (int, optional): Nomor sinyal; default SIGUSR1.
+
+    Returns:
+        bool: False jika platform tidak punya SIGUSR1 (mis. Windows).
+    """
+    if sinyal is None:
+        sinyal = getattr(signal, "SIGUSR1", None)
+        if sinyal is None:
+            return False
+    signal.signal(sinyal, _sinyal_profil(folder))
+    return True
+
+
+def siapkan(port=None, file=None, profil=False, nyala=True):
+    """
+    Mengaktifkan metrik beserta ekspornya.
+
+    Args:
+        port (int, optional): Port endpoint HTTP; None = tanpa HTTP.
+        file (str, optional): File metrik; None = tanpa file.
+        profil (bool, optional): Pasang sinyal profil.
+        nyala (bool, optional): Aktifkan pencatatan.
+
+    Returns:
+        ThreadingHTTPServer | None: Server HTTP jika dijalankan.
+    """
+    aktifkan(nyala)
+    if file:
+        mulai_file(file)
+    if profil:
+        pasang_sinyal_profil()
+    return mulai_http(port) if port is not None else None
+
+
+def dari_env(env=None):
+    """
+    Memanggil siapkan() sesuai variabel APEN_METRIK*, APEN_PROFIL (lihat docstring modul).
+
+    Returns:
+        bool: True jika metrik diaktifkan.
+    """
+    env = os.environ if env is None else env
+    port = env.get("APEN_METRIK_PORT")
+    file = env.get("APEN_METRIK_FILE")
+    nyala = bool(port or file or env.get("APEN_METRIK", "") not in ("", "0"))
+    profil = env.get("APEN_PROFIL", "") not in ("", "0")
+    if nyala or profil:
+        siapkan(int(port) if port else None, file, profil, nyala)
+    return nyala
@@ -0,0 +1,205 @@
+"""
+Mesin harga Apen Al-wawi Rent.
+
+Semua perhitungan uang (subtotal, pajak, diskon durasi, voucher, sopir) ada di sini
+supaya alur interaktif di rent.main() dan perhitungan massal (dashboard harga)
+memakai aturan yang persis sama.
+
+Aturan:
+    - subtotal        = jumlahHari * harga + jumlahHari * hargaSopir
+    - pajak           = int(subtotal * 0.10)
+    - diskon durasi   = int(totalSebelumDiskon * persen), >=14 hari -> 10%, >=7 hari -> 5%
+    - diskon voucher  = int(totalSetelahDiskon * persen), diterapkan setelah diskon durasi
+    - sopir hanya untuk mobil (kode 'mb*'), Rp 250.000 per hari
+
+Fungsi penting:
+    - quote(harga, jumlahHari, hargaSopir=0, voucher=""): hitung satu penyewaan.
+    - quote_batch(pilihan, kode, hari, sopir, voucher): hitung banyak penyewaan sekaligus
+      dengan NumPy (satu kali lewat, tanpa loop per baris).
+"""
+
+PAJAK = 0.10
+HARGA_SOPIR = 250000
+# (minimal hari, persen diskon), diurutkan dari ambang terbesar
+DISKON_DURASI = ((14, 0.10), (7, 0.05))
+VOUCHER = {
+    "MERDEKA17": 0.17,
+    "HEMAT5": 0.05,
+}
+
+
+def format_rupiah(angka):
+    """
+    Mengubah angka menjadi format rupiah dengan titik sebagai pemisah ribuan.
+
+    Args:
+        angka (int): Nilai yang akan diformat.
+
+    Returns:
+        str: String angka dalam format rupiah.
+    """
+    return "{:,}".format(angka).replace(",", ".")
+
+
+def bisa_sopir(kode):
+    """
+    Mengecek apakah kendaraan boleh disewa bersama sopir (hanya mobil).
+
+    Args:
+        kode (str): Kode kendaraan, mis. 'mb1'.
+
+    Returns:
+        bool: True jika kendaraan adalah mobil.
+    """
+    return kode.startswith("mb")
+
+
+def diskon_durasi_persen(jumlahHari):
+    """
+    Mengambil persen diskon durasi untuk lama sewa tertentu.
+
+    Args:
+        jumlahHari (int): Lama sewa dalam hari.
+
+    Returns:
+        float: Persen diskon (0.10, 0.05, atau 0).
+    """
+    for minimal, persen in DISKON_DURASI:
+        if jumlahHari >= minimal:
+            return persen
+    return 0
+
+
+def voucher_persen(voucher):
+    """
+    Mengambil persen diskon dari kode voucher.
+
+    Args:
+        voucher (str): Kode voucher (tidak peka huruf besar/kecil).
+
+    Returns:
+        float: Persen diskon, 0 jika voucher kosong atau tidak valid.
+    """
+    return VOUCHER.get(voucher.strip().upper(), 0)
+
+
+def quote(harga, jumlahHari, hargaSopir=0, voucher="", voucherPersen=None):
+    """
+    Menghitung semua rincian harga untuk satu penyewaan.
+
+    Args:
+        harga (int): Harga sewa kendaraan per hari.
+        jumlahHari (int): Lama sewa dalam hari (harus > 0).
+        hargaSopir (int, optional): Harga sopir per hari, 0 jika tanpa sopir.
+        voucher (str, optional): Kode voucher, kosong jika tidak ada.
+        voucherPersen (float, optional): Persen voucher yang sudah divalidasi (mis. oleh
+            vouchers.VoucherBook). None = dicari di VOUCHER.
+
+    Returns:
+        dict: Rincian harga dengan key yang sama seperti variabel di rent.main():
+            hargaSopir, totalHargaSopir, subtotal, pajak, totalSebelumDiskon,
+            diskonPersen, diskon, totalSetelahDiskon, voucher, diskonVoucher, grandTotal.
+    """
+    if jumlahHari <= 0:
+        raise ValueError("Jumlah hari harus lebih dari 0")
+
+    totalHargaSopir = jumlahHari * hargaSopir
+    subtotal = jumlahHari * harga + totalHargaSopir
+    pajak = int(subtotal * PAJAK)
+    totalSebelumDiskon = subtotal + pajak
+
+    diskonPersen = diskon_durasi_persen(jumlahHari)
+    diskon = int(totalSebelumDiskon * diskonPersen)
+    totalSetelahDiskon = totalSebelumDiskon - diskon
+
+    voucher = voucher.strip().upper()
+    if voucherPersen is None:
+        voucherPersen = voucher_persen(voucher)
+    diskonVoucher = int(totalSetelahDiskon * voucherPersen)
+    grandTotal = totalSetelahDiskon - diskonVoucher
+
+    return {
+        "hargaSopir": hargaSopir,
+        "totalHargaSopir": totalHargaSopir,
+        "subtotal": subtotal,
+        "pajak": pajak,
+        "totalSebelumDiskon": totalSebelumDiskon,
+        "diskonPersen": diskonPersen,
+        "diskon": diskon,
+        "totalSetelahDiskon": totalSetelahDiskon,
+        "voucher": voucher,
+        "diskonVoucher": diskonVoucher,
+        "grandTotal": grandTotal,
+    }
+
+
+def quote_batch(pilihan, kode, hari, sopir, voucher, cek_sopir=bisa_sopir):
+    """
+    Menghitung rincian harga untuk banyak penyewaan sekaligus dengan NumPy.
+
+    Hasilnya identik dengan memanggil quote() per baris: pajak dan diskon dihitung
+    dengan float64 lalu dipotong ke int64, sama seperti int() di Python.
+
+    Args:
+        pilihan (dict): Katalog kendaraan (kode -> (nama, harga, warna)).
+        kode (sequence of str): Kode kendaraan per baris.
+        hari (sequence of int): Lama sewa per baris (harus > 0).
+        sopir (sequence of bool): Apakah baris tersebut menyewa sopir.
+            Diabaikan untuk kendaraan yang bukan mobil.
+        voucher (sequence of str): Kode voucher per baris (kosong jika tidak ada).
+        cek_sopir (callable, optional): cek_sopir(kode) -> bool, kendaraan yang boleh pakai sopir
+            (mis. catalog.Katalog.bisa_sopir). Default aturan kode 'mb'.
+
+    Returns:
+        dict: Key sama seperti quote() (kecuali 'voucher'), nilai berupa numpy array.
+    """
+    import numpy as np
+
+    kode = np.asarray(kode, dtype=str)
+    hari = np.asarray(hari, dtype=np.int64)
+    sopir = np.asarray(sopir, dtype=bool)
+    voucher = np.char.upper(np.char.strip(np.asarray(voucher, dtype=str)))
+    if not (kode.shape == hari.shape == sopir.shape == voucher.shape):
+        raise ValueError("Panjang kode, hari, sopir, dan voucher harus sama")
+    if np.any(hari <= 0):
+        raise ValueError("Jumlah hari harus lebih dari 0")
+
+    # Lookup katalog hanya sekali per kode unik, lalu disebar lewat indeks
+    kodeUnik, idxKode = np.unique(kode, return_inverse=True)
+    tidakAda = [k for k in kodeUnik if k not in pilihan]
+    if tidakAda:
+        raise ValueError(f"Kode kendaraan tidak valid: {', '.join(tidakAda)}")
+    harga = np.array([pilihan[k][1] for k in kodeUnik], dtype=np.int64)[idxKode]
+    mobil = np.array([cek_sopir(k) for k in kodeUnik], dtype=bool)[idxKode]
+
+    voucherUnik, idxVoucher = np.unique(voucher, return_inverse=True)
+    persenVoucher = np.array([voucher_persen(v) for v in voucherUnik], dtype=np.float64)[idxVoucher]
+
+    hargaSopir = np.where(sopir & mobil, HARGA_SOPIR, 0).astype(np.int64)
+    totalHargaSopir = hari * hargaSopir
+    subtotal = hari * harga + totalHargaSopir
+    pajak = (subtotal * PAJAK).astype(np.int64)
+    totalSebelumDiskon = subtotal + pajak
+
+    diskonPersen = np.zeros(hari.shape, dtype=np.float64)
+    # Ambang kecil dulu supaya ambang besar menimpanya
+    for minimal, persen in reversed(DISKON_DURASI):
+        diskonPersen[hari >= minimal] = persen
+    diskon = (totalSebelumDiskon * diskonPersen).astype(np.int64)
+    totalSetelahDiskon = totalSebelumDiskon - diskon
+
+    diskonVoucher = (totalSetelahDiskon * persenVoucher).astype(np.int64)
+    grandTotal = totalSetelahDiskon - diskonVoucher
+
+    return {
+        "hargaSopir": hargaSopir,
+        "totalHargaSopir": totalHargaSopir,
+        "subtotal": subtotal,
+        "pajak": pajak,
+        "totalSebelumDiskon": totalSebelumDiskon,
+        "diskonPersen": diskonPersen,
+        "diskon": diskon,
+        "totalSetelahDiskon": totalSetelahDiskon,
+        "diskonVoucher": diskonVoucher,
+        "grandTotal": grandTotal,
+    }
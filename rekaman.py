@@ -0,0 +1,121 @@
+"""
+Rekaman sesi sewa untuk diputar ulang tanpa manusia (lihat replay.py).
+
+Setiap sesi rent.py yang selesai ditambahkan sebagai satu baris JSON:
+
+    {"v": 1, "tanggal": "2025-08-17",
+     "masukan": [["kendaraan", "mb1"], ["warna", "Hitam"], ["chat", "ada diskon?", "Ada, ..."], ...],
+     "hasil": {"kode": "mb1", "jumlahHari": 7, ..., "grandTotal": 36483563, "struk": "9f2c0d..."},
+     "voucher": {"kode": "KORPORAT", "persen": 0.2, "kategori": ["Mobil"], "gabung": true}}
+
+    - tanggal  : hari sewa dimulai (jam palsu saat diputar ulang: cek stok dan voucher memakai tanggal ini).
+    - masukan  : jawaban yang diterima sesi, berurutan, sebagai [state, jawaban]; pertanyaan ke Masyud
+                 sebagai ["chat", pertanyaan, jawaban Masyud].
+    - hasil    : rincian harga dan hash teks struk (store.teks_struk) untuk diverifikasi saat diputar ulang.
+    - voucher  : aturan voucher yang dipakai sesi (vouchers.Voucher.data()), hanya jika ada; dimuat
+                 ke VoucherBook pemutar supaya voucher dari database (korporat, kategori, dll.) ikut
+                 berlaku saat diputar ulang.
+
+Merekam dari terminal (file ditambah, tidak ditimpa):
+    APEN_REKAM=rekaman.jsonl python rent.py
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import threading
+
+from store import teks_struk
+
+VERSI = 1
+CHAT = "chat"
+ENV_REKAM = "APEN_REKAM"
+
+# Isian sesi yang dibandingkan saat diputar ulang (selain hash struk)
+KOLOM_HASIL = ("kode", "warna", "jumlahHari", "hargaSopir", "voucher", "pembayaran", "subtotal", "pajak",
+               "diskon", "diskonVoucher", "totalHargaSopir", "grandTotal", "uang", "kembalian")
+
+
+def hash_struk(d):
+    """Hash pendek teks struk booking `d`."""
+    return hashlib.sha1(teks_struk(d).encode("utf-8")).hexdigest()[:16]
+
+
+def ringkas_hasil(d):
+    """
+    Hasil sesi yang selesai untuk dibandingkan.
+
+    Args:
+        d (dict): SesiSewa.data setelah pembayaran.
+
+    Returns:
+        dict: Kolom KOLOM_HASIL yang ada di `d`, ditambah 'struk' (hash_struk()).
+    """
+    hasil = {k: d[k] for k in KOLOM_HASIL if k in d}
+    hasil["struk"] = hash_struk(d)
+    return hasil
+
+
+def baca_rekaman(path):
+    """
+    Membaca file rekaman sebagai stream.
+
+    Yields:
+        dict: Satu rekaman sesi (baris kosong dilewati).
+    """
+    with open(path, encoding="utf-8") as f:
+        for baris in f:
+            if baris.strip():
+                yield json.loads(baris)
+
+
+class Perekam:
+    """
+    Merekam masukan satu sesi lalu menambahkannya ke file saat sesi selesai.
+
+    Args:
+        path (str): File rekaman (JSONL).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._kunci = threading.Lock()
+        self.mulai(datetime.date.today())
+
+    def mulai(self, tanggal):
+        """Memulai rekaman sesi baru yang dimulai pada `tanggal` (datetime.date)."""
+        self.tanggal = tanggal
+        self.masukan_sesi = []
+
+    def masukan(self, state, jawaban):
+        """Mencatat jawaban user yang dikirim ke sesi pada langkah `state`."""
+        self.masukan_sesi.append([state, jawaban])
+
+    def chat(self, pertanyaan, jawaban):
+        """Mencatat satu pertanyaan ke Masyud beserta jawabannya."""
+        self.masukan_sesi.append([CHAT, pertanyaan, jawaban])
+
+    def selesai(self, data, voucher=None):
+        """
+        Menambahkan rekaman sesi ke file.
+
+        Args:
+            data (dict): SesiSewa.data setelah pembayaran.
+            voucher (vouchers.Voucher, optional): Aturan voucher yang dipakai sesi.
+        """
+        baris = {"v": VERSI, "tanggal": self.tanggal.isoformat(), "masukan": self.masukan_sesi,
+                 "hasil": ringkas_hasil(data)}
+        if voucher is not None:
+            baris["voucher"] = voucher.data()
+        with self._kunci, open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(baris, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+
+def dari_env(env=None):
+    """
+    Returns:
+        Perekam | None: Perekam ke file di APEN_REKAM, atau None jika tidak diisi.
+    """
+    path = (os.environ if env is None else env).get(ENV_REKAM)
+    return Perekam(path) if path else None
@@ -9,7 +9,11 @@ Overview:
       - Menghitung subtotal, pajak (10%), diskon durasi, voucher.
       - Metode pembayaran tunai atau transfer.
       - Mencetak dan menyimpan struk ke 'struk_penyewaan.txt'.
+      - Menyimpan setiap sewa yang selesai (tunai dan transfer) ke 'booking.db' (lihat store.py).
+      - Cek stok unit per tanggal: satu unit dipesan saat jumlah hari diisi (lihat availability.py).
       - Interaksi dengan AI customer service (masyud) menggunakan model generative.
+      - Metrik durasi per tahap dan ukuran prompt, opsional (lihat metrics.py).
+      - Rekaman sesi untuk diputar ulang secepat mesin, opsional (lihat rekaman.py dan replay.py).
 
 Requirements:
     - Python 3.8+
@@ -29,18 +33,24 @@ Environment / Setup:
         python rent.py
 
 File dan struktur data:
-    - pilihan (dict): mapping kode -> (nama_kendaraan, harga_per_hari, list_warna)
+    - katalog.json: daftar kendaraan (kode, nama, kategori, harga, warna, sopir, unit), dimuat oleh catalog.Katalog
+      dan dimuat ulang otomatis jika file berubah.
+    - pilihan (dict): mapping kode -> (nama_kendaraan, harga_per_hari, list_warna), dibangun dari katalog
       Contoh: "mb1": ("G-Class", 5000000, ["Hitam","Putih","Silver"])
 
 Fungsi penting:
-    - format_rupiah(angka): format int ke string rupiah menggunakan titik sebagai pemisah ribuan.
+    - format_rupiah(angka): format int ke string rupiah menggunakan titik sebagai pemisah ribuan (dari pricing.py).
+    - pricing.quote(...) / pricing.quote_batch(...): mesin harga (subtotal, pajak, diskon, voucher, sopir)
+      yang dipakai main() maupun perhitungan massal.
+    - rekomendasi(hari, budget, ...) / teks_rekomendasi(...): kendaraan terbaik dalam budget total akhir,
+      dipakai menu dan Masyud (pertanyaan budget dijawab lokal oleh faq.FaqResolver).
     - tabelAwal(): menampilkan tabel ringkasan kendaraan dan harga.
     - input_user(prompt_text, choices=None, capitalize=False):
         Membaca input user, mendukung validasi pilihan dan trigger AI lewat input 'halomas' (tanpa spasi).
     - pilih_warna(warnaTersedia): menampilkan warna dan meminta input valid.
     - tanya_masyud(): loop interaktif untuk bertanya ke AI menggunakan model yang dikonfigurasi.
       - Model dikonfigurasi dengan MASYUD_API_KEY dari .env; jawaban AI diharapkan berbasis context.txt.
-    - Alur utama:
+    - Alur utama (dijalankan oleh session.SesiSewa sebagai state machine, tanpa rekursi):
         1. Tampilkan tabelAwal
         2. Minta kode kendaraan
         3. Konfirmasi, jumlah hari, hitung subtotal + pajak
@@ -106,92 +116,399 @@ License:
 
 """
 
-from dotenv import load_dotenv
+import datetime
 import os
-import google.generativeai as masyud
+import threading
 import time
-
-# Load .env
-load_dotenv()
+import metrics
+import pricing
+import rekaman
+from ai_client import LatencyLog, ResilientClient, stream_jawaban
+from availability import UNIT_DEFAULT, Ketersediaan
+from answer_cache import CACHE_FILE, AnswerCache
+from catalog import Katalog
+from chatlog import PAMIT_MASYUD, PEMBUKA_MASYUD, ChatLog, ChatWriter
+from faq import FaqResolver
+from memory import MemoriSesi
+from retrieval import ContextIndex, estimasi_token
+from session import SesiSewa
+from store import STORE_FILE, BookingStore
+from vouchers import VoucherBook, voucher_default
+
+# Diekspor ulang untuk pemanggil lama (rent.format_rupiah, test_rent); tidak dipakai di modul ini
+format_rupiah = pricing.format_rupiah
 
 LOG_FILE = 'chatlog.txt'
+KATALOG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'katalog.json')
+CONTEXT_FILE = 'context.txt'
+CONTEXT_TOP_K = 3  # Jumlah bagian context.txt yang dikirim per pertanyaan (selain personalitas)
+CONTEXT_MAX_TOKENS = 800  # Batas perkiraan token untuk bagian-bagian tersebut
+AI_TIMEOUT = 30  # Detik maksimal menunggu jawaban (atau potongan jawaban) dari Gemini
+AI_RETRIES = 2  # Percobaan ulang jika Gemini gagal/lambat
+STREAMING = True  # Tampilkan jawaban AI potongan demi potongan
+JEDA_ULANG = 2  # Detik jeda sebelum memuat ulang saat kode kendaraan tidak valid (0 = tanpa jeda)
+SYSTEM_INSTRUCTION = "Kamu adalah customer service untuk Apen Al-wawi Rent. Jawablah hanya seputar layanan rental kendaraan ini."
+chat_log = ChatLog(LOG_FILE)
+chat_writer = ChatWriter(chat_log)
+
+# =================== AI CLIENT (LAZY) ===================
+# SDK Gemini, model, dan context baru dimuat saat pertama kali dibutuhkan (atau di-pre-warm
+# dari main()), supaya `import rent` cepat dan tidak punya efek samping.
+model = None
+ai = None
+answer_cache = None
+_kunci_ai = threading.Lock()
+
+def siapkan_ai():
+    """
+    Memuat .env, SDK Gemini, model, cache jawaban, dan context (hanya sekali).
 
-# Ambil API key dari environment
-api_key = os.getenv("MASYUD_API_KEY")
+    Aman dipanggil berkali-kali dan dari beberapa thread sekaligus.
 
-masyud.configure(api_key=api_key)
-model = masyud.GenerativeModel(
-    "gemini-2.5-flash", 
-    system_instruction="Kamu adalah customer service untuk Apen Al-wawi Rent. Jawablah hanya seputar layanan rental kendaraan ini."
-)
+    Returns:
+        ResilientClient: Klien AI yang siap dipakai.
+    """
+    global model, ai, answer_cache
+    if ai is not None:
+        return ai
+    with _kunci_ai:
+        if ai is None:
+            from dotenv import load_dotenv
+            import google.generativeai as masyud
+
+            # Load .env lalu ambil API key dari environment
+            load_dotenv()
+            api_key = os.getenv("MASYUD_API_KEY")
+
+            masyud.configure(api_key=api_key)
+            model = masyud.GenerativeModel(
+                "gemini-2.5-flash", 
+                system_instruction=SYSTEM_INSTRUCTION
+            )
+            muat_context()
+            # Jawaban AI di-cache per pertanyaan + hash konteks; dikosongkan otomatis jika context.txt berubah
+            answer_cache = AnswerCache(path=CACHE_FILE, context_path=CONTEXT_FILE)
+            # Semua panggilan lewat klien ini: ada batas waktu, retry, circuit breaker, dan jawaban cadangan
+            ai = ResilientClient(model, timeout=AI_TIMEOUT, retries=AI_RETRIES)
+    return ai
+
+def prewarm_ai():
+    """
+    Memanaskan klien AI di thread latar belakang selagi user membaca tabel kendaraan.
 
-def format_rupiah(angka):
+    Error diabaikan di sini; jika AI benar-benar gagal dimuat, error muncul saat dipakai.
     """
-    Mengubah angka menjadi format rupiah dengan titik sebagai pemisah ribuan.
+    def kerja():
+        try:
+            siapkan_ai()
+        except Exception:
+            pass
+    threading.Thread(target=kerja, name="prewarm-ai", daemon=True).start()
 
-    Args:
-        angka (int): Nilai yang akan diformat.
+# =================== DATA BOOKING (LAZY) ===================
+booking_store = None
+_kunci_store = threading.Lock()
+
+def buka_store():
+    """
+    Membuka database booking (hanya sekali, saat pertama kali dibutuhkan).
 
     Returns:
-        str: String angka dalam format rupiah.
+        BookingStore: Store yang dipakai semua sesi di proses ini.
     """
-    return "{:,}".format(angka).replace(",", ".")
+    global booking_store
+    with _kunci_store:
+        if booking_store is None:
+            booking_store = BookingStore(STORE_FILE)
+    return booking_store
+
+# =================== KETERSEDIAAN UNIT (LAZY) ===================
+ketersediaan = None
+
+def unit_katalog():
+    """Jumlah unit per kode dari katalog (UNIT_DEFAULT jika tidak diisi)."""
+    return {k.kode: k.unit or UNIT_DEFAULT for k in katalog.kendaraan.values()}
+
+def buka_ketersediaan():
+    """
+    Membuat kalender unit kendaraan dan memuat sewa yang masih berjalan dari database booking.
+
+    Returns:
+        Ketersediaan: Kalender yang dipakai semua sesi di proses ini.
+    """
+    global ketersediaan
+    store = buka_store()
+    with _kunci_store:
+        if ketersediaan is None:
+            kalender = Ketersediaan(unit_katalog())
+            kalender.muat(store.reservasi_aktif(datetime.date.today().isoformat()))
+            ketersediaan = kalender
+    return ketersediaan
+
+# =================== VOUCHER (LAZY) ===================
+voucher_book = None
+
+def kategori_kendaraan(kode):
+    """Kategori kendaraan dari katalog (None jika kode tidak ada)."""
+    return katalog[kode].kategori if kode in katalog else None
+
+def buka_voucher():
+    """
+    Membuka aturan voucher di database booking; voucher bawaan (pricing.VOUCHER) ditambahkan
+    jika belum ada, tanpa menimpa aturan yang sudah diubah.
+
+    Returns:
+        VoucherBook: Voucher yang dipakai semua sesi di proses ini.
+    """
+    global voucher_book
+    with _kunci_store:
+        if voucher_book is None:
+            book = VoucherBook(STORE_FILE, kategori_kendaraan=kategori_kendaraan)
+            book.simpan_aturan(voucher_default(), timpa=False)
+            voucher_book = book
+    return voucher_book
 
 # =================== DATA KENDARAAN ===================
-pilihan = {
-    "mb1": ("G-Class", 5000000, ["Hitam", "Putih", "Silver"]),
-    "mb2": ("BMW M4", 3450000, ["Biru", "Merah", "Hitam"]),
-    "mb3": ("Porsche 911", 2800000, ["Kuning", "Putih"]),
-    "mb4": ("McLaren Senna", 4250000, ["Oranye", "Abu-abu"]),
-    "mb5": ("Toyota GR Supra", 3000000, ["Merah", "Putih", "Hijau"]),
-    "mb6": ("Toyota Alphard Hybrid", 5000000, ["Hitam", "Putih"]),
-    "mk1": ("Harley Davidson RG", 2500000, ["Hitam", "Coklat"]),
-    "mk2": ("Yamaha R6", 700000, ["Biru", "Hitam"]),
-    "mk3": ("Honda CBR 1000 RR", 1500000, ["Merah", "Putih"]),
-    "mk4": ("Yamaha XSR 155", 550000, ["Hitam", "Hijau"]),
-    "mk5": ("Sportster 48", 1500000, ["Hitam", "Silver"]),
-    "s1": ("Sepeda Listrik", 20000, ["Hitam", "Putih"]),
-    "s2": ("Sepeda", 10000, ["Biru", "Merah", "Hijau"]),
-}
+# Sumber data kendaraan: katalog.json (kode, nama, kategori, harga, warna, sopir, unit)
+katalog = Katalog(KATALOG_FILE)
+# Bentuk lama (kode -> (nama, harga, warna)); dict yang sama diperbarui saat katalog dimuat ulang
+pilihan = katalog.pilihan()
+
+# Pertanyaan sederhana (harga, warna, sopir, diskon, pajak, budget) dijawab langsung dari data di atas
+faq_resolver = FaqResolver(pilihan, cek_sopir=katalog.bisa_sopir, katalog=katalog, buka_voucher=buka_voucher)
+
+def segarkan_katalog():
+    """
+    Memuat ulang katalog jika file-nya berubah (hot reload, tanpa restart program).
+
+    `pilihan` diperbarui di tempat sehingga semua sesi yang memegang dict ini ikut melihat
+    data baru; penjawab FAQ dibangun ulang dan unit kendaraan baru ditambahkan ke kalender.
+
+    Returns:
+        bool: True jika katalog dimuat ulang.
+    """
+    global faq_resolver
+    with _kunci_store:
+        if not katalog.muat_ulang_jika_berubah():
+            return False
+        baru = katalog.pilihan()
+        pilihan.clear()
+        pilihan.update(baru)
+        faq_resolver = FaqResolver(pilihan, cek_sopir=katalog.bisa_sopir, katalog=katalog, buka_voucher=buka_voucher)
+        if ketersediaan is not None:
+            ketersediaan.tambah_unit(unit_katalog())
+    return True
+
+def rekomendasi(hari, budget=None, **syarat):
+    """
+    Kendaraan terbaik untuk `hari` hari dengan total akhir (pajak, diskon, sopir, voucher) dalam budget.
+
+    Voucher dicek dengan VoucherBook yang sama seperti sesi sewa (tanpa memakai kuota).
+
+    Args:
+        hari (int): Lama sewa.
+        budget (int, optional): Total akhir maksimal. None = tanpa batas.
+        **syarat: kategori, warna, sopir, voucher, k, termurah (lihat catalog.Katalog.rekomendasi()).
+
+    Returns:
+        list: Tuple (Kendaraan, rincian harga), dari yang paling mahal yang masih masuk budget.
+    """
+    segarkan_katalog()
+    if syarat.get("voucher") and "voucherPersen" not in syarat:
+        # Voucher dicek dengan VoucherBook seperti di sesi; yang tidak berlaku dihitung 0%
+        syarat["voucherPersen"] = faq_resolver.persen_voucher(syarat["voucher"], hari, syarat.get("kategori"))[0]
+    return katalog.rekomendasi(hari, budget, **syarat)
+
+def teks_rekomendasi(hari, budget, **syarat):
+    """
+    Rekomendasi dalam budget sebagai teks siap cetak (sama dengan jawaban Masyud).
+
+    Args:
+        hari (int): Lama sewa.
+        budget (int): Total akhir maksimal.
+        **syarat: kategori, warna, sopir, voucher.
+
+    Returns:
+        str: Teks rekomendasi.
+    """
+    segarkan_katalog()
+    return faq_resolver.teks_rekomendasi(hari, budget, **syarat)
 
 # =================== STATIC CONTEXT ===================
-with open("context.txt", "r", encoding="utf-8") as f:
-    base_context = f.read()
+base_context = None
+_context_mtime = None
+context_index = None
+
+def muat_context():
+    """
+    Mengambil base_context, membaca context.txt (dan membangun indeksnya) saat pertama kali
+    dipakai atau jika file sudah berubah.
+
+    Returns:
+        str: Isi context.txt terbaru.
+    """
+    global base_context, _context_mtime, context_index
+    mtime = os.stat(CONTEXT_FILE).st_mtime_ns
+    if mtime != _context_mtime:
+        with open(CONTEXT_FILE, "r", encoding="utf-8") as f:
+            base_context = f.read()
+        context_index = ContextIndex(base_context)
+        _context_mtime = mtime
+    return base_context
+
+def konteks_relevan(pertanyaan):
+    """
+    Mengambil bagian context.txt yang relevan dengan pertanyaan (personalitas selalu ikut).
+
+    Args:
+        pertanyaan (str): Pertanyaan user.
+
+    Returns:
+        str: Context untuk dimasukkan ke prompt.
+    """
+    muat_context()
+    return context_index.build_context(pertanyaan, k=CONTEXT_TOP_K, max_tokens=CONTEXT_MAX_TOKENS)
+
+# Latensi per pertanyaan: waktu sampai potongan pertama vs sampai jawaban lengkap
+latensi_ai = LatencyLog()
+
+# Riwayat chat untuk prompt disimpan per sesi (bukan dari chatlog.txt bersama), lihat memory.py
+memori_sesi = MemoriSesi()
+
+# Perekam sesi untuk replay.py (hanya aktif jika APEN_REKAM diisi, lihat rekaman.py)
+perekam = None
 
 # =================== AI FUNCTION ===================
 
+@metrics.diukur("save_chat")
 def save_chat(role, text):
     """
     Fungsi untuk menyimpan chat history.
-    Menyimpan chat history di file 'chatlog.txt'.
+    Menyimpan chat history di file 'chatlog.txt' (satu record per baris, lihat chatlog.py).
+    Pesan masuk antrean dan ditulis per batch oleh thread latar belakang.
 
     Args:
         role (str): Peran yang sedang berbicara (Anda atau Masyud).
         text (str): Teks yang diucapkan peran tersebut.
     """
-    with open(LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(f"{role}: {text}\n")
+    chat_writer.write(role, text)
 
+@metrics.diukur("load_chat_history")
 def load_chat_history(limit=5):
     """
     Fungsi untuk memuat riwayat chat.
+    Hanya membaca bagian akhir file, jadi waktunya tidak bergantung pada ukuran log.
+    Riwayat ini gabungan semua pelanggan; prompt AI memakai memori per sesi (memori_sesi).
 
     Args:
-        limit (int): Jumlah baris riwayat chat yang ingin dimuat. Default 5.
+        limit (int): Jumlah record riwayat chat yang ingin dimuat. Default 5.
 
     Returns:
         str: Riwayat chat dalam bentuk string.
     """
-    if not os.path.exists(LOG_FILE):
-        return ""
+    # Pastikan pesan yang masih di antrean ikut terbaca
+    chat_writer.flush()
+    return "".join(f"{role}: {text}\n" if role else f"{text}\n" for role, text in chat_log.tail(limit))
+
+BANNER_MASYUD = "\n".join([
+    "",
+    "=" * 120,
+    "(C) Copyright 2025 Rayud All Rights Reserved.",
+    "Rayud Masyud | Version 1.0.0 | Powered by Gemini.",
+    "Anda memasuki mode AI customer service. AI bersifat eksperimental dan mungkin akan membuat kesalahan. \nHarap periksa info penting. Ketik 'Pelajari Masyud' untuk info lebih lanjut.",
+    "Ketik 'keluar', 'exit', 'quit' untuk berhenti interaksi.",
+    "=" * 120,
+])
+KATA_KELUAR = ["keluar", "exit", "quit"]
+INFO_MASYUD = "Masyud adalah AI (Artificial Intelligence) atau Kecerdasan Buatan yang mungkin akan membuat kesalahan. Masyud berbasis pada LLM buatan Google, yakni Gemini 2.5 Flash. \nDiskusikan apapun yang anda inginkan bersama Masyud. \nBagaimana cara kami menggunakan data anda? Kami (Rayud) tidak mengambil data apapun dari program ini. Data yang anda kirimkan melalui Masyud ini akan langsung dikirimkan ke Google Gemini tanpa adanya interupsi dari Kami.\nMasyud dilatih untuk mengenal dan menjawab HANYA seputar program ini"
+
+def jawab_masyud(pertanyaan, tampil=None, memori=None):
+    """
+    Menjawab satu pertanyaan: FAQ lokal dulu, lalu cache, baru Gemini.
 
-    with open(LOG_FILE, "r", encoding="utf-8") as f:
-        lines = f.readlines()
+    Dipakai oleh tanya_masyud() (terminal) dan server (banyak sesi). Aman dipanggil dari
+    beberapa thread sekaligus.
 
-    recent_lines = lines[-limit:]
-    return "".join(recent_lines)
+    Args:
+        pertanyaan (str): Pertanyaan user.
+        tampil (callable, optional): Fungsi seperti print() untuk menampilkan jawaban
+            (termasuk streaming). None = tidak menampilkan apa pun.
+        memori (memory.MemoriChat, optional): Riwayat chat sesi ini; dipakai di prompt lalu
+            ditambah tanya-jawab ini. None = prompt tanpa riwayat.
 
-def tanya_masyud():
+    Returns:
+        str: Jawaban Masyud.
+    """
+    jawaban = _jawab_masyud(pertanyaan, tampil, memori)
+    if memori is not None:
+        memori.tambah(pertanyaan, jawaban)
+    return jawaban
+
+def _jawab_masyud(pertanyaan, tampil, memori):
+    # Pertanyaan katalog dijawab lokal, tanpa memanggil model
+    jawaban = faq_resolver.jawab(pertanyaan)
+    if jawaban is not None:
+        metrics.hitung("jawaban_total", sumber="faq")
+        if tampil:
+            tampil("Masyud:", jawaban)
+        return jawaban
+
+    siapkan_ai()
+    context = muat_context()
+    # Hanya riwayat sesi ini, sudah dibatasi budget token (ringkasan + tanya-jawab terakhir)
+    history = memori.teks() if memori is not None else ""
+    # Jawaban lanjutan ("yang itu berapa?") bergantung pada obrolan sesi ini, jadi cache yang
+    # dibagi antar pelanggan hanya dipakai untuk pertanyaan tanpa riwayat
+    pakai_cache = not history
+    jawaban = answer_cache.get(pertanyaan, context, SYSTEM_INSTRUCTION) if pakai_cache else None
+    if jawaban is not None:
+        metrics.hitung("jawaban_total", sumber="cache")
+        if tampil:
+            tampil("Masyud:", jawaban)
+        return jawaban
+
+    if tampil:
+        tampil("Masyud: [berfikir...]")
+    full_prompt = f"""
+    {konteks_relevan(pertanyaan)}
+
+    Berikut adalah cuplikan percakapan sebelumnya:
+    {history}
+
+    Sekarang lanjutkan percakapan:
+    User: {pertanyaan}
+    """
+    metrics.amati("prompt_karakter", len(full_prompt))
+    metrics.amati("prompt_token", estimasi_token(full_prompt))
+
+    if STREAMING and tampil:
+        tampil("Masyud: ", end="", flush=True)
+        with metrics.ukur("ai"):
+            response = stream_jawaban(ai, full_prompt, tulis=lambda t: tampil(t, end="", flush=True),
+                                      latensi=latensi_ai)
+        tampil("")
+        jawaban = response.text
+        # Flag per panggilan: `ai` dipakai bersama semua sesi server, jadi penghitung ai.fallbacks
+        # bisa berubah karena sesi lain
+        cadangan = response.fallback
+    else:
+        mulai = time.perf_counter()
+        response = ai.generate_content(full_prompt)
+        jawaban = response.text
+        lama = time.perf_counter() - mulai
+        latensi_ai.record(lama, lama, "blocking")
+        metrics.catat_waktu("ai", lama)
+        cadangan = getattr(response, "fallback", False)
+        if tampil:
+            tampil("Masyud:", jawaban)
+    metrics.hitung("jawaban_total", sumber="cadangan" if cadangan else "ai")
+    # Jawaban cadangan (Gemini tidak bisa dihubungi) dan jawaban yang memakai riwayat sesi jangan di-cache
+    if not cadangan and pakai_cache:
+        answer_cache.put(pertanyaan, context, jawaban, SYSTEM_INSTRUCTION)
+    return jawaban
+
+@metrics.diukur("tanya_masyud")
+def tanya_masyud(id_sesi=None):
     """
     Fungsi untuk berinteraksi dengan AI Masyud.
     AI Masyud berbasis pada LLM Gemini 2.5 Flash buatan Google.
@@ -204,57 +521,42 @@ def tanya_masyud():
     Bagaimana cara kami menggunakan data anda?
     Kami (Rayud) tidak mengambil data apapun dari program ini.
     Data yang anda kirimkan melalui Masyud ini akan langsung dikirimkan ke Google Gemini tanpa adanya interupsi dari Kami.
+
+    Args:
+        id_sesi (str, optional): ID sesi sewa; riwayat chat untuk prompt disimpan per sesi.
     """
-    print("")
-    print("=" * 120)
-    print("(C) Copyright 2025 Rayud All Rights Reserved.")
-    print("Rayud Masyud | Version 1.0.0 | Powered by Gemini.")
-    print("Anda memasuki mode AI customer service. AI bersifat eksperimental dan mungkin akan membuat kesalahan. \nHarap periksa info penting. Ketik 'Pelajari Masyud' untuk info lebih lanjut.")
-    print("Ketik 'keluar', 'exit', 'quit' untuk berhenti interaksi.")
-    print("=" * 120)
+    memori = memori_sesi.ambil(id_sesi)
+    print(BANNER_MASYUD)
 
-    pembuka = "Halo! Mau tanya apa seputar penyewaan?"
-    print("Masyud:", pembuka)
-    save_chat("Masyud", pembuka)
+    print("Masyud:", PEMBUKA_MASYUD)
+    save_chat("Masyud", PEMBUKA_MASYUD)
 
     while True:
         pertanyaan = input("Anda: ")
         save_chat("Anda", pertanyaan)
 
-        if pertanyaan.lower() in ["keluar", "exit", "quit"]:
-            pamit = "Oke, sampai jumpa!"
-            print("Masyud:", pamit)
-            save_chat("Masyud", pamit)
+        if pertanyaan.lower() in KATA_KELUAR:
+            print("Masyud:", PAMIT_MASYUD)
+            save_chat("Masyud", PAMIT_MASYUD)
             break
 
         if pertanyaan.lower() in ["pelajari masyud"]:
-            info = "Masyud adalah AI (Artificial Intelligence) atau Kecerdasan Buatan yang mungkin akan membuat kesalahan. Masyud berbasis pada LLM buatan Google, yakni Gemini 2.5 Flash. \nDiskusikan apapun yang anda inginkan bersama Masyud. \nBagaimana cara kami menggunakan data anda? Kami (Rayud) tidak mengambil data apapun dari program ini. Data yang anda kirimkan melalui Masyud ini akan langsung dikirimkan ke Google Gemini tanpa adanya interupsi dari Kami.\nMasyud dilatih untuk mengenal dan menjawab HANYA seputar program ini"
             print("-" * 120)
-            print(info)
-            save_chat("Masyud", info)
+            print(INFO_MASYUD)
+            save_chat("Masyud", INFO_MASYUD)
+            if perekam is not None:
+                perekam.chat(pertanyaan, INFO_MASYUD)
             print("-" * 120)
             print("")
             continue
 
-        history = load_chat_history(limit=5)
-
-        print("Masyud: [berfikir...]")
-        full_prompt = f"""
-        {base_context}
-
-        Berikut adalah cuplikan percakapan sebelumnya:
-        {history}
-
-        Sekarang lanjutkan percakapan:
-        User: {pertanyaan}
-        """
-
-        response = model.generate_content(full_prompt)
-        print("Masyud:", response.text)
-        save_chat("Masyud", response.text)
+        jawaban = jawab_masyud(pertanyaan, tampil=print, memori=memori)
+        save_chat("Masyud", jawaban)
+        if perekam is not None:
+            perekam.chat(pertanyaan, jawaban)
 
 # =================== INPUT FUNCTION ===================
-def input_user(prompt_text, choices=None, capitalize=False):
+def input_user(prompt_text, choices=None, capitalize=False, id_sesi=None):
     """
     Mengambil input dari user dengan validasi pilihan dan fitur tanya AI.
 
@@ -262,23 +564,25 @@ def input_user(prompt_text, choices=None, capitalize=False):
         prompt_text (str): Teks prompt untuk input.
         choices (list, optional): Daftar pilihan yang valid.
         capitalize (bool, optional): Apakah input perlu dikapitalisasi.
+        id_sesi (str, optional): ID sesi sewa untuk memori chat Masyud.
 
     Returns:
         str: Input user yang sudah divalidasi.
     """
     while True:
-        user_input = input(prompt_text).strip()
+        with metrics.ukur("input_user"):
+            user_input = input(prompt_text).strip()
 
         # Trigger AI 
         if user_input.lower().replace(" ", "") == "halomas":
-            tanya_masyud()
+            tanya_masyud(id_sesi)
             continue
 
         # Kalau ada pilihan yang valid
         if choices:
             # Normalisasi input biar fleksibel (bisa kecil, besar, campur)
             if (user_input in choices or user_input.lower() in [c.lower() for c in choices]):
-                return user_input
+                return user_input.capitalize() if capitalize else user_input
             print("-" * 120)
             print(f"Input tidak valid. Pilihan: {', '.join(choices)}")
             continue
@@ -286,39 +590,24 @@ def input_user(prompt_text, choices=None, capitalize=False):
         # Kalau tidak ada choices, langsung return input
         return user_input
 # =================== TABEL AWAL ===================
+def teks_tabel_awal():
+    """
+    Menyusun tabel daftar kendaraan, harga, dan kategori yang tersedia untuk disewa.
+
+    Tabel dibangun dari katalog (satu kolom per kategori: Mobil, Motor, Sepeda) dan di-cache
+    sebagai string; file katalog dicek dulu sehingga perubahan langsung terlihat.
+
+    Returns:
+        str: Tabel yang siap dicetak.
+    """
+    segarkan_katalog()
+    return katalog.tabel()
+
 def tabelAwal():
     """
     Menampilkan tabel daftar kendaraan, harga, dan kategori yang tersedia untuk disewa.
-
-    Tabel berisi 6 baris dan 4 kolom. Kolom pertama berisi nomor urut,
-    kolom kedua berisi kendaraan mobil, kolom ketiga berisi kendaraan motor,
-    dan kolom keempat berisi kendaraan sepeda.
-    """
-    data = [
-        # Baris 1
-        ["1", "G-Class - Rp 5.000.000/hari", "Harley Davidson RG - Rp 2.500.000/hari", "Sepeda Listrik - Rp 20.000/hari"],
-        # Baris 2
-        ["2", "BMW M4 - Rp 3.450.000/hari", "Yamaha R6 - Rp 700.000/hari", "Sepeda - Rp 10.000/hari"],
-        # Baris 3
-        ["3", "Porsche 911 - Rp 2.800.000/hari", "Honda CBR 1000 RR - Rp 1.500.000/hari", ""],
-        # Baris 4
-        ["4", "McLaren Senna - Rp 4.250.000/hari", "Yamaha XSR 155 - Rp 550.000/hari", ""],
-        # Baris 5
-        ["5", "Toyota GR Supra - Rp 3.000.000/hari", "Sportster 48 - Rp 1.500.000/hari", ""],
-        # Baris 6
-        ["6", "Toyota Alphard Hybrid - Rp 5.000.000/hari", "", ""],
-    ]
-    print("="*120)
-    print("\n{:^120}".format("Apen Al-wawi Rent\n"))
-    print("="*120)
-    print("-"*120)
-    # Judul tabel
-    print(f"{'No':<2} | {'Mobil':<50} | {'Motor':<40} | {'Sepeda':<20}")
-    print("-"*120)
-    # Isi tabel
-    for row in data:
-        print(f"{row[0]:<2} | {row[1]:<50} | {row[2]:<40} | {row[3]:<20}")
-    print("-"*120)
+    """
+    print(teks_tabel_awal())
 
 # =================== PILIH WARNA ===================
 def pilih_warna(warnaTersedia):
@@ -335,231 +624,57 @@ def pilih_warna(warnaTersedia):
     return input_user("Pilih warna kendaraan: ", choices=warnaTersedia, capitalize=True)
 
 # =================== MAIN PROGRAM ===================
+def buat_sesi(**kwargs):
+    """
+    Membuat SesiSewa yang memakai katalog, database booking, kalender unit, dan voucher bersama.
+
+    Args:
+        **kwargs: Diteruskan ke SesiSewa (mis. tulis, jeda_ulang, struk_path).
+
+    Returns:
+        SesiSewa: Sesi baru (belum dimulai).
+    """
+    kwargs.setdefault("jeda_ulang", JEDA_ULANG)
+    return SesiSewa(pilihan, menu=teks_tabel_awal, store=buka_store(), ketersediaan=buka_ketersediaan(),
+                    cek_sopir=katalog.bisa_sopir, vouchers=buka_voucher(), **kwargs)
+
 def main():
     """
     Fungsi main program.
     Menampilkan menu pilihan kendaraan dan melakukan proses sewa kendaraan.
-    """
 
-    tabelAwal()
-    print("Masukan jenis kendaraan yang akan di sewa dengan kode: ")
-    print("mb = Mobil, mk = Motor, s = Sepeda")
-    print("Contoh: mb1 untuk sewa mobil G-Class (nomor 1)")
-    print("="*120)
-    print("Ragu? Tanya AI Masyud dengan ketik 'halo mas' di input manapun!")
-
-    # Ambil input kendaraan
-    kendaraan = input_user("Masukan jenis kendaraan yang akan di sewa : ").lower().replace(" ", "")
-    print("")
-    if kendaraan in pilihan:
-        jenisKendaraan, harga, warnaTersedia = pilihan[kendaraan]
-        print(f"Anda memilih {jenisKendaraan} dengan harga Rp {format_rupiah(harga)} per hari.")
-        warna = pilih_warna(warnaTersedia).capitalize()
-        print(f"Anda memilih warna {warna} untuk kendaraan {jenisKendaraan}.")
-    else:
-        print("")
-        print("=" * 120, "\n")
-        print("Kode kendaraan tidak valid!\nSedang memuat ulang program. Harap tunggu sebentar...\n")
-        print("=" * 120)
-        print("")
-        time.sleep(2)
-        main()
-        return
-
-    # =================== KONFIRMASI ===================
-    print("\n" * 2)
-    print("=" * 40)
-    print("Konfirmasi sewa kendaraan")
-    print("=" * 40)
-    print("Jenis kendaraan yang akan di sewa : ", jenisKendaraan)
-    print("Warna                             : ", warna)
-    print("--------------------------------------------------")
-    print("Harga sewa per hari : Rp", format_rupiah(harga))
-    print("--------------------------------------------------")
-
-    konfirmasi = input_user("Yakin akan sewa kendaraan ini? (Y/T) : ", choices=["Y","T"], capitalize=True)
-    if konfirmasi.upper() == "T":
-        return main()
-
-    # =================== SOPIR ===================
-    hargaSopir = 0
-    if kendaraan in ["mb1", "mb2", "mb3", "mb4", "mb5", "mb6"]:
-        Sopir = 250000
-        print("\n" * 2)
-        print("=" * 40)
-        print("Sopir")
-        print("=" * 40)
-        print("Harga sopir per hari : Rp", format_rupiah(Sopir))
-        sopir = input_user("Apakah anda ingin sewa sopir? (Y/T) : ", choices=["Y","T"], capitalize=True)
-        if sopir.upper() == "Y":
-            hargaSopir = 250000
-        elif sopir.upper() == "T":
-            hargaSopir = 0
-        else:
-            print("Input tidak valid!")
-
-    # =================== HITUNG SUBTOTAL + PAJAK ===================
-    while True:
-        user_input = input_user("\nMasukan jumlah hari sewa kendaraan : ")
-        try:
-            jumlahHari = int(user_input)
-            if jumlahHari > 0:
-                break
-            else:
-                print("0 Bukan jumlah hari yang valid. Silakan coba lagi.")
-        except ValueError:
-            print("Input tidak valid. Silakan coba lagi.")
-
-    totalHargaSopir = jumlahHari * hargaSopir
-    subtotal = jumlahHari * harga + totalHargaSopir
-    pajak = int(subtotal * 0.10)
-    totalSebelumDiskon = subtotal + pajak
-    # =================== FORMULIR PENYEWA ===================
-    print("\n" * 2)
-    print("=" * 20)
-    print("Formulir ketentuan penyewaan")
-    print("=" * 20)
-    nama = input_user("Masukan nama anda        : ")
-    alamat = input_user("Masukan alamat anda      : ")
-    telepon = input_user("Masukan nomor telepon    : ")
-    jenisKelamin = input_user("Masukan jenis kelamin    : ")
-
-    # =================== JENIS JAMINAN ===================
-    print("\n" + "="*20)
-    print("Jenis Jaminan")
-    print("="*20)
-    print("1. KTP\n2. Pasport\n3. SIM")
-    jaminan = input_user("Masukan jenis jaminan (1/2/3) : ", choices=["1","2","3"])
-    if jaminan == "1":
-        jaminan = "KTP"
-        nik = input_user("Masukan NIK anda : ")
-    elif jaminan == "2":
-        jaminan = "Pasport"
-        nomorPasport = input_user("Masukan Nomor Pasport anda : ")
-    elif jaminan == "3":
-        jaminan = "SIM"
-        nomorSIM = input_user("Masukan Nomor SIM anda : ")
-
-    # =================== DISKON ===================
-    diskonPersen = 0
-    if jumlahHari >= 14:
-        diskonPersen = 0.10
-    elif jumlahHari >= 7:
-        diskonPersen = 0.05
-    diskon = int(totalSebelumDiskon * diskonPersen)
-    totalSetelahDiskon = totalSebelumDiskon - diskon
-
-    # =================== VOUCHER ===================
-    voucher = input_user("Masukkan kode voucher (atau kosong jika tidak ada): ").upper()
-    diskonVoucher = 0
-    if voucher == "MERDEKA17":
-        diskonVoucher = int(totalSetelahDiskon * 0.17)
-        print(f"Voucher MERDEKA17 berhasil! Diskon tambahan Rp{format_rupiah(diskonVoucher)}")
-    elif voucher == "HEMAT5":
-        diskonVoucher = int(totalSetelahDiskon * 0.05)
-        print(f"Voucher HEMAT5 berhasil! Diskon tambahan Rp{format_rupiah(diskonVoucher)}")
-    elif voucher != "":
-        print("Kode voucher tidak valid.")
-
-    grandTotal = totalSetelahDiskon - diskonVoucher
-
-    # =================== STRUK TAGIHAN ===================
-    print("\n" + "=" * 120)
-    print("                                                    Apen Al-wawi Rent")
-    print("=" * 120)
-    print("                                                    Bukti Penyewaan")
-    print("-" * 120)
-    print("Nama                         :", nama)
-    print("Alamat                       :", alamat)
-    print("Telepon                      :", telepon)
-    print("Jenis Kelamin                :", jenisKelamin)
-    print("Jenis Kendaraan              :", jenisKendaraan)
-    print("Warna                        :", warna)
-    print("Jumlah Hari Sewa             :", jumlahHari)
-    print("Harga Sewa                   : Rp", format_rupiah(harga))
-    print("Harga Sopir (", jumlahHari, "x", format_rupiah(hargaSopir),")    : Rp", format_rupiah(totalHargaSopir))
-    print("Jumlah yang harus dibayar    : Rp", format_rupiah(grandTotal))
-
-    # =================== METODE PEMBAYARAN ===================
-    print("\n" + "=" * 20)
-    print("Metode Pembayaran")
-    print("=" * 20)
-    print("1. Tunai\n2. Transfer")
-    pembayaran = input_user("Masukan metode pembayaran (1/2) : ", choices=["1","2"])
-
-    if pembayaran == "1":
-        uang = int(input_user("\nSilakan isi jumlah uang yang akan dibayar : Rp"))
-        kembalian = uang - grandTotal
-        while kembalian < 0:
-            print(f"\nUang tidak cukup! Masih kurang Rp{format_rupiah(-kembalian)}")
-            tambahan = int(input_user(f"Masukkan uang tambahan sebesar Rp{format_rupiah(-kembalian)}: Rp"))
-            print("")
-            uang += tambahan
-            kembalian = uang - grandTotal
-
-        # =================== CETAK STRUK ===================
-        print("\n" + "=" * 120)
-        print("                                                    Apen Al-wawi Rent")
-        print("=" * 120)
-        print("                                                    Bukti Pembayaran")
-        print("-" * 120)
-        print("Nama                                     :", nama)
-        print("Alamat                                   :", alamat)
-        print("Jenis Kelamin                            :", jenisKelamin)
-        print(f"Nomor Telepon                            : {telepon}")
-        print("--------------------------------------------------------------------------------------")
-        print("Pesanan Anda:")
-        print("-------------------------------------------------------------------------------------")
-        print(f"Jenis Kendaraan                          : {jenisKendaraan}")
-        print(f"Jumlah Hari                              : {jumlahHari}")
-        print(f"Subtotal                                 : Rp{format_rupiah(subtotal)}")
-        print(f"Pajak (10%)                              : Rp{format_rupiah(pajak)}")
-        if diskonPersen > 0:
-            print(f"Diskon Durasi                           : Rp{format_rupiah(diskon)}")
-        if diskonVoucher > 0:
-            print(f"Voucher Diskon                          : Rp{format_rupiah(diskonVoucher)}")
-        print("Harga Sopir (", jumlahHari, "x", format_rupiah(hargaSopir),")        : Rp", format_rupiah(totalHargaSopir))
-        print(f"Total Bayar                              : Rp{format_rupiah(grandTotal)}")
-        print("Metode Pembayaran                        : Tunai")
-        print("Nominal Pembayaran                       : Rp", format_rupiah(uang))
-        print("Kembalian                                : Rp", format_rupiah(kembalian))
-        print("=" * 120)
-
-        with open("struk_penyewaan.txt", "w", encoding="utf-8") as f:
-            f.write("==================================================\n")
-            f.write("                Apen Al-wawi Rent\n")
-            f.write("==================================================\n")
-            f.write("Bukti Pembayaran\n")
-            f.write("--------------------------------------------------\n")
-            f.write(f"Nama             : {nama}\n")
-            f.write(f"Alamat           : {alamat}\n")
-            f.write(f"Jenis Kelamin    : {jenisKelamin}\n")
-            f.write(f"No. Telepon      : {telepon}\n")
-            f.write("--------------------------------------------------\n")
-            f.write("Pesanan Anda:\n")
-            f.write(f"Jenis Kendaraan  : {jenisKendaraan}\n")
-            f.write(f"Jumlah Hari      : {jumlahHari}\n")
-            f.write(f"Subtotal         : Rp{format_rupiah(subtotal)}\n")
-            f.write(f"Pajak (10%)      : Rp{format_rupiah(pajak)}\n")
-            if diskonPersen > 0:
-                f.write(f"Diskon Durasi     : Rp{format_rupiah(diskon)}\n")
-            if diskonVoucher > 0:
-                f.write(f"Voucher Diskon    : Rp{format_rupiah(diskonVoucher)}\n")
-            f.write(f"Harga Sopir ({jumlahHari} x {format_rupiah(hargaSopir)}): Rp{format_rupiah(totalHargaSopir)}\n")
-            f.write(f"Nominal Dibayar  : Rp{format_rupiah(uang)}\n")
-            f.write(f"Kembalian        : Rp{format_rupiah(kembalian)}\n")
-            f.write("==================================================\n")
-            print("Struk berhasil disimpan ke file: struk_penyewaan.txt")
-
-    elif pembayaran == "2":
-        # =================== PEMBAYARAN TRANSFER ===================
-        print("Metode pembayaran transfer")
-        print("Silakan transfer ke rekening berikut:")
-        print("Bank ABC - 123456789 a.n Apen Al-wawi Rent")
-        print(f"Total yang harus ditransfer: Rp{format_rupiah(grandTotal)}")
-        print("=" * 120)
-        print("                     Terima kasih atas penyewaan Anda!")
-        print("=" * 120)
-    else:
-        print("Metode pembayaran tidak tersedia")
-main()
\ No newline at end of file
+    Alur sewa dijalankan oleh session.SesiSewa (state machine), jadi memulai ulang karena
+    kode tidak valid atau batal konfirmasi tidak menambah kedalaman stack.
+    """
+    global perekam
+    # Metrik/profil hanya aktif jika APEN_METRIK* atau APEN_PROFIL diisi (lihat metrics.py)
+    metrics.dari_env()
+    # Rekaman sesi untuk replay.py hanya jika APEN_REKAM diisi (lihat rekaman.py)
+    perekam = rekaman.dari_env()
+    sesi = buat_sesi()
+    if perekam is not None:
+        perekam.mulai(sesi.hari_ini())
+    sesi.mulai()
+    # Muat SDK Gemini di latar belakang selagi user membaca tabel
+    prewarm_ai()
+
+    try:
+        while not sesi.selesai:
+            if sesi.tunggu:
+                time.sleep(sesi.tunggu)
+                sesi.lanjut()
+                continue
+            jawaban = input_user(sesi.prompt, choices=sesi.choices, capitalize=sesi.capitalize, id_sesi=sesi.id)
+            if perekam is not None:
+                perekam.masukan(sesi.state, jawaban)
+            sesi.kirim(jawaban)
+    finally:
+        # Ctrl-C/EOF sebelum bayar: unit dan voucher yang sudah dipakai dilepas lagi (seperti server.layani)
+        sesi.batal()
+        memori_sesi.hapus(sesi.id)
+    if perekam is not None:
+        voucher = sesi.data.get("voucher")
+        perekam.selesai(sesi.data, buka_voucher().get(voucher) if voucher else None)
+
+if __name__ == "__main__":
+    main()
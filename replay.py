@@ -0,0 +1,282 @@
+"""
+Memutar ulang rekaman sesi sewa (rekaman.py) secepat mesin, lalu memverifikasi hasilnya.
+
+Setiap rekaman dijalankan lewat session.SesiSewa yang sama dengan rent.main(), dengan:
+
+    - jam palsu: tanggal sewa diambil dari rekaman, dan jeda memuat ulang (kode tidak valid)
+      dilewati tanpa sleep;
+    - AI tiruan: pertanyaan tetap lewat rent.jawab_masyud() (FAQ, cache, prompt, memori sesi),
+      tetapi model menjawab dengan jawaban yang terekam, tanpa jaringan;
+    - database booking sendiri (default di memori) dan kalender unit kosong per sesi;
+    - voucher selalu di memori (tidak pernah memakai kuota voucher di --db): voucher bawaan, ditambah
+      aturan voucher yang terekam di setiap sesi (tanpa kuota dan batas per pelanggan, karena sesi
+      rekaman sudah lolos cek itu dan --ulang memutar sesi yang sama berkali-kali).
+
+Rincian harga dan hash struk setiap sesi dibandingkan dengan rekaman. Laporan berisi sesi/detik,
+waktu proses per prompt (p50/p95 per langkah), dan total jeda yang dilewati, yaitu biaya alur
+sewa tanpa waktu mengetik manusia.
+
+CLI:
+    python replay.py rekaman.jsonl --ulang 10
+Keluar dengan kode 1 jika ada sesi yang hasilnya berbeda dari rekaman.
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import sys
+import time
+
+import rent
+from ai_client import ResilientClient
+from answer_cache import AnswerCache
+from availability import Ketersediaan
+from chatlog import ChatLog, ChatWriter
+from memory import MemoriChat
+from rekaman import CHAT, baca_rekaman, ringkas_hasil
+from session import SesiSewa
+from store import BookingStore
+from vouchers import VoucherBook, buat_voucher, voucher_default
+
+CONTEXT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "context.txt")
+MAKS_BEDA = 20  # Sesi berbeda yang dicatat rinciannya di laporan
+
+
+class _Jawaban:
+    def __init__(self, text):
+        self.text = text
+
+
+class ModelRekaman:
+    """Model tiruan: menjawab dengan `jawaban` yang diisi pemutar sebelum setiap pertanyaan."""
+
+    def __init__(self):
+        self.jawaban = ""
+        self.panggilan = 0
+
+    def generate_content(self, prompt, stream=False):
+        self.panggilan += 1
+        if stream:
+            return iter([_Jawaban(self.jawaban)])
+        return _Jawaban(self.jawaban)
+
+
+def bandingkan(rekam, putar):
+    """
+    Returns:
+        dict: kolom -> (nilai rekaman, nilai putar ulang) untuk kolom yang berbeda.
+    """
+    kolom = sorted(set(rekam) | set(putar))
+    return {k: (rekam.get(k), putar.get(k)) for k in kolom if rekam.get(k) != putar.get(k)}
+
+
+def _persen(nilai, p):
+    return nilai[min(len(nilai) - 1, int(len(nilai) * p / 100))] if nilai else 0.0
+
+
+class Pemutar:
+    """
+    Memutar ulang rekaman lewat alur sewa.
+
+    Args:
+        db (str, optional): Database booking untuk sesi yang diputar. Voucher selalu di memori.
+        chatlog (str, optional): File chatlog untuk save_chat. None = chat tidak dicatat.
+    """
+
+    def __init__(self, db=":memory:", chatlog=None):
+        self.store = BookingStore(db)
+        # Voucher tidak pernah di `db`: SesiSewa memanggil pakai(), yang memotong kuota sungguhan
+        self.vouchers = VoucherBook(":memory:", kategori_kendaraan=rent.kategori_kendaraan)
+        self.vouchers.simpan_aturan(voucher_default(), timpa=False)
+        self.model = ModelRekaman()
+        self.ai = ResilientClient(self.model, retries=0)
+        self.answer_cache = AnswerCache()
+        self.chat_writer = ChatWriter(ChatLog(chatlog, max_bytes=None)) if chatlog else None
+        self.waktu = {}  # state -> list detik proses setiap jawaban
+        self.tunggu = 0.0
+
+    def _simpan_chat(self, role, text):
+        if self.chat_writer is not None:
+            self.chat_writer.write(role, text)
+
+    def _muat_voucher(self, aturan):
+        # Kuota dan batas per pelanggan dilepas; aturan lain (masa berlaku, kategori, ...) tetap dicek
+        v = buat_voucher(dict(aturan, kuota=None, perPelanggan=None))
+        lama = self.vouchers.get(v.kode)
+        if lama is None or lama.baris() != v.baris():
+            self.vouchers.simpan_aturan([v])
+
+    def _catat(self, state, detik):
+        self.waktu.setdefault(state, []).append(detik)
+
+    @contextlib.contextmanager
+    def terpasang(self):
+        """
+        Memasang AI tiruan dan cache jawaban pemutar ke rent selama blok with.
+
+        rent.jawab_masyud() memakai klien AI dan cache global; nilai lamanya dikembalikan setelah blok.
+        """
+        lama = rent.ai, rent.answer_cache, rent.CONTEXT_FILE
+        rent.ai, rent.answer_cache = self.ai, self.answer_cache
+        if not os.path.exists(rent.CONTEXT_FILE):
+            rent.CONTEXT_FILE = CONTEXT_FILE
+        try:
+            yield self
+        finally:
+            rent.ai, rent.answer_cache, rent.CONTEXT_FILE = lama
+            if self.chat_writer is not None:
+                self.chat_writer.flush()
+
+    def putar(self, rekaman):
+        """
+        Menjalankan satu rekaman sampai masukan habis.
+
+        AI tiruan harus sudah terpasang (lihat terpasang()).
+
+        Args:
+            rekaman (dict): Satu rekaman dari rekaman.baca_rekaman().
+
+        Returns:
+            tuple: (hasil, alasan). hasil = ringkas_hasil() jika sesi selesai, selain itu None;
+            alasan berisi penjelasan jika alur berbeda dari rekaman (None jika sama).
+        """
+        tanggal = datetime.date.fromisoformat(rekaman["tanggal"])
+        if rekaman.get("voucher"):
+            self._muat_voucher(rekaman["voucher"])
+        keluaran = io.StringIO()
+
+        def tulis(*args, **kwargs):
+            kwargs.pop("flush", None)
+            print(*args, file=keluaran, **kwargs)
+
+        sesi = SesiSewa(rent.pilihan, menu=rent.teks_tabel_awal, tulis=tulis, jeda_ulang=rent.JEDA_ULANG,
+                        struk_path=None, store=self.store, ketersediaan=Ketersediaan(rent.unit_katalog()),
+                        hari_ini=lambda: tanggal, cek_sopir=rent.katalog.bisa_sopir, vouchers=self.vouchers)
+        memori = MemoriChat()
+        di_chat = False
+        sesi.mulai()
+        for nomor, langkah in enumerate(rekaman["masukan"], start=1):
+            if sesi.tunggu:
+                # Jam palsu: jeda dilewati, hanya dijumlahkan
+                self.tunggu += sesi.tunggu
+                sesi.lanjut()
+            mulai = time.perf_counter()
+            if langkah[0] == CHAT:
+                _, pertanyaan, terekam = langkah
+                if not di_chat:
+                    di_chat = True
+                    self._simpan_chat("Masyud", rent.PEMBUKA_MASYUD)
+                self._simpan_chat("Anda", pertanyaan)
+                if pertanyaan.lower() in ["pelajari masyud"]:
+                    jawaban = rent.INFO_MASYUD
+                else:
+                    self.model.jawaban = terekam
+                    jawaban = rent.jawab_masyud(pertanyaan, None, memori)
+                self._simpan_chat("Masyud", jawaban)
+                self._catat(CHAT, time.perf_counter() - mulai)
+                continue
+            if di_chat:
+                di_chat = False
+                self._simpan_chat("Masyud", rent.PAMIT_MASYUD)
+            state, jawaban = langkah
+            if state != sesi.state:
+                sesi.batal()
+                return None, f"masukan ke-{nomor} untuk langkah {state!r}, sesi di langkah {sesi.state!r}"
+            sesi.kirim(jawaban)
+            self._catat(state, time.perf_counter() - mulai)
+        if not sesi.selesai:
+            sesi.batal()
+            return None, f"sesi berhenti di langkah {sesi.state!r}"
+        return ringkas_hasil(sesi.data), None
+
+    def jalankan(self, daftar):
+        """
+        Memutar ulang banyak rekaman dan membandingkan hasilnya.
+
+        Args:
+            daftar (iterable): Rekaman (dict) berisi 'hasil' yang diharapkan.
+
+        Returns:
+            dict: sesi, cocok, beda (jumlah), contohBeda (list (nomor, alasan), maks MAKS_BEDA),
+            detik, sesiPerDetik, tungguDilewati (detik), prompt (state -> n/rata/p50/p95 dalam detik).
+        """
+        sesi = cocok = 0
+        contoh = []
+        mulai = time.perf_counter()
+        with self.terpasang():
+            for nomor, rekaman in enumerate(daftar, start=1):
+                sesi += 1
+                hasil, alasan = self.putar(rekaman)
+                if alasan is None:
+                    beda = bandingkan(rekaman["hasil"], hasil)
+                    if not beda:
+                        cocok += 1
+                        continue
+                    alasan = ", ".join(f"{k} rekaman {a!r} != putar ulang {b!r}" for k, (a, b) in beda.items())
+                if len(contoh) < MAKS_BEDA:
+                    contoh.append((nomor, alasan))
+        detik = time.perf_counter() - mulai
+
+        prompt = {}
+        for state, nilai in self.waktu.items():
+            nilai.sort()
+            prompt[state] = {"n": len(nilai), "rata": sum(nilai) / len(nilai),
+                             "p50": _persen(nilai, 50), "p95": _persen(nilai, 95)}
+        return {"sesi": sesi, "cocok": cocok, "beda": sesi - cocok, "contohBeda": contoh, "detik": detik,
+                "sesiPerDetik": sesi / detik if detik > 0 else 0.0, "tungguDilewati": self.tunggu,
+                "prompt": prompt}
+
+    def close(self):
+        """Menutup database dan chatlog pemutar."""
+        if self.chat_writer is not None:
+            self.chat_writer.close()
+        self.vouchers.close()
+        self.store.close()
+
+
+def teks_laporan(laporan):
+    """Laporan jalankan() sebagai teks."""
+    baris = [
+        f"{laporan['sesi']} sesi diputar ulang dalam {laporan['detik']:.2f} detik "
+        f"({laporan['sesiPerDetik']:,.0f} sesi/detik): {laporan['cocok']} cocok, {laporan['beda']} beda",
+        f"Jeda yang dilewati: {laporan['tungguDilewati']:g} detik",
+        "",
+        f"{'Langkah':<16} {'n':>8} {'rata (us)':>10} {'p50 (us)':>10} {'p95 (us)':>10}",
+    ]
+    for state, w in sorted(laporan["prompt"].items(), key=lambda x: -x[1]["rata"] * x[1]["n"]):
+        baris.append(f"{state:<16} {w['n']:>8} {w['rata'] * 1e6:>10.1f} {w['p50'] * 1e6:>10.1f} "
+                     f"{w['p95'] * 1e6:>10.1f}")
+    if laporan["contohBeda"]:
+        baris += ["", "Sesi yang berbeda dari rekaman:"]
+        baris += [f"  #{nomor}: {alasan}" for nomor, alasan in laporan["contohBeda"]]
+    return "\n".join(baris)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Putar ulang rekaman sesi sewa dan verifikasi struk/total")
+    parser.add_argument("file", nargs="+", help="File rekaman (.jsonl, dari APEN_REKAM)")
+    parser.add_argument("--ulang", type=int, default=1, help="Putar setiap file sebanyak N kali")
+    parser.add_argument("--db", default=":memory:", help="Database booking untuk sesi yang diputar")
+    parser.add_argument("--chatlog", help="Catat chat ke file ini (default tidak dicatat)")
+    parser.add_argument("--json", action="store_true", help="Cetak laporan sebagai JSON")
+    args = parser.parse_args(argv)
+
+    def semua():
+        for _ in range(args.ulang):
+            for path in args.file:
+                yield from baca_rekaman(path)
+
+    pemutar = Pemutar(args.db, args.chatlog)
+    try:
+        laporan = pemutar.jalankan(semua())
+    finally:
+        pemutar.close()
+    print(json.dumps(laporan, indent=2) if args.json else teks_laporan(laporan))
+    return 1 if laporan["beda"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""
+Pencarian bagian context.txt yang relevan untuk setiap pertanyaan.
+
+Daripada mengirim seluruh context.txt ke model di setiap pertanyaan, context dipecah menjadi
+beberapa bagian saat dimuat, diindeks dengan TF-IDF sederhana (tanpa layanan embedding,
+sepenuhnya offline), lalu hanya top-k bagian yang paling relevan yang dimasukkan ke prompt.
+
+Aturan pemecahan:
+    - Semua teks sebelum baris pemisah '====' adalah blok personalitas dan SELALU ikut.
+      Jika tidak ada pemisah, blok pertama dianggap personalitas.
+    - Sisanya dipecah per paragraf (dipisah baris kosong), mis. "Mobil:", "Pajak:", "Diskon:".
+
+Batas prompt:
+    max_tokens membatasi jumlah token perkiraan (1 token ~ 4 karakter) dari bagian tambahan.
+"""
+
+import math
+import re
+from collections import Counter
+
+_POLA_KATA = re.compile(r"[a-z0-9]+")
+_POLA_PEMISAH = re.compile(r"^\s*={3,}\s*$", re.MULTILINE)
+_POLA_PARAGRAF = re.compile(r"\n\s*\n")
+
+STOPWORDS = {
+    "apa", "apakah", "ada", "yang", "dan", "atau", "di", "ke", "dari", "untuk", "saya", "aku",
+    "kamu", "anda", "ini", "itu", "bisa", "dengan", "mau", "berapa", "kah", "dong", "ya", "min",
+    "mas", "kak", "gak", "tidak", "nggak", "juga", "kalau", "kalo", "per", "the",
+}
+SINONIM = {
+    "supir": "sopir",
+    "pasport": "paspor",
+    "passport": "paspor",
+    "hybird": "hybrid",
+}
+_AWALAN = ("meng", "meny", "mem", "men", "me", "peng", "peny", "pem", "pen", "pe", "ber", "ter", "di", "ke", "se")
+# Dibuang berurutan per kelompok: partikel, kata ganti milik, lalu akhiran
+_AKHIRAN = (("lah", "kah"), ("nya", "ku", "mu"), ("kan", "an", "i"))
+
+
+def stem(kata):
+    """
+    Stemmer bahasa Indonesia yang sangat ringan (buang partikel, akhiran, lalu awalan).
+
+    Tidak harus benar secara bahasa, cukup konsisten antara pertanyaan dan context.
+
+    Args:
+        kata (str): Kata huruf kecil.
+
+    Returns:
+        str: Kata dasar perkiraan.
+    """
+    kata = SINONIM.get(kata, kata)
+    for kelompok in _AKHIRAN:
+        for akhiran in kelompok:
+            if kata.endswith(akhiran) and len(kata) - len(akhiran) >= 4:
+                kata = kata[: -len(akhiran)]
+                break
+    for awalan in _AWALAN:
+        if kata.startswith(awalan) and len(kata) - len(awalan) >= 4:
+            kata = kata[len(awalan):]
+            break
+    return kata
+
+
+def tokenize(teks):
+    """
+    Memecah teks menjadi token yang sudah di-stem, tanpa stopword.
+
+    Args:
+        teks (str): Teks bebas.
+
+    Returns:
+        list: Daftar token.
+    """
+    return [stem(k) for k in _POLA_KATA.findall(teks.lower()) if k not in STOPWORDS]
+
+
+def estimasi_token(teks):
+    """
+    Perkiraan jumlah token untuk sebuah teks (1 token ~ 4 karakter).
+
+    Args:
+        teks (str): Teks.
+
+    Returns:
+        int: Perkiraan token.
+    """
+    return (len(teks) + 3) // 4
+
+
+def split_sections(context):
+    """
+    Memecah context menjadi blok personalitas dan daftar bagian.
+
+    Args:
+        context (str): Isi context.txt.
+
+    Returns:
+        tuple: (personalitas (str), bagian (list of str)).
+    """
+    pemisah = _POLA_PEMISAH.search(context)
+    if pemisah:
+        personalitas = context[: pemisah.start()].strip()
+        sisa = context[pemisah.end():]
+        bagian = [b.strip() for b in _POLA_PARAGRAF.split(sisa) if b.strip()]
+    else:
+        bagian = [b.strip() for b in _POLA_PARAGRAF.split(context) if b.strip()]
+        personalitas = bagian.pop(0) if bagian else ""
+    return personalitas, bagian
+
+
+class ContextIndex:
+    """
+    Indeks TF-IDF atas bagian-bagian context.txt.
+
+    Args:
+        context (str): Isi context.txt.
+    """
+
+    def __init__(self, context):
+        self.context = context
+        self.personalitas, self.sections = split_sections(context)
+        self._tf = []
+        df = Counter()
+        for bagian in self.sections:
+            tf = Counter(tokenize(bagian))
+            self._tf.append(tf)
+            df.update(tf.keys())
+        n = len(self.sections)
+        self._idf = {t: math.log((n + 1) / (d + 0.5)) for t, d in df.items()}
+        # Posting list: token -> [(indeks bagian, bobot tf-idf)], supaya pencarian tidak memindai semua bagian
+        self._posting = {}
+        for i, tf in enumerate(self._tf):
+            bobot = {t: (1 + math.log(c)) * self._idf[t] for t, c in tf.items()}
+            norma = math.sqrt(sum(w * w for w in bobot.values())) or 1.0
+            for t, w in bobot.items():
+                self._posting.setdefault(t, []).append((i, w / norma))
+
+    def search(self, pertanyaan, k=3):
+        """
+        Mencari bagian yang paling relevan.
+
+        Args:
+            pertanyaan (str): Pertanyaan user.
+            k (int, optional): Jumlah bagian maksimal.
+
+        Returns:
+            list: Daftar (skor, indeks bagian), skor tertinggi dulu. Bagian dengan skor 0 tidak ikut.
+        """
+        skor = Counter()
+        for token in set(tokenize(pertanyaan)):
+            for i, w in self._posting.get(token, ()):
+                skor[i] += w * self._idf[token]
+        return [(s, i) for i, s in skor.most_common(k)]
+
+    def build_context(self, pertanyaan, k=3, max_tokens=800):
+        """
+        Menyusun context untuk prompt: personalitas + bagian relevan dalam batas token.
+
+        Args:
+            pertanyaan (str): Pertanyaan user.
+            k (int, optional): Jumlah bagian maksimal.
+            max_tokens (int, optional): Batas perkiraan token untuk bagian tambahan.
+
+        Returns:
+            str: Context yang siap dimasukkan ke prompt.
+        """
+        terpilih = []
+        sisa = max_tokens
+        for _, i in self.search(pertanyaan, k):
+            biaya = estimasi_token(self.sections[i])
+            if biaya > sisa:
+                continue
+            terpilih.append(i)
+            sisa -= biaya
+        # Urutan asli context dipertahankan supaya mudah dibaca model
+        bagian = [self.sections[i] for i in sorted(terpilih)]
+        return "\n\n".join([self.personalitas] + bagian if self.personalitas else bagian)
@@ -0,0 +1,197 @@
+"""
+Server multi-sesi Apen Al-wawi Rent (asyncio, protokol baris lewat TCP).
+
+Satu proses melayani banyak loket/pelanggan sekaligus. Semua sesi memakai katalog
+`rent.pilihan`, klien AI, context.txt, database booking, stok unit, dan voucher yang sama. Setiap koneksi menjalankan
+session.SesiSewa sendiri; pertanyaan ke Masyud dijalankan di thread pool sehingga
+menunggu Gemini tidak menghambat sesi lain.
+
+Protokol:
+    - Server mengirim output sebagai baris teks biasa.
+    - Setiap kali server menunggu jawaban, dikirim satu baris prompt yang diawali PROMPT_PREFIX
+      ("?> "), mis. "?> Masukan jenis kendaraan yang akan di sewa :".
+    - Client membalas satu baris. Ketik 'halo mas' di prompt mana pun untuk bertanya ke Masyud,
+      dan 'keluar' untuk kembali ke alur sewa.
+    - Koneksi ditutup server setelah sesi selesai.
+
+Menjalankan:
+    python server.py --port 8765
+    nc 127.0.0.1 8765
+"""
+
+import argparse
+import asyncio
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+import rent
+
+PROMPT_PREFIX = "?> "
+AI_WORKERS = 64  # Jumlah panggilan AI yang boleh berjalan bersamaan
+
+
+class Koneksi:
+    """
+    Satu pelanggan yang terhubung ke server.
+
+    Args:
+        reader (asyncio.StreamReader): Stream masuk.
+        writer (asyncio.StreamWriter): Stream keluar.
+        jeda_ulang (float, optional): Jeda (non-blocking) saat kode kendaraan tidak valid.
+    """
+
+    def __init__(self, reader, writer, jeda_ulang=rent.JEDA_ULANG):
+        self.reader = reader
+        self.writer = writer
+        self._buffer = io.StringIO()
+        self.sesi = rent.buat_sesi(tulis=self.tulis, jeda_ulang=jeda_ulang, struk_path=None)
+
+    def tulis(self, *args, **kwargs):
+        """Seperti print(), tetapi ke buffer koneksi ini."""
+        kwargs.pop("flush", None)
+        print(*args, file=self._buffer, **kwargs)
+
+    async def kirim_output(self, prompt=None):
+        """Mengirim semua output yang tertampung, diikuti prompt bila ada."""
+        teks = self._buffer.getvalue()
+        self._buffer = io.StringIO()
+        if prompt is not None:
+            # Prompt boleh diawali baris kosong ("\nMasukan ..."); baris kosongnya ikut sebagai output
+            depan = prompt[: len(prompt) - len(prompt.lstrip("\n"))]
+            teks += depan + PROMPT_PREFIX + prompt.strip() + "\n"
+        if teks:
+            self.writer.write(teks.encode("utf-8"))
+            await self.writer.drain()
+
+    async def baca(self, prompt):
+        """
+        Mengirim prompt lalu membaca satu baris jawaban.
+
+        Returns:
+            str | None: Jawaban (sudah di-strip), atau None jika client memutus koneksi.
+        """
+        await self.kirim_output(prompt)
+        with metrics.ukur("input_user"):
+            baris = await self.reader.readline()
+        if not baris:
+            return None
+        return baris.decode("utf-8", errors="replace").strip()
+
+    async def tanya_masyud(self):
+        """Mode chat Masyud untuk koneksi ini (versi non-blocking dari rent.tanya_masyud())."""
+        loop = asyncio.get_running_loop()
+        memori = rent.memori_sesi.ambil(self.sesi.id)
+        self.tulis(rent.BANNER_MASYUD)
+        self.tulis("Masyud:", rent.PEMBUKA_MASYUD)
+        rent.save_chat("Masyud", rent.PEMBUKA_MASYUD)
+        while True:
+            pertanyaan = await self.baca("Anda: ")
+            if pertanyaan is None:
+                return False
+            rent.save_chat("Anda", pertanyaan)
+            if pertanyaan.lower() in rent.KATA_KELUAR:
+                self.tulis("Masyud:", rent.PAMIT_MASYUD)
+                rent.save_chat("Masyud", rent.PAMIT_MASYUD)
+                return True
+            if pertanyaan.lower() in ["pelajari masyud"]:
+                jawaban = rent.INFO_MASYUD
+            else:
+                # Panggilan AI di thread pool, event loop tetap melayani sesi lain
+                jawaban = await loop.run_in_executor(None, rent.jawab_masyud, pertanyaan, None, memori)
+            self.tulis("Masyud:", jawaban)
+            rent.save_chat("Masyud", jawaban)
+
+    async def jalankan(self):
+        """Menjalankan satu sesi sewa sampai selesai atau client memutus koneksi."""
+        sesi = self.sesi
+        sesi.mulai()
+        while not sesi.selesai:
+            if sesi.tunggu:
+                await self.kirim_output()
+                await asyncio.sleep(sesi.tunggu)
+                sesi.lanjut()
+                continue
+            jawaban = await self.baca(sesi.prompt)
+            if jawaban is None:
+                return
+            if jawaban.lower().replace(" ", "") == "halomas":
+                with metrics.ukur("tanya_masyud"):
+                    lanjut = await self.tanya_masyud()
+                if not lanjut:
+                    return
+                continue
+            sesi.kirim(jawaban)
+        await self.kirim_output()
+
+
+async def layani(reader, writer, jeda_ulang=rent.JEDA_ULANG):
+    """Handler asyncio untuk satu koneksi."""
+    koneksi = Koneksi(reader, writer, jeda_ulang=jeda_ulang)
+    try:
+        await koneksi.jalankan()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        # Client putus sebelum bayar: unit yang sudah dipesan dilepas lagi
+        koneksi.sesi.batal()
+        rent.memori_sesi.hapus(koneksi.sesi.id)
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def mulai_server(host="127.0.0.1", port=8765, jeda_ulang=rent.JEDA_ULANG, ai_workers=AI_WORKERS):
+    """
+    Membuat server (belum serve_forever).
+
+    Args:
+        host (str, optional): Alamat bind.
+        port (int, optional): Port (0 = pilih otomatis).
+        jeda_ulang (float, optional): Jeda saat kode kendaraan tidak valid.
+        ai_workers (int, optional): Ukuran thread pool untuk panggilan AI.
+
+    Returns:
+        asyncio.Server: Server yang sudah listen.
+    """
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=ai_workers))
+    return await asyncio.start_server(lambda r, w: layani(r, w, jeda_ulang), host, port)
+
+
+async def _main(args):
+    server = await mulai_server(args.host, args.port, args.jeda_ulang, args.ai_workers)
+    if args.prewarm:
+        rent.prewarm_ai()
+    alamat = ", ".join(str(s.getsockname()) for s in server.sockets)
+    print(f"Apen Al-wawi Rent server mendengarkan di {alamat}")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Server multi-sesi Apen Al-wawi Rent")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--jeda-ulang", type=float, default=rent.JEDA_ULANG,
+                        help="Jeda (detik) saat kode kendaraan tidak valid")
+    parser.add_argument("--ai-workers", type=int, default=AI_WORKERS)
+    parser.add_argument("--prewarm", action="store_true", help="Muat SDK Gemini saat server mulai")
+    parser.add_argument("--metrics-port", type=int, help="Port endpoint /metrics (format Prometheus)")
+    parser.add_argument("--metrics-file", help="File metrik untuk textfile collector Prometheus")
+    parser.add_argument("--profil", action="store_true", help="SIGUSR1 untuk mulai/berhenti cProfile")
+    args = parser.parse_args()
+    if args.metrics_port is not None or args.metrics_file or args.profil:
+        metrics.siapkan(args.metrics_port, args.metrics_file, args.profil,
+                        nyala=args.metrics_port is not None or bool(args.metrics_file))
+    else:
+        metrics.dari_env()
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
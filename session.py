@@ -0,0 +1,419 @@
+"""
+Sesi penyewaan sebagai state machine.
+
+Alur: pilih kendaraan -> warna -> konfirmasi -> sopir -> hari -> formulir -> jaminan
+-> voucher -> pembayaran. Setiap langkah punya satu prompt; jawaban user dikirim lewat
+kirim(), lalu sesi mencetak output dan pindah ke langkah berikutnya. Memulai ulang
+(kode tidak valid atau jawab "T" saat konfirmasi) hanya mengganti state, bukan memanggil
+main() lagi, sehingga stack dan memori tetap konstan berapa kali pun sesi diulang.
+
+Sesi tidak membaca input sendiri. Pemanggil (rent.main() untuk terminal, atau server
+untuk banyak sesi sekaligus) yang menampilkan `prompt`, membaca jawaban, dan memanggil
+kirim(). Jeda 2 detik saat kode tidak valid juga diserahkan ke pemanggil lewat atribut
+`tunggu` + lanjut(), jadi bisa dilewati atau diganti dengan jeda non-blocking.
+
+Contoh:
+    sesi = SesiSewa(pilihan, menu=teks_tabel_awal)
+    sesi.mulai()
+    while not sesi.selesai:
+        if sesi.tunggu:
+            time.sleep(sesi.tunggu)
+            sesi.lanjut()
+            continue
+        sesi.kirim(input(sesi.prompt))
+"""
+
+import datetime
+import uuid
+
+from pricing import HARGA_SOPIR, bisa_sopir, format_rupiah, quote, voucher_persen
+from store import tulis_struk
+from struk import TAGIHAN, render
+
+STRUK_FILE = "struk_penyewaan.txt"
+
+KENDARAAN = "kendaraan"
+WARNA = "warna"
+KONFIRMASI = "konfirmasi"
+SOPIR = "sopir"
+HARI = "hari"
+NAMA = "nama"
+ALAMAT = "alamat"
+TELEPON = "telepon"
+JENIS_KELAMIN = "jenis_kelamin"
+JAMINAN = "jaminan"
+NOMOR_JAMINAN = "nomor_jaminan"
+VOUCHER = "voucher"
+PEMBAYARAN = "pembayaran"
+UANG = "uang"
+UANG_TAMBAHAN = "uang_tambahan"
+SELESAI = "selesai"
+
+JENIS_JAMINAN = {
+    "1": ("KTP", "Masukan NIK anda : "),
+    "2": ("Pasport", "Masukan Nomor Pasport anda : "),
+    "3": ("SIM", "Masukan Nomor SIM anda : "),
+}
+
+
+class SesiSewa:
+    """
+    Satu sesi penyewaan kendaraan.
+
+    Args:
+        pilihan (dict): Katalog kendaraan (kode -> (nama, harga, warna)).
+        menu (callable, optional): Fungsi tanpa argumen yang mengembalikan teks tabel kendaraan.
+        tulis (callable, optional): Fungsi output dengan signature seperti print(). Default print.
+        jeda_ulang (float, optional): Detik jeda yang diminta sebelum memuat ulang saat kode tidak valid.
+        struk_path (str, optional): File struk untuk pembayaran tunai. None = tidak menulis file.
+        store (store.BookingStore, optional): Tempat menyimpan setiap sewa yang selesai
+            (tunai dan transfer). None = tidak disimpan.
+        ketersediaan (availability.Ketersediaan, optional): Kalender unit kendaraan. Jika ada,
+            satu unit dipesan saat jumlah hari diisi (sewa mulai hari ini). None = tanpa cek stok.
+        hari_ini (callable, optional): Sumber tanggal hari ini (bisa diganti di test).
+        cek_sopir (callable, optional): cek_sopir(kode) -> bool, kendaraan yang boleh pakai sopir
+            (mis. catalog.Katalog.bisa_sopir). Default aturan kode 'mb' di pricing.py.
+        vouchers (vouchers.VoucherBook, optional): Aturan dan kuota voucher. None = hanya voucher
+            bawaan di pricing.VOUCHER tanpa batas pemakaian.
+
+    Attributes:
+        id (str): ID unik sesi (mis. kunci memori chat Masyud per sesi).
+        state (str): Langkah saat ini.
+        prompt (str): Teks prompt untuk langkah saat ini.
+        choices (list | None): Pilihan valid untuk langkah saat ini.
+        capitalize (bool): Apakah jawaban langkah ini dikapitalisasi.
+        tunggu (float): Jeda yang diminta sebelum lanjut() dipanggil (0 = tidak ada).
+        data (dict): Semua isian sesi (kode, warna, jumlahHari, nama, rincian harga, dst.).
+    """
+
+    def __init__(self, pilihan, menu=None, tulis=print, jeda_ulang=2, struk_path=STRUK_FILE, store=None,
+                 ketersediaan=None, hari_ini=datetime.date.today, cek_sopir=bisa_sopir, vouchers=None):
+        self.pilihan = pilihan
+        self.menu = menu
+        self.tulis = tulis
+        self.jeda_ulang = jeda_ulang
+        self.struk_path = struk_path
+        self.store = store
+        self.ketersediaan = ketersediaan
+        self.hari_ini = hari_ini
+        self.cek_sopir = cek_sopir
+        self.vouchers = vouchers
+        self.id = uuid.uuid4().hex
+        self.state = None
+        self.prompt = ""
+        self.choices = None
+        self.capitalize = False
+        self.tunggu = 0
+        self.data = {}
+        self._setelah_tunggu = None
+
+    @property
+    def selesai(self):
+        """True jika sesi sudah sampai akhir (pembayaran selesai)."""
+        return self.state == SELESAI
+
+    def _minta(self, state, prompt, choices=None, capitalize=False):
+        self.state = state
+        self.prompt = prompt
+        self.choices = choices
+        self.capitalize = capitalize
+
+    # =================== ALUR ===================
+    def mulai(self):
+        """Menampilkan menu dan meminta kode kendaraan (juga dipakai saat memulai ulang)."""
+        self.batal()
+        self.data = {}
+        tulis = self.tulis
+        if self.menu is not None:
+            tulis(self.menu())
+        tulis("Masukan jenis kendaraan yang akan di sewa dengan kode: ")
+        tulis("mb = Mobil, mk = Motor, s = Sepeda")
+        tulis("Contoh: mb1 untuk sewa mobil G-Class (nomor 1)")
+        tulis("="*120)
+        tulis("Ragu? Tanya AI Masyud dengan ketik 'halo mas' di input manapun!")
+        self._minta(KENDARAAN, "Masukan jenis kendaraan yang akan di sewa : ")
+
+    def lanjut(self):
+        """Menjalankan langkah yang ditunda oleh `tunggu` (dipanggil pemanggil setelah jeda)."""
+        self.tunggu = 0
+        aksi, self._setelah_tunggu = self._setelah_tunggu, None
+        if aksi is not None:
+            aksi()
+
+    def _muat_ulang(self):
+        """Kembali ke pemilihan kendaraan setelah jeda `jeda_ulang`."""
+        self.state = KENDARAAN
+        self.prompt = ""
+        self.tunggu = self.jeda_ulang
+        self._setelah_tunggu = self.mulai
+        if not self.tunggu:
+            self.lanjut()
+
+    def batal(self):
+        """Melepas unit dan voucher yang sudah dipakai jika sesi dibatalkan sebelum pembayaran selesai."""
+        d = self.data
+        if self.selesai:
+            return
+        if self.ketersediaan is not None and "unit" in d:
+            self.ketersediaan.lepas(d["kode"], d.pop("unit"), datetime.date.fromisoformat(d["sewaMulai"]))
+        if self.vouchers is not None and d.get("voucherPakai") is not None:
+            self.vouchers.kembalikan(d.pop("voucherPakai"))
+
+    def kirim(self, jawaban):
+        """
+        Memproses jawaban user untuk langkah saat ini.
+
+        Args:
+            jawaban (str): Jawaban user (sudah di-strip).
+
+        Returns:
+            bool: False jika jawaban tidak valid dan prompt yang sama harus ditanyakan lagi.
+        """
+        if self.selesai or self.tunggu:
+            return False
+        if self.choices:
+            if not (jawaban in self.choices or jawaban.lower() in [c.lower() for c in self.choices]):
+                self.tulis("-" * 120)
+                self.tulis(f"Input tidak valid. Pilihan: {', '.join(self.choices)}")
+                return False
+            if self.capitalize:
+                jawaban = jawaban.capitalize()
+        handler = getattr(self, f"_jawab_{self.state}")
+        return handler(jawaban) is not False
+
+    def _jawab_kendaraan(self, jawaban):
+        tulis = self.tulis
+        kendaraan = jawaban.lower().replace(" ", "")
+        tulis("")
+        if kendaraan not in self.pilihan:
+            tulis("")
+            tulis("=" * 120, "\n")
+            tulis("Kode kendaraan tidak valid!\nSedang memuat ulang program. Harap tunggu sebentar...\n")
+            tulis("=" * 120)
+            tulis("")
+            self._muat_ulang()
+            return None
+
+        jenisKendaraan, harga, warnaTersedia = self.pilihan[kendaraan]
+        self.data.update(kode=kendaraan, jenisKendaraan=jenisKendaraan, harga=harga)
+        tulis(f"Anda memilih {jenisKendaraan} dengan harga Rp {format_rupiah(harga)} per hari.")
+        tulis("\nPilihan warna tersedia:", ", ".join(warnaTersedia))
+        self._minta(WARNA, "Pilih warna kendaraan: ", choices=warnaTersedia, capitalize=True)
+
+    def _jawab_warna(self, jawaban):
+        tulis = self.tulis
+        d = self.data
+        d["warna"] = jawaban.capitalize()
+        tulis(f"Anda memilih warna {d['warna']} untuk kendaraan {d['jenisKendaraan']}.")
+
+        # =================== KONFIRMASI ===================
+        tulis("\n" * 2)
+        tulis("=" * 40)
+        tulis("Konfirmasi sewa kendaraan")
+        tulis("=" * 40)
+        tulis("Jenis kendaraan yang akan di sewa : ", d["jenisKendaraan"])
+        tulis("Warna                             : ", d["warna"])
+        tulis("--------------------------------------------------")
+        tulis("Harga sewa per hari : Rp", format_rupiah(d["harga"]))
+        tulis("--------------------------------------------------")
+        self._minta(KONFIRMASI, "Yakin akan sewa kendaraan ini? (Y/T) : ", choices=["Y", "T"], capitalize=True)
+
+    def _jawab_konfirmasi(self, jawaban):
+        if jawaban.upper() == "T":
+            self.mulai()
+            return
+
+        # =================== SOPIR ===================
+        self.data["hargaSopir"] = 0
+        if self.cek_sopir(self.data["kode"]):
+            tulis = self.tulis
+            tulis("\n" * 2)
+            tulis("=" * 40)
+            tulis("Sopir")
+            tulis("=" * 40)
+            tulis("Harga sopir per hari : Rp", format_rupiah(HARGA_SOPIR))
+            self._minta(SOPIR, "Apakah anda ingin sewa sopir? (Y/T) : ", choices=["Y", "T"], capitalize=True)
+        else:
+            self._ke_hari()
+
+    def _jawab_sopir(self, jawaban):
+        self.data["hargaSopir"] = HARGA_SOPIR if jawaban.upper() == "Y" else 0
+        self._ke_hari()
+
+    def _ke_hari(self):
+        self._minta(HARI, "\nMasukan jumlah hari sewa kendaraan : ")
+
+    def _jawab_hari(self, jawaban):
+        try:
+            jumlahHari = int(jawaban)
+        except ValueError:
+            self.tulis("Input tidak valid. Silakan coba lagi.")
+            return False
+        if jumlahHari <= 0:
+            self.tulis("0 Bukan jumlah hari yang valid. Silakan coba lagi.")
+            return False
+        self.data["jumlahHari"] = jumlahHari
+        if self.ketersediaan is not None and not self._pesan_unit():
+            return None
+
+        # =================== FORMULIR PENYEWA ===================
+        tulis = self.tulis
+        tulis("\n" * 2)
+        tulis("=" * 20)
+        tulis("Formulir ketentuan penyewaan")
+        tulis("=" * 20)
+        self._minta(NAMA, "Masukan nama anda        : ")
+
+    def _pesan_unit(self):
+        """Memesan satu unit untuk jumlahHari mulai hari ini; memuat ulang jika semua unit tersewa."""
+        d = self.data
+        mulai = self.hari_ini()
+        unit = self.ketersediaan.reservasi(d["kode"], mulai, d["jumlahHari"])
+        if unit is not None:
+            selesai = mulai + datetime.timedelta(days=d["jumlahHari"])
+            d.update(unit=unit, sewaMulai=mulai.isoformat(), sewaSelesai=selesai.isoformat())
+            return True
+        tulis = self.tulis
+        berikutnya = self.ketersediaan.kosong_berikutnya(d["kode"], mulai, d["jumlahHari"])
+        tulis("")
+        tulis("=" * 120)
+        tulis(f"Maaf, semua unit {d['jenisKendaraan']} sudah tersewa untuk {d['jumlahHari']} hari mulai hari ini.")
+        if berikutnya is not None:
+            tulis(f"Unit tersedia lagi mulai {berikutnya:%d-%m-%Y}. Silakan pilih kendaraan lain.")
+        tulis("=" * 120)
+        self._muat_ulang()
+        return False
+
+    def _jawab_nama(self, jawaban):
+        self.data["nama"] = jawaban
+        self._minta(ALAMAT, "Masukan alamat anda      : ")
+
+    def _jawab_alamat(self, jawaban):
+        self.data["alamat"] = jawaban
+        self._minta(TELEPON, "Masukan nomor telepon    : ")
+
+    def _jawab_telepon(self, jawaban):
+        self.data["telepon"] = jawaban
+        self._minta(JENIS_KELAMIN, "Masukan jenis kelamin    : ")
+
+    def _jawab_jenis_kelamin(self, jawaban):
+        self.data["jenisKelamin"] = jawaban
+
+        # =================== JENIS JAMINAN ===================
+        tulis = self.tulis
+        tulis("\n" + "="*20)
+        tulis("Jenis Jaminan")
+        tulis("="*20)
+        tulis("1. KTP\n2. Pasport\n3. SIM")
+        self._minta(JAMINAN, "Masukan jenis jaminan (1/2/3) : ", choices=["1", "2", "3"])
+
+    def _jawab_jaminan(self, jawaban):
+        jaminan, prompt = JENIS_JAMINAN[jawaban]
+        self.data["jaminan"] = jaminan
+        self._minta(NOMOR_JAMINAN, prompt)
+
+    def _jawab_nomor_jaminan(self, jawaban):
+        self.data["nomorJaminan"] = jawaban
+        self._minta(VOUCHER, "Masukkan kode voucher (atau kosong jika tidak ada): ")
+
+    def _jawab_voucher(self, jawaban):
+        tulis = self.tulis
+        d = self.data
+        voucher = jawaban.upper()
+        d["voucher"] = voucher
+
+        # =================== VOUCHER ===================
+        if self.vouchers is not None and voucher:
+            # Syarat dan kuota dicek lalu dipakai sekaligus (atomik); dikembalikan jika sesi batal
+            pesanan = dict(kode=d["kode"], jumlahHari=d["jumlahHari"], telepon=d["telepon"], tanggal=self.hari_ini())
+            persen, alasan, d["voucherPakai"] = self.vouchers.pakai(voucher, pesanan)
+        else:
+            persen = voucher_persen(voucher)
+            alasan = "Kode voucher tidak valid."
+
+        # =================== HITUNG HARGA ===================
+        # Subtotal, pajak, diskon durasi, dan voucher dihitung oleh pricing.quote()
+        rincian = quote(d["harga"], d["jumlahHari"], d["hargaSopir"], voucher, voucherPersen=persen)
+        d.update(rincian)
+
+        if persen:
+            tulis(f"Voucher {voucher} berhasil! Diskon tambahan Rp{format_rupiah(d['diskonVoucher'])}")
+        elif voucher != "":
+            tulis(alasan)
+
+        # =================== STRUK TAGIHAN ===================
+        tulis("\n" + render(d, judul=TAGIHAN), end="")
+
+        # =================== METODE PEMBAYARAN ===================
+        tulis("\n" + "=" * 20)
+        tulis("Metode Pembayaran")
+        tulis("=" * 20)
+        tulis("1. Tunai\n2. Transfer")
+        self._minta(PEMBAYARAN, "Masukan metode pembayaran (1/2) : ", choices=["1", "2"])
+
+    def _jawab_pembayaran(self, jawaban):
+        d = self.data
+        if jawaban == "1":
+            d["pembayaran"] = "Tunai"
+            self._minta(UANG, "\nSilakan isi jumlah uang yang akan dibayar : Rp")
+            return
+
+        # =================== PEMBAYARAN TRANSFER ===================
+        d["pembayaran"] = "Transfer"
+        self._simpan()
+        tulis = self.tulis
+        tulis("Metode pembayaran transfer")
+        tulis("Silakan transfer ke rekening berikut:")
+        tulis("Bank ABC - 123456789 a.n Apen Al-wawi Rent")
+        tulis(f"Total yang harus ditransfer: Rp{format_rupiah(d['grandTotal'])}")
+        tulis("=" * 120)
+        tulis("                     Terima kasih atas penyewaan Anda!")
+        tulis("=" * 120)
+        self._minta(SELESAI, "")
+
+    def _jawab_uang(self, jawaban):
+        try:
+            self.data["uang"] = int(jawaban)
+        except ValueError:
+            self.tulis("Input tidak valid. Silakan coba lagi.")
+            return False
+        self._cek_uang()
+
+    def _jawab_uang_tambahan(self, jawaban):
+        try:
+            tambahan = int(jawaban)
+        except ValueError:
+            self.tulis("Input tidak valid. Silakan coba lagi.")
+            return False
+        self.tulis("")
+        self.data["uang"] += tambahan
+        self._cek_uang()
+
+    def _cek_uang(self):
+        d = self.data
+        d["kembalian"] = d["uang"] - d["grandTotal"]
+        if d["kembalian"] < 0:
+            kurang = format_rupiah(-d["kembalian"])
+            self.tulis(f"\nUang tidak cukup! Masih kurang Rp{kurang}")
+            self._minta(UANG_TAMBAHAN, f"Masukkan uang tambahan sebesar Rp{kurang}: Rp")
+            return
+        self._simpan()
+        self._cetak_struk()
+        self._minta(SELESAI, "")
+
+    def _simpan(self):
+        """Mencatat sewa yang selesai ke store (ID booking disimpan di data['id'])."""
+        if self.store is not None:
+            self.data["id"] = self.store.simpan(self.data)
+
+    # =================== CETAK STRUK ===================
+    def _cetak_struk(self):
+        # Satu struk untuk layar dan file (struk.py), dibangun utuh lalu ditulis sekaligus
+        d = self.data
+        self.tulis("\n" + render(d), end="")
+
+        if self.struk_path is None:
+            return
+        # Struk file hanya ekspor; data lengkapnya ada di store
+        tulis_struk(d, self.struk_path)
+        self.tulis(f"Struk berhasil disimpan ke file: {self.struk_path}")
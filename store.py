@@ -0,0 +1,347 @@
+"""
+Penyimpanan data penyewaan (booking) Apen Al-wawi Rent.
+
+Sebelumnya setiap pembayaran tunai menimpa struk_penyewaan.txt dan pembayaran transfer
+tidak dicatat sama sekali. BookingStore menyimpan setiap sewa yang selesai (tunai maupun
+transfer) beserta semua rinciannya ke SQLite:
+
+    - Mode WAL + synchronous=NORMAL: penulis tidak memblokir pembaca, dan commit tidak
+      menunggu fsync setiap kali.
+    - simpan() satu transaksi per booking; simpan_banyak() memasukkan ribuan booking dalam
+      satu transaksi (executemany) untuk impor massal.
+    - Index pada telepon, nama (tanpa beda huruf besar/kecil), kode kendaraan, dan tanggal,
+      sehingga cari() tetap hitungan milidetik walaupun ada jutaan baris.
+
+Struk sekarang hanya ekspor opsional dari data yang tersimpan (teks_struk()/export_struk(), atau
+banyak struk sekaligus lewat CLI ekspor); layout dan format struk ada di struk.py.
+
+CLI:
+    python store.py cari --telepon 0812 --nama Budi --kode mb1 --dari 2025-01-01 --sampai 2025-01-31
+    python store.py struk 42 --out struk_42.txt
+    python store.py ekspor --dari 2025-01-01 --format csv --out struk_januari.csv
+    python store.py jumlah
+"""
+
+import argparse
+import datetime
+import sqlite3
+import sys
+import threading
+
+import metrics
+from pricing import format_rupiah
+from struk import CSV, FORMAT, TEKS, render, tulis_banyak, tulis_file
+
+STORE_FILE = "booking.db"
+
+# Urutan kolom tabel booking; nama kolom sama dengan key di SesiSewa.data
+KOLOM = (
+    "tanggal", "kode", "jenisKendaraan", "warna", "harga", "hargaSopir", "jumlahHari",
+    "nama", "alamat", "telepon", "jenisKelamin", "jaminan", "nomorJaminan", "voucher",
+    "subtotal", "pajak", "totalHargaSopir", "diskonPersen", "diskon", "diskonVoucher",
+    "grandTotal", "pembayaran", "uang", "kembalian", "unit", "sewaMulai", "sewaSelesai",
+)
+
+SKEMA = """
+CREATE TABLE IF NOT EXISTS booking (
+    id INTEGER PRIMARY KEY,
+    tanggal TEXT NOT NULL,
+    kode TEXT NOT NULL,
+    jenisKendaraan TEXT NOT NULL,
+    warna TEXT,
+    harga INTEGER NOT NULL,
+    hargaSopir INTEGER NOT NULL DEFAULT 0,
+    jumlahHari INTEGER NOT NULL,
+    nama TEXT COLLATE NOCASE,
+    alamat TEXT,
+    telepon TEXT,
+    jenisKelamin TEXT,
+    jaminan TEXT,
+    nomorJaminan TEXT,
+    voucher TEXT,
+    subtotal INTEGER,
+    pajak INTEGER,
+    totalHargaSopir INTEGER,
+    diskonPersen REAL,
+    diskon INTEGER,
+    diskonVoucher INTEGER,
+    grandTotal INTEGER NOT NULL,
+    pembayaran TEXT,
+    uang INTEGER,
+    kembalian INTEGER,
+    unit TEXT,
+    sewaMulai TEXT,
+    sewaSelesai TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_booking_telepon ON booking (telepon);
+CREATE INDEX IF NOT EXISTS idx_booking_nama ON booking (nama COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_booking_kode ON booking (kode, tanggal);
+CREATE INDEX IF NOT EXISTS idx_booking_tanggal ON booking (tanggal);
+CREATE INDEX IF NOT EXISTS idx_booking_sewa ON booking (sewaSelesai);
+"""
+
+# Kolom yang ditambahkan setelah versi pertama tabel booking (untuk database lama)
+KOLOM_BARU = {"unit": "TEXT", "sewaMulai": "TEXT", "sewaSelesai": "TEXT"}
+
+_INSERT = f"INSERT INTO booking ({', '.join(KOLOM)}) VALUES ({', '.join('?' * len(KOLOM))})"
+
+
+def _sekarang():
+    return datetime.datetime.now().isoformat(sep=" ", timespec="seconds")
+
+
+def _baris(data):
+    """Tuple nilai kolom dari dict booking (key yang tidak ada menjadi NULL)."""
+    if not data.get("tanggal"):
+        data = dict(data, tanggal=_sekarang())
+    return tuple(data.get(k) for k in KOLOM)
+
+
+class BookingStore:
+    """
+    Penyimpanan booking berbasis SQLite.
+
+    Args:
+        path (str, optional): File database. ":memory:" untuk database sementara.
+    """
+
+    def __init__(self, path=STORE_FILE):
+        self.path = path
+        # Satu koneksi dipakai bersama (server asyncio, thread AI); akses dijaga kunci
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._kunci = threading.Lock()
+        with self._kunci:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._migrasi()
+            self._conn.executescript(SKEMA)
+
+    def _migrasi(self):
+        """Menambah kolom baru ke tabel booking dari versi sebelumnya."""
+        ada = {r[1] for r in self._conn.execute("PRAGMA table_info(booking)")}
+        if not ada:
+            return
+        with self._conn:
+            for kolom, tipe in KOLOM_BARU.items():
+                if kolom not in ada:
+                    self._conn.execute(f"ALTER TABLE booking ADD COLUMN {kolom} {tipe}")
+
+    def close(self):
+        """Menutup koneksi database."""
+        with self._kunci:
+            self._conn.close()
+
+    @metrics.diukur("simpan_booking")
+    def simpan(self, data):
+        """
+        Menyimpan satu booking dalam satu transaksi.
+
+        Args:
+            data (dict): Isian sesi (SesiSewa.data). 'tanggal' diisi waktu sekarang jika kosong.
+
+        Returns:
+            int: ID booking.
+        """
+        with self._kunci, self._conn:
+            return self._conn.execute(_INSERT, _baris(data)).lastrowid
+
+    def simpan_banyak(self, daftar):
+        """
+        Menyimpan banyak booking sekaligus dalam satu transaksi.
+
+        Args:
+            daftar (iterable): Dict booking.
+
+        Returns:
+            int: Jumlah booking yang disimpan.
+        """
+        with self._kunci, self._conn:
+            return self._conn.executemany(_INSERT, (_baris(d) for d in daftar)).rowcount
+
+    def ambil(self, id_booking):
+        """
+        Mengambil satu booking.
+
+        Args:
+            id_booking (int): ID booking.
+
+        Returns:
+            dict | None: Booking, atau None jika tidak ada.
+        """
+        with self._kunci:
+            baris = self._conn.execute("SELECT * FROM booking WHERE id = ?", (id_booking,)).fetchone()
+        return dict(baris) if baris else None
+
+    def cari(self, telepon=None, nama=None, kode=None, dari=None, sampai=None, limit=50):
+        """
+        Mencari booking (terbaru lebih dulu). Semua filter digabung dengan AND.
+
+        Args:
+            telepon (str, optional): Nomor telepon (persis).
+            nama (str, optional): Awalan nama, tanpa beda huruf besar/kecil ('bud' cocok dengan 'Budi').
+            kode (str, optional): Kode kendaraan, mis. 'mb1'.
+            dari (str, optional): Tanggal awal 'YYYY-MM-DD' (inklusif).
+            sampai (str, optional): Tanggal akhir 'YYYY-MM-DD' (inklusif).
+            limit (int, optional): Jumlah hasil maksimal.
+
+        Returns:
+            list: Dict booking.
+        """
+        syarat, nilai = [], []
+        if telepon:
+            syarat.append("telepon = ?")
+            nilai.append(telepon)
+        if nama:
+            # Awalan dengan LIKE memakai index NOCASE; karakter wildcard di input di-escape
+            syarat.append("nama LIKE ? ESCAPE '\\'")
+            nilai.append(nama.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+        if kode:
+            syarat.append("kode = ?")
+            nilai.append(kode.lower())
+        if dari:
+            syarat.append("tanggal >= ?")
+            nilai.append(dari)
+        if sampai:
+            besok = datetime.date.fromisoformat(sampai) + datetime.timedelta(days=1)
+            syarat.append("tanggal < ?")
+            nilai.append(besok.isoformat())
+        sql = "SELECT * FROM booking"
+        if syarat:
+            sql += " WHERE " + " AND ".join(syarat)
+        sql += " ORDER BY id DESC LIMIT ?"
+        nilai.append(limit)
+        with self._kunci:
+            return [dict(b) for b in self._conn.execute(sql, nilai)]
+
+    def reservasi_aktif(self, sejak):
+        """
+        Rentang sewa unit yang belum selesai, untuk memuat ulang availability.Ketersediaan.
+
+        Args:
+            sejak (str): Tanggal 'YYYY-MM-DD'; sewa yang selesai sebelum/pada tanggal ini dilewati.
+
+        Returns:
+            list: Tuple (kode, unit, sewaMulai, sewaSelesai).
+        """
+        with self._kunci:
+            return [tuple(r) for r in self._conn.execute(
+                "SELECT kode, unit, sewaMulai, sewaSelesai FROM booking "
+                "WHERE sewaSelesai > ? AND unit IS NOT NULL", (sejak,))]
+
+    def jumlah(self):
+        """
+        Returns:
+            int: Jumlah booking tersimpan.
+        """
+        with self._kunci:
+            return self._conn.execute("SELECT COUNT(*) FROM booking").fetchone()[0]
+
+    def export_struk(self, id_booking, path):
+        """
+        Menulis struk teks satu booking ke file.
+
+        Args:
+            id_booking (int): ID booking.
+            path (str): File tujuan.
+
+        Raises:
+            KeyError: Jika booking tidak ditemukan.
+        """
+        data = self.ambil(id_booking)
+        if data is None:
+            raise KeyError(id_booking)
+        tulis_struk(data, path)
+
+
+# =================== STRUK ===================
+def teks_struk(d):
+    """
+    Teks struk pembayaran untuk satu booking (format struk_penyewaan.txt, lihat struk.py).
+
+    Args:
+        d (dict): Booking (dari BookingStore atau SesiSewa.data).
+
+    Returns:
+        str: Isi struk.
+    """
+    return render(d)
+
+
+def tulis_struk(d, path, format=TEKS):
+    """Menulis struk d ke file (ditimpa) dengan satu write()."""
+    tulis_file(d, path, format)
+
+
+# =================== CLI ===================
+def _ringkas(d):
+    return (f"#{d['id']:<7} {d['tanggal']}  {d['nama']:<20} {d['telepon'] or '-':<14} "
+            f"{d['kode']:<4} {d['jenisKendaraan']:<22} {d['jumlahHari']:>3} hari  "
+            f"Rp{format_rupiah(d['grandTotal']):>14}  {d['pembayaran'] or '-'}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Data penyewaan Apen Al-wawi Rent")
+    parser.add_argument("--db", default=STORE_FILE, help="File database")
+    sub = parser.add_subparsers(dest="perintah", required=True)
+
+    cari = sub.add_parser("cari", help="Cari booking")
+    cari.add_argument("--telepon")
+    cari.add_argument("--nama", help="Awalan nama")
+    cari.add_argument("--kode")
+    cari.add_argument("--dari", help="YYYY-MM-DD")
+    cari.add_argument("--sampai", help="YYYY-MM-DD")
+    cari.add_argument("--limit", type=int, default=50)
+
+    struk = sub.add_parser("struk", help="Tampilkan/ekspor struk satu booking")
+    struk.add_argument("id", type=int)
+    struk.add_argument("--out", help="File tujuan (kosong = tampilkan di layar)")
+    struk.add_argument("--format", choices=FORMAT, default=TEKS)
+
+    ekspor = sub.add_parser("ekspor", help="Ekspor struk booking yang cocok ke satu file/stdout")
+    ekspor.add_argument("--telepon")
+    ekspor.add_argument("--nama", help="Awalan nama")
+    ekspor.add_argument("--kode")
+    ekspor.add_argument("--dari", help="YYYY-MM-DD")
+    ekspor.add_argument("--sampai", help="YYYY-MM-DD")
+    ekspor.add_argument("--limit", type=int, default=1000)
+    ekspor.add_argument("--format", choices=FORMAT, default=CSV)
+    ekspor.add_argument("--out", help="File tujuan (kosong = stdout)")
+
+    sub.add_parser("jumlah", help="Jumlah booking tersimpan")
+
+    args = parser.parse_args(argv)
+    store = BookingStore(args.db)
+    try:
+        if args.perintah == "cari":
+            hasil = store.cari(args.telepon, args.nama, args.kode, args.dari, args.sampai, args.limit)
+            for d in hasil:
+                print(_ringkas(d))
+            print(f"{len(hasil)} booking ditemukan.")
+        elif args.perintah == "struk":
+            data = store.ambil(args.id)
+            if data is None:
+                print(f"Booking #{args.id} tidak ditemukan.")
+                return 1
+            if args.out:
+                tulis_struk(data, args.out, args.format)
+                print(f"Struk booking #{args.id} disimpan ke file: {args.out}")
+            else:
+                sys.stdout.write(render(data, args.format))
+        elif args.perintah == "ekspor":
+            hasil = store.cari(args.telepon, args.nama, args.kode, args.dari, args.sampai, args.limit)
+            if args.out:
+                with open(args.out, "w", encoding="utf-8", newline="") as f:
+                    jumlah = tulis_banyak(hasil, f, args.format)
+                print(f"{jumlah} struk disimpan ke file: {args.out}")
+            else:
+                tulis_banyak(hasil, sys.stdout, args.format)
+        else:
+            print(store.jumlah())
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,230 @@
+"""
+Satu model struk dan renderer terkompilasi untuk layar, file, dan ekspor massal.
+
+Sebelumnya struk dicetak dengan puluhan print() ("Bukti Penyewaan"/"Bukti Pembayaran" di
+layar) dan layout file struk_penyewaan.txt yang ditulis terpisah, sehingga keduanya tidak
+sama (file tanpa total dan metode bayar, lebar kolom berbeda). Sekarang:
+
+    - Model struk = data booking (key seperti SesiSewa.data / BookingStore); KOLOM adalah
+      urutan field untuk JSON dan CSV.
+    - Layout teks didefinisikan sekali dan dikompilasi saat import: baris berurutan dengan
+      syarat yang sama digabung menjadi satu format string, jadi satu struk = beberapa
+      format_map() dan satu join.
+    - Setiap struk dibangun utuh di memori lalu dikeluarkan dengan satu write(), ke stdout,
+      file, atau stream berisi banyak struk (tulis_banyak() menggabungkan PER_TULIS struk
+      per write()).
+
+Format: teks (layout struk), json (satu objek per baris), csv (satu baris, header HEADER_CSV).
+
+Contoh:
+    print(render(data, judul=TAGIHAN), end="")
+    tulis_file(data, "struk_penyewaan.txt")
+    with open("struk.csv", "w", encoding="utf-8", newline="") as f:
+        tulis_banyak(daftar_booking, f, format=CSV)
+"""
+
+import csv
+import io
+import json
+import sys
+
+import metrics
+from pricing import format_rupiah
+
+TEKS = "teks"
+JSON = "json"
+CSV = "csv"
+FORMAT = (TEKS, JSON, CSV)
+EKSTENSI = {TEKS: ".txt", JSON: ".json", CSV: ".csv"}
+
+TAGIHAN = "Bukti Penyewaan"      # Sebelum dibayar: tanpa bagian pembayaran
+PEMBAYARAN = "Bukti Pembayaran"  # Setelah dibayar (tunai/transfer)
+
+TOKO = "Apen Al-wawi Rent"
+LEBAR = 50
+LEBAR_LABEL = 17
+PER_TULIS = 256  # Struk per write() di tulis_banyak()
+
+KOLOM = (
+    "id", "tanggal", "nama", "alamat", "jenisKelamin", "telepon", "kode", "jenisKendaraan", "warna",
+    "jumlahHari", "harga", "hargaSopir", "totalHargaSopir", "subtotal", "pajak", "diskonPersen", "diskon",
+    "voucher", "diskonVoucher", "grandTotal", "pembayaran", "uang", "kembalian",
+)
+HEADER_CSV = ",".join(KOLOM) + "\n"
+
+_RUPIAH = ("harga", "hargaSopir", "totalHargaSopir", "subtotal", "pajak", "diskon", "diskonVoucher",
+           "grandTotal")
+
+
+def _baris(label, nilai):
+    return f"{label:<{LEBAR_LABEL}}: {nilai}"
+
+
+# (syarat, baris). Syarat None = selalu dicetak; lainnya key dari _syarat().
+LAYOUT = (
+    (None, "=" * LEBAR),
+    (None, " " * ((LEBAR - len(TOKO)) // 2) + TOKO),
+    (None, "=" * LEBAR),
+    (None, "{judul}"),
+    (None, "-" * LEBAR),
+    (None, _baris("Nama", "{nama}")),
+    (None, _baris("Alamat", "{alamat}")),
+    (None, _baris("Jenis Kelamin", "{jenisKelamin}")),
+    (None, _baris("No. Telepon", "{telepon}")),
+    (None, "-" * LEBAR),
+    (None, "Pesanan Anda:"),
+    (None, _baris("Jenis Kendaraan", "{jenisKendaraan}")),
+    (None, _baris("Warna", "{warna}")),
+    (None, _baris("Jumlah Hari", "{jumlahHari}")),
+    (None, _baris("Harga Sewa", "Rp{harga} per hari")),
+    (None, _baris("Subtotal", "Rp{subtotal}")),
+    (None, _baris("Pajak (10%)", "Rp{pajak}")),
+    ("durasi", _baris("Diskon Durasi", "Rp{diskon}")),
+    ("voucher", _baris("Voucher Diskon", "Rp{diskonVoucher} ({voucher})")),
+    (None, _baris("Harga Sopir", "Rp{totalHargaSopir} ({jumlahHari} x Rp{hargaSopir})")),
+    ("total", _baris("Total Bayar", "Rp{grandTotal}")),
+    ("tunai", _baris("Metode Bayar", "Tunai")),
+    ("tunai", _baris("Nominal Dibayar", "Rp{uang}")),
+    ("tunai", _baris("Kembalian", "Rp{kembalian}")),
+    ("transfer", _baris("Metode Bayar", "Transfer")),
+    ("transfer", _baris("Total Transfer", "Rp{grandTotal}")),
+    (None, "=" * LEBAR),
+)
+
+
+def kompilasi(layout):
+    """
+    Mengompilasi layout menjadi potongan format string.
+
+    Args:
+        layout (iterable): Pasangan (syarat, baris) seperti LAYOUT.
+
+    Returns:
+        tuple: (syarat, format_map) untuk setiap kelompok baris berurutan dengan syarat yang sama.
+    """
+    kelompok = []
+    for syarat, baris in layout:
+        if kelompok and kelompok[-1][0] == syarat:
+            kelompok[-1][1].append(baris)
+        else:
+            kelompok.append((syarat, [baris]))
+    return tuple((syarat, ("\n".join(baris) + "\n").format_map) for syarat, baris in kelompok)
+
+
+_TEMPLAT = kompilasi(LAYOUT)
+
+
+def _syarat(d, judul):
+    transfer = judul != TAGIHAN and d.get("pembayaran") == "Transfer"
+    return {
+        "durasi": d["diskonPersen"] > 0,
+        "voucher": d["diskonVoucher"] > 0,
+        "total": not transfer,
+        "tunai": judul != TAGIHAN and not transfer,
+        "transfer": transfer,
+    }
+
+
+def teks(d, judul=PEMBAYARAN):
+    """
+    Struk dalam format teks.
+
+    Args:
+        d (dict): Booking (dari BookingStore atau SesiSewa.data).
+        judul (str, optional): PEMBAYARAN (dengan bagian pembayaran) atau TAGIHAN (tanpa).
+
+    Returns:
+        str: Isi struk, diakhiri baris baru.
+    """
+    nilai = dict(d, judul=judul)
+    for kolom in _RUPIAH:
+        nilai[kolom] = format_rupiah(d[kolom])
+    if judul != TAGIHAN and d.get("pembayaran") != "Transfer":
+        nilai["uang"] = format_rupiah(d["uang"])
+        nilai["kembalian"] = format_rupiah(d["kembalian"])
+    syarat = _syarat(d, judul)
+    return "".join(isi(nilai) for s, isi in _TEMPLAT if s is None or syarat[s])
+
+
+def baris_json(d):
+    """Struk sebagai satu baris JSON (field KOLOM)."""
+    return json.dumps({k: d.get(k) for k in KOLOM}, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def baris_csv(d):
+    """Struk sebagai satu baris CSV (urutan KOLOM, tanpa header)."""
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator="\n").writerow(["" if d.get(k) is None else d.get(k) for k in KOLOM])
+    return buf.getvalue()
+
+
+_RENDER = {JSON: baris_json, CSV: baris_csv}
+
+
+def render(d, format=TEKS, judul=PEMBAYARAN):
+    """
+    Membangun satu struk utuh dalam format yang diminta.
+
+    Args:
+        d (dict): Booking.
+        format (str, optional): TEKS, JSON, atau CSV.
+        judul (str, optional): Judul struk teks (PEMBAYARAN atau TAGIHAN).
+
+    Returns:
+        str: Isi struk.
+
+    Raises:
+        ValueError: Jika format tidak dikenal.
+    """
+    if format == TEKS:
+        return teks(d, judul)
+    if format not in _RENDER:
+        raise ValueError(f"Format struk tidak dikenal: {format!r} (pilihan: {', '.join(FORMAT)})")
+    return _RENDER[format](d)
+
+
+def tulis(d, out=None, format=TEKS, judul=PEMBAYARAN):
+    """Menulis satu struk ke stream `out` (default stdout) dengan satu write()."""
+    (out or sys.stdout).write(render(d, format, judul))
+
+
+@metrics.diukur("tulis_struk")
+def tulis_file(d, path, format=TEKS):
+    """Menulis satu struk ke file (ditimpa)."""
+    isi = render(d, format)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(isi)
+
+
+def tulis_banyak(daftar, out, format=TEKS, header=True, per_tulis=PER_TULIS):
+    """
+    Menulis banyak struk ke satu stream.
+
+    Struk dikumpulkan di buffer dan dikeluarkan `per_tulis` struk sekaligus. Struk teks
+    dipisah satu baris kosong; JSON menjadi JSONL; CSV diawali HEADER_CSV jika `header`.
+
+    Args:
+        daftar (iterable): Booking.
+        out: Stream teks tujuan (mis. file yang dibuka dengan newline="").
+        format (str, optional): TEKS, JSON, atau CSV.
+        header (bool, optional): Tulis header CSV.
+        per_tulis (int, optional): Struk per write().
+
+    Returns:
+        int: Jumlah struk yang ditulis.
+    """
+    if format not in FORMAT:
+        raise ValueError(f"Format struk tidak dikenal: {format!r} (pilihan: {', '.join(FORMAT)})")
+    buf = [HEADER_CSV] if format == CSV and header else []
+    jumlah = 0
+    for d in daftar:
+        if format == TEKS and jumlah:
+            buf.append("\n")
+        buf.append(render(d, format))
+        jumlah += 1
+        if jumlah % per_tulis == 0:
+            out.write("".join(buf))
+            buf = []
+    if buf:
+        out.write("".join(buf))
+    return jumlah
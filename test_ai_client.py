@@ -0,0 +1,154 @@
+import threading
+import time
+import unittest
+import ai_client
+
+class Chunk:
+    def __init__(self, text):
+        self.text = text
+
+class FakeModel:
+    def __init__(self, chunks, gagal_setelah=None):
+        self.chunks = chunks
+        self.gagal_setelah = gagal_setelah
+
+    def generate_content(self, prompt, stream=False):
+        if not stream:
+            return Chunk("".join(self.chunks))
+        return self._stream()
+
+    def _stream(self):
+        for i, c in enumerate(self.chunks):
+            if self.gagal_setelah is not None and i >= self.gagal_setelah:
+                raise ConnectionError("putus")
+            yield Chunk(c)
+
+class TestStreamJawaban(unittest.TestCase):
+    def test_stream(self):
+        tampil = []
+        latensi = ai_client.LatencyLog()
+        jawaban = ai_client.stream_jawaban(FakeModel(["Halo", ", ada ", "diskon!"]), "p", tampil.append, latensi)
+        self.assertEqual(jawaban.text, "Halo, ada diskon!")
+        self.assertFalse(jawaban.fallback)
+        self.assertEqual(tampil, ["Halo", ", ada ", "diskon!"])
+        self.assertEqual(latensi.records[0][2], "stream")
+        self.assertLessEqual(latensi.records[0][0], latensi.records[0][1])
+
+    def test_fallback_blocking(self):
+        tampil = []
+        latensi = ai_client.LatencyLog()
+        jawaban = ai_client.stream_jawaban(FakeModel(["Halo", ", ada ", "diskon!"], gagal_setelah=1), "p", tampil.append, latensi)
+        self.assertEqual(jawaban.text, "Halo, ada diskon!")
+        self.assertEqual("".join(tampil), "Halo, ada diskon!")
+        self.assertEqual(latensi.summary()["count"], 1)
+        self.assertEqual(latensi.records[0][2], "blocking")
+
+class FaultyModel:
+    """Model palsu lokal untuk injeksi gangguan: gagal N kali, lalu lambat, lalu normal."""
+
+    def __init__(self, gagal=0, lambat=0, jeda=0.5, jawaban="OK"):
+        self.gagal = gagal
+        self.lambat = lambat
+        self.jeda = jeda
+        self.jawaban = jawaban
+        self.panggilan = 0
+        self._kunci = threading.Lock()
+
+    def generate_content(self, prompt, stream=False):
+        with self._kunci:
+            self.panggilan += 1
+            if self.gagal > 0:
+                self.gagal -= 1
+                raise ConnectionError("503 Service Unavailable")
+            lambat = self.lambat > 0
+            if lambat:
+                self.lambat -= 1
+        if lambat:
+            time.sleep(self.jeda)
+        if stream:
+            return iter([Chunk(self.jawaban)])
+        return Chunk(self.jawaban)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestResilientClient(unittest.TestCase):
+    def setUp(self):
+        self.jeda = []
+
+    def client(self, model, **kwargs):
+        kwargs.setdefault("sleep", self.jeda.append)
+        return ai_client.ResilientClient(model, **kwargs)
+
+    def test_retry_dengan_backoff(self):
+        model = FaultyModel(gagal=2)
+        client = self.client(model, retries=2, backoff=0.5)
+        self.assertEqual(client.generate_content("p").text, "OK")
+        self.assertEqual(model.panggilan, 3)
+        self.assertEqual(self.jeda, [0.5, 1.0])
+
+    def test_timeout_lalu_retry(self):
+        model = FaultyModel(lambat=1, jeda=0.5)
+        client = self.client(model, timeout=0.05, retries=1)
+        self.assertEqual(client.generate_content("p").text, "OK")
+        self.assertEqual(client.errors, 1)
+
+    def test_fallback_dan_circuit_breaker(self):
+        clock = FakeClock()
+        model = FaultyModel(gagal=100)
+        breaker = ai_client.CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=clock)
+        client = self.client(model, retries=5, breaker=breaker, fallback=lambda p: "cadangan")
+        self.assertEqual(client.generate_content("p").text, "cadangan")
+        self.assertEqual(model.panggilan, 3)
+        self.assertEqual(breaker.state, "open")
+        # Breaker terbuka: langsung cadangan tanpa memanggil model
+        self.assertEqual(client.generate_content("p").text, "cadangan")
+        self.assertEqual(model.panggilan, 3)
+        # Setelah reset_timeout, satu panggilan percobaan; berhasil -> tertutup lagi
+        model.gagal = 0
+        clock.now = 11
+        self.assertEqual(client.generate_content("p").text, "OK")
+        self.assertEqual(breaker.state, "closed")
+
+    def test_stream_lewat_client(self):
+        client = self.client(FakeModel(["Ha", "lo"]))
+        tampil = []
+        self.assertEqual(ai_client.stream_jawaban(client, "p", tampil.append).text, "Halo")
+        self.assertEqual(client.stats()["state"], "closed")
+
+    def test_stream_timeout_fallback_ke_blocking(self):
+        model = FaultyModel(lambat=1, jeda=0.5, jawaban="Halo")
+        client = self.client(model, timeout=0.05)
+        tampil = []
+        self.assertEqual(ai_client.stream_jawaban(client, "p", tampil.append).text, "Halo")
+        self.assertEqual("".join(tampil), "Halo")
+
+    def test_stream_fallback_per_panggilan(self):
+        clock = FakeClock()
+        breaker = ai_client.CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        client = self.client(FaultyModel(gagal=1), retries=0, breaker=breaker, fallback=lambda p: "cadangan")
+        # Streaming gagal -> panggilan biasa juga gagal (breaker terbuka) -> cadangan
+        jawaban = ai_client.stream_jawaban(client, "p", [].append)
+        self.assertEqual((jawaban.text, jawaban.fallback), ("cadangan", True))
+        # Breaker masih terbuka: cadangan langsung dari stream
+        jawaban = ai_client.stream_jawaban(client, "p", [].append)
+        self.assertEqual((jawaban.text, jawaban.fallback), ("cadangan", True))
+        # Penghitung bersama naik, tetapi jawaban asli berikutnya tetap bukan cadangan
+        fallbacks = client.fallbacks
+        clock.now = 11
+        jawaban = ai_client.stream_jawaban(client, "p", [].append)
+        self.assertEqual((jawaban.text, jawaban.fallback), ("OK", False))
+        self.assertEqual(client.fallbacks, fallbacks)
+
+    def test_percentiles(self):
+        log = ai_client.LatencyLog()
+        for i in range(1, 101):
+            log.record(0, i / 100, "call")
+        self.assertEqual(log.percentiles(), {"p50": 0.5, "p95": 0.95, "p99": 0.99})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+import analytics
+from chatlog import PAMIT_MASYUD, PEMBUKA_MASYUD, format_record
+from pricing import quote
+from store import BookingStore
+
+KATEGORI = {"mb1": "Mobil", "mk2": "Motor"}
+
+def booking(tanggal, kode, harga, hari, voucher="", pembayaran="Transfer"):
+    d = {"tanggal": tanggal, "kode": kode, "jenisKendaraan": kode, "harga": harga, "jumlahHari": hari,
+         "nama": "Budi", "pembayaran": pembayaran}
+    d.update(quote(harga, hari, voucher=voucher))
+    return d
+
+class TestRingkasBooking(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self.tmp.name, "booking.db")
+        self.daftar = [
+            booking("2025-07-31 23:00:00", "mb1", 5000000, 2),
+            booking("2025-08-01 09:00:00", "mb1", 5000000, 7, "MERDEKA17", "Tunai"),
+            booking("2025-08-01 10:00:00", "mk2", 700000, 3, "GRATIS"),
+            booking("2025-08-31 20:00:00", "mk2", 700000, 14, "HEMAT5"),
+            booking("2025-08-15 12:00:00", "xx9", 10000, 1),
+        ]
+        store = BookingStore(self.db)
+        store.simpan_banyak(self.daftar)
+        store.close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_per_dimensi(self):
+        hasil = analytics.ringkas_booking(self.db, KATEGORI, dari="2025-08-01", sampai="2025-08-31", ukuran=2)
+        agustus = self.daftar[1:]
+        self.assertEqual(hasil["total"]["sewa"], 4)
+        self.assertEqual(hasil["total"]["hari"], 25)
+        self.assertEqual(hasil["total"]["pendapatan"], sum(d["grandTotal"] for d in agustus))
+        self.assertEqual(hasil["kategori"]["Motor"]["pendapatan"], agustus[1]["grandTotal"] + agustus[2]["grandTotal"])
+        self.assertEqual(hasil["kategori"]["Lainnya"]["sewa"], 1)
+        self.assertEqual(hasil["tanggal"]["2025-08-01"]["sewa"], 2)
+        self.assertEqual(hasil["pembayaran"]["Tunai"]["sewa"], 1)
+        # Voucher tidak valid dihitung tanpa voucher
+        self.assertEqual(sorted(hasil["voucher"]), ["-", "HEMAT5", "MERDEKA17"])
+        self.assertEqual(hasil["voucher"]["-"]["sewa"], 2)
+        self.assertEqual(hasil["total"]["diskonVoucher"], agustus[0]["diskonVoucher"] + agustus[2]["diskonVoucher"])
+
+    def test_laporan_dan_cli(self):
+        hasil = analytics.ringkas_booking(self.db, KATEGORI)
+        teks = analytics.teks_laporan(hasil, nama_kendaraan={"mb1": "G-Class"})
+        self.assertIn("Jumlah sewa            : 5", teks)
+        self.assertIn("Sewa dengan voucher    : 2 (40.0%)", teks)
+        self.assertIn("mb1 G-Class", teks)
+        self.assertIn("Rp" + analytics.format_rupiah(self.daftar[0]["grandTotal"] + self.daftar[1]["grandTotal"]), teks)
+        chatlog = os.path.join(self.tmp.name, "chatlog.txt")
+        self.assertEqual(analytics.main(["--db", self.db, "--chatlog", chatlog, "--bulan", "2025-07"]), 0)
+
+class TestHitungChat(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log = os.path.join(self.tmp.name, "chatlog.txt")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def tulis(self, path, record, akhir="\n"):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("".join(format_record(r, t) for r, t in record).rstrip("\n") + akhir)
+
+    def test_hitung_lintas_blok_dan_rotasi(self):
+        sesi = [("Masyud", PEMBUKA_MASYUD), ("Anda", "berapa harga\nG-Class?"), ("Masyud", "Rp 5.000.000 per hari"),
+                ("Anda", "keluar"), ("Masyud", PAMIT_MASYUD)]
+        self.tulis(self.log + ".1", sesi * 3)
+        # Tiga pembuka berturut-turut (tiga sesi server) dan file tanpa '\n' di akhir
+        self.tulis(self.log, [("Masyud", PEMBUKA_MASYUD)] * 2 + sesi, akhir="")
+        paths = analytics.file_chatlog(self.log)
+        self.assertEqual(paths, [self.log + ".1", self.log])
+        for blok in (7, 64, analytics.BLOK_CHAT):
+            hasil = analytics.hitung_chat(paths, blok=blok)
+            self.assertEqual(hasil["halomas"], 6)
+            self.assertEqual(hasil["keluar"], 4)
+            self.assertEqual(hasil["pertanyaan"], 8)
+            self.assertEqual(hasil["jawaban"], 4)
+            self.assertEqual(hasil["record"], 22)
+        self.assertIn("Pertanyaan per sesi    : 1.33", analytics.teks_laporan(chat=hasil))
+
+    def test_baris_sama_berurutan(self):
+        # 4, 6, dan 7 baris sama berurutan (dulu terhitung 3, 5, dan 6)
+        for k in (1, 2, 3, 4, 5, 6, 7):
+            self.tulis(self.log, [("Masyud", PEMBUKA_MASYUD)] * k + [("Anda", "halo")] +
+                       [("Masyud", PAMIT_MASYUD)] * k + [("Masyud", "jawaban")])
+            for blok in (7, analytics.BLOK_CHAT):
+                hasil = analytics.hitung_chat([self.log], blok=blok)
+                self.assertEqual((hasil["halomas"], hasil["keluar"], hasil["jawaban"]), (k, k, 1), (k, blok))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+from answer_cache import AnswerCache, normalisasi_pertanyaan
+
+KONTEKS = "Pajak 10%"
+SISTEM = "Kamu adalah customer service."
+
+class TestAnswerCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.context_path = os.path.join(self.tmp.name, "context.txt")
+        with open(self.context_path, "w", encoding="utf-8") as f:
+            f.write(KONTEKS)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_normalisasi(self):
+        self.assertEqual(normalisasi_pertanyaan("  Berapa   harga G-Class?? "), "berapa harga g-class")
+
+    def test_hit_miss(self):
+        cache = AnswerCache()
+        self.assertIsNone(cache.get("ada diskon?", KONTEKS, SISTEM))
+        cache.put("ada diskon?", KONTEKS, "Ada, 5% untuk 7 hari.", SISTEM)
+        self.assertEqual(cache.get("Ada diskon", KONTEKS, SISTEM), "Ada, 5% untuk 7 hari.")
+        self.assertIsNone(cache.get("ada diskon?", KONTEKS + " berubah", SISTEM))
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 2)
+
+    def test_lru(self):
+        cache = AnswerCache(max_entries=2)
+        cache.put("a", KONTEKS, "1")
+        cache.put("b", KONTEKS, "2")
+        cache.get("a", KONTEKS)
+        cache.put("c", KONTEKS, "3")
+        self.assertIsNone(cache.get("b", KONTEKS))
+        self.assertEqual(cache.get("a", KONTEKS), "1")
+
+    def test_ttl(self):
+        cache = AnswerCache(ttl=-1)
+        cache.put("a", KONTEKS, "1")
+        self.assertIsNone(cache.get("a", KONTEKS))
+
+    def test_persistensi(self):
+        path = os.path.join(self.tmp.name, "cache.json")
+        cache = AnswerCache(path=path, context_path=self.context_path)
+        cache.put("harga sepeda?", KONTEKS, "Rp 10.000/hari")
+        baru = AnswerCache(path=path, context_path=self.context_path)
+        self.assertEqual(baru.get("harga sepeda", KONTEKS), "Rp 10.000/hari")
+
+    def test_invalidasi_saat_context_berubah(self):
+        path = os.path.join(self.tmp.name, "cache.json")
+        cache = AnswerCache(path=path, context_path=self.context_path)
+        cache.put("a", KONTEKS, "1")
+        st = os.stat(self.context_path)
+        os.utime(self.context_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+        self.assertIsNone(cache.get("a", KONTEKS))
+        self.assertFalse(os.path.exists(path))
+
+if __name__ == "__main__":
+    unittest.main()
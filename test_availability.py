@@ -0,0 +1,67 @@
+import datetime
+import threading
+import unittest
+from availability import Ketersediaan
+
+H = datetime.date(2025, 8, 1)
+
+def tgl(n):
+    return H + datetime.timedelta(days=n)
+
+class TestKetersediaan(unittest.TestCase):
+    def setUp(self):
+        self.k = Ketersediaan({"mb1": 2, "mk2": 1})
+
+    def test_reservasi_dan_bentrok(self):
+        self.assertEqual(self.k.reservasi("mb1", H, 5), "mb1-1")
+        self.assertEqual(self.k.reservasi("mb1", tgl(2), 3), "mb1-2")
+        self.assertIsNone(self.k.reservasi("mb1", tgl(4), 1))
+        # Rentang setengah terbuka: sewa 5 hari dari H selesai tepat di tgl(5)
+        self.assertEqual(self.k.reservasi("mb1", tgl(5), 2), "mb1-1")
+        self.assertEqual(self.k.unit_tersedia("mb1", tgl(5), 1), ["mb1-2"])
+        self.assertFalse(self.k.tersedia("xx9", H, 1))
+
+    def test_celah_di_antara_reservasi(self):
+        self.k.reservasi("mk2", H, 3)
+        self.k.reservasi("mk2", tgl(10), 3)
+        self.assertTrue(self.k.tersedia("mk2", tgl(3), 7))
+        self.assertFalse(self.k.tersedia("mk2", tgl(3), 8))
+        self.assertEqual(self.k.reservasi("mk2", tgl(4), 2), "mk2-1")
+        self.assertEqual(self.k.kosong_berikutnya("mk2", H, 4), tgl(6))
+        self.assertEqual(self.k.kosong_berikutnya("mk2", H, 5), tgl(13))
+        self.assertEqual(self.k.kosong_berikutnya("mk2", H, 1), tgl(3))
+
+    def test_ringkasan_dan_lepas(self):
+        self.k.reservasi("mb1", H, 7)
+        self.assertEqual(self.k.ringkasan(tgl(1), 7), {"mb1": 1, "mk2": 1})
+        self.assertTrue(self.k.lepas("mb1", "mb1-1", H))
+        self.assertFalse(self.k.lepas("mb1", "mb1-1", H))
+        self.assertEqual(self.k.ringkasan(tgl(1), 7), {"mb1": 2, "mk2": 1})
+
+    def test_hari_tidak_valid(self):
+        with self.assertRaises(ValueError):
+            self.k.reservasi("mb1", H, 0)
+
+    def test_muat_melewati_bentrok(self):
+        jumlah = self.k.muat([("mb1", "mb1-1", "2025-08-01", "2025-08-05"),
+                              ("mb1", "mb1-1", "2025-08-03", "2025-08-04"),
+                              ("mb1", "mb1-9", "2025-08-01", "2025-08-05")])
+        self.assertEqual(jumlah, 1)
+        self.assertEqual(self.k.unit_tersedia("mb1", tgl(1), 1), ["mb1-2"])
+
+    def test_reservasi_bersamaan_tidak_dobel(self):
+        k = Ketersediaan({"mb1": 10})
+        hasil = []
+        def pesan():
+            for _ in range(50):
+                hasil.append(k.reservasi("mb1", H, 1))
+        threads = [threading.Thread(target=pesan) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        dipesan = [u for u in hasil if u is not None]
+        self.assertEqual(sorted(dipesan), sorted(k.unit("mb1")))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+import csv
+import datetime
+import json
+import os
+import tempfile
+import unittest
+import bulk
+from session import SesiSewa
+from vouchers import VoucherBook, buat_voucher
+
+PESANAN = {
+    "kode": "mb1", "warna": "hitam", "jumlahHari": 7, "sopir": True, "nama": "Budi", "alamat": "Jl. Mawar",
+    "telepon": "0812", "jenisKelamin": "L", "jaminan": "KTP", "nomorJaminan": "3201", "voucher": "hemat5",
+    "pembayaran": "Tunai", "uang": 50000000,
+}
+
+def pesanan(**kwargs):
+    d = dict(PESANAN)
+    d.update(kwargs)
+    return d
+
+class TestBulk(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.out = os.path.join(self.tmp.name, "out")
+        self.db = os.path.join(self.tmp.name, "booking.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def tulis_jsonl(self, daftar):
+        path = os.path.join(self.tmp.name, "pesanan.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            for d in daftar:
+                f.write(d if isinstance(d, str) else json.dumps(d))
+                f.write("\n")
+        return path
+
+    def struk(self, folder, nomor):
+        with open(os.path.join(self.out, folder, f"struk_{nomor:08d}.txt"), encoding="utf-8") as f:
+            return f.read()
+
+    def test_struk_sama_dengan_sesi_interaktif(self):
+        path = self.tulis_jsonl([PESANAN])
+        hasil = bulk.jalankan(path, self.out, workers=0, voucher_db=self.db)
+        self.assertEqual((hasil["pesanan"], hasil["struk"], hasil["gagal"]), (1, 1, 0))
+
+        struk_sesi = os.path.join(self.tmp.name, "struk_penyewaan.txt")
+        sesi = SesiSewa(bulk.Katalog(bulk.KATALOG_FILE).pilihan(), tulis=lambda *a, **k: None, struk_path=struk_sesi)
+        sesi.mulai()
+        for jawaban in ["mb1", "hitam", "Y", "Y", "7", "Budi", "Jl. Mawar", "0812", "L", "1", "3201", "hemat5", "1",
+                        "50000000"]:
+            sesi.kirim(jawaban)
+        with open(struk_sesi, encoding="utf-8") as f:
+            self.assertEqual(self.struk("00000", 1), f.read())
+
+    def test_pesanan_tidak_valid_dicatat(self):
+        path = self.tulis_jsonl([
+            pesanan(kode="xx9"),
+            pesanan(warna="Ungu"),
+            pesanan(kode="mk2", warna="Biru"),
+            pesanan(jumlahHari=0),
+            pesanan(jaminan="NPWP"),
+            pesanan(uang=1000),
+            "{rusak",
+            pesanan(pembayaran="2", jaminan="3", uang=None),
+        ])
+        hasil = bulk.jalankan(path, self.out, workers=0, voucher_db=self.db)
+        self.assertEqual((hasil["struk"], hasil["gagal"]), (1, 7))
+        with open(os.path.join(self.out, bulk.GAGAL_FILE), encoding="utf-8") as f:
+            gagal = [json.loads(baris) for baris in f]
+        self.assertEqual([g["baris"] for g in gagal], list(range(1, 8)))
+        self.assertIn("Kode kendaraan tidak valid", gagal[0]["alasan"])
+        self.assertIn("tidak bisa disewa dengan sopir", gagal[2]["alasan"])
+        self.assertIn("Uang tidak cukup", gagal[5]["alasan"])
+        self.assertIn("Total Transfer   : Rp36.483.563", self.struk("00000", 8))
+
+    def test_csv_dan_process_pool(self):
+        path = os.path.join(self.tmp.name, "pesanan.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("kode,warna,jumlahHari,sopir,nama,alamat,telepon,jenisKelamin,jaminan,nomorJaminan,voucher,"
+                    "pembayaran,uang\n")
+            for i in range(25):
+                f.write(f"s1,Hitam,{i + 1},,Ani {i},Jl,0813,P,SIM,99,,Tunai,\n")
+        hasil = bulk.main([path, "--out", self.out, "--workers", "2", "--potongan", "10", "--db", self.db])
+        self.assertEqual(hasil, 0)
+        self.assertEqual(sorted(os.listdir(self.out)), ["00000", "00001", "00002", bulk.GAGAL_FILE])
+        self.assertEqual(len(os.listdir(os.path.join(self.out, "00002"))), 5)
+        # Baris 1 adalah header; uang kosong = uang pas
+        self.assertIn("Kembalian        : Rp0", self.struk("00002", 26))
+
+    def test_voucher_dari_voucher_book(self):
+        bulk.siapkan_voucher(self.db)
+        book = VoucherBook(self.db)
+        book.simpan_aturan([
+            buat_voucher({"kode": "KORPORAT", "persen": 0.2}),
+            buat_voucher({"kode": "AGUSTUS", "persen": 0.1, "sampai": "2025-08-31"}),
+            buat_voucher({"kode": "MOBIL10", "persen": 0.1, "kategori": ["Mobil"], "minHari": 10}),
+            buat_voucher({"kode": "HABIS", "persen": 0.1, "kuota": 1}),
+        ])
+        book.pakai("HABIS", {"kode": "mb1", "jumlahHari": 7, "telepon": "0899", "tanggal": datetime.date.today()})
+        book.close()
+        path = self.tulis_jsonl([
+            pesanan(voucher="korporat"),
+            pesanan(voucher="agustus", tanggal="2025-08-17"),
+            pesanan(voucher="agustus", tanggal="2025-09-01"),
+            pesanan(voucher="mobil10"),
+            pesanan(voucher="habis"),
+            pesanan(voucher="GRATIS"),
+        ])
+        hasil = bulk.jalankan(path, self.out, workers=0, format="json", voucher_db=self.db)
+        self.assertEqual((hasil["struk"], hasil["gagal"]), (3, 3))
+        with open(os.path.join(self.out, "00000", "struk_00000001.json"), encoding="utf-8") as f:
+            d = json.loads(f.read())
+        self.assertEqual(d["voucher"], "KORPORAT")
+        self.assertEqual(d["grandTotal"], d["subtotal"] + d["pajak"] - d["diskon"] - d["diskonVoucher"])
+        self.assertEqual(d["diskonVoucher"], int((d["subtotal"] + d["pajak"] - d["diskon"]) * 0.2))
+        with open(os.path.join(self.out, bulk.GAGAL_FILE), encoding="utf-8") as f:
+            gagal = {g["baris"]: g["alasan"] for g in map(json.loads, f)}
+        self.assertIn("sudah tidak berlaku", gagal[3])
+        self.assertIn("minimal 10 hari", gagal[4])
+        self.assertIn("Kode voucher tidak valid", gagal[6])
+
+    def test_cetak_ulang_voucher_yang_sudah_dipakai(self):
+        bulk.siapkan_voucher(self.db)
+        book = VoucherBook(self.db)
+        book.simpan_aturan([
+            buat_voucher({"kode": "SEKALI", "persen": 0.1, "kuota": 1}),
+            buat_voucher({"kode": "LANGGANAN", "persen": 0.1, "perPelanggan": 1}),
+            buat_voucher({"kode": "AGUSTUS", "persen": 0.1, "mulai": "2025-08-01", "sampai": "2025-08-31"}),
+        ])
+        tanggal = datetime.date(2025, 8, 17)
+        for kode in ("SEKALI", "LANGGANAN", "AGUSTUS"):
+            persen, alasan, _ = book.pakai(kode, {"kode": "mb1", "jumlahHari": 7, "telepon": "0812",
+                                                  "tanggal": tanggal})
+            self.assertEqual((persen, alasan), (0.1, None))
+        path = self.tulis_jsonl([
+            pesanan(voucher="sekali"),
+            pesanan(voucher="langganan"),
+            pesanan(voucher="agustus", tanggal="2025-08-17"),
+            pesanan(voucher="agustus"),
+        ])
+        hasil = bulk.jalankan(path, self.out, workers=0, voucher_db=self.db)
+        self.assertEqual((hasil["struk"], hasil["gagal"]), (3, 1))
+        self.assertIn("Voucher Diskon", self.struk("00000", 1))
+        with open(os.path.join(self.out, bulk.GAGAL_FILE), encoding="utf-8") as f:
+            gagal = {g["baris"]: g["alasan"] for g in map(json.loads, f)}
+        self.assertIn("tanggal wajib diisi", gagal[4])
+        # Cetak ulang tidak memotong kuota lagi
+        self.assertEqual(book.sisa("SEKALI"), 0)
+        book.close()
+
+    def test_gabung_csv(self):
+        path = self.tulis_jsonl([PESANAN, pesanan(kode="xx9"), pesanan(pembayaran="2", uang=None)])
+        hasil = bulk.jalankan(path, self.out, workers=0, format="csv", gabung=True, voucher_db=self.db)
+        self.assertEqual((hasil["struk"], hasil["gagal"]), (2, 1))
+        self.assertEqual(sorted(os.listdir(os.path.join(self.out, "00000"))), ["struk.csv"])
+        with open(os.path.join(self.out, "00000", "struk.csv"), encoding="utf-8", newline="") as f:
+            baris = list(csv.DictReader(f))
+        self.assertEqual([b["pembayaran"] for b in baris], ["Tunai", "Transfer"])
+        self.assertEqual(baris[1]["grandTotal"], "36483563")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import json
+import os
+import random
+import tempfile
+import unittest
+from unittest.mock import patch
+import catalog
+from catalog import Katalog, Kendaraan, baca_katalog
+from pricing import HARGA_SOPIR, quote
+
+DATA = [
+    {"kode": "mb1", "nama": "G-Class", "kategori": "Mobil", "harga": 5000000, "warna": ["Hitam", "Putih"], "sopir": True},
+    {"kode": "mk2", "nama": "Yamaha R6", "kategori": "Motor", "harga": 700000, "warna": ["Biru", "Hitam"], "unit": 5},
+    {"kode": "s2", "nama": "Sepeda", "kategori": "Sepeda", "harga": 10000, "warna": ["Biru"]},
+]
+
+class TestKatalog(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "katalog.json")
+        self.tulis(DATA)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def tulis(self, data, mtime=None):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        if mtime is not None:
+            os.utime(self.path, ns=(mtime, mtime))
+
+    def test_muat_json(self):
+        k = Katalog(self.path)
+        self.assertEqual(len(k), 3)
+        self.assertEqual(k.pilihan()["mk2"], ("Yamaha R6", 700000, ["Biru", "Hitam"]))
+        self.assertTrue(k.bisa_sopir("mb1"))
+        self.assertFalse(k.bisa_sopir("mk2"))
+        self.assertFalse(k.bisa_sopir("xx9"))
+        self.assertEqual(k["mk2"].unit, 5)
+        self.assertIsNone(k["mb1"].unit)
+        with self.assertRaises(AttributeError):
+            k["mb1"].diskon = 1
+
+    def test_muat_csv(self):
+        path = os.path.join(self.tmp.name, "katalog.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("kode,nama,kategori,harga,warna,sopir,unit\n")
+            f.write("MB1,G-Class,Mobil,5000000,Hitam|Putih,ya,\n")
+            f.write("tr1,Truk,Truk,900000,Kuning,tidak,2\n")
+        daftar = baca_katalog(path)
+        self.assertEqual([d.kode for d in daftar], ["mb1", "tr1"])
+        self.assertEqual(daftar[0].warna, ("Hitam", "Putih"))
+        self.assertTrue(daftar[0].sopir)
+        self.assertEqual(daftar[1].unit, 2)
+
+    def test_katalog_tidak_valid(self):
+        self.tulis(DATA + [DATA[0]])
+        with self.assertRaises(ValueError):
+            Katalog(self.path)
+        self.tulis([{"kode": "mb1", "nama": "X", "kategori": "Mobil", "harga": 0, "warna": ["Hitam"]}])
+        with self.assertRaises(ValueError):
+            Katalog(self.path)
+
+    def test_cari_dengan_index(self):
+        k = Katalog(self.path)
+        self.assertEqual([v.kode for v in k.cari(warna="biru")], ["s2", "mk2"])
+        self.assertEqual([v.kode for v in k.cari(harga_min=10000, harga_max=700000)], ["s2", "mk2"])
+        self.assertEqual([v.kode for v in k.cari(kategori="Mobil", warna="Hitam")], ["mb1"])
+        self.assertEqual(k.cari(kategori="Mobil", harga_max=100000), [])
+        self.assertEqual(k.cari(kategori="Perahu"), [])
+
+    def test_cari_katalog_besar(self):
+        daftar = [Kendaraan(f"mb{i}", f"Mobil {i}", "Mobil" if i % 2 else "Motor", 1000 + i, ("Hitam",))
+                  for i in range(20000)]
+        k = Katalog(None, daftar)
+        hasil = k.cari(kategori="Mobil", harga_min=5000, harga_max=5010)
+        self.assertEqual([v.harga for v in hasil], [5001, 5003, 5005, 5007, 5009])
+
+    def test_rekomendasi_dalam_budget(self):
+        k = Katalog(self.path)
+        # 3 hari R6 = 2.310.000, G-Class + sopir 3 hari = 17.325.000
+        self.assertEqual([v.kode for v, _ in k.rekomendasi(3, 2310000)], ["mk2", "s2"])
+        self.assertEqual([v.kode for v, _ in k.rekomendasi(3, 2309999)], ["s2"])
+        self.assertEqual([v.kode for v, _ in k.rekomendasi(3, 10**9, termurah=True)], ["s2", "mk2", "mb1"])
+        (v, rincian), = k.rekomendasi(3, 10**9, sopir=True, voucher="hemat5")
+        self.assertEqual(rincian, quote(5000000, 3, HARGA_SOPIR, "HEMAT5"))
+        self.assertEqual(k.rekomendasi(3, 10**9, kategori="Mobil", warna="biru"), [])
+        self.assertEqual([v.kode for v, _ in k.rekomendasi(3, 10**9, warna="hitam", k=1)], ["mb1"])
+        with self.assertRaises(ValueError):
+            k.rekomendasi(0, 1000)
+
+    def test_rekomendasi_sama_dengan_hitung_semua(self):
+        rng = random.Random(5)
+        daftar = [Kendaraan(f"k{i}", f"K {i}", rng.choice(["Mobil", "Motor"]), rng.randrange(10, 500) * 10000,
+                            (rng.choice(["Hitam", "Putih", "Merah"]),), sopir=rng.random() < 0.5)
+                  for i in range(1000)]
+        k = Katalog(None, daftar)
+        urut = sorted(daftar, key=lambda v: v.harga)
+        for _ in range(100):
+            hari, budget = rng.randint(1, 20), rng.randrange(10, 10000) * 10000
+            syarat = dict(kategori=rng.choice([None, "Mobil"]), warna=rng.choice([None, "Merah"]),
+                          sopir=rng.random() < 0.3, voucher=rng.choice(["", "MERDEKA17"]))
+            sopir = HARGA_SOPIR if syarat["sopir"] else 0
+            semua = [v for v in urut
+                     if quote(v.harga, hari, sopir, syarat["voucher"])["grandTotal"] <= budget
+                     and syarat["kategori"] in (None, v.kategori) and syarat["warna"] in (None, *v.warna)
+                     and (v.sopir or not syarat["sopir"])]
+            hasil = k.rekomendasi(hari, budget, k=5, **syarat)
+            self.assertEqual([v.harga for v, _ in hasil], [v.harga for v in reversed(semua)][:5])
+            hasil = k.rekomendasi(hari, budget, k=5, termurah=True, **syarat)
+            self.assertEqual([v.harga for v, _ in hasil], [v.harga for v in semua][:5])
+
+    def test_rekomendasi_berhenti_lebih_awal(self):
+        daftar = [Kendaraan(f"mb{i}", f"Mobil {i}", "Mobil", 100000 + i * 1000, ("Hitam",)) for i in range(50000)]
+        k = Katalog(None, daftar)
+        with patch.object(catalog, "quote", wraps=quote) as dihitung:
+            hasil = k.rekomendasi(10, 300000000, k=3)
+        # Binary search + quote untuk 3 hasil, bukan satu quote per kendaraan
+        self.assertLess(dihitung.call_count, 25)
+        self.assertEqual(len(hasil), 3)
+        self.assertTrue(all(r["grandTotal"] <= 300000000 for _, r in hasil))
+        self.assertGreater(quote(hasil[0][0].harga + 1000, 10)["grandTotal"], 300000000)
+
+    def test_tabel_cache_dan_hot_reload(self):
+        k = Katalog(self.path)
+        tabel = k.tabel()
+        self.assertIs(k.tabel(), tabel)
+        self.assertIn("1  | G-Class - Rp 5.000.000/hari", tabel)
+        self.assertFalse(k.muat_ulang_jika_berubah())
+
+        self.tulis(DATA[:1] + [dict(DATA[1], harga=750000)], mtime=10**18)
+        self.assertTrue(k.muat_ulang_jika_berubah())
+        self.assertIn("Yamaha R6 - Rp 750.000/hari", k.tabel())
+        self.assertNotIn("Sepeda", k.kategori())
+
+    def test_file_rusak_tetap_pakai_katalog_lama(self):
+        k = Katalog(self.path)
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("[{\"kode\": ")
+        self.assertFalse(k.muat_ulang_jika_berubah())
+        self.assertIsNotNone(k.error_terakhir)
+        self.assertEqual(len(k), 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import os
+import tempfile
+import time
+import unittest
+import chatlog
+
+class TestChatLog(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "chatlog.txt")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_escape_roundtrip(self):
+        teks = "Baris 1\nBaris 2\\n bukan baris baru\r\n"
+        self.assertEqual(chatlog.unescape_text(chatlog.escape_text(teks)), teks)
+        self.assertNotIn("\n", chatlog.escape_text(teks))
+
+    def test_tail_record_multi_baris(self):
+        log = chatlog.ChatLog(self.path)
+        log.append("Anda", "ada diskon?")
+        log.append("Masyud", "Ada!\n- 7 hari: 5%\n- 14 hari: 10%")
+        log.append("Anda", "oke")
+        self.assertEqual(log.tail(2), [
+            ("Masyud", "Ada!\n- 7 hari: 5%\n- 14 hari: 10%"),
+            ("Anda", "oke"),
+        ])
+
+    def test_tail_lines_blok_kecil(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            for i in range(1000):
+                f.write(f"Anda: pesan ke-{i}\n")
+        self.assertEqual(chatlog.tail_lines(self.path, 3, blok=7),
+                         ["Anda: pesan ke-997", "Anda: pesan ke-998", "Anda: pesan ke-999"])
+        self.assertEqual(len(chatlog.tail_lines(self.path, 5000, blok=64)), 1000)
+
+    def test_tail_file_tidak_ada(self):
+        self.assertEqual(chatlog.ChatLog(self.path).tail(5), [])
+
+    def test_rotasi_ukuran(self):
+        log = chatlog.ChatLog(self.path, max_bytes=40, backup_count=2)
+        for i in range(6):
+            log.append("Anda", f"pesan {i}")
+        self.assertTrue(os.path.exists(self.path + ".1"))
+        self.assertLessEqual(os.path.getsize(self.path), 40)
+        # Riwayat tetap tersambung melewati batas rotasi
+        self.assertEqual([t for _, t in log.tail(4)], ["pesan 2", "pesan 3", "pesan 4", "pesan 5"])
+
+    def test_rotasi_umur(self):
+        log = chatlog.ChatLog(self.path, max_bytes=None, max_age=-1)
+        log.append("Anda", "lama")
+        log.append("Anda", "baru")
+        with open(self.path + ".1", encoding="utf-8") as f:
+            self.assertEqual(f.read(), "Anda: lama\n")
+
+    def test_rotasi_umur_setelah_dibuka_ulang(self):
+        # Proses pertama menulis log; proses berikutnya (ChatLog baru) sehari kemudian harus merotasi
+        chatlog.ChatLog(self.path, max_bytes=None, max_age=3600).append("Anda", "kemarin")
+        with open(self.path + chatlog.SUFIKS_MULAI, "w", encoding="utf-8") as f:
+            f.write(repr(time.time() - 86400))
+        log = chatlog.ChatLog(self.path, max_bytes=None, max_age=3600)
+        log.append("Anda", "hari ini")
+        with open(self.path + ".1", encoding="utf-8") as f:
+            self.assertEqual(f.read(), "Anda: kemarin\n")
+        # File baru mendapat waktu mulai baru, jadi tidak langsung dirotasi lagi
+        chatlog.ChatLog(self.path, max_bytes=None, max_age=3600).append("Anda", "lagi")
+        self.assertFalse(os.path.exists(self.path + ".2"))
+
+    def test_rotasi_umur_log_lama_tanpa_catatan(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("Anda: lama\n")
+        dua_hari = time.time() - 2 * 86400
+        os.utime(self.path, (dua_hari, dua_hari))
+        chatlog.ChatLog(self.path, max_bytes=None, max_age=86400).append("Anda", "baru")
+        with open(self.path + ".1", encoding="utf-8") as f:
+            self.assertEqual(f.read(), "Anda: lama\n")
+
+class TestChatWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log = chatlog.ChatLog(os.path.join(self.tmp.name, "chatlog.txt"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_flush_format_sama(self):
+        writer = chatlog.ChatWriter(self.log, flush_interval=60)
+        writer.write("Anda", "halo")
+        writer.write("Masyud", "Halo!\nAda yang bisa dibantu?")
+        writer.flush()
+        self.assertEqual(self.log.tail(5), [("Anda", "halo"), ("Masyud", "Halo!\nAda yang bisa dibantu?")])
+        writer.close()
+
+    def test_batch_ditahan_sampai_batas(self):
+        writer = chatlog.ChatWriter(self.log, flush_bytes=10 ** 6, flush_interval=60)
+        writer.write("Anda", "belum ditulis")
+        self.assertEqual(self.log.tail(1), [])
+        writer.close()
+        self.assertEqual(self.log.tail(1), [("Anda", "belum ditulis")])
+
+    def test_flush_interval(self):
+        writer = chatlog.ChatWriter(self.log, flush_interval=0.01, fsync=True)
+        writer.write("Anda", "cepat")
+        for _ in range(200):
+            if self.log.tail(1):
+                break
+            time.sleep(0.01)
+        self.assertEqual(self.log.tail(1), [("Anda", "cepat")])
+        writer.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+from catalog import Katalog, Kendaraan
+from faq import FaqResolver, cari_budget
+from vouchers import VoucherBook, buat_voucher, voucher_default
+
+PILIHAN = {
+    "mb1": ("G-Class", 5000000, ["Hitam", "Putih", "Silver"]),
+    "mb5": ("Toyota GR Supra", 3000000, ["Merah", "Putih", "Hijau"]),
+    "mb6": ("Toyota Alphard Hybrid", 5000000, ["Hitam", "Putih"]),
+    "mk2": ("Yamaha R6", 700000, ["Biru", "Hitam"]),
+    "mk5": ("Sportster 48", 1500000, ["Hitam", "Silver"]),
+    "s1": ("Sepeda Listrik", 20000, ["Hitam", "Putih"]),
+    "s2": ("Sepeda", 10000, ["Biru", "Merah", "Hijau"]),
+}
+
+class TestFaqResolver(unittest.TestCase):
+    def setUp(self):
+        self.faq = FaqResolver(PILIHAN)
+
+    def test_cari_kendaraan(self):
+        self.assertEqual(self.faq.cari_kendaraan("berapa harga G-Class?"), ["mb1"])
+        self.assertEqual(self.faq.cari_kendaraan("mb5 atau alphard?"), ["mb5", "mb6"])
+        self.assertEqual(self.faq.cari_kendaraan("sepeda listrik"), ["s1"])
+        self.assertEqual(self.faq.cari_kendaraan("sewa 48 hari"), [])
+
+    def test_harga_dan_warna(self):
+        self.assertEqual(self.faq.jawab("berapa harga G-Class?"), "Harga sewa G-Class (mb1): Rp 5.000.000 per hari.")
+        self.assertIn("Biru, Hitam", self.faq.jawab("warna r6 apa aja?"))
+
+    def test_sopir(self):
+        self.assertIn("tidak bisa", self.faq.jawab("r6 bisa pakai supir?"))
+        self.assertIn("Rp 250.000", self.faq.jawab("bisa sewa sopir?"))
+        self.assertEqual(self.faq.jawab("bisa sewa sopir?"),
+                         "Sopir bisa disewa untuk semua mobil dengan biaya Rp 250.000 per hari. "
+                         "Motor dan sepeda tidak termasuk.")
+        # Kendaraan yang boleh pakai sopir diambil dari cek_sopir (katalog), bukan teks tetap
+        faq = FaqResolver(PILIHAN, cek_sopir=lambda kode: kode in ("mb1", "mk5"))
+        self.assertEqual(faq.jawab("bisa sewa sopir?"),
+                         "Sopir bisa disewa untuk G-Class dan Sportster 48 dengan biaya Rp 250.000 per hari. "
+                         "Sepeda tidak termasuk.")
+        self.assertIn("sopir hanya untuk G-Class dan Sportster 48", faq.jawab("supra bisa pakai sopir?"))
+
+    def test_intent_spesifik_sebelum_harga(self):
+        self.assertEqual(self.faq.jawab("berapa pajak G-Class?"), "Semua penyewaan dikenakan pajak 10% dari subtotal.")
+        self.assertIn("diskon durasi 5%", self.faq.jawab("berapa diskon G-Class 7 hari?"))
+        self.assertIn("Estimasi total G-Class 7 hari", self.faq.jawab("berapa G-Class 7 hari?"))
+        self.assertEqual(self.faq.jawab("berapa harga G-Class?"), "Harga sewa G-Class (mb1): Rp 5.000.000 per hari.")
+
+    def test_diskon_dan_total(self):
+        self.assertIn("5%", self.faq.jawab("sewa 10 hari dapat diskon?"))
+        # 10 * (3.000.000 + 250.000) = 32.500.000, pajak 3.250.000, diskon 5% = 1.787.500
+        self.assertIn("Rp 33.962.500", self.faq.jawab("total supra 10 hari pakai sopir berapa?"))
+
+    def test_cari_budget(self):
+        self.assertEqual(cari_budget("di bawah Rp 30.000.000"), 30000000)
+        self.assertEqual(cari_budget("budget 30 juta untuk 10 hari"), 30000000)
+        self.assertEqual(cari_budget("maks 1,5jt"), 1500000)
+        self.assertEqual(cari_budget("cuma 500 ribu"), 500000)
+        self.assertIsNone(cari_budget("sewa 10 hari"))
+
+    def test_rekomendasi_budget(self):
+        katalog = Katalog(None, [
+            Kendaraan(k, nama, "Mobil" if k.startswith("mb") else "Motor" if k.startswith("mk") else "Sepeda",
+                      harga, tuple(warna), sopir=k.startswith("mb"))
+            for k, (nama, harga, warna) in PILIHAN.items()
+        ])
+        faq = FaqResolver(PILIHAN, katalog=katalog)
+        # Supra + sopir 10 hari = 33.962.500; G-Class/Alphard + sopir = 54.862.500
+        jawaban = faq.jawab("mobil terbaik apa yang bisa saya sewa 10 hari di bawah Rp 40 juta dengan sopir?")
+        self.assertTrue(jawaban.startswith("Rekomendasi mobil dengan sopir untuk 10 hari dengan budget "
+                                           "Rp 40.000.000: Toyota GR Supra (mb5) Rp 33.962.500"))
+        jawaban = faq.jawab("budget 30 juta 10 hari mobil pakai sopir")
+        self.assertIn("tidak ada mobil dengan sopir", jawaban)
+        self.assertIn("Pilihan termurah: Toyota GR Supra (mb5) Rp 33.962.500", jawaban)
+        self.assertIn("Yamaha R6 (mk2)", faq.jawab("motor hitam 3 hari budget 5 jt"))
+        self.assertIn("voucher HEMAT5", faq.jawab("rekomendasi 3 hari maksimal rp 100.000 pakai hemat5"))
+        # Tanpa katalog, pertanyaan budget diteruskan ke model
+        self.assertIsNone(self.faq.jawab("mobil terbaik 10 hari di bawah 40 juta"))
+
+    def test_rekomendasi_voucher_book(self):
+        katalog = Katalog(None, [
+            Kendaraan(k, nama, "Mobil" if k.startswith("mb") else "Motor" if k.startswith("mk") else "Sepeda",
+                      harga, tuple(warna), sopir=k.startswith("mb"))
+            for k, (nama, harga, warna) in PILIHAN.items()
+        ])
+        book = VoucherBook(":memory:",
+                           kategori_kendaraan=lambda kode: katalog[kode].kategori if kode in katalog else None)
+        self.addCleanup(book.close)
+        book.simpan_aturan(voucher_default() + [
+            buat_voucher({"kode": "KORPORAT-30", "persen": 0.3}),
+            buat_voucher({"kode": "MOTOR20", "persen": 0.2, "kategori": ["Motor"]}),
+            buat_voucher({"kode": "LAMA", "persen": 0.5, "sampai": "2020-01-01"}),
+        ])
+        faq = FaqResolver(PILIHAN, katalog=katalog, buka_voucher=lambda: book)
+        # Supra + sopir 10 hari = 33.962.500 -> voucher 30% = 23.773.750, masuk budget 30 juta
+        jawaban = faq.jawab("budget 30 juta 10 hari mobil pakai sopir pakai korporat-30")
+        self.assertIn("Toyota GR Supra (mb5) Rp 23.773.750", jawaban)
+        self.assertIn("voucher KORPORAT-30", jawaban)
+        self.assertEqual(faq.persen_voucher("MOTOR20", 3, "Motor"), (0.2, None))
+        self.assertEqual(faq.persen_voucher("MOTOR20", 3, "Mobil")[0], 0)
+        jawaban = faq.jawab("budget 30 juta 10 hari mobil pakai sopir voucher lama")
+        self.assertIn("tidak ada mobil dengan sopir", jawaban)
+        self.assertIn("Voucher LAMA sudah tidak berlaku.", jawaban)
+        self.assertEqual(faq.cari_voucher("rekomendasi 3 hari maksimal rp 100.000 pakai hemat5"), "HEMAT5")
+
+    def test_diteruskan_ke_model(self):
+        self.assertIsNone(self.faq.jawab("siapa yang membuat kamu?"))
+        self.assertIsNone(self.faq.jawab("ada voucher diskon?"))
+        self.assertIsNone(self.faq.jawab(""))
+
+if __name__ == "__main__":
+    unittest.main()
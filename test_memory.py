@@ -0,0 +1,102 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import rent
+from answer_cache import AnswerCache
+from memory import MemoriChat, MemoriSesi
+from retrieval import estimasi_token
+
+class TestMemoriChat(unittest.TestCase):
+    def test_giliran_terakhir_utuh_sisanya_diringkas(self):
+        memori = MemoriChat(maks_utuh=2)
+        memori.tambah("berapa harga G-Class?", "Harga G-Class Rp 5.000.000 per hari. Warna hitam, putih, silver.")
+        memori.tambah("ada sopir?", "Ada, Rp 250.000 per hari.")
+        memori.tambah("diskon?", "Diskon 5% untuk 7 hari.")
+        teks = memori.teks()
+        self.assertTrue(teks.startswith("Ringkasan percakapan sebelumnya:\n"))
+        self.assertIn("- Anda: berapa harga G-Class? -> Masyud: Harga G-Class Rp 5.000.000 per hari.", teks)
+        self.assertNotIn("Warna hitam", teks)
+        self.assertTrue(teks.endswith("Anda: ada sopir?\nMasyud: Ada, Rp 250.000 per hari.\n"
+                                      "Anda: diskon?\nMasyud: Diskon 5% untuk 7 hari."))
+        self.assertEqual(len(memori), 3)
+
+    def test_obrolan_panjang_tetap_di_bawah_budget(self):
+        memori = MemoriChat(budget_token=300, budget_ringkasan=100)
+        for i in range(500):
+            memori.tambah(f"pertanyaan nomor {i} " * (i % 7 + 1), f"Jawaban {i}. " + "lanjutan " * (i % 50))
+            self.assertLessEqual(estimasi_token(memori.teks()), 300)
+        # Pertanyaan terbaru tetap ada, yang paling awal sudah bergulir keluar dari ringkasan
+        self.assertIn("pertanyaan nomor 499", memori.teks())
+        self.assertNotIn("pertanyaan nomor 0 ", memori.teks())
+
+    def test_peringkas_dipanggil_sekali_per_pemadatan(self):
+        peringkas = MagicMock(side_effect=lambda lama, giliran: f"{lama}+{len(giliran)}")
+        memori = MemoriChat(maks_utuh=1, peringkas=peringkas)
+        for i in range(3):
+            memori.tambah(f"q{i}", f"a{i}")
+        memori.teks()
+        memori.teks()
+        self.assertEqual(peringkas.call_count, 2)
+        self.assertEqual(memori.ringkasan, "+1+1")
+
+class TestMemoriSesi(unittest.TestCase):
+    def test_per_sesi_dan_lru(self):
+        sesi = MemoriSesi(maks_sesi=2)
+        a, b = sesi.ambil("a"), sesi.ambil("b")
+        self.assertIs(sesi.ambil("a"), a)
+        # "a" baru dipakai, jadi "b" yang dibuang
+        sesi.ambil("c")
+        self.assertEqual(len(sesi), 2)
+        self.assertIs(sesi.ambil("a"), a)
+        self.assertIsNot(sesi.ambil("b"), b)
+        sesi.hapus("b")
+        self.assertEqual(len(sesi), 1)
+
+class TestPromptPerSesi(unittest.TestCase):
+    def setUp(self):
+        self.prompts = []
+        def generate_content(prompt):
+            self.prompts.append(prompt)
+            return MagicMock(text=f"jawaban {len(self.prompts)}", fallback=False)
+        self.model = MagicMock()
+        self.model.generate_content.side_effect = generate_content
+        self.cache = cache = AnswerCache()  # Di memori, tanpa file
+        self.patches = [
+            patch("rent.siapkan_ai"), patch("rent.ai", self.model), patch("rent.answer_cache", cache),
+            patch("rent.muat_context", return_value="ctx"), patch("rent.konteks_relevan", return_value="ctx"),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+
+    def test_riwayat_pelanggan_lain_tidak_ikut(self):
+        sesi = MemoriSesi()
+        ani, budi = sesi.ambil("ani"), sesi.ambil("budi")
+        rent.jawab_masyud("rahasia ani: alamat saya jalan melati", memori=ani)
+        rent.jawab_masyud("bolehkah bayar dengan kartu kredit?", memori=budi)
+        rent.jawab_masyud("kalau dicicil bagaimana?", memori=budi)
+        self.assertNotIn("melati", self.prompts[1])
+        self.assertNotIn("melati", self.prompts[2])
+        self.assertIn("Anda: bolehkah bayar dengan kartu kredit?\nMasyud: jawaban 2", self.prompts[2])
+        # Jawaban FAQ lokal juga masuk memori sesi
+        rent.jawab_masyud("berapa harga G-Class?", memori=ani)
+        self.assertEqual(len(self.prompts), 3)
+        self.assertIn("G-Class", ani.teks())
+
+    def test_jawaban_lanjutan_tidak_dibagi_lewat_cache(self):
+        sesi = MemoriSesi()
+        ani, budi, citra = sesi.ambil("ani"), sesi.ambil("budi"), sesi.ambil("citra")
+        rent.jawab_masyud("ada mobil listrik?", memori=ani)
+        self.assertEqual(rent.jawab_masyud("yang itu berapa?", memori=ani), "jawaban 2")
+        rent.jawab_masyud("ada mobil klasik?", memori=budi)
+        # Riwayat Budi berbeda: pertanyaan lanjutan yang sama tetap ke model, bukan jawaban Ani
+        self.assertEqual(rent.jawab_masyud("yang itu berapa?", memori=budi), "jawaban 4")
+        self.assertEqual(self.cache.stats()["size"], 2)
+        # Pertanyaan pertama tanpa riwayat tetap memakai cache
+        self.assertEqual(rent.jawab_masyud("ada mobil listrik?", memori=citra), "jawaban 1")
+        self.assertEqual(len(self.prompts), 4)
+
+if __name__ == '__main__':
+    unittest.main()
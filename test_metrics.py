@@ -0,0 +1,111 @@
+import os
+import pstats
+import signal
+import tempfile
+import unittest
+import urllib.error
+import urllib.request
+from unittest.mock import patch
+import metrics
+import rent
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        metrics.reset()
+        metrics.aktifkan(True)
+
+    def tearDown(self):
+        metrics.aktifkan(False)
+        metrics.reset()
+
+    def test_mati_tidak_mencatat(self):
+        metrics.aktifkan(False)
+        self.assertIs(metrics.ukur("input_user"), metrics.ukur("ai"))
+        with metrics.ukur("input_user"):
+            pass
+        metrics.hitung("jawaban_total", sumber="faq")
+        self.assertEqual(metrics.diukur("x")(lambda a: a * 2)(21), 42)
+        self.assertEqual(metrics.snapshot(), {"histogram": {}, "penghitung": {}})
+        self.assertEqual(metrics.teks_prometheus(), "\n")
+
+    def test_format_prometheus(self):
+        for detik in (0.002, 0.002, 0.3, 500):
+            metrics.catat_waktu("ai", detik)
+        metrics.amati("prompt_karakter", 1200)
+        metrics.hitung("jawaban_total", sumber="faq")
+        metrics.hitung("jawaban_total", 2, sumber="faq")
+        teks = metrics.teks_prometheus()
+        self.assertIn("# TYPE apen_tahap_detik histogram", teks)
+        self.assertIn('apen_tahap_detik_bucket{tahap="ai",le="0.001"} 0\n', teks)
+        self.assertIn('apen_tahap_detik_bucket{tahap="ai",le="0.005"} 2\n', teks)
+        self.assertIn('apen_tahap_detik_bucket{tahap="ai",le="300"} 3\n', teks)
+        self.assertIn('apen_tahap_detik_bucket{tahap="ai",le="+Inf"} 4\n', teks)
+        self.assertIn('apen_tahap_detik_count{tahap="ai"} 4\n', teks)
+        self.assertIn('apen_prompt_karakter_bucket{le="2000"} 1\n', teks)
+        self.assertIn("# TYPE apen_jawaban_total counter", teks)
+        self.assertIn('apen_jawaban_total{sumber="faq"} 3\n', teks)
+
+    def test_diukur_tetap_mencatat_saat_error(self):
+        @metrics.diukur("gagal")
+        def gagal():
+            raise ValueError("x")
+        with self.assertRaises(ValueError):
+            gagal()
+        self.assertEqual(metrics.snapshot()["histogram"][("tahap_detik", (("tahap", "gagal"),))][0], 1)
+
+    def test_http_dan_file(self):
+        metrics.hitung("jawaban_total", sumber="ai")
+        server = metrics.mulai_http(0)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}"
+            with urllib.request.urlopen(url + "/metrics", timeout=5) as r:
+                self.assertIn("text/plain", r.headers["Content-Type"])
+                self.assertIn('apen_jawaban_total{sumber="ai"} 1', r.read().decode("utf-8"))
+            with self.assertRaises(urllib.error.HTTPError):
+                urllib.request.urlopen(url + "/lain", timeout=5)
+        finally:
+            server.shutdown()
+            server.server_close()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "apen.prom")
+            metrics.tulis_file(path)
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(f.read(), metrics.teks_prometheus())
+            self.assertEqual(os.listdir(tmp), ["apen.prom"])
+
+    @unittest.skipUnless(hasattr(signal, "SIGUSR1"), "butuh SIGUSR1")
+    def test_sinyal_profil(self):
+        lama = signal.getsignal(signal.SIGUSR1)
+        with tempfile.TemporaryDirectory() as tmp:
+            try:
+                self.assertTrue(metrics.pasang_sinyal_profil(tmp))
+                os.kill(os.getpid(), signal.SIGUSR1)
+                sum(i * i for i in range(1000))
+                os.kill(os.getpid(), signal.SIGUSR1)
+            finally:
+                signal.signal(signal.SIGUSR1, lama)
+            file = os.listdir(tmp)
+            self.assertEqual(len(file), 1)
+            self.assertTrue(file[0].endswith(".pstats"))
+            pstats.Stats(os.path.join(tmp, file[0]))
+
+    def test_dari_env(self):
+        metrics.aktifkan(False)
+        self.assertFalse(metrics.dari_env({}))
+        self.assertFalse(metrics.aktif)
+        self.assertTrue(metrics.dari_env({"APEN_METRIK": "1"}))
+        self.assertTrue(metrics.aktif)
+
+    @patch("builtins.input", side_effect=["halomas", "berapa harga G-Class?", "keluar", "mb1"])
+    @patch("rent.save_chat")
+    def test_tahap_rent(self, mock_save, mock_input):
+        with patch("builtins.print"):
+            rent.input_user("Masukan jenis kendaraan: ", choices=["mb1"])
+        data = metrics.snapshot()
+        tahap = {dict(label)["tahap"]: n for (nama, label), (n, _) in data["histogram"].items()}
+        self.assertEqual(tahap["input_user"], 2)
+        self.assertEqual(tahap["tanya_masyud"], 1)
+        self.assertEqual(data["penghitung"][("jawaban_total", (("sumber", "faq"),))], 1)
+
+if __name__ == '__main__':
+    unittest.main()
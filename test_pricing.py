@@ -0,0 +1,65 @@
+import unittest
+import pricing
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+PILIHAN = {
+    "mb1": ("G-Class", 5000000, ["Hitam", "Putih", "Silver"]),
+    "mb3": ("Porsche 911", 2800000, ["Kuning", "Putih"]),
+    "mk2": ("Yamaha R6", 700000, ["Biru", "Hitam"]),
+    "s2": ("Sepeda", 10000, ["Biru", "Merah", "Hijau"]),
+}
+
+class TestQuote(unittest.TestCase):
+    def test_format_rupiah(self):
+        self.assertEqual(pricing.format_rupiah(1250000), "1.250.000")
+
+    def test_quote_tanpa_diskon(self):
+        rincian = pricing.quote(700000, 3)
+        self.assertEqual(rincian["subtotal"], 2100000)
+        self.assertEqual(rincian["pajak"], 210000)
+        self.assertEqual(rincian["diskon"], 0)
+        self.assertEqual(rincian["grandTotal"], 2310000)
+
+    def test_quote_sopir_diskon_voucher(self):
+        rincian = pricing.quote(5000000, 14, pricing.HARGA_SOPIR, "merdeka17")
+        self.assertEqual(rincian["totalHargaSopir"], 3500000)
+        self.assertEqual(rincian["subtotal"], 73500000)
+        self.assertEqual(rincian["pajak"], int(73500000 * 0.10))
+        self.assertEqual(rincian["diskon"], int(80850000 * 0.10))
+        self.assertEqual(rincian["diskonVoucher"], int(72765000 * 0.17))
+        self.assertEqual(rincian["voucher"], "MERDEKA17")
+        self.assertEqual(rincian["grandTotal"], 72765000 - int(72765000 * 0.17))
+
+    def test_quote_voucher_tidak_valid(self):
+        rincian = pricing.quote(10000, 7, voucher="GRATIS")
+        self.assertEqual(rincian["diskonVoucher"], 0)
+        self.assertEqual(rincian["diskonPersen"], 0.05)
+
+    def test_quote_hari_tidak_valid(self):
+        with self.assertRaises(ValueError):
+            pricing.quote(10000, 0)
+
+@unittest.skipIf(numpy is None, "numpy tidak terpasang")
+class TestQuoteBatch(unittest.TestCase):
+    def test_batch_sama_dengan_quote(self):
+        kode = ["mb1", "mk2", "s2", "mb3", "mk2", "mb1"]
+        hari = [1, 7, 14, 13, 30, 6]
+        sopir = [True, True, False, True, False, False]
+        voucher = ["", "hemat5", "MERDEKA17", "SALAH", "", "HEMAT5"]
+        hasil = pricing.quote_batch(PILIHAN, kode, hari, sopir, voucher)
+        for i, k in enumerate(kode):
+            hargaSopir = pricing.HARGA_SOPIR if sopir[i] and pricing.bisa_sopir(k) else 0
+            satu = pricing.quote(PILIHAN[k][1], hari[i], hargaSopir, voucher[i])
+            for key, nilai in hasil.items():
+                self.assertEqual(nilai[i], satu[key], f"{key} baris {i}")
+
+    def test_batch_kode_tidak_valid(self):
+        with self.assertRaises(ValueError):
+            pricing.quote_batch(PILIHAN, ["xx9"], [1], [False], [""])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import datetime
+import json
+import os
+import tempfile
+import unittest
+import rekaman
+from rekaman import CHAT, Perekam, baca_rekaman, ringkas_hasil
+from session import SesiSewa
+
+PILIHAN = {"mb1": ("G-Class", 5000000, ["Hitam", "Putih", "Silver"])}
+MASUKAN = ["mb1", "hitam", "Y", "Y", "7", "Budi", "Jl. Mawar", "0812", "L", "1", "3201", "hemat5", "1", "50000000"]
+
+def sesi_selesai(**kwargs):
+    sesi = SesiSewa(PILIHAN, tulis=lambda *a, **k: None, struk_path=None)
+    sesi.mulai()
+    for j in MASUKAN:
+        sesi.kirim(j)
+    sesi.data.update(kwargs)
+    return sesi
+
+class TestRekaman(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "rekaman.jsonl")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_perekam_menambah_satu_baris_per_sesi(self):
+        perekam = Perekam(self.path)
+        for nama in ("Budi", "Ani"):
+            sesi = sesi_selesai(nama=nama)
+            perekam.mulai(datetime.date(2025, 8, 17))
+            perekam.masukan("kendaraan", "mb1")
+            perekam.chat("ada diskon?", "Ada, 5% untuk 7 hari.")
+            perekam.selesai(sesi.data)
+        daftar = list(baca_rekaman(self.path))
+        self.assertEqual(len(daftar), 2)
+        self.assertEqual(daftar[0]["tanggal"], "2025-08-17")
+        self.assertEqual(daftar[0]["masukan"], [["kendaraan", "mb1"], [CHAT, "ada diskon?", "Ada, 5% untuk 7 hari."]])
+        self.assertEqual(daftar[0]["hasil"]["grandTotal"], 36483563)
+        # Isi struk berbeda -> hash struk berbeda, total tetap sama
+        self.assertNotEqual(daftar[0]["hasil"]["struk"], daftar[1]["hasil"]["struk"])
+        self.assertEqual(daftar[0]["hasil"]["grandTotal"], daftar[1]["hasil"]["grandTotal"])
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(json.loads(f.readline())["v"], rekaman.VERSI)
+
+    def test_ringkas_hasil(self):
+        hasil = ringkas_hasil(sesi_selesai().data)
+        self.assertEqual(hasil["pembayaran"], "Tunai")
+        self.assertEqual(hasil["kembalian"], 50000000 - 36483563)
+        self.assertNotIn("nama", hasil)
+        self.assertEqual(len(hasil["struk"]), 16)
+
+    def test_dari_env(self):
+        self.assertIsNone(rekaman.dari_env({}))
+        self.assertEqual(rekaman.dari_env({"APEN_REKAM": self.path}).path, self.path)
+
+if __name__ == "__main__":
+    unittest.main()
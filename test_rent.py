@@ -1,6 +1,16 @@
+import datetime
+import functools
+import json
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
 from unittest.mock import patch
 import rent
+from availability import Ketersediaan
+from store import BookingStore
+from vouchers import VoucherBook, buat_voucher, voucher_default
 
 class TestRentUtils(unittest.TestCase):
     def test_format_rupiah(self):
@@ -29,5 +39,112 @@ class TestRentUtils(unittest.TestCase):
         result = rent.input_user("Pilih warna: ", choices=["Merah", "Putih"], capitalize=True)
         self.assertEqual(result, "Merah")
 
+class TestKatalogRent(unittest.TestCase):
+    def test_hot_reload_memperbarui_pilihan(self):
+        with open(rent.katalog.path, encoding="utf-8") as f:
+            isi = json.load(f)
+        isi[0]["harga"] = 5100000
+        isi.append({"kode": "mb7", "nama": "Toyota Avanza", "kategori": "Mobil", "harga": 400000,
+                    "warna": ["Putih"], "sopir": True})
+        pilihan = rent.pilihan
+        path_lama = rent.katalog.path
+        with tempfile.TemporaryDirectory() as tmp:
+            rent.katalog.path = os.path.join(tmp, "katalog.json")
+            with open(rent.katalog.path, "w", encoding="utf-8") as f:
+                json.dump(isi, f)
+            try:
+                tabel = rent.teks_tabel_awal()
+                self.assertIs(rent.pilihan, pilihan)
+                self.assertEqual(rent.pilihan["mb1"][1], 5100000)
+                self.assertIn("7  | Toyota Avanza - Rp 400.000/hari", tabel)
+                self.assertIn("Toyota Avanza", rent.faq_resolver.jawab("berapa harga avanza?"))
+            finally:
+                rent.katalog.path = path_lama
+                rent.segarkan_katalog()
+        self.assertEqual(rent.pilihan["mb1"][1], 5000000)
+        self.assertNotIn("mb7", rent.pilihan)
+
+class TestRekomendasi(unittest.TestCase):
+    def setUp(self):
+        # Voucher dari database sementara, bukan booking.db di direktori kerja
+        book = VoucherBook(":memory:", kategori_kendaraan=rent.kategori_kendaraan)
+        book.simpan_aturan(voucher_default() + [buat_voucher({"kode": "MITRA", "persen": 0.4})])
+        self.addCleanup(book.close)
+        patcher = patch.object(rent, "voucher_book", book)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_voucher_dari_voucher_book(self):
+        tanpa = rent.rekomendasi(10, 30000000, kategori="Mobil", sopir=True, k=50)
+        dengan = rent.rekomendasi(10, 30000000, kategori="Mobil", sopir=True, voucher="MITRA", k=50)
+        self.assertGreater(len(dengan), len(tanpa))
+        self.assertTrue(all(r["voucher"] == "MITRA" and r["diskonVoucher"] > 0 for _, r in dengan))
+        self.assertIn("voucher MITRA", rent.faq_resolver.jawab("mobil 10 hari di bawah 30 juta pakai sopir mitra"))
+
+    def test_menu_dan_masyud_memakai_katalog_yang_sama(self):
+        hasil = rent.rekomendasi(10, 60000000, kategori="Mobil", sopir=True, k=2)
+        self.assertEqual(len(hasil), 2)
+        self.assertTrue(all(v.sopir and r["grandTotal"] <= 60000000 for v, r in hasil))
+        teks = rent.teks_rekomendasi(10, 60000000, kategori="Mobil", sopir=True)
+        self.assertIn(f"{hasil[0][0].nama} ({hasil[0][0].kode})", teks)
+        self.assertEqual(rent.faq_resolver.jawab("mobil apa yang bisa disewa 10 hari di bawah 60 juta pakai sopir?"),
+                         teks)
+
+class TestMain(unittest.TestCase):
+    def test_sesi_terputus_melepas_unit_dan_voucher(self):
+        book = VoucherBook(":memory:", kategori_kendaraan=rent.kategori_kendaraan)
+        book.simpan_aturan([buat_voucher({"kode": "SEKALI", "persen": 0.1, "kuota": 1})])
+        self.addCleanup(book.close)
+        ketersediaan = Ketersediaan(rent.unit_katalog())
+        store = BookingStore(":memory:")
+        self.addCleanup(store.close)
+        semua_unit = ketersediaan.unit_tersedia("mb1", datetime.date.today(), 7)
+        masukan = ["mb1", "hitam", "Y", "Y", "7", "Budi", "Jl. Mawar", "0812", "L", "1", "3201", "sekali"]
+        with patch.object(rent, "perekam", None), \
+             patch.object(rent, "booking_store", store), \
+             patch.object(rent, "ketersediaan", ketersediaan), \
+             patch.object(rent, "voucher_book", book), \
+             patch.object(rent, "prewarm_ai", lambda: None), \
+             patch.object(rent, "memori_sesi") as memori_sesi, \
+             patch.object(rent, "buat_sesi", functools.partial(rent.buat_sesi, tulis=lambda *a, **k: None,
+                                                              struk_path=None, jeda_ulang=0)), \
+             patch("builtins.input", side_effect=masukan + [EOFError()]), patch("builtins.print"):
+            self.assertEqual(book.sisa("SEKALI"), 1)
+            with self.assertRaises(EOFError):
+                rent.main()
+        # Voucher sudah dipakai dan unit sudah dipesan sebelum EOF; keduanya dikembalikan
+        self.assertEqual(book.sisa("SEKALI"), 1)
+        self.assertEqual(ketersediaan.unit_tersedia("mb1", datetime.date.today(), 7), semua_unit)
+        memori_sesi.hapus.assert_called_once()
+
+class TestImportTime(unittest.TestCase):
+    # Batas waktu import rent (ms), diukur dengan `python -X importtime`
+    BATAS_MS = 500
+    # http.server hanya untuk endpoint metrik opsional (metrics.mulai_http)
+    MODUL_BERAT = ("google", "dotenv", "numpy", "http.server")
+
+    def test_import_ringan(self):
+        hasil = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import rent"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stdin=subprocess.DEVNULL, capture_output=True, text=True, timeout=60,
+        )
+        self.assertEqual(hasil.returncode, 0, hasil.stderr)
+        kumulatif = {}
+        for baris in hasil.stderr.splitlines():
+            if not baris.startswith("import time:") or "|" not in baris:
+                continue
+            _, total, nama = baris.split("|")
+            if total.strip().isdigit():
+                kumulatif[nama.strip()] = int(total)
+        self.assertIn("rent", kumulatif)
+        # SDK AI tidak boleh ikut dimuat saat import
+        for modul in kumulatif:
+            self.assertFalse(modul.startswith(self.MODUL_BERAT), modul)
+        self.assertLess(kumulatif["rent"] / 1000, self.BATAS_MS)
+
+    def test_ai_belum_dimuat(self):
+        self.assertIsNone(rent.ai)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,133 @@
+import functools
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import rent
+import replay
+from ai_client import ResilientClient
+from answer_cache import AnswerCache
+from availability import Ketersediaan
+from chatlog import ChatLog, ChatWriter
+from rekaman import CHAT, baca_rekaman
+from store import BookingStore
+from vouchers import VoucherBook, buat_voucher, voucher_default
+
+TUNAI = ["mb1", "hitam", "Y", "Y", "7", "Budi", "Jl. Mawar", "0812", "L", "1", "3201", "hemat5", "1", "1000",
+         "50000000"]
+TRANSFER = ["mk2", "biru", "Y", "3", "Ani", "Jl", "0813", "P", "3", "999", "", "2"]
+
+def diam(*args, **kwargs):
+    pass
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "rekaman.jsonl")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def rekam(self, masukan, aturan=()):
+        """Menjalankan rent.main() dengan input palsu dan APEN_REKAM aktif."""
+        db = os.path.join(self.tmp.name, "booking.db")
+        writer = ChatWriter(ChatLog(os.path.join(self.tmp.name, "chatlog.txt")))
+        vouchers = VoucherBook(db, kategori_kendaraan=rent.kategori_kendaraan)
+        vouchers.simpan_aturan(voucher_default() + [buat_voucher(a) for a in aturan])
+        model = replay.ModelRekaman()
+        model.jawaban = "Klaim asuransi diproses 3 hari kerja."
+        with patch.dict(os.environ, {"APEN_REKAM": self.path}), \
+             patch.object(rent, "perekam", None), \
+             patch.object(rent, "booking_store", BookingStore(db)), \
+             patch.object(rent, "ketersediaan", Ketersediaan(rent.unit_katalog())), \
+             patch.object(rent, "voucher_book", vouchers), \
+             patch.object(rent, "ai", ResilientClient(model, retries=0)), \
+             patch.object(rent, "answer_cache", AnswerCache()), \
+             patch.object(rent, "CONTEXT_FILE", replay.CONTEXT_FILE), \
+             patch.object(rent, "chat_writer", writer), \
+             patch.object(rent, "JEDA_ULANG", 0), \
+             patch.object(rent, "prewarm_ai", lambda: None), \
+             patch.object(rent, "buat_sesi", functools.partial(rent.buat_sesi, tulis=diam, struk_path=None)), \
+             patch("builtins.input", side_effect=masukan), patch("builtins.print"):
+            rent.main()
+        writer.close()
+        vouchers.close()
+        return list(baca_rekaman(self.path))[-1]
+
+    def putar(self, *argv):
+        with patch("builtins.print") as cetak:
+            kode = replay.main([self.path, *argv])
+        return kode, cetak.call_args[0][0]
+
+    def test_rekam_lalu_putar_ulang_cocok(self):
+        chat = ["halo mas", "berapa harga G-Class?", "bagaimana klaim asuransi?", "pelajari masyud", "keluar"]
+        r = self.rekam(["xx9"] + chat + TUNAI)
+        self.assertEqual(r["masukan"][0], ["kendaraan", "xx9"])
+        self.assertEqual([m[1] for m in r["masukan"] if m[0] == CHAT],
+                         ["berapa harga G-Class?", "bagaimana klaim asuransi?", "pelajari masyud"])
+        self.assertEqual(r["masukan"][2][2], "Klaim asuransi diproses 3 hari kerja.")
+        self.assertEqual(r["hasil"]["grandTotal"], 36483563)
+        self.rekam(TRANSFER)
+
+        kode, teks = self.putar("--ulang", "3", "--json")
+        laporan = json.loads(teks)
+        self.assertEqual(kode, 0)
+        self.assertEqual((laporan["sesi"], laporan["cocok"], laporan["beda"]), (6, 6, 0))
+        # Jeda memuat ulang tidak benar-benar ditunggu
+        self.assertEqual(laporan["tungguDilewati"], 3 * rent.JEDA_ULANG)
+        self.assertEqual(laporan["prompt"][CHAT]["n"], 9)
+        self.assertEqual(laporan["prompt"]["pembayaran"]["n"], 6)
+        # Klien AI dan cache global dikembalikan
+        self.assertIsNone(rent.ai)
+        self.assertIsNone(rent.answer_cache)
+
+    def test_hasil_berbeda_dilaporkan(self):
+        r = self.rekam(TUNAI)
+        r["hasil"]["grandTotal"] += 1
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(r) + "\n")
+        kode, teks = self.putar()
+        self.assertEqual(kode, 1)
+        self.assertIn("1 sesi diputar ulang", teks)
+        self.assertIn("#1: grandTotal rekaman 36483564 != putar ulang 36483563", teks)
+
+    def test_alur_berbeda_dilaporkan(self):
+        r = self.rekam(TRANSFER)
+        # Rekaman lama: mk2 dulu bisa pakai sopir
+        r["masukan"].insert(3, ["sopir", "Y"])
+        pemutar = replay.Pemutar()
+        laporan = pemutar.jalankan([r, self.rekam(TRANSFER)])
+        pemutar.close()
+        self.assertEqual((laporan["cocok"], laporan["beda"]), (1, 1))
+        self.assertEqual(laporan["contohBeda"][0][0], 1)
+        self.assertIn("langkah 'sopir', sesi di langkah 'hari'", laporan["contohBeda"][0][1])
+
+    def test_voucher_dari_database_ikut_terekam(self):
+        korporat = {"kode": "KORPORAT", "persen": 0.2, "kategori": ["Mobil"], "kuota": 1, "perPelanggan": 1}
+        r = self.rekam(TUNAI[:11] + ["korporat"] + TUNAI[12:], aturan=[korporat])
+        self.assertEqual(r["voucher"], {"kode": "KORPORAT", "persen": 0.2, "kategori": ["Mobil"], "kuota": 1,
+                                        "perPelanggan": 1, "gabung": True})
+        self.assertEqual(r["hasil"]["voucher"], "KORPORAT")
+        self.assertGreater(r["hasil"]["diskonVoucher"], 0)
+        self.assertNotIn("voucher", self.rekam(TRANSFER))
+
+        # Kuota voucher di database asli tidak ikut terpakai walaupun --db menunjuk ke sana
+        db = os.path.join(self.tmp.name, "booking.db")
+        kode, teks = self.putar("--ulang", "3", "--json", "--db", db)
+        laporan = json.loads(teks)
+        self.assertEqual((kode, laporan["cocok"], laporan["beda"]), (0, 6, 0))
+        vouchers = VoucherBook(db)
+        self.assertEqual(vouchers.sisa("KORPORAT"), 0)
+        vouchers.close()
+
+    def test_chat_dicatat_ke_chatlog(self):
+        self.rekam(["halo mas", "ada diskon?", "keluar"] + TRANSFER)
+        chatlog = os.path.join(self.tmp.name, "replay.txt")
+        self.putar("--chatlog", chatlog)
+        teks = "\n".join(f"{role}: {text}" for role, text in ChatLog(chatlog).tail(4))
+        self.assertIn("Anda: ada diskon?", teks)
+        self.assertTrue(teks.endswith(f"Masyud: {rent.PAMIT_MASYUD}"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+import retrieval
+
+CONTEXT = """Personalitas
+Namamu: Masyud
+====
+
+Daftar harga kendaraan:
+Mobil:
+- G-Class: Rp 5.000.000, Hitam, Putih, Silver
+
+Motor:
+- Yamaha R6: Rp 700.000, Biru, Hitam
+
+Jaminan
+- KTP dengan NIKnya
+
+Metode Pembayaran:
+- Tunai
+- Transfer
+
+Pajak:
+- Semua kendaraan dikenakan pajak 10%
+"""
+
+class TestRetrieval(unittest.TestCase):
+    def setUp(self):
+        self.index = retrieval.ContextIndex(CONTEXT)
+
+    def test_split_sections(self):
+        personalitas, bagian = retrieval.split_sections(CONTEXT)
+        self.assertEqual(personalitas, "Personalitas\nNamamu: Masyud")
+        self.assertEqual(len(bagian), 5)
+
+    def test_stem_konsisten(self):
+        self.assertEqual(retrieval.stem("jaminannya"), retrieval.stem("jaminan"))
+        self.assertEqual(retrieval.stem("pembayaran"), retrieval.stem("bayar"))
+        self.assertEqual(retrieval.stem("supir"), "sopir")
+
+    def test_search_relevan(self):
+        teratas = self.index.search("bisa bayar pakai apa?", k=1)
+        self.assertIn("Pembayaran", self.index.sections[teratas[0][1]])
+        teratas = self.index.search("harga yamaha r6", k=1)
+        self.assertIn("Yamaha R6", self.index.sections[teratas[0][1]])
+
+    def test_build_context_personalitas_selalu_ikut(self):
+        hasil = self.index.build_context("halo", k=3)
+        self.assertEqual(hasil, "Personalitas\nNamamu: Masyud")
+        hasil = self.index.build_context("jaminannya apa?", k=3)
+        self.assertTrue(hasil.startswith("Personalitas"))
+        self.assertIn("KTP", hasil)
+        self.assertNotIn("Yamaha", hasil)
+
+    def test_build_context_batas_token(self):
+        hasil = self.index.build_context("harga pajak jaminan pembayaran yamaha", k=5, max_tokens=10)
+        bagian = hasil.split("\n\n")[1:]
+        self.assertLessEqual(sum(retrieval.estimasi_token(b) for b in bagian), 10)
+
+if __name__ == "__main__":
+    unittest.main()
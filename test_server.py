@@ -0,0 +1,104 @@
+import asyncio
+import datetime
+import unittest
+from unittest.mock import patch
+import rent
+import server
+from availability import Ketersediaan
+from store import BookingStore
+from vouchers import VoucherBook, voucher_default
+
+JAWABAN = {
+    "jenis kendaraan": "mb1", "warna": "Hitam", "yakin": "Y", "sopir": "Y", "jumlah hari": "7",
+    "nama": "Budi", "alamat": "Jl. Mawar", "telepon": "0812", "jenis kelamin": "L",
+    "jenis jaminan": "1", "nik": "3201", "voucher": "", "metode pembayaran": "2",
+}
+
+async def pelanggan(port, chat=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    output, prompts = [], []
+    try:
+        while True:
+            baris = (await reader.readline()).decode("utf-8")
+            if not baris:
+                return output, prompts
+            if not baris.startswith(server.PROMPT_PREFIX):
+                output.append(baris)
+                continue
+            prompt = baris[len(server.PROMPT_PREFIX):].strip()
+            prompts.append(prompt)
+            if chat:
+                jawaban = chat.pop(0)
+            else:
+                jawaban = next(v for k, v in JAWABAN.items() if k in prompt.lower())
+            writer.write((jawaban + "\n").encode("utf-8"))
+            await writer.drain()
+    finally:
+        writer.close()
+
+async def jalankan(*pelanggan_pelanggan):
+    srv = await server.mulai_server("127.0.0.1", 0, jeda_ulang=0)
+    port = srv.sockets[0].getsockname()[1]
+    try:
+        return await asyncio.wait_for(asyncio.gather(*(p(port) for p in pelanggan_pelanggan)), 30)
+    finally:
+        srv.close()
+        await srv.wait_closed()
+
+@patch("rent.save_chat")
+class TestServer(unittest.TestCase):
+    def setUp(self):
+        self.store_lama = rent.booking_store, rent.ketersediaan, rent.voucher_book
+        rent.booking_store = BookingStore(":memory:")
+        rent.ketersediaan = Ketersediaan({kode: 100 for kode in rent.pilihan})
+        rent.voucher_book = VoucherBook(":memory:", kategori_kendaraan=rent.kategori_kendaraan)
+        rent.voucher_book.simpan_aturan(voucher_default())
+
+    def tearDown(self):
+        rent.booking_store.close()
+        rent.voucher_book.close()
+        rent.booking_store, rent.ketersediaan, rent.voucher_book = self.store_lama
+
+    def test_banyak_sesi_bersamaan(self, mock_save):
+        hasil = asyncio.run(jalankan(*[pelanggan] * 20))
+        self.assertEqual(len(hasil), 20)
+        for output, prompts in hasil:
+            teks = "".join(output)
+            self.assertIn("Apen Al-wawi Rent", teks)
+            self.assertIn("Total yang harus ditransfer: Rp38.403.750", teks)
+            self.assertIn("Terima kasih atas penyewaan Anda!", teks)
+            self.assertEqual(prompts[0], "Masukan jenis kendaraan yang akan di sewa :")
+        self.assertEqual(rent.booking_store.jumlah(), 20)
+        self.assertEqual(len(rent.ketersediaan.unit_tersedia("mb1", datetime.date.today(), 7)), 80)
+
+    def test_putus_sebelum_bayar_melepas_unit(self, mock_save):
+        async def putus(port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            for jawaban in ["mb1", "Hitam", "Y", "T", "3"]:
+                writer.write((jawaban + "\n").encode("utf-8"))
+            await writer.drain()
+            while not (await reader.readline()).startswith(b"?> Masukan nama"):
+                pass
+            self.assertEqual(len(rent.ketersediaan.unit_tersedia("mb1", datetime.date.today(), 3)), 99)
+            writer.close()
+            await reader.read()
+        asyncio.run(jalankan(putus))
+        self.assertEqual(len(rent.ketersediaan.unit_tersedia("mb1", datetime.date.today(), 3)), 100)
+
+    def test_chat_masyud_lalu_lanjut_sewa(self, mock_save):
+        chat = ["halo mas", "berapa harga G-Class?", "keluar"]
+        hasil = asyncio.run(jalankan(lambda port: pelanggan(port, chat)))
+        output, prompts = hasil[0]
+        teks = "".join(output)
+        self.assertIn("Rp 5.000.000 per hari", teks)
+        self.assertEqual(prompts[1:3], ["Anda:", "Anda:"])
+        self.assertIn("Terima kasih atas penyewaan Anda!", teks)
+
+    def test_kode_tidak_valid_tidak_menghambat(self, mock_save):
+        chat = ["xx9"]
+        hasil = asyncio.run(jalankan(lambda port: pelanggan(port, chat)))
+        output, prompts = hasil[0]
+        self.assertEqual(prompts[:2], ["Masukan jenis kendaraan yang akan di sewa :"] * 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+import datetime
+import io
+import os
+import tempfile
+import unittest
+import session
+from session import SesiSewa
+from availability import Ketersediaan
+from store import BookingStore
+from vouchers import Voucher, VoucherBook
+
+PILIHAN = {
+    "mb1": ("G-Class", 5000000, ["Hitam", "Putih", "Silver"]),
+    "mk2": ("Yamaha R6", 700000, ["Biru", "Hitam"]),
+}
+
+def jalankan(sesi, jawaban):
+    sesi.mulai()
+    for j in jawaban:
+        if sesi.tunggu:
+            sesi.lanjut()
+        sesi.kirim(j)
+    return sesi
+
+class TestSesiSewa(unittest.TestCase):
+    def setUp(self):
+        self.out = io.StringIO()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.struk = os.path.join(self.tmp.name, "struk.txt")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def sesi(self, **kwargs):
+        kwargs.setdefault("struk_path", self.struk)
+        return SesiSewa(PILIHAN, tulis=lambda *a, **k: print(*a, file=self.out, **k), **kwargs)
+
+    def test_alur_tunai_lengkap(self):
+        sesi = jalankan(self.sesi(), ["mb1", "hitam", "y", "Y", "7", "Budi", "Jl. Mawar", "0812", "L",
+                                      "1", "3201", "hemat5", "1", "1000", "50000000"])
+        self.assertTrue(sesi.selesai)
+        d = sesi.data
+        self.assertEqual(d["warna"], "Hitam")
+        self.assertEqual(d["hargaSopir"], 250000)
+        self.assertEqual(d["jaminan"], "KTP")
+        self.assertEqual(d["grandTotal"], 36483563)
+        self.assertEqual(d["kembalian"], 50001000 - 36483563)
+        with open(self.struk, encoding="utf-8") as f:
+            self.assertIn("Kembalian        : Rp13.517.437", f.read())
+
+    def test_transfer_tanpa_sopir_untuk_motor(self):
+        sesi = jalankan(self.sesi(), ["mk2", "biru", "Y", "3", "Ani", "Jl", "0813", "P", "3", "999", "", "2"])
+        self.assertTrue(sesi.selesai)
+        self.assertEqual(sesi.data["pembayaran"], "Transfer")
+        self.assertEqual(sesi.data["hargaSopir"], 0)
+        self.assertFalse(os.path.exists(self.struk))
+
+    def test_tunai_dan_transfer_tersimpan_di_store(self):
+        store = BookingStore(":memory:")
+        tunai = jalankan(self.sesi(store=store), ["mb1", "hitam", "y", "Y", "7", "Budi", "Jl. Mawar", "0812", "L",
+                                                  "1", "3201", "hemat5", "1", "50000000"])
+        transfer = jalankan(self.sesi(store=store, struk_path=None),
+                            ["mk2", "biru", "Y", "3", "Ani", "Jl", "0813", "P", "3", "999", "", "2"])
+        self.assertEqual(store.jumlah(), 2)
+        self.assertEqual(store.ambil(tunai.data["id"])["kembalian"], 50000000 - 36483563)
+        self.assertEqual(store.cari(telepon="0813")[0]["id"], transfer.data["id"])
+        self.assertEqual(store.cari(telepon="0813")[0]["pembayaran"], "Transfer")
+        # Struk file sama persis dengan ekspor dari store
+        ekspor = os.path.join(self.tmp.name, "ekspor.txt")
+        store.export_struk(tunai.data["id"], ekspor)
+        with open(self.struk, encoding="utf-8") as a, open(ekspor, encoding="utf-8") as b:
+            self.assertEqual(a.read(), b.read())
+        store.close()
+
+    def test_unit_habis_muat_ulang(self):
+        hari_ini = datetime.date(2025, 8, 1)
+        kalender = Ketersediaan({"mb1": 1, "mk2": 1})
+        store = BookingStore(":memory:")
+        pertama = jalankan(self.sesi(ketersediaan=kalender, store=store, hari_ini=lambda: hari_ini, struk_path=None),
+                           ["mk2", "biru", "Y", "3", "Ani", "Jl", "0813", "P", "3", "999", "", "2"])
+        self.assertEqual(pertama.data["unit"], "mk2-1")
+        self.assertEqual(store.reservasi_aktif("2025-08-01"), [("mk2", "mk2-1", "2025-08-01", "2025-08-04")])
+        kedua = jalankan(self.sesi(ketersediaan=kalender, hari_ini=lambda: hari_ini, jeda_ulang=0),
+                         ["mk2", "biru", "Y", "1"])
+        self.assertEqual(kedua.state, session.KENDARAAN)
+        self.assertIn("Unit tersedia lagi mulai 04-08-2025", self.out.getvalue())
+        # Sesi yang dibatalkan sebelum bayar melepas unitnya
+        ketiga = jalankan(self.sesi(ketersediaan=kalender, hari_ini=lambda: hari_ini), ["mb1", "hitam", "Y", "T", "2"])
+        self.assertEqual(kalender.unit_tersedia("mb1", hari_ini, 1), [])
+        ketiga.batal()
+        self.assertEqual(kalender.unit_tersedia("mb1", hari_ini, 1), ["mb1-1"])
+        store.close()
+
+    def test_voucher_sekali_pakai(self):
+        book = VoucherBook(":memory:")
+        book.simpan_aturan([Voucher("HEMAT5", 0.05), Voucher("SEKALI", 0.10, kuota=1)])
+        jawaban = ["mk2", "biru", "Y", "3", "Ani", "Jl", "0813", "P", "3", "999", "sekali", "2"]
+        pertama = jalankan(self.sesi(vouchers=book, struk_path=None), jawaban)
+        self.assertEqual(pertama.data["diskonVoucher"], int(pertama.data["totalSetelahDiskon"] * 0.10))
+        kedua = jalankan(self.sesi(vouchers=book, struk_path=None), jawaban)
+        self.assertEqual(kedua.data["diskonVoucher"], 0)
+        self.assertIn("Kuota voucher SEKALI sudah habis.", self.out.getvalue())
+        # Voucher bawaan tetap sama dengan perhitungan lama
+        ketiga = jalankan(self.sesi(vouchers=book), ["mb1", "hitam", "y", "Y", "7", "Budi", "Jl. Mawar", "0812", "L",
+                                                     "1", "3201", "hemat5", "1", "50000000"])
+        self.assertEqual(ketiga.data["grandTotal"], 36483563)
+        book.close()
+
+    def test_batal_mengembalikan_voucher(self):
+        book = VoucherBook(":memory:")
+        book.simpan_aturan([Voucher("SEKALI", 0.10, kuota=1)])
+        sesi = jalankan(self.sesi(vouchers=book), ["mk2", "biru", "Y", "3", "Ani", "Jl", "0813", "P", "3", "999", "sekali"])
+        self.assertEqual(book.sisa("SEKALI"), 0)
+        sesi.batal()
+        self.assertEqual(book.sisa("SEKALI"), 1)
+        book.close()
+
+    def test_input_tidak_valid_tetap_di_langkah_sama(self):
+        sesi = jalankan(self.sesi(), ["mk2", "ungu"])
+        self.assertEqual(sesi.state, session.WARNA)
+        self.assertIn("Input tidak valid. Pilihan: Biru, Hitam", self.out.getvalue())
+        jalankan_lagi = ["biru", "Y", "0", "abc"]
+        for j in jalankan_lagi:
+            sesi.kirim(j)
+        self.assertEqual(sesi.state, session.HARI)
+
+    def test_kode_tidak_valid_minta_jeda(self):
+        sesi = self.sesi(jeda_ulang=2)
+        sesi.mulai()
+        sesi.kirim("xx9")
+        self.assertEqual(sesi.tunggu, 2)
+        self.assertFalse(sesi.kirim("mb1"))
+        sesi.lanjut()
+        self.assertEqual(sesi.state, session.KENDARAAN)
+        self.assertTrue(sesi.kirim("mb1"))
+
+    def test_ulang_berkali_kali_stack_konstan(self):
+        sesi = self.sesi(menu=lambda: "MENU", jeda_ulang=0, struk_path=None)
+        sesi.mulai()
+        for _ in range(5000):
+            sesi.kirim("xx9")
+            sesi.kirim("mb1")
+            sesi.kirim("hitam")
+            sesi.kirim("T")
+        self.assertEqual(sesi.state, session.KENDARAAN)
+        self.assertEqual(sesi.data, {})
+
+if __name__ == "__main__":
+    unittest.main()
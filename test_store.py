@@ -0,0 +1,95 @@
+import json
+import os
+import tempfile
+import unittest
+import store
+from store import BookingStore, teks_struk
+
+def booking(**kwargs):
+    d = {
+        "kode": "mb1", "jenisKendaraan": "G-Class", "warna": "Hitam", "harga": 5000000, "hargaSopir": 0,
+        "jumlahHari": 2, "nama": "Budi", "alamat": "Jl. Mawar", "telepon": "0812", "jenisKelamin": "L",
+        "jaminan": "KTP", "nomorJaminan": "3201", "voucher": "", "subtotal": 10000000, "pajak": 1000000,
+        "totalHargaSopir": 0, "diskonPersen": 0, "diskon": 0, "diskonVoucher": 0, "grandTotal": 11000000,
+        "pembayaran": "Tunai", "uang": 12000000, "kembalian": 1000000,
+    }
+    d.update(kwargs)
+    return d
+
+class TestBookingStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = BookingStore(os.path.join(self.tmp.name, "booking.db"))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_wal_dan_index(self):
+        conn = self.store._conn
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        index = {r[1] for r in conn.execute("PRAGMA index_list(booking)")}
+        self.assertTrue({"idx_booking_telepon", "idx_booking_nama", "idx_booking_kode", "idx_booking_tanggal"} <= index)
+        for kolom, nilai in [("telepon", "0812"), ("nama", "Bud%"), ("kode", "mb1")]:
+            op = "LIKE" if kolom == "nama" else "="
+            rencana = " ".join(r[-1] for r in conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT * FROM booking WHERE {kolom} {op} ?", (nilai,)))
+            self.assertIn(f"idx_booking_{kolom}", rencana)
+
+    def test_simpan_dan_ambil(self):
+        id_booking = self.store.simpan(booking())
+        d = self.store.ambil(id_booking)
+        self.assertEqual(d["nama"], "Budi")
+        self.assertEqual(d["grandTotal"], 11000000)
+        self.assertTrue(d["tanggal"])
+        self.assertIsNone(self.store.ambil(999))
+
+    def test_cari_dengan_filter(self):
+        self.store.simpan_banyak([
+            booking(nama="Budi Santoso", tanggal="2025-01-05 10:00:00"),
+            booking(nama="budiman", telepon="0813", kode="mk2", tanggal="2025-01-31 23:59:00"),
+            booking(nama="Ani", telepon="0814", tanggal="2025-02-01 08:00:00"),
+            booking(nama="50%_off", telepon="0815", tanggal="2025-02-02 08:00:00"),
+        ])
+        self.assertEqual(self.store.jumlah(), 4)
+        self.assertEqual([d["nama"] for d in self.store.cari(nama="BUDI")], ["budiman", "Budi Santoso"])
+        self.assertEqual(len(self.store.cari(nama="50%")), 1)
+        self.assertEqual(self.store.cari(nama="5%"), [])
+        self.assertEqual([d["telepon"] for d in self.store.cari(kode="MK2")], ["0813"])
+        januari = self.store.cari(dari="2025-01-01", sampai="2025-01-31")
+        self.assertEqual(len(januari), 2)
+        self.assertEqual(len(self.store.cari(limit=1)), 1)
+
+    def test_struk_transfer_dan_tunai(self):
+        self.assertIn("Kembalian        : Rp1.000.000", teks_struk(booking()))
+        transfer = teks_struk(booking(pembayaran="Transfer", uang=None, kembalian=None))
+        self.assertIn("Total Transfer   : Rp11.000.000", transfer)
+        self.assertNotIn("Kembalian", transfer)
+
+    def test_export_struk(self):
+        id_booking = self.store.simpan(booking(diskonPersen=0.05, diskon=550000))
+        path = os.path.join(self.tmp.name, "struk.txt")
+        self.store.export_struk(id_booking, path)
+        with open(path, encoding="utf-8") as f:
+            self.assertIn("Diskon Durasi    : Rp550.000", f.read())
+        with self.assertRaises(KeyError):
+            self.store.export_struk(999, path)
+
+    def test_cli(self):
+        db = self.store.path
+        self.store.simpan(booking())
+        with open(os.devnull, "w") as null:
+            import contextlib
+            with contextlib.redirect_stdout(null):
+                self.assertEqual(store.main(["--db", db, "cari", "--telepon", "0812"]), 0)
+                self.assertEqual(store.main(["--db", db, "struk", "999"]), 1)
+        path = os.path.join(self.tmp.name, "ekspor.jsonl")
+        self.store.simpan(booking(nama="Ani"))
+        with open(os.devnull, "w") as null:
+            with contextlib.redirect_stdout(null):
+                self.assertEqual(store.main(["--db", db, "ekspor", "--format", "json", "--out", path]), 0)
+        with open(path, encoding="utf-8") as f:
+            self.assertEqual(sorted(json.loads(baris)["nama"] for baris in f), ["Ani", "Budi"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+import struk
+
+def booking(**kwargs):
+    d = {
+        "kode": "mb1", "jenisKendaraan": "G-Class", "warna": "Hitam", "harga": 5000000, "hargaSopir": 0,
+        "jumlahHari": 2, "nama": "Budi", "alamat": "Jl. Mawar", "telepon": "0812", "jenisKelamin": "L",
+        "voucher": "", "subtotal": 10000000, "pajak": 1000000, "totalHargaSopir": 0, "diskonPersen": 0,
+        "diskon": 0, "diskonVoucher": 0, "grandTotal": 11000000, "pembayaran": "Tunai", "uang": 12000000,
+        "kembalian": 1000000,
+    }
+    d.update(kwargs)
+    return d
+
+class TestStruk(unittest.TestCase):
+    def test_tagihan_tunai_dan_transfer_satu_layout(self):
+        d = booking(voucher="HEMAT5", diskonVoucher=100000)
+        tagihan = struk.render(d, judul=struk.TAGIHAN)
+        tunai = struk.render(d)
+        transfer = struk.render(booking(pembayaran="Transfer", uang=None, kembalian=None))
+        self.assertTrue(tagihan.startswith("=" * struk.LEBAR + "\n"))
+        self.assertIn("Bukti Penyewaan\n", tagihan)
+        self.assertIn("Total Bayar      : Rp11.000.000", tagihan)
+        self.assertNotIn("Metode Bayar", tagihan)
+        self.assertIn("Voucher Diskon   : Rp100.000 (HEMAT5)", tunai)
+        self.assertIn("Metode Bayar     : Tunai\nNominal Dibayar  : Rp12.000.000\nKembalian        : Rp1.000.000",
+                      tunai)
+        self.assertIn("Metode Bayar     : Transfer\nTotal Transfer   : Rp11.000.000", transfer)
+        self.assertNotIn("Total Bayar", transfer)
+        # Semua baris label sejajar di kolom yang sama
+        for baris in (tagihan + tunai + transfer).splitlines():
+            if ": " in baris:
+                self.assertEqual(baris.index(": "), struk.LEBAR_LABEL, baris)
+
+    def test_json_dan_csv(self):
+        d = booking(id=7, nama='Budi, "B"')
+        self.assertEqual(json.loads(struk.render(d, struk.JSON))["grandTotal"], 11000000)
+        baris = next(csv.DictReader(io.StringIO(struk.HEADER_CSV + struk.render(d, struk.CSV))))
+        self.assertEqual((baris["id"], baris["nama"], baris["tanggal"]), ("7", 'Budi, "B"', ""))
+        with self.assertRaises(ValueError):
+            struk.render(d, "pdf")
+
+    def test_satu_write_per_struk_dan_per_blok(self):
+        class Hitung(io.StringIO):
+            write_ = 0
+
+            def write(self, s):
+                self.write_ += 1
+                return super().write(s)
+
+        out = Hitung()
+        struk.tulis(booking(), out)
+        self.assertEqual(out.write_, 1)
+        out = Hitung()
+        self.assertEqual(struk.tulis_banyak((booking(id=i) for i in range(10)), out, struk.CSV, per_tulis=4), 10)
+        self.assertEqual(out.write_, 3)
+        self.assertEqual(len(out.getvalue().splitlines()), 11)
+        out = io.StringIO()
+        struk.tulis_banyak([booking(), booking()], out)
+        self.assertEqual(out.getvalue(), struk.render(booking()) + "\n" + struk.render(booking()))
+
+    def test_tulis_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "struk.txt")
+            struk.tulis_file(booking(), path)
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(f.read(), struk.render(booking()))
+
+if __name__ == "__main__":
+    unittest.main()
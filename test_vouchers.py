@@ -0,0 +1,133 @@
+import datetime
+import json
+import os
+import tempfile
+import threading
+import unittest
+import vouchers
+from vouchers import Voucher, VoucherBook, baca_voucher, buat_voucher, voucher_default
+
+H = datetime.date(2025, 8, 17)
+
+def pesanan(**kwargs):
+    d = {"kode": "mk2", "jumlahHari": 3, "telepon": "0812", "tanggal": H}
+    d.update(kwargs)
+    return d
+
+class TestVoucherBook(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self.tmp.name, "booking.db")
+        kategori = {"mb1": "Mobil", "mk2": "Motor"}
+        self.book = VoucherBook(self.db, kategori_kendaraan=kategori.get)
+        self.book.simpan_aturan(voucher_default())
+
+    def tearDown(self):
+        self.book.close()
+        self.tmp.cleanup()
+
+    def test_voucher_bawaan_sama_seperti_dulu(self):
+        self.assertEqual(self.book.pakai("merdeka17", pesanan())[0], 0.17)
+        self.assertEqual(self.book.pakai(" hemat5 ", pesanan())[0], 0.05)
+        self.assertEqual(self.book.pakai("GRATIS", pesanan()), (0, "Kode voucher tidak valid.", None))
+        self.assertIsNone(self.book.sisa("HEMAT5"))
+
+    def test_syarat_voucher(self):
+        self.book.simpan_aturan([
+            buat_voucher({"kode": "motoragustus", "persen": 0.15, "mulai": "2025-08-01", "sampai": "2025-08-31",
+                          "kategori": ["Motor"], "minHari": 3, "gabung": False}),
+        ])
+        self.assertEqual(self.book.pakai("MOTORAGUSTUS", pesanan())[0], 0.15)
+        cek = [
+            (pesanan(tanggal=datetime.date(2025, 9, 1)), "sudah tidak berlaku"),
+            (pesanan(tanggal=datetime.date(2025, 7, 31)), "baru berlaku mulai 2025-08-01"),
+            (pesanan(kode="mb1"), "hanya untuk Motor"),
+            (pesanan(jumlahHari=2), "minimal 3 hari"),
+            (pesanan(jumlahHari=7), "tidak bisa digabung"),
+        ]
+        for p, alasan in cek:
+            persen, pesan, idPakai = self.book.pakai("motoragustus", p)
+            self.assertEqual((persen, idPakai), (0, None))
+            self.assertIn(alasan, pesan)
+
+    def test_sekali_pakai_dan_per_pelanggan(self):
+        self.book.simpan_aturan([Voucher("SEKALI", 0.1, kuota=1), Voucher("LANGGANAN", 0.1, perPelanggan=1)])
+        self.assertEqual(self.book.pakai("SEKALI", pesanan())[0], 0.1)
+        self.assertIn("habis", self.book.pakai("SEKALI", pesanan(telepon="0899"))[1])
+        self.assertEqual(self.book.pakai("LANGGANAN", pesanan())[0], 0.1)
+        self.assertIn("sudah pernah", self.book.pakai("LANGGANAN", pesanan())[1])
+        self.assertEqual(self.book.pakai("LANGGANAN", pesanan(telepon="0899"))[0], 0.1)
+
+    def test_cek_tanpa_memakai_kuota(self):
+        self.book.simpan_aturan([Voucher("SEKALI", 0.1, kuota=1), Voucher("LANGGANAN", 0.1, perPelanggan=1)])
+        for _ in range(3):
+            self.assertEqual(self.book.cek("sekali", pesanan()), (0.1, None))
+        self.assertEqual(self.book.sisa("SEKALI"), 1)
+        self.book.pakai("SEKALI", pesanan())
+        self.book.pakai("LANGGANAN", pesanan())
+        self.assertIn("habis", self.book.cek("SEKALI", pesanan(telepon="0899"))[1])
+        self.assertIn("sudah pernah", self.book.cek("LANGGANAN", pesanan())[1])
+        self.assertEqual(self.book.cek("LANGGANAN", pesanan(telepon="0899")), (0.1, None))
+        self.assertEqual(self.book.cek("GRATIS", pesanan()), (0, "Kode voucher tidak valid."))
+
+    def test_kembalikan_kuota(self):
+        self.book.simpan_aturan([Voucher("SEKALI", 0.1, kuota=1)])
+        _, _, idPakai = self.book.pakai("SEKALI", pesanan())
+        self.assertEqual(self.book.sisa("SEKALI"), 0)
+        self.assertTrue(self.book.kembalikan(idPakai))
+        self.assertFalse(self.book.kembalikan(idPakai))
+        self.assertEqual(self.book.sisa("SEKALI"), 1)
+
+    def test_ubah_kuota_menghitung_pemakaian(self):
+        self.book.simpan_aturan([Voucher("PROMO", 0.1, kuota=2)])
+        self.book.pakai("PROMO", pesanan())
+        self.book.simpan_aturan([Voucher("PROMO", 0.2, kuota=5)])
+        self.assertEqual(self.book.sisa("PROMO"), 4)
+        self.assertEqual(self.book.get("promo").persen, 0.2)
+        # Voucher bawaan tidak menimpa aturan yang sudah diubah
+        self.book.simpan_aturan([Voucher("HEMAT5", 0.07)])
+        self.book.simpan_aturan(voucher_default(), timpa=False)
+        self.assertEqual(self.book.get("HEMAT5").persen, 0.07)
+
+    def test_pakai_bersamaan_tidak_dobel(self):
+        self.book.simpan_aturan([Voucher("REBUTAN", 0.5, kuota=3)])
+        # Dua koneksi (seperti dua proses) ke database yang sama
+        lain = VoucherBook(self.db)
+        hasil = []
+        def rebut(book):
+            for i in range(20):
+                hasil.append(book.pakai("REBUTAN", pesanan(telepon=str(i)))[0])
+        threads = [threading.Thread(target=rebut, args=(b,)) for b in (self.book, lain) * 3]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        lain.close()
+        self.assertEqual(hasil.count(0.5), 3)
+        self.assertEqual(self.book.sisa("REBUTAN"), 0)
+
+    def test_impor_dari_proses_lain_terlihat(self):
+        path = os.path.join(self.tmp.name, "voucher.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("kode,persen,mulai,sampai,kategori,minHari,kuota,perPelanggan,gabung\n")
+            f.write("CSV10,0.10,,,Mobil|Motor,,100,,ya\n")
+        self.assertEqual(vouchers.main(["--db", self.db, "impor", path]), 0)
+        v = self.book.get("csv10")
+        self.assertEqual(v.kategori, frozenset({"Mobil", "Motor"}))
+        self.assertEqual(self.book.sisa("CSV10"), 100)
+
+    def test_banyak_kode(self):
+        daftar = [Voucher(f"KODE{i:05d}", 0.05, kuota=1) for i in range(20000)]
+        self.book.simpan_aturan(daftar)
+        self.assertEqual(len(self.book), 20002)
+        self.assertEqual(self.book.pakai("kode12345", pesanan())[0], 0.05)
+
+    def test_file_json_tidak_valid(self):
+        path = os.path.join(self.tmp.name, "voucher.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump([{"kode": "X", "persen": 2}], f)
+        with self.assertRaises(ValueError):
+            baca_voucher(path)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,407 @@
+"""
+Voucher berbasis aturan.
+
+Dulu voucher hanya dua kode tetap (MERDEKA17, HEMAT5). Sekarang setiap voucher adalah satu
+aturan yang disimpan di database lokal (tabel `voucher` di booking.db) dan bisa diimpor dari
+file JSON/CSV tanpa mengubah kode program:
+
+    [{"kode": "MERDEKA17", "persen": 0.17},
+     {"kode": "BARU-8H2K", "persen": 0.10, "kuota": 1},
+     {"kode": "MOTORAGUSTUS", "persen": 0.15, "mulai": "2025-08-01", "sampai": "2025-08-31",
+      "kategori": ["Motor"], "minHari": 3, "perPelanggan": 1, "gabung": false}]
+
+Aturan:
+    - persen       : diskon dari total setelah diskon durasi (dipotong ke int, sama seperti dulu).
+    - mulai/sampai : masa berlaku (inklusif, 'YYYY-MM-DD').
+    - kategori     : hanya untuk kategori kendaraan tertentu.
+    - minHari      : lama sewa minimal.
+    - kuota        : jumlah pemakaian total (1 = sekali pakai). Kosong = tanpa batas.
+    - perPelanggan : jumlah pemakaian maksimal per nomor telepon.
+    - gabung       : False = tidak bisa dipakai bersama diskon durasi.
+
+Pencarian kode memakai dict (O(1)) walaupun ada puluhan ribu voucher. Pemakaian dicatat di
+tabel `voucher_pakai` dan sisa kuota dikurangi dalam satu transaksi BEGIN IMMEDIATE, jadi dua
+sesi (atau dua proses) tidak bisa memakai kuota terakhir bersamaan.
+
+CLI:
+    python vouchers.py impor voucher_agustus.json
+    python vouchers.py daftar
+"""
+
+import argparse
+import csv
+import datetime
+import json
+import sqlite3
+import threading
+
+from pricing import VOUCHER, diskon_durasi_persen
+from store import STORE_FILE
+
+SKEMA = """
+CREATE TABLE IF NOT EXISTS voucher (
+    kode TEXT PRIMARY KEY,
+    persen REAL NOT NULL,
+    mulai TEXT,
+    sampai TEXT,
+    kategori TEXT,
+    minHari INTEGER,
+    kuota INTEGER,
+    perPelanggan INTEGER,
+    gabung INTEGER NOT NULL DEFAULT 1,
+    sisa INTEGER
+);
+CREATE TABLE IF NOT EXISTS voucher_pakai (
+    id INTEGER PRIMARY KEY,
+    kode TEXT NOT NULL,
+    telepon TEXT,
+    tanggal TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_voucher_pakai ON voucher_pakai (kode, telepon);
+CREATE TABLE IF NOT EXISTS voucher_versi (id INTEGER PRIMARY KEY CHECK (id = 1), versi INTEGER NOT NULL);
+INSERT OR IGNORE INTO voucher_versi VALUES (1, 0);
+"""
+
+KOLOM = ("kode", "persen", "mulai", "sampai", "kategori", "minHari", "kuota", "perPelanggan", "gabung")
+
+_INSERT = f"INSERT INTO voucher ({', '.join(KOLOM)}, sisa) VALUES ({', '.join('?' * len(KOLOM))}, ?)"
+# Sisa kuota dihitung ulang dari pemakaian yang sudah tercatat jika kuota diubah
+_UPSERT = _INSERT + """
+ON CONFLICT(kode) DO UPDATE SET
+    persen = excluded.persen, mulai = excluded.mulai, sampai = excluded.sampai,
+    kategori = excluded.kategori, minHari = excluded.minHari, kuota = excluded.kuota,
+    perPelanggan = excluded.perPelanggan, gabung = excluded.gabung,
+    sisa = CASE WHEN excluded.kuota IS NULL THEN NULL
+                ELSE max(0, excluded.kuota - (SELECT COUNT(*) FROM voucher_pakai p WHERE p.kode = excluded.kode))
+           END
+"""
+
+
+class Voucher:
+    """
+    Satu aturan voucher (lihat docstring modul untuk arti setiap atribut).
+    """
+
+    __slots__ = KOLOM
+
+    def __init__(self, kode, persen, mulai=None, sampai=None, kategori=None, minHari=None,
+                 kuota=None, perPelanggan=None, gabung=True):
+        self.kode = kode
+        self.persen = persen
+        self.mulai = mulai
+        self.sampai = sampai
+        self.kategori = kategori
+        self.minHari = minHari
+        self.kuota = kuota
+        self.perPelanggan = perPelanggan
+        self.gabung = gabung
+
+    def __repr__(self):
+        return f"Voucher({self.kode!r}, {self.persen})"
+
+    def data(self):
+        """Aturan sebagai dict JSON (kebalikan buat_voucher(); atribut kosong tidak ditulis)."""
+        d = {k: getattr(self, k) for k in KOLOM if getattr(self, k) is not None}
+        if self.kategori:
+            d["kategori"] = sorted(self.kategori)
+        return d
+
+    def baris(self):
+        """Tuple nilai kolom untuk tabel voucher."""
+        kategori = "|".join(sorted(self.kategori)) if self.kategori else None
+        return (self.kode, self.persen, self.mulai, self.sampai, kategori, self.minHari,
+                self.kuota, self.perPelanggan, int(self.gabung))
+
+
+def _opsional(nilai, tipe):
+    return tipe(nilai) if nilai not in (None, "") else None
+
+
+def buat_voucher(data):
+    """
+    Membuat Voucher dari dict (baris JSON/CSV atau database).
+
+    Raises:
+        ValueError: Jika kode kosong atau persen di luar 0-1.
+    """
+    try:
+        kode = str(data["kode"]).strip().upper()
+        persen = float(data["persen"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Voucher tidak valid: {data!r}") from e
+    if not kode or not 0 < persen <= 1:
+        raise ValueError(f"Voucher tidak valid: {data!r}")
+    kategori = data.get("kategori")
+    if isinstance(kategori, str):
+        kategori = kategori.split("|")
+    kategori = frozenset(k.strip() for k in kategori if k.strip()) if kategori else None
+    for kunci in ("mulai", "sampai"):
+        if data.get(kunci):
+            datetime.date.fromisoformat(data[kunci])
+    gabung = data.get("gabung", True)
+    if isinstance(gabung, str):
+        gabung = gabung.strip().lower() not in ("0", "t", "tidak", "false")
+    return Voucher(kode, persen, data.get("mulai") or None, data.get("sampai") or None, kategori,
+                   _opsional(data.get("minHari"), int), _opsional(data.get("kuota"), int),
+                   _opsional(data.get("perPelanggan"), int), bool(gabung))
+
+
+def baca_voucher(path):
+    """
+    Membaca aturan voucher dari file JSON atau CSV (kolom sama dengan key JSON, kategori dipisah '|').
+
+    Returns:
+        list: Voucher.
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        baris = list(csv.DictReader(f)) if path.lower().endswith(".csv") else json.load(f)
+    return [buat_voucher(b) for b in baris]
+
+
+def voucher_default():
+    """Voucher bawaan dari pricing.VOUCHER (tanpa batas, seperti sebelumnya)."""
+    return [Voucher(kode, persen) for kode, persen in VOUCHER.items()]
+
+
+class VoucherBook:
+    """
+    Kumpulan voucher beserta penghitung pemakaiannya.
+
+    Args:
+        path (str, optional): File database SQLite (default booking.db). ":memory:" untuk sementara.
+        kategori_kendaraan (callable, optional): kategori_kendaraan(kode) -> nama kategori,
+            dipakai untuk voucher yang dibatasi kategori.
+    """
+
+    def __init__(self, path=STORE_FILE, kategori_kendaraan=None):
+        self.path = path
+        self.kategori_kendaraan = kategori_kendaraan
+        # isolation_level=None: transaksi diatur manual (BEGIN IMMEDIATE) di pakai()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._kunci = threading.Lock()
+        self._index = {}
+        self._versi = None
+        with self._kunci:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SKEMA)
+            self._segarkan()
+
+    def close(self):
+        with self._kunci:
+            self._conn.close()
+
+    def _segarkan(self):
+        """Memuat ulang index jika aturan di database diubah (mis. lewat CLI impor dari proses lain)."""
+        versi = self._conn.execute("SELECT versi FROM voucher_versi").fetchone()[0]
+        if versi == self._versi:
+            return
+        kursor = self._conn.execute(f"SELECT {', '.join(KOLOM)} FROM voucher")
+        self._index = {b[0]: buat_voucher(dict(zip(KOLOM, b))) for b in kursor}
+        self._versi = versi
+
+    def simpan_aturan(self, daftar, timpa=True):
+        """
+        Menyimpan aturan voucher ke database.
+
+        Args:
+            daftar (iterable): Voucher.
+            timpa (bool, optional): False = voucher yang sudah ada tidak diubah (untuk voucher bawaan).
+
+        Returns:
+            int: Jumlah voucher yang ditulis.
+        """
+        sql = _UPSERT if timpa else _INSERT + " ON CONFLICT(kode) DO NOTHING"
+        with self._kunci:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                jumlah = 0
+                for v in daftar:
+                    jumlah += self._conn.execute(sql, v.baris() + (v.kuota,)).rowcount
+                self._conn.execute("UPDATE voucher_versi SET versi = versi + 1")
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._segarkan()
+        return jumlah
+
+    def get(self, kode):
+        """
+        Returns:
+            Voucher | None: Aturan untuk kode (tidak peka huruf besar/kecil).
+        """
+        with self._kunci:
+            self._segarkan()
+            return self._index.get(kode.strip().upper())
+
+    def __len__(self):
+        return len(self._index)
+
+    def semua(self):
+        """
+        Returns:
+            list: Semua Voucher, urut kode.
+        """
+        with self._kunci:
+            self._segarkan()
+            return sorted(self._index.values(), key=lambda v: v.kode)
+
+    def periksa(self, v, pesanan):
+        """
+        Mengecek syarat voucher yang tidak bergantung pada kuota.
+
+        Args:
+            v (Voucher): Aturan voucher.
+            pesanan (dict): kode, jumlahHari, tanggal (datetime.date), dan telepon. tanggal hanya
+                dibaca jika voucher punya masa berlaku.
+
+        Returns:
+            str | None: Alasan voucher tidak berlaku, None jika berlaku.
+        """
+        if v.mulai or v.sampai:
+            tanggal = pesanan["tanggal"].isoformat()
+            if v.mulai and tanggal < v.mulai:
+                return f"Voucher {v.kode} baru berlaku mulai {v.mulai}."
+            if v.sampai and tanggal > v.sampai:
+                return f"Voucher {v.kode} sudah tidak berlaku."
+        if v.kategori:
+            kategori = self.kategori_kendaraan(pesanan["kode"]) if self.kategori_kendaraan else None
+            if kategori not in v.kategori:
+                return f"Voucher {v.kode} hanya untuk {', '.join(sorted(v.kategori))}."
+        if v.minHari and pesanan["jumlahHari"] < v.minHari:
+            return f"Voucher {v.kode} hanya untuk sewa minimal {v.minHari} hari."
+        if not v.gabung and diskon_durasi_persen(pesanan["jumlahHari"]):
+            return f"Voucher {v.kode} tidak bisa digabung dengan diskon durasi."
+        return None
+
+    def cek(self, kode, pesanan):
+        """
+        Mengecek voucher seperti pakai(), termasuk kuota dan batas per pelanggan, tanpa memakainya.
+
+        Dipakai untuk rekomendasi budget, yang tidak boleh menghabiskan kuota pelanggan.
+
+        Args:
+            kode (str): Kode voucher yang diketik user.
+            pesanan (dict): kode, jumlahHari, tanggal (datetime.date), dan telepon.
+
+        Returns:
+            tuple: (persen, alasan). persen 0 dan alasan berisi pesan jika voucher tidak berlaku.
+        """
+        v = self.get(kode)
+        if v is None:
+            return 0, "Kode voucher tidak valid."
+        alasan = self.periksa(v, pesanan)
+        if alasan:
+            return 0, alasan
+        with self._kunci:
+            if v.perPelanggan:
+                dipakai = self._conn.execute("SELECT COUNT(*) FROM voucher_pakai WHERE kode = ? AND telepon = ?",
+                                             (v.kode, pesanan.get("telepon"))).fetchone()[0]
+                if dipakai >= v.perPelanggan:
+                    return 0, f"Voucher {v.kode} sudah pernah Anda pakai."
+            sisa = self._conn.execute("SELECT sisa FROM voucher WHERE kode = ?", (v.kode,)).fetchone()
+        if sisa is not None and sisa[0] is not None and sisa[0] <= 0:
+            return 0, f"Kuota voucher {v.kode} sudah habis."
+        return v.persen, None
+
+    def pakai(self, kode, pesanan):
+        """
+        Mengecek dan memakai voucher secara atomik (kuota dan batas per pelanggan).
+
+        Args:
+            kode (str): Kode voucher yang diketik user.
+            pesanan (dict): kode, jumlahHari, tanggal (datetime.date), dan telepon.
+
+        Returns:
+            tuple: (persen, alasan, idPakai). persen 0 dan alasan berisi pesan jika voucher tidak
+                bisa dipakai; idPakai dipakai untuk kembalikan() jika sewa batal.
+        """
+        v = self.get(kode)
+        if v is None:
+            return 0, "Kode voucher tidak valid.", None
+        alasan = self.periksa(v, pesanan)
+        if alasan:
+            return 0, alasan, None
+        telepon = pesanan.get("telepon")
+        with self._kunci:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if v.perPelanggan:
+                    dipakai = self._conn.execute(
+                        "SELECT COUNT(*) FROM voucher_pakai WHERE kode = ? AND telepon = ?",
+                        (v.kode, telepon)).fetchone()[0]
+                    if dipakai >= v.perPelanggan:
+                        self._conn.execute("ROLLBACK")
+                        return 0, f"Voucher {v.kode} sudah pernah Anda pakai.", None
+                sisa = self._conn.execute(
+                    "UPDATE voucher SET sisa = sisa - 1 WHERE kode = ? AND (sisa IS NULL OR sisa > 0)", (v.kode,))
+                if sisa.rowcount == 0:
+                    self._conn.execute("ROLLBACK")
+                    return 0, f"Kuota voucher {v.kode} sudah habis.", None
+                idPakai = self._conn.execute(
+                    "INSERT INTO voucher_pakai (kode, telepon, tanggal) VALUES (?, ?, ?)",
+                    (v.kode, telepon, pesanan["tanggal"].isoformat())).lastrowid
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return v.persen, None, idPakai
+
+    def kembalikan(self, idPakai):
+        """
+        Membatalkan satu pemakaian voucher (sewa batal sebelum bayar); kuotanya kembali.
+
+        Returns:
+            bool: False jika pemakaian tidak ditemukan.
+        """
+        with self._kunci:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                baris = self._conn.execute("SELECT kode FROM voucher_pakai WHERE id = ?", (idPakai,)).fetchone()
+                if baris is not None:
+                    self._conn.execute("DELETE FROM voucher_pakai WHERE id = ?", (idPakai,))
+                    self._conn.execute("UPDATE voucher SET sisa = sisa + 1 WHERE kode = ? AND sisa IS NOT NULL",
+                                       (baris[0],))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return baris is not None
+
+    def sisa(self, kode):
+        """
+        Returns:
+            int | None: Sisa kuota (None = tanpa batas atau voucher tidak ada).
+        """
+        with self._kunci:
+            baris = self._conn.execute("SELECT sisa FROM voucher WHERE kode = ?", (kode.strip().upper(),)).fetchone()
+        return baris[0] if baris else None
+
+
+# =================== CLI ===================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Voucher Apen Al-wawi Rent")
+    parser.add_argument("--db", default=STORE_FILE, help="File database")
+    sub = parser.add_subparsers(dest="perintah", required=True)
+    impor = sub.add_parser("impor", help="Impor/ubah aturan voucher dari file JSON/CSV")
+    impor.add_argument("file")
+    sub.add_parser("daftar", help="Tampilkan semua voucher")
+    args = parser.parse_args(argv)
+
+    book = VoucherBook(args.db)
+    try:
+        if args.perintah == "impor":
+            print(f"{book.simpan_aturan(baca_voucher(args.file))} voucher disimpan.")
+        else:
+            for v in book.semua():
+                sisa = book.sisa(v.kode)
+                print(f"{v.kode:<20} {v.persen * 100:>5.1f}%  sisa {'-' if sisa is None else sisa:<8} "
+                      f"{v.mulai or ''}..{v.sampai or ''} {','.join(sorted(v.kategori or ()))}")
+    finally:
+        book.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())